@@ -0,0 +1,6 @@
+from api.exceptions.base import ValidationException
+
+
+class InvalidCursorException(ValidationException):
+    default_code = "INVALID_CURSOR"
+    default_detail = "Pagination cursor is invalid."
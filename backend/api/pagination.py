@@ -0,0 +1,126 @@
+"""
+Keyset (cursor) pagination for ordered querysets.
+
+The queryset's ordering must end with a unique ``id`` tiebreaker, so the
+ordering values of the last row on a page identify the position in the
+result set exactly.  The next page is fetched with a "row comes after these
+values" filter instead of an OFFSET, which keeps every page equally cheap
+and stable while rows are added or removed between requests.
+
+Cursors are opaque URL-safe strings.  They embed the ordering they were
+issued for, so a cursor reused with a different ordering is rejected
+instead of silently producing a wrong page.
+
+Used by the catalogue (products.search.pagination adds relevance-ranked
+paging on top) and the order list.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+from typing import Any, Optional
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded or does not match the ordering."""
+
+
+@dataclass
+class CursorPage:
+    """One page of results."""
+
+    items: list = field(default_factory=list)
+    # Opaque cursor for the next page, or None when this is the last page.
+    next_cursor: Optional[str] = None
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(ordering: list[str], values: list[Any]) -> str:
+    payload = json.dumps(
+        {"o": ordering, "v": [_json_value(v) for v in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, ordering: list[str]) -> list[Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor("Cursor is malformed.") from exc
+
+    if not isinstance(payload, dict) or payload.get("o") != ordering:
+        raise InvalidCursor("Cursor does not match the requested ordering.")
+    values = payload.get("v")
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor("Cursor is malformed.")
+    return values
+
+
+def _after_q(ordering: list[str], values: list[Any]) -> Q:
+    """Build ``(k1, k2, …) > (v1, v2, …)`` honouring per-field direction.
+
+    Expands to ``k1 > v1 OR (k1 = v1 AND k2 > v2) OR …`` where ``>`` becomes
+    ``<`` for descending fields.
+    """
+    clauses = []
+    equal: dict[str, Any] = {}
+    for key, value in zip(ordering, values):
+        name = key.lstrip("-")
+        lookup = "lt" if key.startswith("-") else "gt"
+        clauses.append(Q(**equal, **{f"{name}__{lookup}": value}))
+        equal[name] = value
+    return reduce(or_, clauses)
+
+
+class KeysetCursorPaginator:
+    """
+    Keyset paginator for an ordered queryset.
+
+    Usage::
+
+        page = KeysetCursorPaginator(page_size=24).paginate(qs, cursor)
+        page.items        # list of model instances
+        page.next_cursor  # str | None
+    """
+
+    def __init__(self, page_size: int) -> None:
+        self.page_size = page_size
+
+    def paginate(self, qs: QuerySet, cursor: Optional[str]) -> CursorPage:
+        ordering = [str(key) for key in qs.query.order_by]
+        if not ordering or ordering[-1].lstrip("-") not in ("id", "pk"):
+            raise ValueError("Keyset pagination requires an ordering ending with 'id'.")
+
+        if cursor:
+            values = decode_cursor(cursor, ordering)
+            try:
+                # Values are coerced to the field types here; a cursor with
+                # e.g. a string where an id belongs fails before any query.
+                qs = qs.filter(_after_q(ordering, values))
+            except (ValueError, TypeError, ValidationError) as exc:
+                raise InvalidCursor("Cursor is malformed.") from exc
+
+        rows = list(qs[: self.page_size + 1])
+        if len(rows) <= self.page_size:
+            return CursorPage(items=rows)
+
+        items = rows[: self.page_size]
+        last = items[-1]
+        values = [getattr(last, key.lstrip("-")) for key in ordering]
+        return CursorPage(items=items, next_cursor=encode_cursor(ordering, values))
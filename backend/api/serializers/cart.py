@@ -244,24 +244,26 @@ class CartSerializer(serializers.ModelSerializer):
         context and the session contains a claimed CAMPAIGN_APPLY offer, the
         campaign offer pricing function is used instead of the AUTO_APPLY
         resolver, so the discount is reflected in the cart response.
+
+        The result is shared with preflight and checkout through the
+        fingerprint-validated cart pricing cache (carts.services.pricing_cache).
+        Views that already priced the cart (e.g. incrementally after a line
+        edit) pass it as ``cart_pricing`` in the serializer context.
         """
+        if not hasattr(self, "_cart_pricing_cache") and "cart_pricing" in self.context:
+            self._cart_pricing_cache = self.context["cart_pricing"]
         if not hasattr(self, "_cart_pricing_cache"):
-            from carts.services.pricing import (  # noqa: PLC0415
-                get_cart_pricing_with_campaign_offer,
-                get_cart_pricing_with_order_discount,
+            from carts.services.pricing_cache import (  # noqa: PLC0415
+                get_cached_cart_pricing,
             )
             from api.services.campaign_offer_session import (  # noqa: PLC0415
                 get_claimed_campaign_offer,
             )
 
             request = self.context.get("request")
-            claimed_offer = get_claimed_campaign_offer(request)
-            if claimed_offer is not None:
-                self._cart_pricing_cache = get_cart_pricing_with_campaign_offer(
-                    instance, claimed_offer
-                )
-            else:
-                self._cart_pricing_cache = get_cart_pricing_with_order_discount(instance)
+            self._cart_pricing_cache = get_cached_cart_pricing(
+                instance, offer=get_claimed_campaign_offer(request)
+            )
         return self._cart_pricing_cache
 
     # ------------------------------------------------------------------
@@ -270,14 +272,14 @@ class CartSerializer(serializers.ModelSerializer):
 
     def get_items(self, instance):
         """Return cart items enriched with per-item pricing breakdown."""
-        from api.serializers.product import ProductPricingResultSerializer  # noqa: PLC0415
+        from api.serializers.product import pricing_result_payload  # noqa: PLC0415
 
         cart_pricing = self._get_cart_pricing(instance)
         result = []
         for line in cart_pricing.items:
             item_data = dict(CartItemSerializer(line.item).data)
             item_data["pricing"] = (
-                ProductPricingResultSerializer(line.unit_pricing).data
+                pricing_result_payload(line.unit_pricing)
                 if line.unit_pricing is not None
                 else None
             )
@@ -309,6 +311,33 @@ class CartItemUpdateRequestSerializer(serializers.Serializer):
     quantity = serializers.IntegerField(min_value=0)
 
 
+# Upper bound on lines accepted by POST /cart/items/bulk/ in one request.
+CART_ITEMS_BULK_MAX_LINES = 100
+
+
+class CartItemBulkRequestSerializer(serializers.Serializer):
+    """
+    OpenAPI request schema for setting several cart lines at once.
+
+    Each line uses the same shape and rules as the single-item add request.
+    A product may appear only once per request.
+    """
+    items = CartItemCreateRequestSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=CART_ITEMS_BULK_MAX_LINES,
+        help_text="Cart lines to upsert (quantity is set, not added).",
+    )
+
+    def validate_items(self, items):
+        product_ids = [line["product_id"] for line in items]
+        if len(set(product_ids)) != len(product_ids):
+            raise serializers.ValidationError(
+                "Each product_id may appear only once."
+            )
+        return items
+
+
 class CartCheckoutRequestSerializer(serializers.Serializer):
     customer_email = serializers.EmailField()
     shipping_provider_code = serializers.CharField()
@@ -381,6 +410,15 @@ class CartCheckoutRequestSerializer(serializers.Serializer):
         help_text="Payment method: CARD (hosted redirect) or COD (cash on delivery).",
     )
 
+    # Optional token from GET /cart/checkout/preflight/.  A valid, unexpired
+    # token whose cart pricing inputs are unchanged lets checkout skip
+    # repricing; anything else is ignored.
+    pricing_token = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        help_text="pricing_token returned by the checkout preflight.",
+    )
+
     def validate(self, attrs):
         try:
             service = resolve_shipping_service_selection(
@@ -1,17 +1,13 @@
-from collections import defaultdict
 from decimal import Decimal, ROUND_HALF_UP
 
+from django.db.models import Prefetch
 from rest_framework import serializers
 
-from discounts.models import PromotionType
-from discounts.services.order_discount_allocation import (
-    OrderDiscountInput,
-    OrderLineInput,
-    allocate_order_discount,
-)
 from orders.models import Order
+from orders.services.vat_breakdown import compute_order_vat_breakdown
 from orderitems.models import OrderItem
 from payments.models import Payment
+from shipping.models import Shipment
 
 
 def _format_decimal(value: Decimal) -> str:
@@ -24,6 +20,48 @@ def _format_decimal_or_none(value) -> str | None:
     return _format_decimal(Decimal(str(value)))
 
 
+def with_order_response_relations(qs):
+    """Prefetch everything ``OrderResponseSerializer`` reads for a list of orders.
+
+    Serialising a list then takes a constant number of queries instead of
+    several per order:
+    - items (with product, read by ``OrderItemResponseSerializer.product``)
+    - shipments with their events (shipment summary and timeline)
+    - the latest payment only, as ``latest_payments`` (payment method)
+
+    Only for read paths: prefetched relations are not refreshed when a
+    service adds shipments or payments to the order afterwards.
+    """
+    return qs.prefetch_related(
+        Prefetch("items", queryset=OrderItem.objects.select_related("product")),
+        Prefetch("shipments", queryset=Shipment.objects.prefetch_related("events")),
+        Prefetch(
+            "payments",
+            queryset=Payment.objects.order_by("-created_at", "-pk").only(
+                "id", "order_id", "payment_method", "created_at"
+            )[:1],
+            to_attr="latest_payments",
+        ),
+    )
+
+
+def with_order_list_relations(qs):
+    """Prefetch the item fields ``OrderListItemSerializer`` reads."""
+    return qs.prefetch_related(
+        Prefetch(
+            "items",
+            queryset=OrderItem.objects.only(
+                "id",
+                "order_id",
+                "quantity",
+                "line_total_gross_at_order_time",
+                "line_total_at_order_time",
+                "price_at_order_time",
+            ),
+        )
+    )
+
+
 def _line_total_gross_decimal(obj: OrderItem) -> Decimal:
     """Return the gross line total, preferring the new snapshot field."""
     if obj.line_total_gross_at_order_time is not None:
@@ -35,6 +73,18 @@ def _line_total_gross_decimal(obj: OrderItem) -> Decimal:
     return Decimal("0.00")
 
 
+def _order_total(obj: Order) -> str:
+    # post_order_discount_total_gross = subtotal_gross after applying OD
+    # (when OD exists, subtotal_gross is already post-OD).
+    if obj.subtotal_gross is not None:
+        return _format_decimal(obj.subtotal_gross)
+    total = sum(
+        (_line_total_gross_decimal(item) for item in obj.items.all()),
+        Decimal("0.00"),
+    )
+    return _format_decimal(total)
+
+
 class OrderItemResponseSerializer(serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
     product = serializers.IntegerField(source="product.id", read_only=True)
@@ -146,15 +196,7 @@ class OrderResponseSerializer(serializers.Serializer):
         return None
 
     def get_total(self, obj: Order) -> str:
-        # post_order_discount_total_gross = subtotal_gross after applying OD
-        # (when OD exists, subtotal_gross is already post-OD).
-        if obj.subtotal_gross is not None:
-            return _format_decimal(obj.subtotal_gross)
-        total = sum(
-            (_line_total_gross_decimal(item) for item in obj.items.all()),
-            Decimal("0.00"),
-        )
-        return _format_decimal(total)
+        return _order_total(obj)
 
     def get_subtotal_net(self, obj: Order) -> str | None:
         return _format_decimal_or_none(obj.subtotal_net)
@@ -239,86 +281,15 @@ class OrderResponseSerializer(serializers.Serializer):
 
         Only items with fully-populated Phase 3 snapshot fields are included.
         Items without line_total_net or line_total_gross snapshots are skipped.
-        """
-        _ZERO = Decimal("0")
-
-        # Collect items with full Phase 3 snapshot fields.
-        items_with_snapshots = [
-            item
-            for item in obj.items.all()
-            if (
-                item.line_total_net_at_order_time is not None
-                and item.line_total_gross_at_order_time is not None
-            )
-        ]
-
-        if not items_with_snapshots:
-            return []
 
-        # When order-level discount exists, use the allocation engine to obtain
-        # post-discount per-bucket accounting truth.
-        if (
-            obj.order_discount_gross is not None
-            and obj.order_discount_gross > _ZERO
-            and obj.currency
-        ):
-            lines = [
-                OrderLineInput(
-                    line_net=Decimal(str(item.line_total_net_at_order_time)),
-                    line_gross=Decimal(str(item.line_total_gross_at_order_time)),
-                    tax_rate=(
-                        Decimal(str(item.tax_rate_at_order_time))
-                        if item.tax_rate_at_order_time is not None
-                        else _ZERO
-                    ),
-                    currency=obj.currency,
-                )
-                for item in items_with_snapshots
-            ]
-            discount = OrderDiscountInput(
-                type=PromotionType.FIXED,
-                value=Decimal(str(obj.order_discount_gross)),
-                currency=obj.currency,
-            )
-            result = allocate_order_discount(lines=lines, discount=discount)
-            return [
-                {
-                    "tax_rate": _format_decimal(bucket.tax_rate),
-                    "tax_base": _format_decimal(bucket.adjusted_net),
-                    "vat_amount": _format_decimal(bucket.adjusted_tax),
-                    "total_incl_vat": _format_decimal(bucket.adjusted_gross),
-                }
-                for bucket in result.buckets
-            ]
-
-        # No order-level discount: group item line totals directly.
-        groups: dict[str, dict] = defaultdict(
-            lambda: {"tax_base": _ZERO, "vat_amount": _ZERO, "total_incl_vat": _ZERO}
-        )
+        The rows are stored on the order at checkout (Order.vat_breakdown);
+        they are only computed here for orders that predate the snapshot and
+        have not been backfilled yet.
+        """
+        if obj.vat_breakdown is not None:
+            return obj.vat_breakdown
+        return compute_order_vat_breakdown(obj)
 
-        for item in items_with_snapshots:
-            rate_raw = (
-                item.tax_rate_at_order_time
-                if item.tax_rate_at_order_time is not None
-                else _ZERO
-            )
-            rate_key = _format_decimal(Decimal(str(rate_raw)))
-
-            line_net = Decimal(str(item.line_total_net_at_order_time))
-            line_gross = Decimal(str(item.line_total_gross_at_order_time))
-            groups[rate_key]["tax_base"] += line_net
-            groups[rate_key]["vat_amount"] += line_gross - line_net
-            groups[rate_key]["total_incl_vat"] += line_gross
-
-        return [
-            {
-                "tax_rate": rate,
-                "tax_base": _format_decimal(g["tax_base"]),
-                "vat_amount": _format_decimal(g["vat_amount"]),
-                "total_incl_vat": _format_decimal(g["total_incl_vat"]),
-            }
-            for rate, g in sorted(groups.items(), key=lambda x: Decimal(x[0]))
-        ]
     def get_shipping_address(self, obj: Order) -> dict:
         """Full shipping address snapshot including business fields.
 
@@ -394,11 +365,16 @@ class OrderResponseSerializer(serializers.Serializer):
         return shipment.get_timeline()
 
     def get_payment_method(self, obj: Order) -> str | None:
-        payment_method = (
-            obj.payments.order_by("-created_at", "-pk")
-            .values_list("payment_method", flat=True)
-            .first()
-        )
+        latest_payments = getattr(obj, "latest_payments", None)
+        if latest_payments is not None:
+            # Prefetched by with_order_response_relations().
+            payment_method = latest_payments[0].payment_method if latest_payments else None
+        else:
+            payment_method = (
+                obj.payments.order_by("-created_at", "-pk")
+                .values_list("payment_method", flat=True)
+                .first()
+            )
         if payment_method not in {choice.value for choice in Payment.PaymentMethod}:
             return None
         return payment_method
@@ -436,4 +412,39 @@ class OrderResponseSerializer(serializers.Serializer):
             "account_number": obj.supplier_account_number or "",
             "iban": obj.supplier_iban or "",
             "swift": obj.supplier_swift or "",
-        }
\ No newline at end of file
+        }
+
+
+class OrderListItemSerializer(serializers.Serializer):
+    """Compact order row for the paginated order history list.
+
+    Use with ``with_order_list_relations``; the full order is available
+    from the detail endpoint.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    created_at = serializers.SerializerMethodField()
+    total = serializers.SerializerMethodField()
+    currency = serializers.CharField(read_only=True)
+    # Sum of item quantities.
+    item_count = serializers.SerializerMethodField()
+
+    def get_created_at(self, obj: Order) -> str | None:
+        if obj.created_at:
+            return obj.created_at.isoformat()
+        return None
+
+    def get_total(self, obj: Order) -> str:
+        return _order_total(obj)
+
+    def get_item_count(self, obj: Order) -> int:
+        return sum(item.quantity for item in obj.items.all())
+
+
+class OrderListPageSerializer(serializers.Serializer):
+    """One page of the cursor-paginated order list (schema only)."""
+
+    results = OrderListItemSerializer(many=True, read_only=True)
+    # ``null`` on the last page.
+    next_cursor = serializers.CharField(read_only=True, allow_null=True)
@@ -133,6 +133,59 @@ class ProductPricingResultSerializer(serializers.Serializer):
         return _DiscountResultSerializer(obj.discount).data
 
 
+# ---------------------------------------------------------------------------
+# Pricing payload builders — fast path
+# ---------------------------------------------------------------------------
+#
+# The serializers above document the pricing payload (they drive the OpenAPI
+# schema) but run the full DRF field machinery for every product and cart
+# line.  The builders below produce the identical structure as plain dicts
+# and are what the list / detail / cart serializers actually call.  Keep
+# both in sync; tests/api/test_pricing_payload_builders.py asserts parity.
+
+
+def pricing_tier_payload(tier) -> dict:
+    """Plain-dict equivalent of ``_PricingTierSerializer(tier).data``."""
+    return {
+        "net": str(tier.net.amount),
+        "gross": str(tier.gross.amount),
+        "tax": str(tier.tax.amount),
+        "currency": tier.currency,
+        "tax_rate": format(tier.tax_rate.normalize(), "f"),
+    }
+
+
+def discount_payload(discount) -> dict:
+    """Plain-dict equivalent of ``_DiscountResultSerializer(discount).data``."""
+    percentage = discount.percentage
+    return {
+        "amount_net": str(discount.amount_net.amount),
+        "amount_gross": str(discount.amount_gross.amount),
+        "percentage": None if percentage is None else str(percentage),
+        "promotion_code": discount.promotion_code,
+        "promotion_type": discount.promotion_type,
+        "amount_scope": discount.amount_scope,
+    }
+
+
+def pricing_result_payload(result) -> dict:
+    """Plain-dict equivalent of ``ProductPricingResultSerializer(result).data``.
+
+    When no promotion applies ``undiscounted`` and ``discounted`` are the
+    same tier object; it is rendered once and the two keys get equal copies.
+    """
+    undiscounted = pricing_tier_payload(result.undiscounted)
+    if result.discounted is result.undiscounted:
+        discounted = dict(undiscounted)
+    else:
+        discounted = pricing_tier_payload(result.discounted)
+    return {
+        "undiscounted": undiscounted,
+        "discounted": discounted,
+        "discount": discount_payload(result.discount),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Stock status constants
 # ---------------------------------------------------------------------------
@@ -188,7 +241,13 @@ class ProductImageSerializer(serializers.ModelSerializer):
 
 
 class ProductSerializer(serializers.ModelSerializer):
-    """Catalogue / list serializer — omits full_description to keep response compact."""
+    """Catalogue / list serializer — omits full_description to keep response compact.
+
+    Accepts an optional ``fields`` keyword (iterable of field names) that
+    projects the output onto a subset of ``Meta.fields``.  Dropped method
+    fields such as ``pricing`` or ``primary_image`` are not computed at all.
+    Unknown names are ignored; an empty projection keeps every field.
+    """
 
     stock_status = serializers.SerializerMethodField(
         help_text="IN_STOCK | LOW_STOCK | OUT_OF_STOCK"
@@ -215,6 +274,14 @@ class ProductSerializer(serializers.ModelSerializer):
             "primary_image",
         ]
 
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields:
+            keep = set(fields) & set(self.fields)
+            if keep:
+                for name in set(self.fields) - keep:
+                    self.fields.pop(name)
+
     def get_stock_status(self, obj: Product) -> str:
         return _compute_stock_status(obj.stock_quantity)
 
@@ -226,10 +293,18 @@ class ProductSerializer(serializers.ModelSerializer):
         ).data
 
     def get_pricing(self, obj: Product):
-        result = get_product_pricing(obj)
+        # List views price the whole page up front (``bulk_pricing``, see
+        # price_products_bulk) or at least resolve the winning promotions in
+        # bulk (``line_promotions``); otherwise pricing falls back to the
+        # per-product path.
+        result = get_product_pricing(
+            obj,
+            line_promotions=self.context.get("line_promotions"),
+            bulk_pricing=self.context.get("bulk_pricing"),
+        )
         if result is None:
             return None
-        return ProductPricingResultSerializer(result).data
+        return pricing_result_payload(result)
 
 
 class ProductDetailSerializer(serializers.ModelSerializer):
@@ -283,4 +358,4 @@ class ProductDetailSerializer(serializers.ModelSerializer):
         result = get_product_pricing(obj)
         if result is None:
             return None
-        return ProductPricingResultSerializer(result).data
\ No newline at end of file
+        return pricing_result_payload(result)
\ No newline at end of file
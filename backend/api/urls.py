@@ -5,7 +5,7 @@ from api.views.categories import CategoryViewSet
 from api.views.carts import CartCheckoutView, CartCheckoutPreflightView, ClaimOfferView
 from api.views.orders import OrderViewSet
 from api.views.discounts import DiscountViewSet
-from api.views.carts import CartView, CartItemCreateView, CartItemDetailView
+from api.views.carts import CartView, CartItemBulkView, CartItemCreateView, CartItemDetailView
 from api.views.payments import PaymentCreateView
 from api.views.webhooks import AcquireMockWebhookView
 from api.views.auth import (
@@ -81,6 +81,7 @@ urlpatterns = [
     ),
     path("cart/", CartView.as_view(), name="cart"),
     path("cart/items/", CartItemCreateView.as_view(), name="cart-item-create"),
+    path("cart/items/bulk/", CartItemBulkView.as_view(), name="cart-item-bulk"),
     path(
         "cart/items/<int:product_id>/",
         CartItemDetailView.as_view(),
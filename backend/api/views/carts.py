@@ -1,6 +1,5 @@
 import logging
 import secrets
-from decimal import Decimal, ROUND_HALF_UP
 
 import sentry_sdk
 
@@ -25,6 +24,7 @@ from orderitems.models import OrderItem
 from products.models import Product
 from api.serializers.cart import (
     CartSerializer,
+    CartItemBulkRequestSerializer,
     CartItemCreateRequestSerializer,
     CartItemSerializer,
     CartItemUpdateRequestSerializer,
@@ -33,9 +33,17 @@ from api.serializers.cart import (
     PaymentInitiationSerializer,
 )
 from api.serializers.common import ErrorResponseSerializer
-from carts.services.pricing import get_cart_pricing, get_cart_pricing_with_order_discount
 from carts.services.price_change import detect_price_changes, serialize_price_change_summary
 from carts.services.snapshot import get_snapshot_gross_price
+from carts.services.pricing import CartLineDelta, reprice_cart_line
+from carts.services.pricing_cache import (
+    get_cached_cart_pricing,
+    get_fingerprinted_cart_pricing,
+    invalidate_cart_pricing,
+    peek_cart_pricing,
+    store_cart_pricing,
+)
+from carts.services.bulk_items import upsert_cart_items
 from api.services.cookies import cart_token_cookie_kwargs
 from carts.services.tokens import generate_cart_token
 from api.exceptions import ProductUnavailableException
@@ -58,12 +66,16 @@ from drf_spectacular.utils import (
     OpenApiParameter,
 )
 from orders.services.inventory_reservation_service import reserve_for_checkout
+from orders.services.order_plan import build_order_plan, cart_fingerprint
+from orders.services.checkout_pricing_token import (
+    issue_checkout_pricing_token,
+    resolve_checkout_pricing_token,
+)
 from orders.services.guest_order_access_service import (
     GuestOrderAccessService,
     generate_guest_access_url,
 )
 from discounts.models import AcquisitionMode, Offer, OfferStatus
-from carts.services.pricing import get_cart_pricing_with_campaign_offer
 from api.services.campaign_offer_session import (
     get_claimed_campaign_offer as _get_claimed_campaign_offer,
     set_campaign_offer_cookie as _set_campaign_offer_cookie,
@@ -277,17 +289,18 @@ Error codes:
             status__in=[OfferStatus.CREATED, OfferStatus.DELIVERED],
         ).update(status=OfferStatus.CLAIMED)
 
-        # Also persist the token on the current active cart (if one already
-        # exists).  This cart-level field acts as the server-side mirror of
+        # Also persist the token on the current active cart, creating it
+        # when the visitor has none yet (anonymous GET /cart/ does not).
+        # This cart-level field acts as the server-side mirror of
         # the cookie and enables best-for-customer comparison during the
         # guest→authenticated cart merge — without it, one side of the
         # comparison would always be invisible to the merge service.
         # Best-effort: a failure here must not abort the claim response.
+        raw_cart_token = None
         try:
-            current_cart = _get_active_cart_for_request(request)
-            if current_cart is not None:
-                current_cart.claimed_offer_token = offer.token
-                current_cart.save(update_fields=["claimed_offer_token"])
+            current_cart, _, raw_cart_token = _resolve_or_create_cart(request)
+            current_cart.claimed_offer_token = offer.token
+            current_cart.save(update_fields=["claimed_offer_token"])
         except Exception:
             with sentry_sdk.new_scope() as scope:
                 scope.set_tag("category", "application")
@@ -313,6 +326,12 @@ Error codes:
             status=status.HTTP_200_OK,
         )
         _set_campaign_offer_cookie(response, token)
+        if raw_cart_token:
+            response.set_cookie(
+                "cart_token",
+                raw_cart_token,
+                **cart_token_cookie_kwargs(),
+            )
         return response
 
 
@@ -327,14 +346,12 @@ Returns the user's active cart.
 
 Behavior:
 - If an ACTIVE cart exists, it is returned.
-- If no ACTIVE cart exists, a new cart is created automatically.
-- If the request is anonymous and a new cart is created, a `cart_token`
-  cookie is set on the response.
-
-Important notes:
-- This endpoint has a side-effect (cart creation).
-- The operation is not strictly read-only.
-- This behavior is intentional to simplify frontend integration.
+- Authenticated users: if no ACTIVE cart exists, a new cart is created
+  automatically.
+- Anonymous users: if no valid cart token is presented, an empty virtual
+  cart (`id: null`) is returned.  Nothing is stored and no `cart_token`
+  cookie is set; the cart and its token are created by the first mutation
+  (adding an item, claiming an offer).
 
 HTTP semantics:
 - 200 OK: an existing active cart is returned
@@ -364,31 +381,29 @@ HTTP semantics:
                 status_codes=["200"],
             ),
             OpenApiExample(
-                name="Newly created empty cart",
+                name="Anonymous visitor without a cart",
                 value={
-                    "id": 11,
+                    "id": None,
                     "status": "ACTIVE",
                     "items": []
                 },
                 response_only=True,
-                status_codes=["201"],
+                status_codes=["200"],
             ),
         ],
     )
     def get(self, request):
-        cart, created, raw_token = _resolve_or_create_cart(request)
+        if request.user.is_authenticated:
+            cart, _, _ = _resolve_or_create_cart(request)
+        else:
+            # Anonymous reads never write: without a valid token an unsaved,
+            # empty cart is serialised and no cookie is issued.  The row and
+            # token are created by the first mutation (_resolve_or_create_cart).
+            cart = _get_active_cart_for_request(request)
+            if cart is None:
+                cart = Cart(status=Cart.Status.ACTIVE)
         serializer = CartSerializer(cart, context={"request": request})
-        response = Response(
-            serializer.data,
-            status=status.HTTP_200_OK,
-        )
-        if raw_token:
-            response.set_cookie(
-                "cart_token",
-                raw_token,
-                **cart_token_cookie_kwargs(),
-            )
-        return response
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     @extend_schema(
         tags=["Cart"],
@@ -611,9 +626,111 @@ Notes:
         return response
 
 
+class CartItemBulkView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        tags=["Cart Items"],
+        summary="Add or update several cart items",
+        description="""
+Sets the quantity of several products in the active cart in one request
+(e.g. "reorder" or "add bundle" flows).
+
+Business rules:
+- Every line follows the rules of `POST /cart/items/`: quantity must be
+  greater than zero and is *set* (not added); the product must exist, be
+  sellable and have enough stock.
+- A product may appear only once per request; at most 100 lines.
+- All lines are validated before anything is written and are then upserted
+  in a single transaction: either every line is applied or none is.
+- Existing lines keep their original `price_at_add_time`; new lines are
+  snapshotted at the current gross price.
+
+Response is a full cart snapshot (same shape as `GET /cart/`).
+
+HTTP semantics:
+- 200 OK: all lines already existed and were updated
+- 201 Created: at least one new line was inserted
+- 400 Bad Request: malformed body, invalid quantity or duplicate product
+- 404 Not Found: a referenced product does not exist, or the cart was
+  checked out or merged while the request was running
+- 409 Conflict: a product is unavailable or out of stock
+""",
+        request=CartItemBulkRequestSerializer,
+        parameters=CART_TOKEN_PARAMETERS,
+        responses={
+            200: CartSerializer,
+            201: CartSerializer,
+            400: ErrorResponseSerializer,
+            404: ErrorResponseSerializer,
+            409: ErrorResponseSerializer,
+        },
+        examples=[
+            OpenApiExample(
+                name="Add a bundle of two products",
+                value={
+                    "items": [
+                        {"product_id": 42, "quantity": 1},
+                        {"product_id": 43, "quantity": 2},
+                    ]
+                },
+                request_only=True,
+            ),
+        ],
+    )
+    def post(self, request):
+        serializer = CartItemBulkRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        quantities = {
+            line["product_id"]: line["quantity"]
+            for line in serializer.validated_data["items"]
+        }
+
+        # --- products: one fetch for every line ---
+        products = Product.objects.select_related("tax_class", "category").in_bulk(
+            list(quantities)
+        )
+        if len(products) != len(quantities):
+            raise ProductNotFoundException()
+
+        for product_id, quantity in quantities.items():
+            product = products[product_id]
+            if not product.is_sellable():
+                raise ProductUnavailableException()
+            if quantity > product.stock_quantity:
+                raise OutOfStockException()
+
+        cart, _, raw_token = _resolve_or_create_cart(request)
+        result = upsert_cart_items(cart, products, quantities)
+
+        response = Response(
+            CartSerializer(cart, context={"request": request}).data,
+            status=status.HTTP_201_CREATED if result.created else status.HTTP_200_OK,
+        )
+        if raw_token:
+            response.set_cookie(
+                "cart_token",
+                raw_token,
+                **cart_token_cookie_kwargs(),
+            )
+        return response
+
+
 class CartItemDetailView(APIView):
     permission_classes = [AllowAny]
 
+    @staticmethod
+    def _repriced_context(request, cart, previous, delta: CartLineDelta) -> dict:
+        """Serializer context carrying the cart pricing after a single-line change.
+
+        Only the changed line is repriced (see ``reprice_cart_line``); the
+        result replaces the cached cart pricing so the next read is a hit.
+        """
+        offer = _get_claimed_campaign_offer(request)
+        cart_pricing = reprice_cart_line(previous, delta, offer=offer)
+        store_cart_pricing(cart, cart_pricing, offer=offer)
+        return {"request": request, "cart_pricing": cart_pricing}
+
     def _delete_cart_item_and_respond(
         self,
         *,
@@ -622,12 +739,21 @@ class CartItemDetailView(APIView):
         raw_token: str | None,
         request=None,
     ) -> Response:
+        previous = None
+        if request is not None:
+            previous = peek_cart_pricing(cart, offer=_get_claimed_campaign_offer(request))
+
         CartItem.objects.filter(cart=cart, product_id=product_id).delete()
 
         # Ensure serializer sees the updated state
         cart.refresh_from_db()
 
-        ctx = {"request": request} if request is not None else {}
+        if previous is not None:
+            ctx = self._repriced_context(
+                request, cart, previous, CartLineDelta(product_id=product_id, quantity=0)
+            )
+        else:
+            ctx = {"request": request} if request is not None else {}
         response = Response(
             CartSerializer(cart, context=ctx).data,
             status=status.HTTP_200_OK,
@@ -684,7 +810,9 @@ HTTP semantics:
             )
 
         try:
-            product = Product.objects.get(id=product_id)
+            product = Product.objects.select_related("tax_class", "category").get(
+                id=product_id
+            )
         except Product.DoesNotExist:
             raise ProductNotFoundException()
 
@@ -694,6 +822,11 @@ HTTP semantics:
         if quantity > product.stock_quantity:
             raise OutOfStockException()
 
+        # Cached pricing of the cart before the edit; the response reprices
+        # only the changed line on top of it.  Without one the cart is
+        # priced once, after the write.
+        previous = peek_cart_pricing(cart, offer=_get_claimed_campaign_offer(request))
+
         # Race-safe UPSERT:
         # - try INSERT in a savepoint (so DB errors don't poison the outer tx)
         # - if unique collision -> lock & UPDATE
@@ -747,8 +880,18 @@ HTTP semantics:
 
         cart.refresh_from_db()
 
+        item.product = product
+        if previous is not None:
+            ctx = self._repriced_context(
+                request,
+                cart,
+                previous,
+                CartLineDelta(product_id=product.id, quantity=quantity, item=item),
+            )
+        else:
+            ctx = {"request": request}
         response = Response(
-            CartSerializer(cart, context={"request": request}).data,
+            CartSerializer(cart, context=ctx).data,
             status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
         )
         if raw_token:
@@ -974,21 +1117,68 @@ Notes:
         price_change_data: dict | None = None
 
         try:
+            # Phase 3: the current pricing pipeline is the authoritative source
+            # for checkout pricing.  price_at_add_time is retained on CartItem as
+            # the customer-visible gross baseline for price-change detection
+            # (Phase 3 Slice 2).
+            # Phase 4 / Slice 3: also resolves AUTO_APPLY order-level promotions
+            # and populates cart_pricing.order_discount when one is eligible.
+            # Phase 4 / Slice 5B: when a CAMPAIGN_APPLY offer has been claimed via
+            # session, it takes precedence over AUTO_APPLY.
+            _checkout_campaign_offer = _get_claimed_campaign_offer(request)
+
+            def _price_cart(cart):
+                # Reuses the result of a preceding cart GET / preflight while
+                # the cart, product, promotion and offer inputs are unchanged.
+                return get_cached_cart_pricing(cart, offer=_checkout_campaign_offer)
+
+            # The cart is priced and the complete order plan (every OrderItem
+            # snapshot value plus the order totals) is computed *before* the cart
+            # row is locked, so the critical section below only verifies the
+            # cart is unchanged and writes.
+            # A valid preflight pricing token carries that plan already; it is
+            # only honoured while the cart's pricing inputs are unchanged.
+            cart = _get_active_cart_for_request(request)
+            if cart is None:
+                raise NoActiveCartException()
+            snapshot = resolve_checkout_pricing_token(
+                checkout_data.get("pricing_token"),
+                cart,
+                offer=_checkout_campaign_offer,
+            )
+            if snapshot is not None:
+                cart_pricing = None
+                plan = snapshot.plan
+                price_change_data = snapshot.price_change
+            else:
+                cart_pricing = _price_cart(cart)
+                plan = build_order_plan(cart_pricing)
+
             with transaction.atomic():
                 try:
-                    cart = _get_active_cart_for_request(request)
-                    if not cart:
-                        raise Cart.DoesNotExist()
                     cart = (
                         Cart.objects
                         .select_for_update()
-                        .get(pk=cart.pk)
+                        .get(pk=cart.pk, status=Cart.Status.ACTIVE)
                     )
                 except Cart.DoesNotExist:
                     raise NoActiveCartException()
 
-                if not cart.items.exists():
+                fingerprint = cart_fingerprint(cart)
+                if not fingerprint:
                     raise CartEmptyException()
+                if fingerprint != plan.cart_fingerprint:
+                    # Cart changed between planning and locking — re-plan
+                    # against the locked state.
+                    cart_pricing = _price_cart(cart)
+                    plan = build_order_plan(cart_pricing)
+
+                # Detect price changes against the pre-checkout cart snapshot
+                # values the plan was built from.
+                if cart_pricing is not None:
+                    price_change_data = serialize_price_change_summary(
+                        detect_price_changes(cart_pricing)
+                    )
 
                 # Resolve supplier configuration before creating the order.
                 # This raises SupplierConfigurationError (HTTP 503) when the
@@ -1056,6 +1246,11 @@ Notes:
                     supplier_iban=supplier_snap.iban,
                     supplier_swift=supplier_snap.swift,
                 )
+                # Phase 3 / 4: order-level totals snapshot, written with the
+                # order INSERT.  When an order-level discount is applied,
+                # subtotal_gross and total_tax are the post-discount values
+                # returned by the VAT allocation engine.
+                plan.apply_totals(order)
                 try:
                     order.full_clean()
                 except DjangoValidationError as exc:
@@ -1097,169 +1292,15 @@ Notes:
                             )
                         )
 
-                # Phase 3: the current pricing pipeline is the authoritative
-                # source for checkout pricing.  price_at_add_time is retained
-                # on CartItem as the customer-visible gross baseline for
-                # price-change detection (Phase 3 Slice 2).
-                # Phase 4 / Slice 3: also resolves AUTO_APPLY order-level
-                # promotions and populates cart_pricing.order_discount when one
-                # is eligible.
-                # Phase 4 / Slice 5B: when a CAMPAIGN_APPLY offer has been
-                # claimed via session, it takes precedence over AUTO_APPLY.
-                _checkout_campaign_offer = _get_claimed_campaign_offer(request)
-                if _checkout_campaign_offer is not None:
-                    cart_pricing = get_cart_pricing_with_campaign_offer(
-                        cart, _checkout_campaign_offer
-                    )
-                else:
-                    cart_pricing = get_cart_pricing_with_order_discount(cart)
-
-                # Detect price changes before order items are created so that
-                # the comparison uses the pre-checkout cart snapshot values.
-                price_change_data = serialize_price_change_summary(
-                    detect_price_changes(cart_pricing)
-                )
-
-                reservation_items = [
-                    {"product_id": line.item.product_id, "quantity": line.item.quantity}
-                    for line in cart_pricing.items
-                ]
-                legacy_unmigrated_gross_total = Decimal("0.00")
-
-                for line in cart_pricing.items:
-                    item = line.item
-                    unit_pricing = line.unit_pricing
-
-                    if unit_pricing is not None:
-                        # Migrated product: use the tax-aware, promotion-aware
-                        # pricing pipeline.  The discounted gross is the amount
-                        # the customer pays per unit.
-                        unit_gross = unit_pricing.discounted.gross.amount
-                        line_total = (
-                            unit_gross * Decimal(str(line.quantity))
-                        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                        discount_type = unit_pricing.discount.promotion_type or None
-                        if discount_type == "PERCENT":
-                            discount_value = unit_pricing.discount.percentage
-                        elif discount_type == "FIXED":
-                            discount_value = unit_pricing.discount.amount_gross.amount
-                        else:
-                            discount_type = None
-                            discount_value = None
-                        # Phase 3 snapshot fields — populated from pricing pipeline.
-                        snap_unit_price_net = unit_pricing.discounted.net.amount
-                        snap_unit_price_gross = unit_gross
-                        snap_tax_amount = unit_pricing.discounted.tax.amount
-                        snap_tax_rate = unit_pricing.discounted.tax_rate
-                        snap_promo_code = unit_pricing.discount.promotion_code
-                        snap_promo_type = unit_pricing.discount.promotion_type
-                        snap_promo_discount_gross = (
-                            unit_pricing.discount.amount_gross.amount
-                            if unit_pricing.discount.promotion_type
-                            else None
-                        )
-                        # Product + line total snapshots
-                        snap_product_name = item.product.name
-                        snap_line_total_net = (
-                            snap_unit_price_net * Decimal(str(line.quantity))
-                        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                        snap_line_total_gross = line_total
-                    else:
-                        # Unmigrated product (price_net_amount not set): fall
-                        # back to price_at_add_time as the gross unit price
-                        # without any discount.  This path will be eliminated
-                        # once all products are migrated to price_net_amount.
-                        unit_gross = item.price_at_add_time
-                        line_total = (
-                            item.price_at_add_time * Decimal(str(line.quantity))
-                        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                        legacy_unmigrated_gross_total += line_total
-                        discount_type = None
-                        discount_value = None
-                        # Phase 3 snapshot fields — unavailable for unmigrated products.
-                        snap_unit_price_net = None
-                        snap_unit_price_gross = None
-                        snap_tax_amount = None
-                        snap_tax_rate = None
-                        snap_promo_code = None
-                        snap_promo_type = None
-                        snap_promo_discount_gross = None
-                        # Product + line total snapshots (partial for unmigrated)
-                        snap_product_name = item.product.name
-                        snap_line_total_net = None
-                        snap_line_total_gross = line_total
-
-                    OrderItem.objects.create(
-                        order=order,
-                        product=item.product,
-                        quantity=item.quantity,
-                        price_at_order_time=line_total,
-                        unit_price_at_order_time=unit_gross,
-                        line_total_at_order_time=line_total,
-                        applied_discount_type_at_order_time=discount_type,
-                        applied_discount_value_at_order_time=discount_value,
-                        # Phase 3 snapshot fields
-                        unit_price_net_at_order_time=snap_unit_price_net,
-                        unit_price_gross_at_order_time=snap_unit_price_gross,
-                        tax_amount_at_order_time=snap_tax_amount,
-                        tax_rate_at_order_time=snap_tax_rate,
-                        promotion_code_at_order_time=snap_promo_code,
-                        promotion_type_at_order_time=snap_promo_type,
-                        promotion_discount_gross_at_order_time=snap_promo_discount_gross,
-                        # Phase 3 Slice 5: product name + line total snapshots
-                        product_name_at_order_time=snap_product_name,
-                        line_total_net_at_order_time=snap_line_total_net,
-                        line_total_gross_at_order_time=snap_line_total_gross,
-                    )
-
-                # Phase 3 / 4: persist order-level totals snapshot.
-                # Phase 4 / Slice 3: when an order-level discount is applied,
-                # subtotal_gross and total_tax are adjusted to the post-discount
-                # values returned by the VAT allocation engine.
-                od = cart_pricing.order_discount
-                if od is not None:
-                    _subtotal_gross = (
-                        od.total_gross_after.amount + legacy_unmigrated_gross_total
-                    ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                    _total_tax = od.total_tax_after.amount
-                    _order_discount_gross = od.gross_reduction.amount
-                    _order_promotion_code = od.promotion_code
-                else:
-                    _subtotal_gross = (
-                        cart_pricing.subtotal_discounted.amount + legacy_unmigrated_gross_total
-                    ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                    _total_tax = cart_pricing.total_tax.amount
-                    _order_discount_gross = None
-                    _order_promotion_code = None
-
-                order.subtotal_gross = _subtotal_gross
-                order.subtotal_net = (
-                    _subtotal_gross - _total_tax
-                ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                order.total_tax = _total_tax
-                order.total_discount = (
-                    cart_pricing.total_discount.amount
-                    + (_order_discount_gross or Decimal("0"))
-                ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                order.order_discount_gross = _order_discount_gross
-                order.order_promotion_code = _order_promotion_code
-                order.currency = cart_pricing.currency
-                order.save(
-                    update_fields=[
-                        "subtotal_net",
-                        "subtotal_gross",
-                        "total_tax",
-                        "total_discount",
-                        "order_discount_gross",
-                        "order_promotion_code",
-                        "currency",
-                    ]
-                )
+                OrderItem.objects.bulk_create(plan.order_items(order))
 
-                reserve_for_checkout(order=order, items=reservation_items)
+                reserve_for_checkout(order=order, items=plan.reservation_items)
 
                 cart.status = Cart.Status.CONVERTED
                 cart.save()
+                # Converted carts are never priced again.  Dropping the entry
+                # is safe even if this transaction rolls back.
+                invalidate_cart_pricing(cart.pk)
 
                 # Phase 4 / Offer status: mark the campaign offer as REDEEMED
                 # only when it was the winning promotion actually applied to
@@ -1268,8 +1309,7 @@ Notes:
                 # terminal states from being silently overwritten.
                 if (
                     _checkout_campaign_offer is not None
-                    and od is not None
-                    and _order_promotion_code == _checkout_campaign_offer.promotion.code
+                    and plan.order_promotion_code == _checkout_campaign_offer.promotion.code
                 ):
                     Offer.objects.filter(
                         pk=_checkout_campaign_offer.pk,
@@ -1391,6 +1431,14 @@ No order is created. The endpoint is safe to call multiple times.
                 "type": "object",
                 "properties": {
                     "price_change": {"type": "object"},
+                    "pricing_token": {
+                        "type": "string",
+                        "description": (
+                            "Signed, short-lived pricing snapshot; pass it as "
+                            "`pricing_token` to POST /cart/checkout/ to skip "
+                            "repricing while the cart is unchanged."
+                        ),
+                    },
                 },
             },
             404: ErrorResponseSerializer,
@@ -1401,7 +1449,21 @@ No order is created. The endpoint is safe to call multiple times.
         if cart is None:
             raise NoActiveCartException()
 
-        cart_pricing = get_cart_pricing(cart)
+        # The full (order-discount-aware) pricing is requested so the cached
+        # result is shared with GET /cart/ and checkout; price-change
+        # detection only reads its per-line part.
+        fingerprint, cart_pricing = get_fingerprinted_cart_pricing(
+            cart, offer=_get_claimed_campaign_offer(request)
+        )
         summary = detect_price_changes(cart_pricing)
         payload = serialize_price_change_summary(summary)
-        return Response({"price_change": payload}, status=status.HTTP_200_OK)
+        pricing_token = issue_checkout_pricing_token(
+            cart,
+            fingerprint=fingerprint,
+            cart_pricing=cart_pricing,
+            price_change=payload,
+        )
+        return Response(
+            {"price_change": payload, "pricing_token": pricing_token},
+            status=status.HTTP_200_OK,
+        )
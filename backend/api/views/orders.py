@@ -1,16 +1,28 @@
+from django.conf import settings
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.decorators import action
 from rest_framework.exceptions import MethodNotAllowed
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
     OpenApiExample,
+    OpenApiParameter,
     OpenApiResponse,
+    PolymorphicProxySerializer,
 )
 from orders.models import Order
-from api.serializers.order import OrderResponseSerializer
+from api.pagination import InvalidCursor, KeysetCursorPaginator
+from api.exceptions.common import InvalidCursorException
+from api.serializers.order import (
+    OrderListItemSerializer,
+    OrderListPageSerializer,
+    OrderResponseSerializer,
+    with_order_list_relations,
+    with_order_response_relations,
+)
 from api.serializers.common import ErrorResponseSerializer
 from orders.services.order_service import OrderService
 from auditlog.models import AuditEvent
@@ -18,6 +30,19 @@ from auditlog.actions import AuditActions
 from auditlog.services import AuditService
 
 
+def _page_size_or_none(value: str | None) -> int | None:
+    """Parse ``?page_size=``, clamped to ORDER_LIST_MAX_PAGE_SIZE; None if invalid."""
+    if value is None:
+        return None
+    try:
+        parsed = int(value.strip())
+    except (ValueError, AttributeError):
+        return None
+    if parsed <= 0:
+        return None
+    return min(parsed, settings.ORDER_LIST_MAX_PAGE_SIZE)
+
+
 @extend_schema_view(
     list=extend_schema(
         tags=["Orders"],
@@ -30,13 +55,72 @@ Orders represent completed checkout results and are read-only.
 Notes:
 - Orders are immutable.
 - Orders are created exclusively via cart checkout.
-- The list is ordered by creation time (implicit database order).
+- The list is ordered by creation time (oldest first).
+
+**Pagination** (opt-in): pass `page_size` (max 100) to receive one page of
+compact rows, newest first:
+
+```json
+{
+  "results": [
+    {"id": 123, "status": "PAID", "created_at": "...", "total": "40.00",
+     "currency": "EUR", "item_count": 2}
+  ],
+  "next_cursor": "..."
+}
+```
+
+Pass `next_cursor` back as `cursor` to fetch the next page (`null` on the
+last page).  Full order data is available from the detail endpoint.
+Without `page_size` / `cursor` the full list of complete orders is returned.
 """,
+        parameters=[
+            OpenApiParameter(
+                name="page_size",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description=(
+                    "Enable cursor pagination with this many orders per page "
+                    "(capped at 100). Omit to receive the full list."
+                ),
+            ),
+            OpenApiParameter(
+                name="cursor",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Opaque `next_cursor` value from the previous page.",
+            ),
+        ],
         responses={
-            200: OrderResponseSerializer,
+            200: PolymorphicProxySerializer(
+                component_name="OrderListResponse",
+                serializers=[OrderResponseSerializer(many=True), OrderListPageSerializer],
+                resource_type_field_name=None,
+                many=False,
+            ),
+            400: ErrorResponseSerializer,
             401: ErrorResponseSerializer,
         },
         examples=[
+            OpenApiExample(
+                name="Paginated order list",
+                value={
+                    "results": [
+                        {
+                            "id": 123,
+                            "status": "PAID",
+                            "created_at": "2026-01-15T10:30:00+00:00",
+                            "total": "40.00",
+                            "currency": "EUR",
+                            "item_count": 2,
+                        }
+                    ],
+                    "next_cursor": "...",
+                },
+                response_only=True,
+            ),
             OpenApiExample(
                 name="List of orders",
                 value=[
@@ -112,7 +196,34 @@ class OrderViewSet(ModelViewSet):
     http_method_names = ["post", "get", "head", "options"]
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        qs = Order.objects.filter(user=self.request.user).order_by("id")
+        if self.action in ("list", "retrieve"):
+            # cancel only transitions the order; it does not need the
+            # relations of the response up front.
+            qs = with_order_response_relations(qs)
+        return qs
+
+    def list(self, request, *args, **kwargs):
+        params = request.query_params
+        page_size = _page_size_or_none(params.get("page_size"))
+        cursor = params.get("cursor") or None
+        if page_size is None and cursor is None:
+            return super().list(request, *args, **kwargs)
+
+        # Newest first; the id tiebreaker makes the keyset cursor exact.
+        qs = with_order_list_relations(
+            Order.objects.filter(user=request.user).order_by("-id")
+        )
+        paginator = KeysetCursorPaginator(page_size or settings.ORDER_LIST_DEFAULT_PAGE_SIZE)
+        try:
+            page = paginator.paginate(qs, cursor)
+        except InvalidCursor as exc:
+            raise InvalidCursorException(str(exc)) from exc
+
+        serializer = OrderListItemSerializer(
+            page.items, many=True, context=self.get_serializer_context()
+        )
+        return Response({"results": serializer.data, "next_cursor": page.next_cursor})
 
     def create(self, request, *args, **kwargs):
         # Prevent direct order creation. Orders must be created via checkout only.
@@ -16,13 +16,28 @@ from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
 )
+from django.conf import settings
 from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
+from api.exceptions.common import InvalidCursorException
 from api.serializers.common import ErrorResponseSerializer
 from api.serializers.product import ProductDetailSerializer, ProductSerializer
-from products.search.backends import MySQLCatalogSearchBackend, NullSearchBackend
+from discounts.services.line_promotion import resolve_line_promotions_bulk
+from products.search.backends import (
+    InMemoryNgramSearchBackend,
+    MySQLCatalogSearchBackend,
+    NullSearchBackend,
+)
+from products.models import Product
+from products.search.cache import CachedSearchBackend
+from products.search.pagination import (
+    CatalogCursorPaginator,
+    InvalidCursor,
+    fetch_in_rank_order,
+)
 from products.search.service import CatalogSearchService
+from products.services.pricing import price_products_bulk
 from products.search.types import CatalogSearchQuery
 
 
@@ -46,12 +61,49 @@ def _decimal_or_none(value: str | None) -> Decimal | None:
         return None
 
 
+def _positive_int_or_none(value: str | None, *, maximum: int) -> int | None:
+    """Parse a positive integer query param, clamped to *maximum*; None if invalid."""
+    if value is None:
+        return None
+    try:
+        parsed = int(value.strip())
+    except (ValueError, AttributeError):
+        return None
+    if parsed <= 0:
+        return None
+    return min(parsed, maximum)
+
+
+def _parse_fields(value: str | None) -> list[str] | None:
+    """Parse ``?fields=id,name,pricing`` into a list of names, or None if absent."""
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    return names or None
+
+
+def _with_serializer_relations(qs):
+    """Apply the select_related needed by the product serializers.
+
+    Prevents FK N+1 queries during pricing serialisation:
+    - tax_class: needed by the tax resolver.
+    - category: needed by the line-level promotion resolver.
+    - primary_image: accessed by get_primary_image() in the serializer.
+
+    Winning line promotions are resolved in bulk by list() and handed to the
+    serializer via context, so pricing adds O(1) queries per page.
+    """
+    return qs.select_related("tax_class", "category", "primary_image")
+
+
 def _build_backend():
     """Return the appropriate search backend for the current database engine."""
     from django.db import connection
 
     if connection.vendor == "mysql":
-        return MySQLCatalogSearchBackend()
+        return CachedSearchBackend(MySQLCatalogSearchBackend())
+    if settings.CATALOGUE_INMEMORY_SEARCH_ENABLED:
+        return InMemoryNgramSearchBackend()
     return NullSearchBackend()
 
 
@@ -90,18 +142,33 @@ Response shape:
 }
 ```
 
+**Pagination** (opt-in): pass `page_size` (max 100) to receive one page and a
+`next_cursor` field; pass that value back as `cursor` to fetch the next page
+(`null` on the last page).  Pages are keyset-based and stable for every sort
+order.  `metadata` is computed on the first page only and is `null` on
+subsequent pages.  Without `page_size` / `cursor` the full list is returned.
+
+**Field projection**: `fields=id,name,pricing` limits each product to the
+listed fields.  Omitting `pricing` or `primary_image` skips their
+computation entirely.
+
 **Default behaviour** (no query params):
 - Only `is_active=True` products are returned.
 - Out-of-stock products are included but sorted last (in-stock first, then name ASC).
 
 **Query params:**
 - `search` — Full-text search across name, short_description, full_description.
-  On MySQL results are ordered by relevance first.
+  Results are ordered by relevance first (MySQL FULLTEXT, or an in-process
+  bigram index on other databases).
 - `category` — Filter by category id (repeatable: `?category=1&category=2` → OR).
-- `min_price` / `max_price` — Numeric price range (inclusive).
+- `min_price` / `max_price` — Numeric price range (inclusive), applied to the
+  effective (promotion-aware) gross price.  Price sorts and `metadata` bounds
+  use the same price.
 - `in_stock_only=true` — Restrict to products with `stock_quantity > 0`.
 - `include_unavailable=true` — Staff/admin only: include `is_active=False` products.
 - `sort` — Explicit sort: `price_asc | price_desc | name_asc | name_desc`.
+- `page_size` / `cursor` — Keyset pagination (see above).
+- `fields` — Comma-separated field projection (see above).
 """,
         parameters=[
             OpenApiParameter(
@@ -128,14 +195,14 @@ Response shape:
                 type=OpenApiTypes.DECIMAL,
                 location=OpenApiParameter.QUERY,
                 required=False,
-                description="Minimum price (inclusive).",
+                description="Minimum effective gross price (inclusive).",
             ),
             OpenApiParameter(
                 name="max_price",
                 type=OpenApiTypes.DECIMAL,
                 location=OpenApiParameter.QUERY,
                 required=False,
-                description="Maximum price (inclusive).",
+                description="Maximum effective gross price (inclusive).",
             ),
             OpenApiParameter(
                 name="in_stock_only",
@@ -165,6 +232,33 @@ Response shape:
                 ),
                 enum=["price_asc", "price_desc", "name_asc", "name_desc"],
             ),
+            OpenApiParameter(
+                name="page_size",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description=(
+                    "Enable cursor pagination with this many products per page "
+                    "(capped at 100). Omit to receive the full list."
+                ),
+            ),
+            OpenApiParameter(
+                name="cursor",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Opaque `next_cursor` value from the previous page.",
+            ),
+            OpenApiParameter(
+                name="fields",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description=(
+                    "Comma-separated list of product fields to return, e.g. "
+                    "`id,name,slug`. Unknown names are ignored."
+                ),
+            ),
         ],
         responses={200: None},  # custom shape — described in description
         examples=[
@@ -293,14 +387,7 @@ class ProductViewSet(ReadOnlyModelViewSet):
     def get_queryset(self):
         service = CatalogSearchService(_build_backend())
         qs = service.get_queryset(self._build_query(), is_staff=self._is_staff())
-        # select_related to prevent FK N+1 queries during pricing serialisation.
-        # - tax_class: needed by the tax resolver.
-        # - category: needed by the line-level promotion resolver.
-        # - primary_image: accessed by get_primary_image() in the serializer.
-        # NOTE: the promotion resolver issues one additional DB query per product
-        # to find the winning promotion.  A batch resolver will be introduced in
-        # a later slice to reduce this to O(1) queries for the whole list.
-        return qs.select_related("tax_class", "category", "primary_image")
+        return _with_serializer_relations(qs)
 
     def list(self, request, *args, **kwargs):
         """
@@ -313,25 +400,80 @@ class ProductViewSet(ReadOnlyModelViewSet):
                 "metadata": {
                     "price_min_available": "X.XX",
                     "price_max_available": "Y.YY"
-                }
+                },
+                "next_cursor": "..."   # only when paginated
             }
 
         ``price_min_available`` / ``price_max_available`` reflect the full
         price range of the current filtered subset (ignoring min_price /
         max_price params), so the FE can initialise slider bounds from them.
+        When paginated they are only computed for the first page.
         """
-        qs = self.get_queryset()
+        params = request.query_params
+        query = self._build_query()
+        service = CatalogSearchService(_build_backend())
 
-        # Serialise the results list.
-        serializer = self.get_serializer(qs, many=True)
+        page_size = _positive_int_or_none(
+            params.get("page_size"), maximum=settings.CATALOGUE_MAX_PAGE_SIZE
+        )
+        cursor = params.get("cursor") or None
+        paginated = page_size is not None or cursor is not None
+        paginator = CatalogCursorPaginator(
+            page_size or settings.CATALOGUE_DEFAULT_PAGE_SIZE
+        )
 
-        # Price bounds — computed without applying the price filter.
-        service = CatalogSearchService(_build_backend())
-        lo, hi = service.get_price_bounds(self._build_query(), is_staff=self._is_staff())
+        # One search pass yields both the results and the slider bounds; the
+        # bounds are only rendered on the first page.
+        result = service.execute(
+            query, is_staff=self._is_staff(), with_price_bounds=cursor is None
+        )
 
-        metadata = {
-            "price_min_available": str(lo) if lo is not None else None,
-            "price_max_available": str(hi) if hi is not None else None,
-        }
+        next_cursor = None
+        try:
+            if result.is_ranked:
+                # Relevance-ordered search: page over the ranked hit ids and
+                # fetch only the products that are actually returned, instead
+                # of ordering with one CASE branch per hit in SQL.
+                base_qs = _with_serializer_relations(Product.objects.all())
+                if paginated:
+                    page = paginator.paginate_ranked(result.ranked, base_qs, cursor)
+                    products, next_cursor = page.items, page.next_cursor
+                else:
+                    products = fetch_in_rank_order(base_qs, result.ranked.product_ids)
+            elif paginated:
+                qs = _with_serializer_relations(result.queryset)
+                page = paginator.paginate(qs, cursor)
+                products, next_cursor = page.items, page.next_cursor
+            else:
+                products = list(_with_serializer_relations(result.queryset))
+        except InvalidCursor as exc:
+            raise InvalidCursorException(str(exc)) from exc
+
+        # Serialise the results list.  Line promotions for the whole list are
+        # resolved in a constant number of queries instead of one per product,
+        # and the list is priced in one pass by the bulk pricing engine.
+        fields = _parse_fields(params.get("fields"))
+        context = self.get_serializer_context()
+        serializer = self.get_serializer(
+            products, many=True, context=context, fields=fields
+        )
+        # The serializer reads context lazily, so the projection can decide
+        # whether the bulk promotion lookup is needed at all.
+        if "pricing" in serializer.child.fields:
+            context["bulk_pricing"] = price_products_bulk(
+                products, resolve_line_promotions_bulk(products)
+            )
+
+        metadata = None
+        if cursor is None:
+            # Price bounds — computed without applying the price filter.
+            lo, hi = result.price_min, result.price_max
+            metadata = {
+                "price_min_available": str(lo) if lo is not None else None,
+                "price_max_available": str(hi) if hi is not None else None,
+            }
 
-        return Response({"results": serializer.data, "metadata": metadata})
+        body = {"results": serializer.data, "metadata": metadata}
+        if paginated:
+            body["next_cursor"] = next_cursor
+        return Response(body)
@@ -1,6 +1,7 @@
 class AuditActions:
     ORDER_CANCELLED = "order.cancelled"
     INVENTORY_RESERVATIONS_EXPIRED = "inventory.reservations.expired"
+    INVENTORY_RESERVATIONS_EXPIRY_SWEEP = "inventory.reservations.expiry_sweep"
     ORDER_SHIPPED = "order.shipped"
     ORDER_DELIVERED = "order.delivered"
     ORDER_CANCELLED_ADMIN = "order.cancelled_admin"
@@ -1,6 +1,7 @@
 import logging
 
 import sentry_sdk
+from django.db import transaction
 
 from auditlog.models import AuditEvent
 
@@ -62,3 +63,52 @@ class AuditService:
                     exc_info=True,
                 )
             return None
+
+    @staticmethod
+    def emit_bulk(
+        events: list[dict],
+        *,
+        fail_silently: bool = False,
+    ) -> list[AuditEvent]:
+        """Create several audit events with one INSERT.
+
+        Each item of *events* takes the keyword arguments of :meth:`emit`
+        (except ``fail_silently``).  The write runs in a savepoint, so with
+        fail_silently=True a failure neither breaks the caller's transaction
+        nor leaves a partial batch; an empty list is returned.
+        """
+        if not events:
+            return []
+        rows = [
+            AuditEvent(
+                entity_type=event["entity_type"],
+                entity_id=event["entity_id"],
+                action=event["action"],
+                actor_type=event["actor_type"],
+                actor_user=event.get("actor_user"),
+                metadata=event.get("metadata") or {},
+                context=event.get("context") or {},
+                scope_key=event.get("scope_key"),
+            )
+            for event in events
+        ]
+        try:
+            with transaction.atomic():
+                return AuditEvent.objects.bulk_create(rows)
+        except Exception:
+            if not fail_silently:
+                raise
+            with sentry_sdk.new_scope() as scope:
+                scope.set_tag("category", "application")
+                scope.set_tag("subsystem", "auditlog")
+                scope.set_tag("operation", "db_write")
+                scope.set_context("audit_event", {
+                    "actions": sorted({event["action"] for event in events}),
+                    "count": len(events),
+                })
+                logger.warning(
+                    "AuditEvent bulk write failed (best-effort). events=%s",
+                    len(events),
+                    exc_info=True,
+                )
+            return []
@@ -0,0 +1,138 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from carts.models import Cart, CartItem
+from carts.services.merge import merge_or_adopt_guest_cart
+from carts.services.resolver import hash_cart_token
+from products.models import Product
+
+EMAIL_DOMAIN = "bench-merge.invalid"
+SLUG_PREFIX = "bench-merge-"
+
+
+def _seed(logins: int, lines: int, hot: int) -> tuple[list, list[int]]:
+    """One user cart and one guest cart per login; *hot* products are shared by all."""
+    products = Product.objects.bulk_create(
+        Product(
+            name=f"Bench merge product {i}",
+            slug=f"{SLUG_PREFIX}{i}",
+            price=Decimal("10.00"),
+            stock_quantity=10_000,
+        )
+        for i in range(hot + logins * lines)
+    )
+    hot_products, own_products = products[:hot], products[hot:]
+
+    # Created row by row: bulk_create does not return primary keys on MySQL.
+    User = get_user_model()
+    users, user_carts, guest_carts = [], [], []
+    for i in range(logins):
+        user = User(email=f"user{i}@{EMAIL_DOMAIN}")
+        user.set_unusable_password()
+        user.save()
+        users.append(user)
+        user_carts.append(Cart.objects.create(user=user, status=Cart.Status.ACTIVE))
+        guest_carts.append(
+            Cart.objects.create(
+                status=Cart.Status.ACTIVE,
+                anonymous_token_hash=hash_cart_token(f"bench-merge-{i}"),
+            )
+        )
+
+    items = []
+    for i, (user_cart, guest_cart) in enumerate(zip(user_carts, guest_carts)):
+        own = own_products[i * lines:(i + 1) * lines]
+        # The guest cart holds the hot products plus its own; the user cart
+        # overlaps on the hot products and every other own product.
+        for product in list(hot_products) + list(own):
+            items.append(
+                CartItem(cart=guest_cart, product=product, quantity=1, price_at_add_time=product.price)
+            )
+        for product in list(hot_products) + list(own[::2]):
+            items.append(
+                CartItem(cart=user_cart, product=product, quantity=1, price_at_add_time=product.price)
+            )
+    CartItem.objects.bulk_create(items)
+    return users, [cart.pk for cart in user_carts + guest_carts]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark concurrent login cart merges (merge_or_adopt_guest_cart). "
+        "Meant to be run against MySQL; SQLite serializes all writers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--logins",
+            type=int,
+            default=200,
+            help="Number of users logging in (default: 200).",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Concurrent workers (default: 8).",
+        )
+        parser.add_argument(
+            "--lines",
+            type=int,
+            default=10,
+            help="Guest-cart lines per login besides the shared products (default: 10).",
+        )
+        parser.add_argument(
+            "--hot-products",
+            type=int,
+            default=3,
+            help="Products present in every cart, as after a campaign email (default: 3).",
+        )
+
+    def handle(self, *args, **options):
+        logins = options["logins"]
+        threads = options["threads"]
+
+        if connection.vendor != "mysql":
+            self.stderr.write(
+                f"Warning: running on {connection.vendor}; concurrency results "
+                "are only meaningful on MySQL."
+            )
+
+        users, cart_ids = _seed(logins, options["lines"], options["hot_products"])
+
+        def _merge(index: int) -> float:
+            try:
+                started = time.perf_counter()
+                report = merge_or_adopt_guest_cart(
+                    user=users[index], raw_token=f"bench-merge-{index}"
+                )
+                elapsed = (time.perf_counter() - started) * 1000
+                if report["result"] != "MERGED":
+                    raise RuntimeError(f"Unexpected merge result: {report['result']}")
+                return elapsed
+            finally:
+                connections.close_all()
+
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                latencies = list(pool.map(_merge, range(logins)))
+            wall = time.perf_counter() - started
+
+            latencies.sort()
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            self.stdout.write(
+                f"logins={logins} threads={threads} "
+                f"throughput={logins / wall:8.1f} merges/s "
+                f"median={statistics.median(latencies):7.2f}ms p95={p95:7.2f}ms"
+            )
+        finally:
+            Cart.objects.filter(pk__in=cart_ids).delete()
+            get_user_model().objects.filter(email__endswith=EMAIL_DOMAIN).delete()
+            Product.objects.filter(slug__startswith=SLUG_PREFIX).delete()
@@ -16,6 +16,7 @@ from django.core.management.base import BaseCommand
 
 from carts.schedules import register_anonymous_cart_cleanup
 from orders.schedules import register_overdue_reservation_expiration
+from products.schedules import register_effective_price_refresh
 
 
 class Command(BaseCommand):
@@ -33,3 +34,8 @@ class Command(BaseCommand):
                 "Registered: overdue reservation expiration schedule."
             )
         )
+
+        register_effective_price_refresh()
+        self.stdout.write(
+            self.style.SUCCESS("Registered: effective price refresh schedule.")
+        )
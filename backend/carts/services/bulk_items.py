@@ -0,0 +1,113 @@
+"""Bulk cart-item upsert — one transaction for N cart lines.
+
+Backs ``POST /cart/items/bulk/`` ("reorder", "add bundle" flows).  The
+single-item endpoints upsert with an INSERT savepoint and a
+``select_for_update`` fallback per product; here all lines are written with
+one ``bulk_create(update_conflicts=True)`` statement (``INSERT … ON
+DUPLICATE KEY UPDATE`` on MySQL, ``ON CONFLICT … DO UPDATE`` elsewhere).
+
+Semantics match the legacy single-item ``POST /cart/items/``:
+
+- ``quantity`` is *set*, not added to the existing quantity.
+- ``price_at_add_time`` is snapshotted for newly inserted lines only; an
+  existing line keeps its original snapshot (price-change detection
+  compares against it).
+
+Validation (existence, sellability, stock) is the caller's job and must be
+done for every line before calling :func:`upsert_cart_items`, so a request
+either writes all of its lines or none.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Mapping
+
+from django.db import connection, transaction
+
+from api.exceptions.cart import NoActiveCartException
+from carts.models import Cart, CartItem
+from carts.services.snapshot import get_snapshot_gross_prices
+
+if TYPE_CHECKING:
+    from products.models import Product
+
+
+@dataclass
+class CartItemsUpsertResult:
+    """Product ids written by :func:`upsert_cart_items`, split by outcome."""
+
+    created: list[int] = field(default_factory=list)
+    updated: list[int] = field(default_factory=list)
+
+
+def upsert_cart_items(
+    cart: Cart,
+    products: Mapping[int, "Product"],
+    quantities: Mapping[int, int],
+) -> CartItemsUpsertResult:
+    """Set the quantity of every ``quantities`` product in *cart* at once.
+
+    Parameters
+    ----------
+    cart:
+        The ACTIVE cart to write to.
+    products:
+        Validated products keyed by id, covering every key of *quantities*.
+        Loaded with ``select_related("tax_class", "category")`` so snapshot
+        pricing issues no per-product queries.
+    quantities:
+        ``{product_id: quantity}``; every quantity must be positive.
+
+    The cart row is locked for the duration of the write so concurrent bulk
+    requests for the same cart are serialised and ``created`` / ``updated``
+    are reported accurately.  Raises ``NoActiveCartException`` when the cart
+    is no longer ACTIVE once locked (checked out or merged meanwhile).
+    """
+    result = CartItemsUpsertResult()
+    if not quantities:
+        return result
+
+    snapshot_prices = get_snapshot_gross_prices(
+        products[product_id] for product_id in quantities
+    )
+
+    with transaction.atomic():
+        locked = (
+            Cart.objects.select_for_update()
+            .filter(pk=cart.pk, status=Cart.Status.ACTIVE)
+            .first()
+        )
+        if locked is None:
+            raise NoActiveCartException()
+        existing = set(
+            CartItem.objects.filter(
+                cart=cart, product_id__in=list(quantities)
+            ).values_list("product_id", flat=True)
+        )
+
+        rows = [
+            CartItem(
+                cart=cart,
+                product_id=product_id,
+                quantity=quantity,
+                price_at_add_time=snapshot_prices[product_id],
+            )
+            for product_id, quantity in quantities.items()
+        ]
+        # MySQL upserts on any unique key and rejects an explicit target.
+        unique_fields = (
+            ["cart", "product"]
+            if connection.features.supports_update_conflicts_with_target
+            else None
+        )
+        CartItem.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=["quantity", "updated_at"],
+        )
+
+    for product_id in quantities:
+        (result.updated if product_id in existing else result.created).append(product_id)
+    return result
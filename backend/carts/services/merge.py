@@ -121,6 +121,40 @@ def _resolve_winning_offer_for_merge(
     return candidates[0]  # deterministic fallback (should never be reached)
 
 
+def _locked_cart_lines(cart_ids: list[int]) -> list:
+    """Lock and return the lines of *cart_ids* with their product stock.
+
+    A single ``SELECT … FOR UPDATE`` over the union of both carts' lines,
+    ordered by ``product_id`` so concurrent merges touching the same
+    products acquire row locks in the same order.  Only the cart lines are
+    locked (``of=("self",)``): the ``product`` join reads the stock values
+    in the same statement without locking the product rows, which checkout
+    and reservations update.
+    """
+    return list(
+        CartItem.objects.select_for_update(of=("self",))
+        .filter(cart_id__in=cart_ids)
+        .order_by("product_id", "id")
+        .values_list(
+            "id",
+            "cart_id",
+            "product_id",
+            "quantity",
+            "product__stock_quantity",
+            named=True,
+        )
+    )
+
+
+def _stock_adjusted(product_id: int, requested: int, applied: int) -> CartMergeWarning:
+    return CartMergeWarning(
+        code="STOCK_ADJUSTED",
+        product_id=product_id,
+        requested=requested,
+        applied=applied,
+    )
+
+
 def merge_or_adopt_guest_cart(*, user, raw_token: Optional[str]) -> CartMergeReport:
     """
     Merge or adopt an anonymous (guest) cart into the authenticated user's cart.
@@ -134,6 +168,11 @@ def merge_or_adopt_guest_cart(*, user, raw_token: Optional[str]) -> CartMergeRep
         warning is added to the report.  Items that have zero available stock are
         skipped entirely (not moved to the user cart).
 
+    Set-based: after the two cart rows, all cart lines (with product stock)
+    are locked by one ordered scan, merged quantities and clamps are computed
+    in memory, and the result is written with at most one bulk UPDATE and
+    one DELETE, independent of the number of lines.
+
     Returns:
         CartMergeReport dict describing what was done.
     """
@@ -158,38 +197,43 @@ def merge_or_adopt_guest_cart(*, user, raw_token: Optional[str]) -> CartMergeRep
             status=Cart.Status.ACTIVE,
         ).first()
 
+        lines = _locked_cart_lines(
+            [anonymous_cart.pk] if user_cart is None else [anonymous_cart.pk, user_cart.pk]
+        )
+        # Report entries follow the guest cart's line order.
+        anonymous_lines = sorted(
+            (line for line in lines if line.cart_id == anonymous_cart.pk),
+            key=lambda line: line.id,
+        )
+
         warnings: list = []
+        to_update: list[CartItem] = []
+        ids_to_delete: list[int] = []
 
         # ------------------------------------------------------------------ ADOPT
         # No active user cart exists — adopt the guest cart directly.
         if user_cart is None:
             items_added = 0
-            anon_items = list(CartItem.objects.filter(cart=anonymous_cart).select_related("product"))
 
-            for item in anon_items:
-                available = item.product.stock_quantity
-                applied = min(item.quantity, available)
+            for line in anonymous_lines:
+                applied = min(line.quantity, line.product__stock_quantity)
                 if applied <= 0:
                     # No stock at all — drop the item entirely.
-                    warnings.append(CartMergeWarning(
-                        code="STOCK_ADJUSTED",
-                        product_id=item.product.id,
-                        requested=item.quantity,
-                        applied=0,
-                    ))
-                    item.delete()
+                    warnings.append(_stock_adjusted(line.product_id, line.quantity, 0))
+                    ids_to_delete.append(line.id)
                     continue
-                if applied < item.quantity:
-                    warnings.append(CartMergeWarning(
-                        code="STOCK_ADJUSTED",
-                        product_id=item.product.id,
-                        requested=item.quantity,
-                        applied=applied,
-                    ))
-                    item.quantity = applied
-                    item.save(update_fields=["quantity"])
+                if applied < line.quantity:
+                    warnings.append(
+                        _stock_adjusted(line.product_id, line.quantity, applied)
+                    )
+                    to_update.append(CartItem(id=line.id, quantity=applied))
                 items_added += 1
 
+            if to_update:
+                CartItem.objects.bulk_update(to_update, ["quantity"])
+            if ids_to_delete:
+                CartItem.objects.filter(id__in=ids_to_delete).delete()
+
             # Evaluate campaign offer context from the guest cart before
             # adopting it.  No competition from an auth cart (none exists),
             # so we just validate the guest's claimed offer.
@@ -226,76 +270,52 @@ def merge_or_adopt_guest_cart(*, user, raw_token: Optional[str]) -> CartMergeRep
 
         # ------------------------------------------------------------------ MERGE
         # User already has an active cart — merge guest items into it.
-        user_items = {
-            item.product_id: item
-            for item in CartItem.objects.select_for_update()
-            .select_related("product")
-            .filter(cart=user_cart)
+        user_lines = {
+            line.product_id: line for line in lines if line.cart_id == user_cart.pk
         }
-        anonymous_items = list(
-            CartItem.objects.select_for_update()
-            .select_related("product")
-            .filter(cart=anonymous_cart)
-        )
-
-        items_to_update = []
-        items_to_move = []
-        anonymous_ids_to_delete = []
         items_updated = 0
         items_added = 0
 
-        for anonymous_item in anonymous_items:
-            product = anonymous_item.product
-            user_item = user_items.get(anonymous_item.product_id)
+        for line in anonymous_lines:
+            available = line.product__stock_quantity
+            user_line = user_lines.get(line.product_id)
 
-            if user_item:
+            if user_line:
                 # Product already in user cart — sum quantities, cap to stock.
-                merged_quantity = user_item.quantity + anonymous_item.quantity
-                available = product.stock_quantity
+                merged_quantity = user_line.quantity + line.quantity
                 applied = min(merged_quantity, available)
                 if applied < merged_quantity:
-                    warnings.append(CartMergeWarning(
-                        code="STOCK_ADJUSTED",
-                        product_id=product.id,
-                        requested=merged_quantity,
-                        applied=applied,
-                    ))
-                user_item.quantity = applied
-                items_to_update.append(user_item)
-                anonymous_ids_to_delete.append(anonymous_item.id)
+                    warnings.append(
+                        _stock_adjusted(line.product_id, merged_quantity, applied)
+                    )
+                to_update.append(
+                    CartItem(id=user_line.id, cart_id=user_cart.pk, quantity=applied)
+                )
+                ids_to_delete.append(line.id)
                 items_updated += 1
             else:
                 # New product — move guest item to user cart, capping to stock.
-                available = product.stock_quantity
-                applied = min(anonymous_item.quantity, available)
+                applied = min(line.quantity, available)
                 if applied <= 0:
                     # Drop the item — no stock available.
-                    warnings.append(CartMergeWarning(
-                        code="STOCK_ADJUSTED",
-                        product_id=product.id,
-                        requested=anonymous_item.quantity,
-                        applied=0,
-                    ))
-                    anonymous_ids_to_delete.append(anonymous_item.id)
+                    warnings.append(_stock_adjusted(line.product_id, line.quantity, 0))
+                    ids_to_delete.append(line.id)
                     continue
-                if applied < anonymous_item.quantity:
-                    warnings.append(CartMergeWarning(
-                        code="STOCK_ADJUSTED",
-                        product_id=product.id,
-                        requested=anonymous_item.quantity,
-                        applied=applied,
-                    ))
-                    anonymous_item.quantity = applied
-                anonymous_item.cart = user_cart
-                items_to_move.append(anonymous_item)
+                if applied < line.quantity:
+                    warnings.append(
+                        _stock_adjusted(line.product_id, line.quantity, applied)
+                    )
+                to_update.append(
+                    CartItem(id=line.id, cart_id=user_cart.pk, quantity=applied)
+                )
                 items_added += 1
 
-        if items_to_update:
-            CartItem.objects.bulk_update(items_to_update, ["quantity"])
-        if items_to_move:
-            CartItem.objects.bulk_update(items_to_move, ["cart", "quantity"])
-        if anonymous_ids_to_delete:
-            CartItem.objects.filter(id__in=anonymous_ids_to_delete).delete()
+        # Duplicates are deleted before the moves so the (cart, product)
+        # unique constraint never sees two rows for one product.
+        if ids_to_delete:
+            CartItem.objects.filter(id__in=ids_to_delete).delete()
+        if to_update:
+            CartItem.objects.bulk_update(to_update, ["cart", "quantity"])
 
         # Evaluate campaign offer context from both carts against the now-merged
         # user cart and pick the best valid outcome for the customer.
@@ -332,108 +352,3 @@ def merge_or_adopt_guest_cart(*, user, raw_token: Optional[str]) -> CartMergeRep
             warnings=warnings,
             winning_offer_token=winning_offer_token,
         )
-
-    """
-    Merge or adopt an anonymous (guest) cart into the authenticated user's cart.
-
-    This function is idempotent: repeated calls with the same token will not duplicate merges.
-
-    Args:
-        user: Authenticated user instance.
-        raw_token: Guest cart token from request header/cookie. Can be None/empty.
-
-    Raises:
-        CartMergeStockConflict: If merging quantities would exceed available product stock.
-    """
-
-    if not raw_token:
-        return
-
-    token_hash = hash_cart_token(raw_token)
-
-    with transaction.atomic():
-        try:
-            anonymous_cart = Cart.objects.select_for_update().get(
-                user__isnull=True,
-                status=Cart.Status.ACTIVE,
-                anonymous_token_hash=token_hash,
-            )
-        except Cart.DoesNotExist:
-            return
-
-        user_cart = Cart.objects.select_for_update().filter(
-            user=user,
-            status=Cart.Status.ACTIVE,
-        ).first()
-
-        if user_cart is None:
-            anonymous_cart.user = user
-            anonymous_cart.anonymous_token_hash = None
-            anonymous_cart.merged_into_cart = None
-            anonymous_cart.merged_at = None
-            anonymous_cart.save(
-                update_fields=[
-                    "user",
-                    "anonymous_token_hash",
-                    "merged_into_cart",
-                    "merged_at",
-                ]
-            )
-            return
-
-        user_items = {
-            item.product_id: item
-            for item in CartItem.objects.select_for_update()
-            .select_related("product")
-            .filter(cart=user_cart)
-        }
-        anonymous_items = list(
-            CartItem.objects.select_for_update()
-            .select_related("product")
-            .filter(cart=anonymous_cart)
-        )
-
-        items_to_update = []
-        items_to_move = []
-        anonymous_ids_to_delete = []
-
-        for anonymous_item in anonymous_items:
-            product = anonymous_item.product
-            user_item = user_items.get(anonymous_item.product_id)
-
-            if user_item:
-                merged_quantity = user_item.quantity + anonymous_item.quantity
-                if merged_quantity > product.stock_quantity:
-                    raise CartMergeStockConflict(
-                        detail=f"Insufficient stock to merge product {product.id}."
-                    )
-                user_item.quantity = merged_quantity
-                items_to_update.append(user_item)
-                anonymous_ids_to_delete.append(anonymous_item.id)
-            else:
-                if anonymous_item.quantity > product.stock_quantity:
-                    raise CartMergeStockConflict(
-                        detail=f"Insufficient stock to merge product {product.id}."
-                    )
-                anonymous_item.cart = user_cart
-                items_to_move.append(anonymous_item)
-
-        if items_to_update:
-            CartItem.objects.bulk_update(items_to_update, ["quantity"])
-        if items_to_move:
-            CartItem.objects.bulk_update(items_to_move, ["cart"])
-        if anonymous_ids_to_delete:
-            CartItem.objects.filter(id__in=anonymous_ids_to_delete).delete()
-
-        anonymous_cart.status = Cart.Status.MERGED
-        anonymous_cart.anonymous_token_hash = None
-        anonymous_cart.merged_into_cart = user_cart
-        anonymous_cart.merged_at = timezone.now()
-        anonymous_cart.save(
-            update_fields=[
-                "status",
-                "anonymous_token_hash",
-                "merged_into_cart",
-                "merged_at",
-            ]
-        )
@@ -8,13 +8,20 @@ Design notes
 ------------
 - One DB pass: cart items are fetched with ``select_related`` on
   ``product__tax_class`` and ``product__category``.
-- Delegates all per-unit pricing to ``get_product_pricing``; this service
-  only orchestrates and aggregates.
-- ``get_product_pricing`` is imported lazily inside ``get_cart_pricing`` to
+- Delegates all per-unit pricing to ``price_products_bulk`` (the batch
+  counterpart of ``get_product_pricing``); this service only orchestrates
+  and aggregates.  Totals are summed in integer minor units.
+- Line promotions for all items are resolved up front with
+  ``resolve_line_promotions_bulk``, so the promotion lookup costs a constant
+  number of queries regardless of cart size.
+- ``price_products_bulk`` is imported lazily inside ``get_cart_pricing`` to
   avoid making ``carts`` depend on ``products`` at module load time.
 - Items whose product has no ``price_net_amount`` (not yet migrated from the
   legacy ``price`` field) are included in ``CartTotalsResult.items`` with
   ``unit_pricing=None`` and are excluded from monetary totals.
+- ``reprice_cart_line`` updates an existing result for a single-line change
+  (quantity update, removal, new line) without pricing the other lines
+  again; only the order-level resolution is rerun.
 
 Usage
 -----
@@ -49,6 +56,10 @@ if TYPE_CHECKING:
 _QUANTIZE = Decimal("0.01")
 
 
+def _from_minor_units(units: int) -> Decimal:
+    return Decimal(units).scaleb(-2)
+
+
 # ---------------------------------------------------------------------------
 # Result types
 # ---------------------------------------------------------------------------
@@ -185,34 +196,51 @@ class CartTotalsResult:
 def get_cart_pricing(cart: "Cart") -> CartTotalsResult:
     """Return the full promotion-aware pricing breakdown for a cart.
 
-    Fetches all cart items in a single DB query via ``select_related``, then
-    calls ``get_product_pricing`` for each product to build per-line pricing
-    and aggregate totals.
+    Fetches all cart items in a single DB query via ``select_related``,
+    resolves the winning line promotions for all products in bulk, then
+    prices every product in one pass with ``price_products_bulk`` to build
+    per-line pricing and aggregate totals.
 
     Parameters
     ----------
     cart:
-        An active ``Cart`` instance.
+        An active ``Cart`` instance.  An unsaved instance prices as empty.
     """
-    # Lazy import to avoid making carts depend on products at module load time.
-    from products.services.pricing import get_product_pricing  # noqa: PLC0415
+    # Lazy imports to avoid making carts depend on products at module load time.
+    from discounts.services.line_promotion import (  # noqa: PLC0415
+        resolve_line_promotions_bulk,
+    )
+    from products.services.pricing import (  # noqa: PLC0415
+        get_product_pricing,
+        price_products_bulk,
+    )
 
-    items_qs = cart.items.select_related(
-        "product__tax_class",
-        "product__category",
-    ).all()
+    # An unsaved cart is the virtual empty cart served to anonymous readers
+    # (see api.views.carts.CartView.get); it has no rows to fetch.
+    items_qs = (
+        []
+        if cart.pk is None
+        else list(
+            cart.items.select_related(
+                "product__tax_class",
+                "product__category",
+            ).all()
+        )
+    )
+    products = [item.product for item in items_qs]
+    bulk = price_products_bulk(products, resolve_line_promotions_bulk(products))
 
     line_results: List[CartLinePricingResult] = []
     currency: Optional[str] = None
 
-    # Decimal accumulators — avoid float rounding during summation.
-    acc_und = Decimal("0")
-    acc_dis = Decimal("0")
-    acc_tax = Decimal("0")
+    # Integer minor-unit accumulators — exact, no intermediate rounding.
+    acc_und = 0
+    acc_dis = 0
+    acc_tax = 0
     item_count = 0
 
     for item in items_qs:
-        unit_pricing = get_product_pricing(item.product)
+        unit_pricing = get_product_pricing(item.product, bulk_pricing=bulk)
         line_results.append(
             CartLinePricingResult(
                 item=item,
@@ -225,26 +253,23 @@ def get_cart_pricing(cart: "Cart") -> CartTotalsResult:
             # Product not yet migrated — exclude from monetary totals.
             continue
 
-        qty = Decimal(str(item.quantity))
         if currency is None:
             currency = unit_pricing.currency
 
-        acc_und += unit_pricing.undiscounted.gross.amount * qty
-        acc_dis += unit_pricing.discounted.gross.amount * qty
-        acc_tax += unit_pricing.discounted.tax.amount * qty
+        units = bulk.minor_units(item.product_id)
+        acc_und += units.undiscounted_gross * item.quantity
+        acc_dis += units.discounted_gross * item.quantity
+        acc_tax += units.discounted_tax * item.quantity
         item_count += item.quantity
 
     # Safe fallback for empty / fully-unmigrated carts.
     if currency is None:
         currency = "EUR"
 
-    sub_und = Money(acc_und.quantize(_QUANTIZE, ROUND_HALF_UP), currency)
-    sub_dis = Money(acc_dis.quantize(_QUANTIZE, ROUND_HALF_UP), currency)
-    tot_tax = Money(acc_tax.quantize(_QUANTIZE, ROUND_HALF_UP), currency)
-    tot_dis = Money(
-        (acc_und - acc_dis).quantize(_QUANTIZE, ROUND_HALF_UP),
-        currency,
-    )
+    sub_und = Money(_from_minor_units(acc_und), currency)
+    sub_dis = Money(_from_minor_units(acc_dis), currency)
+    tot_tax = Money(_from_minor_units(acc_tax), currency)
+    tot_dis = Money(_from_minor_units(acc_und - acc_dis), currency)
 
     return CartTotalsResult(
         items=line_results,
@@ -274,6 +299,11 @@ def get_cart_pricing_with_order_discount(cart: "Cart") -> CartTotalsResult:
     cart:
         An active ``Cart`` instance.
     """
+    return _apply_order_discount(get_cart_pricing(cart))
+
+
+def _apply_order_discount(pricing: CartTotalsResult) -> CartTotalsResult:
+    """Resolve the AUTO_APPLY order-level state on top of line *pricing*."""
     # Lazy imports to avoid circular dependencies at module load time.
     from discounts.services.auto_apply_resolver import (  # noqa: PLC0415
         resolve_auto_apply_order_promotion,
@@ -286,8 +316,6 @@ def get_cart_pricing_with_order_discount(cart: "Cart") -> CartTotalsResult:
     )
     from dataclasses import replace  # noqa: PLC0415
 
-    pricing = get_cart_pricing(cart)
-
     promotion = resolve_auto_apply_order_promotion(
         cart_gross=pricing.total_gross.amount,
         currency=pricing.currency,
@@ -498,6 +526,11 @@ def get_cart_pricing_with_campaign_offer(
         A validated, active ``Offer`` instance whose
         ``promotion.acquisition_mode`` is ``CAMPAIGN_APPLY``.
     """
+    return _apply_campaign_offer(get_cart_pricing(cart), offer)
+
+
+def _apply_campaign_offer(pricing: CartTotalsResult, offer: Any) -> CartTotalsResult:
+    """Resolve the EXCLUSIVE order-level state for *offer* on top of line *pricing*."""
     # Lazy imports to avoid circular dependencies at module load time.
     from discounts.services.auto_apply_resolver import (  # noqa: PLC0415
         resolve_all_eligible_auto_apply_promotions,
@@ -510,8 +543,6 @@ def get_cart_pricing_with_campaign_offer(
     )
     from dataclasses import replace as dc_replace  # noqa: PLC0415
 
-    pricing = get_cart_pricing(cart)
-
     # Threshold reward is always computed from the pre-order-discount total.
     threshold_reward = resolve_threshold_reward_progress(
         cart_gross=pricing.total_gross.amount,
@@ -624,3 +655,146 @@ def get_cart_pricing_with_campaign_offer(
         campaign_outcome=decision.campaign_outcome,
         order_discount_upgrade=decision.next_upgrade,
     )
+
+
+# ---------------------------------------------------------------------------
+# Incremental repricing
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class CartLineDelta:
+    """A change to a single cart line, applied by :func:`reprice_cart_line`.
+
+    Attributes
+    ----------
+    product_id:
+        Product of the changed line.
+    quantity:
+        New line quantity; ``0`` means the line was removed.
+    item:
+        The ``CartItem`` after the write, with ``product`` (and its
+        ``tax_class``) loaded.  Only read when the line is not present in the
+        previous result, i.e. when it was just created.
+    """
+
+    product_id: int
+    quantity: int
+    item: Optional["CartItem"] = None
+
+
+def _line_minor_units(unit_pricing: Optional["ProductPricingResult"]) -> tuple[int, int, int]:
+    """Per-unit ``(undiscounted_gross, discounted_gross, discounted_tax)`` in minor units."""
+    if unit_pricing is None:
+        return 0, 0, 0
+    return (
+        int(unit_pricing.undiscounted.gross.amount.scaleb(2)),
+        int(unit_pricing.discounted.gross.amount.scaleb(2)),
+        int(unit_pricing.discounted.tax.amount.scaleb(2)),
+    )
+
+
+def reprice_cart_line(
+    previous: CartTotalsResult,
+    delta: CartLineDelta,
+    *,
+    offer: Any = None,
+) -> CartTotalsResult:
+    """Return *previous* cart pricing updated for a single-line change.
+
+    Per-unit pricing does not depend on quantity, so only the changed line's
+    contribution is swapped in the integer minor-unit accumulators; the other
+    lines are not priced again.  A line that is new to the cart is priced on
+    its own.  The order-level state (discount allocation, threshold progress,
+    decision state) is then re-resolved on the new totals exactly as
+    :func:`get_cart_pricing_with_order_discount` /
+    :func:`get_cart_pricing_with_campaign_offer` would.
+
+    The result equals a full repricing of the changed cart as long as
+    *previous* was computed from the cart as it was right before the change
+    (e.g. a fingerprint-validated ``get_cached_cart_pricing`` result).
+
+    Parameters
+    ----------
+    previous:
+        Pricing of the cart before the change, with the same *offer*.
+    delta:
+        The changed line.
+    offer:
+        A validated, claimed CAMPAIGN_APPLY ``Offer`` or ``None``.
+    """
+    from copy import copy  # noqa: PLC0415
+
+    items = list(previous.items)
+    acc_und = int(previous.subtotal_undiscounted.amount.scaleb(2))
+    acc_dis = int(previous.subtotal_discounted.amount.scaleb(2))
+    acc_tax = int(previous.total_tax.amount.scaleb(2))
+    item_count = previous.item_count
+
+    index = next(
+        (i for i, line in enumerate(items) if line.product_id == delta.product_id),
+        None,
+    )
+    if index is not None:
+        old = items[index]
+        unit_pricing = old.unit_pricing
+        und, dis, tax = _line_minor_units(unit_pricing)
+        acc_und -= und * old.quantity
+        acc_dis -= dis * old.quantity
+        acc_tax -= tax * old.quantity
+        if unit_pricing is not None:
+            item_count -= old.quantity
+        if delta.quantity == 0:
+            del items[index]
+        else:
+            item = copy(old.item)
+            item.quantity = delta.quantity
+            items[index] = CartLinePricingResult(
+                item=item, quantity=delta.quantity, unit_pricing=unit_pricing
+            )
+    elif delta.quantity > 0:
+        if delta.item is None:
+            raise ValueError("CartLineDelta.item is required for a new cart line.")
+        from products.services.pricing import (  # noqa: PLC0415
+            get_product_pricing,
+            price_products_bulk,
+        )
+
+        product = delta.item.product
+        unit_pricing = get_product_pricing(
+            product, bulk_pricing=price_products_bulk([product])
+        )
+        items.append(
+            CartLinePricingResult(
+                item=delta.item, quantity=delta.quantity, unit_pricing=unit_pricing
+            )
+        )
+    else:
+        unit_pricing = None
+
+    if delta.quantity > 0:
+        und, dis, tax = _line_minor_units(unit_pricing)
+        acc_und += und * delta.quantity
+        acc_dis += dis * delta.quantity
+        acc_tax += tax * delta.quantity
+        if unit_pricing is not None:
+            item_count += delta.quantity
+
+    currency = next(
+        (line.unit_pricing.currency for line in items if line.unit_pricing is not None),
+        "EUR",
+    )
+    sub_dis = Money(_from_minor_units(acc_dis), currency)
+    pricing = CartTotalsResult(
+        items=items,
+        subtotal_undiscounted=Money(_from_minor_units(acc_und), currency),
+        subtotal_discounted=sub_dis,
+        total_discount=Money(_from_minor_units(acc_und - acc_dis), currency),
+        total_tax=Money(_from_minor_units(acc_tax), currency),
+        total_gross=sub_dis,
+        currency=currency,
+        item_count=item_count,
+    )
+    if offer is not None:
+        return _apply_campaign_offer(pricing, offer)
+    return _apply_order_discount(pricing)
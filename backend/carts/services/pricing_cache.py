@@ -0,0 +1,292 @@
+"""Per-cart pricing cache with fingerprint validation.
+
+A cart GET, the checkout preflight and checkout itself each used to run the
+full pricing pipeline (line pricing, order-level discount resolution,
+threshold progress) within moments of each other.  This module stores the
+resulting ``CartTotalsResult`` in the Django cache, one entry per cart, and
+reuses it while the inputs it was computed from are unchanged.
+
+Fingerprint
+-----------
+Every read recomputes a fingerprint of the pricing inputs below and compares it
+with the one stored next to the cached result:
+
+- the cart's ``created_at`` (guards against a reused primary key) and its
+  lines: ``(id, product_id, quantity, price_at_add_time, updated_at)``,
+- the pricing- and display-relevant product fields: ``price``,
+  ``price_net_amount``, ``currency``, ``name``, ``category_id`` and the tax
+  class ``rate`` / ``is_active``,
+- the promotion snapshot ``version``, its ``content_digest`` and the dates
+  it was built for (``discounts.services.promotion_snapshot``; day rollover
+  changes them).  The version alone is per process with a LocMem cache; the
+  digest changes as soon as this worker's snapshot is rebuilt from edited
+  promotion data, i.e. within ``PROMOTION_SNAPSHOT_TTL_SECONDS``,
+- the claimed campaign offer, if any: its token, ``status``,
+  ``is_active`` and window, and the pricing fields of its ``OrderPromotion``
+  (``type``, ``value``, ``minimum_order_value``, ``stacking_policy``,
+  ``priority``, ``is_active`` and window).  CAMPAIGN_APPLY promotions are not
+  part of the promotion snapshot; the offer is loaded per request, so an
+  edit made in any worker changes the fingerprint on the next request.
+
+Computing the fingerprint costs one query (cart lines joined with product
+and tax class) against the pricing pipeline it replaces.  Any mismatch
+recomputes and overwrites the entry, so correctness never depends on
+explicit invalidation.
+``CART_PRICING_CACHE_TTL_SECONDS`` bounds staleness for inputs the
+fingerprint cannot see.
+
+Unsaved carts (the virtual anonymous cart) are priced directly.
+
+Single-line cart edits reprice incrementally from the cached result
+(``carts.services.pricing.reprice_cart_line``) and write the outcome back
+with ``store_cart_pricing()``.  They look the result up with
+``peek_cart_pricing()``, which never prices: on a miss the cart is priced
+once, after the edit.
+
+Statistics
+----------
+Hits and misses are counted in the Django cache and exposed via
+``get_cart_pricing_cache_stats()``.
+
+Usage
+-----
+    from carts.services.pricing_cache import get_cached_cart_pricing
+
+    cart_pricing = get_cached_cart_pricing(cart, offer=claimed_offer)
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING, Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+if TYPE_CHECKING:
+    from carts.models import Cart
+    from carts.services.pricing import CartTotalsResult
+
+HITS_CACHE_KEY = "carts:pricing_cache:hits"
+MISSES_CACHE_KEY = "carts:pricing_cache:misses"
+
+_KEY_PREFIX = "carts:pricing_cache:result"
+_DEFAULT_TTL_SECONDS = 120
+
+_FINGERPRINT_FIELDS = (
+    "id",
+    "product_id",
+    "quantity",
+    "price_at_add_time",
+    "updated_at",
+    "product__price",
+    "product__price_net_amount",
+    "product__currency",
+    "product__name",
+    "product__category_id",
+    "product__tax_class__rate",
+    "product__tax_class__is_active",
+)
+
+_OFFER_FIELDS = ("token", "status", "is_active", "active_from", "active_to")
+_OFFER_PROMOTION_FIELDS = (
+    "id",
+    "type",
+    "value",
+    "minimum_order_value",
+    "stacking_policy",
+    "priority",
+    "is_active",
+    "active_from",
+    "active_to",
+)
+
+
+# ---------------------------------------------------------------------------
+# Hit / miss counters
+# ---------------------------------------------------------------------------
+
+
+def _count(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_cart_pricing_cache_stats() -> dict[str, Any]:
+    """Return ``{"hits": …, "misses": …, "hit_rate": …}`` for the cart pricing cache."""
+    hits = cache.get(HITS_CACHE_KEY, 0)
+    misses = cache.get(MISSES_CACHE_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+    }
+
+
+def reset_cart_pricing_cache_stats() -> None:
+    cache.delete_many([HITS_CACHE_KEY, MISSES_CACHE_KEY])
+
+
+# ---------------------------------------------------------------------------
+# Fingerprint
+# ---------------------------------------------------------------------------
+
+
+def _fingerprint_lines(cart: "Cart") -> tuple:
+    return tuple(cart.items.order_by("id").values_list(*_FINGERPRINT_FIELDS))
+
+
+def _offer_state(offer: Any) -> Optional[tuple]:
+    if offer is None:
+        return None
+    promotion = offer.promotion
+    return (
+        tuple(getattr(offer, field) for field in _OFFER_FIELDS),
+        tuple(getattr(promotion, field) for field in _OFFER_PROMOTION_FIELDS),
+    )
+
+
+def cart_pricing_fingerprint(
+    cart: "Cart",
+    *,
+    offer: Any = None,
+    lines: Optional[tuple] = None,
+) -> str:
+    """Return a digest of every input ``CartTotalsResult`` depends on.
+
+    *offer* is the claimed CAMPAIGN_APPLY ``Offer`` (with its promotion) or
+    ``None``; *lines* are the already fetched ``_FINGERPRINT_FIELDS`` rows,
+    if any.
+    """
+    from discounts.services.promotion_snapshot import (  # noqa: PLC0415
+        get_promotion_snapshot,
+    )
+
+    snapshot = get_promotion_snapshot()
+    if lines is None:
+        lines = _fingerprint_lines(cart)
+    payload = repr(
+        (
+            cart.created_at,
+            lines,
+            snapshot.version,
+            snapshot.content_digest,
+            snapshot.as_of.isoformat(),
+            snapshot.as_of_local.isoformat(),
+            _offer_state(offer),
+        )
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _cache_key(cart_id: int) -> str:
+    return f"{_KEY_PREFIX}:{cart_id}"
+
+
+def _ttl_seconds() -> int:
+    return getattr(settings, "CART_PRICING_CACHE_TTL_SECONDS", _DEFAULT_TTL_SECONDS)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def _compute(cart: "Cart", offer: Any) -> "CartTotalsResult":
+    from carts.services.pricing import (  # noqa: PLC0415
+        get_cart_pricing_with_campaign_offer,
+        get_cart_pricing_with_order_discount,
+    )
+
+    if offer is not None:
+        return get_cart_pricing_with_campaign_offer(cart, offer)
+    return get_cart_pricing_with_order_discount(cart)
+
+
+def get_cached_cart_pricing(cart: "Cart", *, offer: Any = None) -> "CartTotalsResult":
+    """Return cart pricing, reusing the cached result while its fingerprint matches.
+
+    Equivalent to ``get_cart_pricing_with_campaign_offer(cart, offer)`` when
+    *offer* is given, ``get_cart_pricing_with_order_discount(cart)``
+    otherwise.
+
+    Parameters
+    ----------
+    cart:
+        The cart to price.
+    offer:
+        A validated, claimed CAMPAIGN_APPLY ``Offer`` or ``None``.
+    """
+    return get_fingerprinted_cart_pricing(cart, offer=offer)[1]
+
+
+def get_fingerprinted_cart_pricing(
+    cart: "Cart", *, offer: Any = None
+) -> tuple[Optional[str], "CartTotalsResult"]:
+    """Like :func:`get_cached_cart_pricing`, also returning the input fingerprint.
+
+    The fingerprint is taken *before* a miss is priced, so a concurrent
+    write can only make it older than the result, never newer.  It is
+    ``None`` for unsaved carts.
+    """
+    if cart.pk is None:
+        return None, _compute(cart, offer)
+
+    fingerprint = cart_pricing_fingerprint(cart, offer=offer)
+    key = _cache_key(cart.pk)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        _count(HITS_CACHE_KEY)
+        return fingerprint, cached[1]
+
+    _count(MISSES_CACHE_KEY)
+    result = _compute(cart, offer)
+    cache.set(key, (fingerprint, result), timeout=_ttl_seconds())
+    return fingerprint, result
+
+
+def peek_cart_pricing(cart: "Cart", *, offer: Any = None) -> Optional["CartTotalsResult"]:
+    """Return the cached pricing of *cart* if its fingerprint matches, else ``None``.
+
+    Unlike :func:`get_cached_cart_pricing` a miss computes nothing (and is
+    not counted; the caller prices the cart later, which counts it).
+    """
+    if cart.pk is None:
+        return None
+    cached = cache.get(_cache_key(cart.pk))
+    if cached is None or cached[0] != cart_pricing_fingerprint(cart, offer=offer):
+        return None
+    _count(HITS_CACHE_KEY)
+    return cached[1]
+
+
+def invalidate_cart_pricing(cart_id: int) -> None:
+    """Drop the cached pricing of one cart (e.g. after it was converted)."""
+    cache.delete(_cache_key(cart_id))
+
+
+def store_cart_pricing(
+    cart: "Cart", result: "CartTotalsResult", *, offer: Any = None
+) -> bool:
+    """Cache *result* as the current pricing of *cart*, e.g. after an incremental reprice.
+
+    The entry is only written when the cart lines in the database match the
+    lines of *result* (item id, product and quantity), so a concurrent write
+    to another line is never cached under the new fingerprint.  Returns
+    whether the entry was stored.
+    """
+    if cart.pk is None:
+        return False
+
+    lines = _fingerprint_lines(cart)
+    expected = sorted((line.item_id, line.product_id, line.quantity) for line in result.items)
+    if [row[:3] for row in lines] != expected:
+        return False
+
+    fingerprint = cart_pricing_fingerprint(cart, offer=offer, lines=lines)
+    cache.set(_cache_key(cart.pk), (fingerprint, result), timeout=_ttl_seconds())
+    return True
@@ -12,13 +12,16 @@ Design notes
 - For *unmigrated* products (``price_net_amount`` is ``None``), the function
   falls back to ``product.price``.  The price-change detection service skips
   unmigrated items, so no false-positive comparison will occur.
-- ``get_product_pricing`` is imported lazily inside the function to avoid
+- ``get_snapshot_gross_prices`` is the batch variant used by bulk cart
+  mutations: promotions are resolved once and all products are priced in a
+  single ``price_products_bulk`` pass.
+- Pricing helpers are imported lazily inside the functions to avoid
   introducing a ``carts → products`` module-level import cycle.
 """
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 if TYPE_CHECKING:
     from products.models import Product
@@ -54,3 +57,32 @@ def get_snapshot_gross_price(product: "Product") -> Decimal:
     # product.price.  The price-change detection service will skip this item,
     # so no gross-vs-net comparison will be made.
     return product.price
+
+
+def get_snapshot_gross_prices(products: Iterable["Product"]) -> dict[int, Decimal]:
+    """Return ``{product_id: gross unit price}`` for many products at once.
+
+    Equivalent to calling :func:`get_snapshot_gross_price` per product, with
+    the winning promotions resolved in bulk.  Callers should load products
+    with ``select_related("tax_class", "category")``.
+    """
+    from discounts.services.line_promotion import (  # noqa: PLC0415
+        resolve_line_promotions_bulk,
+    )
+    from products.services.pricing import (  # noqa: PLC0415
+        get_product_pricing,
+        price_products_bulk,
+    )
+
+    products = list(products)
+    migrated = [p for p in products if p.price_net_amount is not None]
+    bulk = price_products_bulk(migrated, resolve_line_promotions_bulk(migrated))
+
+    prices: dict[int, Decimal] = {}
+    for product in products:
+        if product.price_net_amount is None:
+            prices[product.pk] = product.price
+        else:
+            pricing = get_product_pricing(product, bulk_pricing=bulk)
+            prices[product.pk] = pricing.discounted.gross.amount
+    return prices
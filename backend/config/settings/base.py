@@ -372,6 +372,52 @@ DISABLE_RATE_LIMITING_FOR_TESTS = False
 # Override in local.py or per-environment as needed.
 LOW_STOCK_THRESHOLD = 5
 
+# Catalogue list cursor pagination (opt-in via ?page_size= / ?cursor=).
+CATALOGUE_DEFAULT_PAGE_SIZE = 24
+CATALOGUE_MAX_PAGE_SIZE = 100
+
+# Customer order list cursor pagination (opt-in via ?page_size= / ?cursor=).
+ORDER_LIST_DEFAULT_PAGE_SIZE = 20
+ORDER_LIST_MAX_PAGE_SIZE = 100
+
+# Lifetime (seconds) of cached search-backend hit lists.  Product signals
+# invalidate them on every product write; the TTL bounds staleness for
+# writes that bypass signals (QuerySet.update, raw SQL).
+CATALOGUE_SEARCH_CACHE_TTL_SECONDS: int = int(
+    os.getenv("CATALOGUE_SEARCH_CACHE_TTL_SECONDS", 300)
+)
+
+# Maximum age (seconds) of the in-process ngram search index before it is
+# rebuilt from the database.  Bounds how long an entry re-read before its
+# writer committed (or written without signals) stays in the index.
+CATALOGUE_NGRAM_INDEX_TTL_SECONDS: int = int(
+    os.getenv("CATALOGUE_NGRAM_INDEX_TTL_SECONDS", 300)
+)
+
+# Cron expression for the daily ProductEffectivePrice refresh at promotion
+# window boundaries.  Promotion windows are day-granular, so run it shortly
+# after midnight.
+EFFECTIVE_PRICE_REFRESH_CRON: str = os.getenv("EFFECTIVE_PRICE_REFRESH_CRON", "5 0 * * *")
+
+# On databases without a FULLTEXT backend (SQLite, PostgreSQL) search runs
+# against an in-process bigram index.  Set to False to disable search there
+# instead (every search term then returns no results).
+CATALOGUE_INMEMORY_SEARCH_ENABLED: bool = (
+    os.getenv("CATALOGUE_INMEMORY_SEARCH_ENABLED", "true").lower() == "true"
+)
+
+# ---------------------------------------------------------------------------
+# Promotion snapshot settings
+# ---------------------------------------------------------------------------
+
+# Maximum age (seconds) of the in-process promotion snapshot used by the
+# discount resolvers.  Model signals invalidate it on every promotion write;
+# the TTL is a safety net for writes that bypass signals (QuerySet.update,
+# raw SQL) and for per-process cache backends.
+PROMOTION_SNAPSHOT_TTL_SECONDS: int = int(
+    os.getenv("PROMOTION_SNAPSHOT_TTL_SECONDS", 60)
+)
+
 # ---------------------------------------------------------------------------
 # Overdue inventory reservation expiration settings
 # ---------------------------------------------------------------------------
@@ -383,6 +429,41 @@ OVERDUE_RESERVATIONS_CLEANUP_CRON: str = os.getenv(
     "OVERDUE_RESERVATIONS_CLEANUP_CRON", "*/15 * * * *"
 )
 
+# Orders expired per transaction by the sweep.  Each chunk locks at most this
+# many orders (SKIP LOCKED) and their reservations, so a large backlog after
+# an outage never holds locks for the whole run.
+OVERDUE_RESERVATIONS_EXPIRY_BATCH_SIZE: int = int(
+    os.getenv("OVERDUE_RESERVATIONS_EXPIRY_BATCH_SIZE", 200)
+)
+
+# Number of Django-Q tasks the scheduled sweep fans the backlog out to.  Each
+# shard expires a disjoint range of order ids, so shards run in parallel on
+# separate workers without contending for locks.  0 (default) means one
+# shard per Q_CLUSTER worker; 1 runs the sweep inline in the scheduled job.
+# Manual runs of expire_overdue_reservations ignore it (use --shards).
+OVERDUE_RESERVATIONS_EXPIRY_SHARDS: int = int(
+    os.getenv("OVERDUE_RESERVATIONS_EXPIRY_SHARDS", 0)
+)
+
+# ---------------------------------------------------------------------------
+# Cart pricing cache settings
+# ---------------------------------------------------------------------------
+
+# Lifetime (seconds) of cached cart pricing results.  Entries are validated
+# against a fingerprint of every pricing input on each read; the TTL bounds
+# staleness for inputs the fingerprint cannot see (e.g. promotion writes
+# that bypass model signals).
+CART_PRICING_CACHE_TTL_SECONDS: int = int(
+    os.getenv("CART_PRICING_CACHE_TTL_SECONDS", 120)
+)
+
+# Lifetime (seconds) of the signed pricing token returned by the checkout
+# preflight.  Checkout reuses the token's order plan instead of repricing
+# while the cart's pricing inputs are unchanged; older tokens are ignored.
+CHECKOUT_PRICING_TOKEN_MAX_AGE_SECONDS: int = int(
+    os.getenv("CHECKOUT_PRICING_TOKEN_MAX_AGE_SECONDS", 600)
+)
+
 # ---------------------------------------------------------------------------
 # Anonymous cart cleanup settings
 # ---------------------------------------------------------------------------
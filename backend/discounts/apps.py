@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class DiscountsConfig(AppConfig):
     name = "discounts"
+
+    def ready(self):
+        from discounts import signals  # noqa: F401
@@ -9,7 +9,10 @@ Selection algorithm
 -------------------
 1. Filter: ``acquisition_mode = AUTO_APPLY``, ``is_active = True``,
    within the active time window (``active_from <= now <= active_to``; NULL
-   bounds mean "open ended").
+   bounds mean "open ended").  Candidates are read from the in-process
+   ``PromotionSnapshot`` rather than queried per call, through the decision
+   table compiled from it
+   (``discounts.services.order_discount_decision``).
 2. Eligibility: ``minimum_order_value <= cart_gross``, or
    ``minimum_order_value`` is NULL (always eligible regardless of cart value).
 3. Winner: iterate candidates ordered by ``-priority`` then ``id`` (ascending)
@@ -32,14 +35,14 @@ Public helpers
 
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Optional
 
-from django.db.models import Q
-from django.utils import timezone
-
-from discounts.models import AcquisitionMode, OrderPromotion, PromotionType
+from discounts.models import OrderPromotion, PromotionType
+from discounts.services.order_discount_decision import get_order_discount_decision_table
+from discounts.services.promotion_snapshot import get_promotion_snapshot
 
 
 _QUANTIZE = Decimal("0.01")
@@ -109,40 +112,13 @@ def resolve_auto_apply_order_promotion(
         The winning promotion, or ``None`` when no AUTO_APPLY promotion is
         eligible for the given cart total.
     """
-    now = timezone.now()
-
-    all_candidates = list(
-        OrderPromotion.objects.filter(
-            acquisition_mode=AcquisitionMode.AUTO_APPLY,
-            is_active=True,
-        )
-        .filter(
-            Q(active_from__isnull=True) | Q(active_from__lte=now),
-            Q(active_to__isnull=True) | Q(active_to__gte=now),
-        )
-        .order_by("id")  # stable ordering; winner selected by max() below
-    )
-
-    # Filter to only currently-eligible promotions (minimum_order_value met).
-    eligible = [
-        p for p in all_candidates
-        if p.minimum_order_value is None or cart_gross >= p.minimum_order_value
-    ]
-    if not eligible:
-        return None
-
-    # Benefit-first storefront policy:
+    # Eligible promotions (minimum_order_value met) are found by binary search
+    # in the compiled decision table; the winner follows the benefit-first
+    # storefront policy:
     #   1. Highest customer benefit (gross discount at current cart value)
     #   2. Highest explicit priority  (tiebreak)
     #   3. Lowest id                  (stable deterministic fallback)
-    return max(
-        eligible,
-        key=lambda p: (
-            _compute_gross_discount(p, cart_gross),
-            p.priority,
-            -p.id,
-        ),
-    )
+    return get_order_discount_decision_table().winner_at(cart_gross)
 
 
 def resolve_threshold_reward_progress(
@@ -180,29 +156,15 @@ def resolve_threshold_reward_progress(
         Progress info, or ``None`` when no threshold-based AUTO_APPLY
         promotions exist.
     """
-    now = timezone.now()
-
-    candidates = list(
-        OrderPromotion.objects.filter(
-            acquisition_mode=AcquisitionMode.AUTO_APPLY,
-            is_active=True,
-            minimum_order_value__isnull=False,
-        )
-        .filter(
-            Q(active_from__isnull=True) | Q(active_from__lte=now),
-            Q(active_to__isnull=True) | Q(active_to__gte=now),
-        )
-        .order_by("-priority", "id")
-    )
-
-    if not candidates:
+    table = get_order_discount_decision_table()
+    if not table.threshold_promotions:
         return None
 
     # Prefer showing an already-unlocked reward.
     # Under benefit-first policy, show the winner — the one with the highest
     # gross customer benefit at the current cart value (same key as the
     # storefront winner resolver).
-    unlocked = [p for p in candidates if cart_gross >= p.minimum_order_value]
+    unlocked = table.threshold_promotions[: bisect_right(table.thresholds, cart_gross)]
     if unlocked:
         best = max(
             unlocked,
@@ -218,8 +180,8 @@ def resolve_threshold_reward_progress(
             currency=currency,
         )
 
-    # No threshold met yet — find the promotion with the smallest remaining gap.
-    best = min(candidates, key=lambda p: p.minimum_order_value - cart_gross)
+    # No threshold met yet — the promotion with the smallest remaining gap.
+    best = table.closest_locked_threshold(cart_gross)
     remaining = (best.minimum_order_value - cart_gross).quantize(
         _QUANTIZE, ROUND_HALF_UP
     )
@@ -256,19 +218,7 @@ def resolve_all_eligible_auto_apply_promotions(
         All eligible AUTO_APPLY promotions, ordered by ``(-priority, id)``.
         Empty list when none are eligible.
     """
-    now = timezone.now()
-
-    candidates = (
-        OrderPromotion.objects.filter(
-            acquisition_mode=AcquisitionMode.AUTO_APPLY,
-            is_active=True,
-        )
-        .filter(
-            Q(active_from__isnull=True) | Q(active_from__lte=now),
-            Q(active_to__isnull=True) | Q(active_to__gte=now),
-        )
-        .order_by("-priority", "id")
-    )
+    candidates = get_promotion_snapshot().auto_apply_order_promotions
 
     return [
         p for p in candidates
@@ -8,7 +8,8 @@ Phase 2 scope
 -------------
 - Promotions targeted directly at a product (``PromotionProduct``)
 - Promotions targeted at the product's category (``PromotionCategory``)
-- Active / date-window filtering
+- Active / date-window filtering (served from the in-process
+  ``PromotionSnapshot``; see ``discounts.services.promotion_snapshot``)
 - Single-winner selection: highest priority wins; stable tie-break by
   promotion id (lower id created earlier, deterministic across runs)
 - PERCENT and FIXED discount types applied against NET price
@@ -34,19 +35,26 @@ Usage
         print(result.discounted_net)   # prices.Money
     else:
         print("no promotion applied")
+
+Listings and carts should resolve all winners up front instead of issuing
+one query per product:
+
+    from discounts.services.line_promotion import resolve_line_promotions_bulk
+
+    winners = resolve_line_promotions_bulk(products)   # {product_id: Promotion | None}
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal, ROUND_HALF_UP
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
 
-from django.db.models import Q
 from django.utils.timezone import now
 from prices import Money
 
 from discounts.models import Promotion, PromotionAmountScope, PromotionType
+from discounts.services.promotion_snapshot import get_promotion_snapshot
 
 if TYPE_CHECKING:
     from products.models import Product
@@ -202,10 +210,9 @@ def resolve_line_promotion(
     Parameters
     ----------
     product:
-        The product for which a promotion should be resolved.  ``category``
-        is accessed via the FK; callers should use
-        ``select_related("category")`` on the queryset when resolving many
-        products at once.
+        The product for which a promotion should be resolved.  Only ``pk``
+        and ``category_id`` are read.  Use :func:`resolve_line_promotions_bulk`
+        when resolving many products at once.
     net_amount:
         The product's net (pre-tax) price for this line.
     currency:
@@ -221,36 +228,79 @@ def resolve_line_promotion(
         When no applicable promotion is found, ``promotion`` is ``None`` and
         ``discount_net`` is zero (``discounted_net == original_net``).
     """
-    today = now().date()
+    # Candidates and targets come from the in-process promotion snapshot;
+    # the winner rule is highest priority first, lowest id breaks ties.
+    winner: Optional[Promotion] = get_promotion_snapshot().line_promotion_winner(
+        product_id=product.pk,
+        category_id=product.category_id,  # None when product has no category
+    )
 
-    # Build the targeting filter: promotions that reference this product
-    # directly OR that reference the product's category.
-    category_id = product.category_id  # None when product has no category
+    return build_line_promotion_result(
+        promotion=winner,
+        net_amount=net_amount,
+        currency=currency,
+        tax_rate=tax_rate,
+    )
 
-    targeting_q = Q(product_targets__product=product)
-    if category_id is not None:
-        targeting_q |= Q(category_targets__category_id=category_id)
 
-    # Date-window filter expressed in SQL for efficiency.
-    window_q = (
-        Q(active_from__isnull=True) | Q(active_from__lte=today)
-    ) & (
-        Q(active_to__isnull=True) | Q(active_to__gte=today)
-    )
+def resolve_line_promotions_bulk(
+    products: Iterable["Product"],
+) -> Dict[int, Optional[Promotion]]:
+    """Resolve the winning promotion for many products in a constant number of queries.
 
-    candidates = (
-        Promotion.objects.filter(targeting_q, window_q, is_active=True)
-        .distinct()
-        .order_by("-priority", "id")  # highest priority first; lowest id breaks ties
-    )
+    Batch counterpart of :func:`resolve_line_promotion` for catalogue listings
+    and carts.  Active, in-window promotions and their targets are read from
+    the promotion snapshot once (no queries while it is fresh, a fixed number
+    when it is rebuilt) and the winner per product is picked in memory using
+    the same rule as the per-product path (highest ``priority``, lowest
+    ``id`` on ties).
 
-    winner: Optional[Promotion] = candidates.first()
+    Parameters
+    ----------
+    products:
+        The products to resolve.  Only ``pk`` and ``category_id`` are read,
+        so no ``select_related`` is required.
 
-    if winner is None:
+    Returns
+    -------
+    dict[int, Promotion | None]
+        Mapping of product id to the winning ``Promotion`` (or ``None`` when
+        no promotion applies).  Every product passed in has an entry.  Pass
+        the mapping to :func:`build_line_promotion_result` (or to
+        ``get_product_pricing(..., line_promotions=...)``) to price a line.
+    """
+    products = list(products)
+    if not products:
+        return {}
+
+    snapshot = get_promotion_snapshot()
+    return {
+        product.pk: snapshot.line_promotion_winner(
+            product_id=product.pk,
+            category_id=product.category_id,
+        )
+        for product in products
+    }
+
+
+def build_line_promotion_result(
+    *,
+    promotion: Optional[Promotion],
+    net_amount: Decimal,
+    currency: str,
+    tax_rate: Decimal = _ZERO,
+) -> LinePromotionResult:
+    """Apply an already-resolved winning *promotion* to a line.
+
+    Shared by :func:`resolve_line_promotion` and callers that resolved the
+    winners up front via :func:`resolve_line_promotions_bulk`.  When
+    *promotion* is ``None`` a no-discount result is returned.
+    """
+    if promotion is None:
         return _no_discount_result(net_amount=net_amount, currency=currency)
 
     discount_amount = _compute_discount(
-        promotion=winner,
+        promotion=promotion,
         net_amount=net_amount,
         tax_rate=tax_rate,
     )
@@ -258,12 +308,12 @@ def resolve_line_promotion(
     discounted_amount = net_q - discount_amount
 
     return LinePromotionResult(
-        promotion=winner,
+        promotion=promotion,
         original_net=Money(net_q, currency),
         discount_net=Money(discount_amount, currency),
         discounted_net=Money(discounted_amount, currency),
         currency=currency,
-        promotion_code=winner.code,
-        promotion_type=winner.type,
-        amount_scope=winner.amount_scope if winner.type == "FIXED" else None,
+        promotion_code=promotion.code,
+        promotion_type=promotion.type,
+        amount_scope=promotion.amount_scope if promotion.type == "FIXED" else None,
     )
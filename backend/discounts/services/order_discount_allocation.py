@@ -21,17 +21,20 @@ Proportional allocation based on bucket gross (post-line-promotion) amounts:
     bucket_share = bucket_gross / total_gross
     bucket_gross_reduction = total_order_discount * bucket_share
 
-Proportional allocation is performed in a single Decimal pass with
-ROUND_HALF_UP.  After rounding, a residual (sum of per-bucket reductions may
-differ from the target by at most ±1 cent due to rounding) is assigned to the
-**largest bucket by gross amount** (stable tie-break by lowest tax_rate).
-If zero-gross buckets exist they can never receive a residual.
+Amounts are converted to integer cents once (ROUND_HALF_UP) and the
+allocation runs on ``int`` arithmetic; each bucket share is rounded half up.
+After rounding, a residual (sum of per-bucket reductions may differ from the
+target by at most ±(n_buckets - 1) cents) is assigned to the **largest bucket
+by gross amount** (stable tie-break by lowest tax_rate).  If zero-gross
+buckets exist they can never receive a residual.  Results are converted back
+to 2-decimal-place ``Decimal`` values and are identical to the former
+``Decimal`` implementation.
 
 VAT derivation per bucket
 -------------------------
 From ``gross_reduction`` per bucket:
 
-    net_reduction  = gross_reduction / (1 + tax_rate / 100)  [ROUND_HALF_UP]
+    net_reduction  = gross_reduction * (100 / (100 + tax_rate))  [ROUND_HALF_UP]
     tax_reduction  = gross_reduction - net_reduction
 
 For zero-rate buckets (tax_rate == 0):
@@ -64,13 +67,17 @@ Usage
     for bucket in result.buckets:
         print(bucket.tax_rate, bucket.adjusted_gross, bucket.adjusted_tax)
     print(result.total_gross_reduction)
+
+    # Many orders at once (e.g. backfills):
+    results = allocate_order_discounts([(lines, discount), (other_lines, other)])
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, List, Sequence
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 from discounts.models import PromotionType
 
@@ -78,6 +85,7 @@ from discounts.models import PromotionType
 _QUANTIZE = Decimal("0.01")
 _HUNDRED = Decimal("100")
 _ZERO = Decimal("0.00")
+_ONE = Decimal("1")
 
 
 def _q(v: Decimal) -> Decimal:
@@ -85,10 +93,6 @@ def _q(v: Decimal) -> Decimal:
     return v.quantize(_QUANTIZE, rounding=ROUND_HALF_UP)
 
 
-def _clamp_non_negative(v: Decimal) -> Decimal:
-    return max(_ZERO, v)
-
-
 # ---------------------------------------------------------------------------
 # Input types
 # ---------------------------------------------------------------------------
@@ -233,52 +237,64 @@ class OrderDiscountAllocationResult:
 
 
 # ---------------------------------------------------------------------------
-# Bucket accumulator (internal)
+# Integer-cent helpers (internal)
 # ---------------------------------------------------------------------------
 
 
-@dataclass
-class _Bucket:
-    """Mutable accumulator for lines sharing the same tax_rate."""
+def _to_cents(v: Decimal) -> int:
+    """Quantise *v* to 2 decimal places (ROUND_HALF_UP) and return whole cents."""
+    return int(v.scaleb(2).quantize(_ONE, rounding=ROUND_HALF_UP))
 
-    tax_rate: Decimal
-    net: Decimal = field(default_factory=lambda: Decimal("0.00"))
-    gross: Decimal = field(default_factory=lambda: Decimal("0.00"))
 
+def _from_cents(cents: int) -> Decimal:
+    """Return *cents* as a 2-decimal-place amount."""
+    return Decimal(cents).scaleb(-2)
 
-# ---------------------------------------------------------------------------
-# Public API
-# ---------------------------------------------------------------------------
 
+def _div_round_half_up(numerator: int, denominator: int) -> int:
+    """``numerator / denominator`` (denominator > 0), rounded half away from zero.
 
-def allocate_order_discount(
-    *,
-    lines: Sequence[OrderLineInput],
-    discount: OrderDiscountInput,
-) -> OrderDiscountAllocationResult:
-    """Allocate an order-level discount proportionally across VAT-rate buckets.
+    Matches ``Decimal.quantize(..., ROUND_HALF_UP)`` for negative values too.
+    """
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if 2 * remainder >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
 
-    Parameters
-    ----------
-    lines:
-        Sequence of priced order lines (post-line-promotion).  May share the
-        same ``tax_rate``; they will be grouped into buckets.  All lines must
-        share the same ``currency``.
-    discount:
-        The order-level discount to allocate.
 
-    Returns
-    -------
-    OrderDiscountAllocationResult
-        Complete per-bucket and aggregate breakdown.
+@lru_cache(maxsize=128)
+def _net_multiplier(rate: Decimal) -> Decimal:
+    """``100 / (100 + rate)`` — computed once per distinct tax rate."""
+    return _ZERO + _HUNDRED / (_HUNDRED + rate)
 
-    Raises
-    ------
-    ValueError
-        If ``lines`` is empty or currencies are inconsistent.
-    ValueError
-        If ``discount.type`` is not ``"PERCENT"`` or ``"FIXED"``.
+
+def _net_reduction_cents(gross_reduction: int, rate: Decimal) -> int:
+    """Back-compute the net part of *gross_reduction* cents at *rate*.
+
+    The multiplier is the same 28-digit ``Decimal`` quotient the engine has
+    always used, so rounding at half-cent boundaries is unchanged; scaling
+    by 100 only shifts the exponent.
     """
+    return int(
+        (Decimal(gross_reduction) * _net_multiplier(rate)).quantize(
+            _ONE, rounding=ROUND_HALF_UP
+        )
+    )
+
+
+def _total_discount_cents(discount: OrderDiscountInput, total_gross: int) -> int:
+    """Order-level gross discount in cents, capped at *total_gross*."""
+    if total_gross <= 0:
+        # Empty or all-zero gross cart: no discount to allocate.
+        return 0
+    if discount.type == PromotionType.PERCENT:
+        numerator, denominator = Decimal(discount.value).as_integer_ratio()
+        return _div_round_half_up(total_gross * numerator, denominator * 100)
+    # FIXED — B2C default: gross amount off, capped at available gross.
+    return min(_to_cents(discount.value), total_gross)
+
+
+def _validate(lines: Sequence[OrderLineInput], discount: OrderDiscountInput) -> None:
     if not lines:
         raise ValueError("lines must not be empty.")
 
@@ -296,136 +312,169 @@ def allocate_order_discount(
             f"Expected 'PERCENT' or 'FIXED'."
         )
 
+
+def _allocate_cents(
+    lines: Sequence[OrderLineInput],
+    discount: OrderDiscountInput,
+) -> OrderDiscountAllocationResult:
+    """Allocation core for one order; inputs must already be validated."""
     # ------------------------------------------------------------------
-    # Step 1: Group lines into VAT-rate buckets.
+    # Step 1: Group lines into VAT-rate buckets (integer cents).
     # ------------------------------------------------------------------
-    bucket_map: Dict[Decimal, _Bucket] = {}
+    net_by_rate: Dict[Decimal, int] = {}
+    gross_by_rate: Dict[Decimal, int] = {}
     for ln in lines:
         rate_key = _q(ln.tax_rate)
-        if rate_key not in bucket_map:
-            bucket_map[rate_key] = _Bucket(tax_rate=rate_key)
-        b = bucket_map[rate_key]
-        b.net += _q(ln.line_net)
-        b.gross += _q(ln.line_gross)
+        net_by_rate[rate_key] = net_by_rate.get(rate_key, 0) + _to_cents(ln.line_net)
+        gross_by_rate[rate_key] = gross_by_rate.get(rate_key, 0) + _to_cents(
+            ln.line_gross
+        )
 
     # Sort buckets by tax_rate ascending for deterministic output ordering.
-    sorted_buckets = sorted(bucket_map.values(), key=lambda b: b.tax_rate)
-
-    total_gross = _q(sum(b.gross for b in sorted_buckets))
+    rates = sorted(gross_by_rate)
+    grosses = [gross_by_rate[r] for r in rates]
+    nets = [net_by_rate[r] for r in rates]
+    total_gross = sum(grosses)
 
     # ------------------------------------------------------------------
     # Step 2: Compute total order discount (gross, capped at total_gross).
     # ------------------------------------------------------------------
-    if total_gross <= _ZERO:
-        # Empty or all-zero gross cart: no discount to allocate.
-        total_discount = _ZERO
-    elif discount.type == PromotionType.PERCENT:
-        total_discount = _q(total_gross * discount.value / _HUNDRED)
-    else:
-        # FIXED — B2C default: gross amount off, capped at available gross.
-        total_discount = _q(min(discount.value, total_gross))
+    total_discount = _total_discount_cents(discount, total_gross)
 
     # ------------------------------------------------------------------
     # Step 3: Proportional allocation.
     #
-    # Each bucket gets: total_discount * (bucket_gross / total_gross).
-    # We round each share with ROUND_HALF_UP.  Because independent rounding
-    # can produce a sum that differs from total_discount by at most
-    # ±(n_buckets - 1) cents, we compute the residual and add it to the
-    # **largest bucket by gross** (tie-break: lowest tax_rate, already
-    # deterministic via sorted order).
-    #
-    # Buckets with zero gross receive zero allocation and are never chosen
-    # for residual assignment.
+    # Each bucket gets total_discount * bucket_gross / total_gross cents,
+    # rounded half up.  The residual (at most ±(n_buckets - 1) cents) goes
+    # to the **largest bucket by gross** (tie-break: lowest tax_rate, via
+    # sorted order and max() returning the first maximum).  Buckets with
+    # zero gross receive nothing and never take the residual.
     # ------------------------------------------------------------------
-    if total_discount == _ZERO or total_gross == _ZERO:
-        gross_reductions = [_ZERO] * len(sorted_buckets)
+    if total_discount == 0 or total_gross == 0:
+        gross_reductions = [0] * len(rates)
     else:
-        gross_reductions = []
-        for b in sorted_buckets:
-            if b.gross <= _ZERO:
-                gross_reductions.append(_ZERO)
-            else:
-                share = _q(total_discount * b.gross / total_gross)
-                gross_reductions.append(share)
-
-        # Residual correction.
-        allocated_sum = _q(sum(gross_reductions))
-        residual = _q(total_discount - allocated_sum)
-
-        if residual != _ZERO:
-            # Find the index of the largest-gross non-zero bucket.
-            # sorted_buckets is ascending by tax_rate; find max gross among
-            # non-zero-gross buckets deterministically (max gross, then first
-            # encountered which has lowest tax_rate due to sort order).
+        gross_reductions = [
+            _div_round_half_up(total_discount * g, total_gross) if g > 0 else 0
+            for g in grosses
+        ]
+        residual = total_discount - sum(gross_reductions)
+        if residual:
             best_idx = max(
-                (i for i, b in enumerate(sorted_buckets) if b.gross > _ZERO),
-                key=lambda i: sorted_buckets[i].gross,
+                (i for i, g in enumerate(grosses) if g > 0),
+                key=grosses.__getitem__,
             )
-            gross_reductions[best_idx] = _q(gross_reductions[best_idx] + residual)
+            gross_reductions[best_idx] += residual
 
     # ------------------------------------------------------------------
     # Step 4: Derive net_reduction and tax_reduction per bucket.
     # Clamp all outputs to ≥ 0.
     # ------------------------------------------------------------------
-    result_buckets: List[OrderDiscountBucketResult] = []
-    for i, b in enumerate(sorted_buckets):
-        gross_red = gross_reductions[i]
-
-        # Cap gross_reduction at bucket gross (guard against floating residual).
-        gross_red = _clamp_non_negative(min(gross_red, b.gross))
+    rows: List[Tuple[int, ...]] = []
+    for rate, gross, net, gross_red in zip(rates, grosses, nets, gross_reductions):
+        # Cap gross_reduction at bucket gross.
+        gross_red = max(0, min(gross_red, gross))
 
-        rate = b.tax_rate
         if rate == _ZERO:
             # Zero-rate bucket: net == gross, no tax component.
             net_red = gross_red
-            tax_red = _ZERO
+            tax_red = 0
         else:
-            # Back-compute net reduction from the gross reduction.
-            # gross = net * (1 + rate/100) → net = gross / (1 + rate/100)
-            multiplier = _ZERO + _HUNDRED / (_HUNDRED + rate)
-            net_red = _q(gross_red * multiplier)
-            tax_red = _clamp_non_negative(_q(gross_red - net_red))
-
-        original_gross = _q(b.gross)
-        original_net = _q(b.net)
-        original_tax = _clamp_non_negative(_q(original_gross - original_net))
-
-        adjusted_gross = _clamp_non_negative(_q(original_gross - gross_red))
-        adjusted_net = _clamp_non_negative(_q(original_net - net_red))
-        adjusted_tax = _clamp_non_negative(_q(original_tax - tax_red))
-
-        result_buckets.append(
-            OrderDiscountBucketResult(
-                tax_rate=rate,
-                original_gross=original_gross,
-                original_net=original_net,
-                original_tax=original_tax,
-                gross_reduction=gross_red,
-                net_reduction=net_red,
-                tax_reduction=tax_red,
-                adjusted_gross=adjusted_gross,
-                adjusted_net=adjusted_net,
-                adjusted_tax=adjusted_tax,
+            net_red = _net_reduction_cents(gross_red, rate)
+            tax_red = max(0, gross_red - net_red)
+
+        original_tax = max(0, gross - net)
+        # Row order follows the OrderDiscountBucketResult amount fields.
+        rows.append(
+            (
+                gross,
+                net,
+                original_tax,
+                gross_red,
+                net_red,
+                tax_red,
+                max(0, gross - gross_red),
+                max(0, net - net_red),
+                max(0, original_tax - tax_red),
             )
         )
 
     # ------------------------------------------------------------------
-    # Step 5: Aggregate totals.
+    # Step 5: Aggregate totals and convert back to Decimal once.
     # ------------------------------------------------------------------
-    def _sum(attr: str) -> Decimal:
-        return _q(sum(getattr(rb, attr) for rb in result_buckets))
-
+    totals = [sum(column) for column in zip(*rows)]
     return OrderDiscountAllocationResult(
-        buckets=result_buckets,
-        total_original_gross=_sum("original_gross"),
-        total_original_net=_sum("original_net"),
-        total_original_tax=_sum("original_tax"),
-        total_gross_reduction=_sum("gross_reduction"),
-        total_net_reduction=_sum("net_reduction"),
-        total_tax_reduction=_sum("tax_reduction"),
-        total_adjusted_gross=_sum("adjusted_gross"),
-        total_adjusted_net=_sum("adjusted_net"),
-        total_adjusted_tax=_sum("adjusted_tax"),
-        currency=currency,
+        [
+            OrderDiscountBucketResult(rate, *map(_from_cents, row))
+            for rate, row in zip(rates, rows)
+        ],
+        *map(_from_cents, totals),
+        currency=discount.currency,
     )
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def allocate_order_discount(
+    *,
+    lines: Sequence[OrderLineInput],
+    discount: OrderDiscountInput,
+) -> OrderDiscountAllocationResult:
+    """Allocate an order-level discount proportionally across VAT-rate buckets.
+
+    Parameters
+    ----------
+    lines:
+        Sequence of priced order lines (post-line-promotion).  May share the
+        same ``tax_rate``; they will be grouped into buckets.  All lines must
+        share the same ``currency``.
+    discount:
+        The order-level discount to allocate.
+
+    Returns
+    -------
+    OrderDiscountAllocationResult
+        Complete per-bucket and aggregate breakdown.
+
+    Raises
+    ------
+    ValueError
+        If ``lines`` is empty or currencies are inconsistent.
+    ValueError
+        If ``discount.type`` is not ``"PERCENT"`` or ``"FIXED"``.
+    """
+    _validate(lines, discount)
+    return _allocate_cents(lines, discount)
+
+
+def allocate_order_discounts(
+    orders: Iterable[Tuple[Sequence[OrderLineInput], OrderDiscountInput]],
+) -> List[OrderDiscountAllocationResult]:
+    """Allocate order-level discounts for many orders in one call.
+
+    Equivalent to calling :func:`allocate_order_discount` per order, in
+    order, but every input is validated before any allocation runs and the
+    per-rate net multipliers are shared across the batch.  Intended for
+    list endpoints and backfills.
+
+    Parameters
+    ----------
+    orders:
+        ``(lines, discount)`` pairs, one per order.
+
+    Returns
+    -------
+    list[OrderDiscountAllocationResult]
+        One result per input pair, in input order.
+
+    Raises
+    ------
+    ValueError
+        As :func:`allocate_order_discount`, for the first invalid pair.
+    """
+    orders = list(orders)
+    for lines, discount in orders:
+        _validate(lines, discount)
+    return [_allocate_cents(lines, discount) for lines, discount in orders]
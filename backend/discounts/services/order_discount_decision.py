@@ -48,21 +48,40 @@ Types of transition points considered
   equals ``FIXED.value + 0.01``, so PERCENT strictly wins under the
   benefit tiebreaker.
 
+Compiled decision table
+-----------------------
+The transition points and the winner at each of them depend only on the
+candidate promotions, not on the cart.  They are compiled once per
+``PromotionSnapshot`` (and per claimed campaign promotion) into an
+:class:`OrderDiscountDecisionTable`: a sorted breakpoint array, the winner
+at every breakpoint and, per candidate current winner, the index of the
+next breakpoint that is a meaningful upgrade.  A request then answers
+``next_upgrade`` with one binary search on ``cart_gross``.
+
+The same table serves threshold-reward progress and the current AUTO_APPLY
+winner: a binary search on the threshold-sorted promotions yields the
+eligible set.  Between breakpoints the winner is *not* strictly constant —
+cent rounding makes PERCENT/PERCENT and PERCENT/FIXED benefits tie at some
+cart values, and ties fall back to priority — so the benefit key is still
+evaluated on the eligible promotions to stay exact.
+
 Public API
 ----------
 - :func:`resolve_order_discount_decision_state` — main entry point.
+- :func:`get_order_discount_decision_table` — compiled table for the
+  current promotion snapshot.
 """
 
 from __future__ import annotations
 
+import threading
+from bisect import bisect_right
 from dataclasses import dataclass
 from decimal import Decimal, ROUND_CEILING, ROUND_HALF_UP
-from typing import Optional
-
-from django.db.models import Q
-from django.utils import timezone
+from typing import Dict, Optional, Tuple
 
-from discounts.models import AcquisitionMode, OrderPromotion, PromotionType
+from discounts.models import OrderPromotion, PromotionType
+from discounts.services.promotion_snapshot import PromotionSnapshot, get_promotion_snapshot
 
 
 _QUANTIZE = Decimal("0.01")
@@ -124,28 +143,6 @@ class OrderDiscountDecisionState:
 # ---------------------------------------------------------------------------
 
 
-def _get_all_active_auto_apply_promotions() -> list:
-    """Return all active AUTO_APPLY ``OrderPromotion`` objects.
-
-    Unlike :func:`~discounts.services.auto_apply_resolver.resolve_all_eligible_auto_apply_promotions`,
-    this function deliberately ignores ``minimum_order_value`` so the
-    decision engine can analyse future transitions to promotions that are
-    not yet eligible at the current cart value.
-    """
-    now = timezone.now()
-    return list(
-        OrderPromotion.objects.filter(
-            acquisition_mode=AcquisitionMode.AUTO_APPLY,
-            is_active=True,
-        )
-        .filter(
-            Q(active_from__isnull=True) | Q(active_from__lte=now),
-            Q(active_to__isnull=True) | Q(active_to__gte=now),
-        )
-        .order_by("-priority", "id")
-    )
-
-
 def _compute_gross_discount(promotion: "OrderPromotion", total_gross: Decimal) -> Decimal:
     """Return the gross discount a promotion would yield on *total_gross*.
 
@@ -273,6 +270,202 @@ def _collect_transition_points(
     return sorted(points)
 
 
+# ---------------------------------------------------------------------------
+# Compiled decision table
+# ---------------------------------------------------------------------------
+
+
+def _is_upgrade(
+    current: Optional["OrderPromotion"],
+    winner: Optional["OrderPromotion"],
+    point: Decimal,
+) -> bool:
+    """Whether *winner* at *point* is a meaningful upgrade over *current*."""
+    if winner is None:
+        return False
+    if current is None:
+        # Any winner is a meaningful upgrade over having nothing.
+        return True
+    return winner.id != current.id and _compute_gross_discount(
+        winner, point
+    ) > _compute_gross_discount(current, point)
+
+
+@dataclass(frozen=True)
+class OrderDiscountDecisionTable:
+    """Piecewise order-discount decision data for a fixed candidate set.
+
+    Built by :func:`compile_order_discount_decision_table`; immutable and
+    shared between requests.
+    """
+
+    candidates: Tuple[OrderPromotion, ...]
+    """Candidate promotions in snapshot order ``(-priority, id)``."""
+
+    points: Tuple[Decimal, ...]
+    """All transition points (thresholds and PERCENT/FIXED crossovers), ascending."""
+
+    winners: Tuple[Optional[OrderPromotion], ...]
+    """EXCLUSIVE winner at each of ``points``."""
+
+    next_upgrade_index: Dict[Optional[int], Tuple[int, ...]]
+    """
+    ``current winner id (None = no winner) → next[i]``: the first index
+    ``j >= i`` whose winner is a meaningful upgrade, or ``len(points)``.
+    """
+
+    thresholds: Tuple[Decimal, ...]
+    """``minimum_order_value`` of the threshold promotions, ascending."""
+
+    threshold_promotions: Tuple[OrderPromotion, ...]
+    """Threshold promotions aligned with ``thresholds`` (stable: snapshot order on ties)."""
+
+    unconditional: Tuple[OrderPromotion, ...]
+    """Candidates without ``minimum_order_value`` (always eligible)."""
+
+    def eligible(self, cart_gross: Decimal) -> list:
+        """Candidates eligible at *cart_gross* (``minimum_order_value <= cart_gross``)."""
+        unlocked = self.threshold_promotions[: bisect_right(self.thresholds, cart_gross)]
+        return list(self.unconditional) + list(unlocked)
+
+    def winner_at(self, cart_gross: Decimal) -> Optional["OrderPromotion"]:
+        """EXCLUSIVE winner at *cart_gross*, or ``None`` when nothing is eligible."""
+        return _pick_winner(self.eligible(cart_gross), cart_gross)
+
+    def next_upgrade(
+        self,
+        cart_gross: Decimal,
+        current_winner: Optional["OrderPromotion"],
+        currency: str,
+    ) -> Optional[OrderDiscountUpgrade]:
+        """Next meaningful winner transition above *cart_gross*, or ``None``."""
+        start = bisect_right(self.points, cart_gross)
+        key = None if current_winner is None else current_winner.id
+        table = self.next_upgrade_index.get(key)
+        if table is not None:
+            index = table[start]
+        else:
+            # Current winner outside the candidate set (not precompiled).
+            index = next(
+                (
+                    i
+                    for i in range(start, len(self.points))
+                    if _is_upgrade(current_winner, self.winners[i], self.points[i])
+                ),
+                len(self.points),
+            )
+        if index >= len(self.points):
+            return None
+        point = self.points[index]
+        return OrderDiscountUpgrade(
+            threshold=point,
+            remaining=(point - cart_gross).quantize(_QUANTIZE, ROUND_HALF_UP),
+            promotion_name=self.winners[index].name,
+            currency=currency,
+        )
+
+    def closest_locked_threshold(self, cart_gross: Decimal) -> Optional["OrderPromotion"]:
+        """Threshold promotion with the smallest ``minimum_order_value`` above *cart_gross*."""
+        index = bisect_right(self.thresholds, cart_gross)
+        if index >= len(self.thresholds):
+            return None
+        return self.threshold_promotions[index]
+
+
+def compile_order_discount_decision_table(candidates) -> OrderDiscountDecisionTable:
+    """Compile the decision table for *candidates* (eligibility not pre-filtered).
+
+    O(P²) transition points, each with an O(P) winner evaluation, plus one
+    next-upgrade array per candidate — paid once per promotion snapshot.
+    """
+    candidates = tuple(candidates)
+    # A floor below any cart value keeps every point; lookups select the
+    # points above the cart with a binary search.
+    points = tuple(_collect_transition_points(list(candidates), Decimal("-1")))
+    winners = tuple(
+        _pick_winner(
+            [
+                p
+                for p in candidates
+                if p.minimum_order_value is None or tp >= p.minimum_order_value
+            ],
+            tp,
+        )
+        for tp in points
+    )
+
+    next_upgrade_index: Dict[Optional[int], Tuple[int, ...]] = {}
+    for current in (None,) + candidates:
+        nxt = [len(points)] * (len(points) + 1)
+        for i in range(len(points) - 1, -1, -1):
+            nxt[i] = i if _is_upgrade(current, winners[i], points[i]) else nxt[i + 1]
+        next_upgrade_index[None if current is None else current.id] = tuple(nxt)
+
+    # sorted() is stable, so equal thresholds keep snapshot order.
+    threshold_promotions = tuple(
+        sorted(
+            (p for p in candidates if p.minimum_order_value is not None),
+            key=lambda p: p.minimum_order_value,
+        )
+    )
+    return OrderDiscountDecisionTable(
+        candidates=candidates,
+        points=points,
+        winners=winners,
+        next_upgrade_index=next_upgrade_index,
+        thresholds=tuple(p.minimum_order_value for p in threshold_promotions),
+        threshold_promotions=threshold_promotions,
+        unconditional=tuple(p for p in candidates if p.minimum_order_value is None),
+    )
+
+
+# Compiled tables for the most recent snapshot, keyed by the id of an extra
+# (campaign) candidate promotion; ``None`` is the AUTO_APPLY-only table.
+# Identity with the snapshot object ties the tables to its lifetime: a new
+# snapshot (version bump, daily rollover, TTL, or one built inside an atomic
+# block) gets freshly compiled tables.
+_MAX_TABLES_PER_SNAPSHOT = 64
+_table_lock = threading.Lock()
+_table_cache: Optional[Tuple[PromotionSnapshot, Dict[Optional[int], OrderDiscountDecisionTable]]] = None
+
+
+def get_order_discount_decision_table(
+    extra_promotion: Optional["OrderPromotion"] = None,
+) -> OrderDiscountDecisionTable:
+    """Return the compiled table for the current promotion snapshot.
+
+    Parameters
+    ----------
+    extra_promotion:
+        A claimed campaign promotion to include as an additional candidate,
+        or ``None`` for the AUTO_APPLY promotions only.
+    """
+    global _table_cache
+
+    snapshot = get_promotion_snapshot()
+    auto_apply = snapshot.auto_apply_order_promotions
+    key = None
+    if extra_promotion is not None and extra_promotion.id not in {p.id for p in auto_apply}:
+        key = extra_promotion.id
+
+    with _table_lock:
+        if _table_cache is None or _table_cache[0] is not snapshot:
+            _table_cache = (snapshot, {})
+        tables = _table_cache[1]
+        table = tables.get(key)
+    if table is not None:
+        return table
+
+    candidates = auto_apply if key is None else (extra_promotion,) + tuple(auto_apply)
+    table = compile_order_discount_decision_table(candidates)
+    with _table_lock:
+        if _table_cache is not None and _table_cache[0] is snapshot:
+            if len(_table_cache[1]) >= _MAX_TABLES_PER_SNAPSHOT:
+                _table_cache[1].clear()
+            _table_cache[1][key] = table
+    return table
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -318,68 +511,14 @@ def resolve_order_discount_decision_state(
         else:
             campaign_outcome = "SUPERSEDED"
 
-    # ── Build candidate pool for transition analysis ──────────────────────────
-    # Fetch all active AUTO_APPLY promotions regardless of minimum_order_value
-    # so that future threshold/crossover transitions are visible.
-    all_auto_apply = _get_all_active_auto_apply_promotions()
-
-    if campaign_offer_promotion is not None:
-        # Include the claimed offer as a candidate (it may improve at some
-        # threshold if it also has a minimum_order_value).
-        promo_ids = {p.id for p in all_auto_apply}
-        if campaign_offer_promotion.id not in promo_ids:
-            all_candidates = [campaign_offer_promotion] + all_auto_apply
-        else:
-            all_candidates = all_auto_apply
-    else:
-        all_candidates = all_auto_apply
-
     # ── Next upgrade ─────────────────────────────────────────────────────────
-    transition_points = (
-        _collect_transition_points(all_candidates, cart_gross)
-        if all_candidates
-        else []
-    )
-
-    next_upgrade: Optional[OrderDiscountUpgrade] = None
-
-    for tp in transition_points:
-        # Evaluate only promotions eligible at this transition point.
-        eligible_at_tp = [
-            p
-            for p in all_candidates
-            if p.minimum_order_value is None or tp >= p.minimum_order_value
-        ]
-        winner_at_tp = _pick_winner(eligible_at_tp, tp)
-
-        if winner_at_tp is None:
-            continue
-
-        if current_winner is None:
-            # Any winner at tp is a meaningful upgrade over having nothing.
-            next_upgrade = OrderDiscountUpgrade(
-                threshold=tp,
-                remaining=(tp - cart_gross).quantize(_QUANTIZE, ROUND_HALF_UP),
-                promotion_name=winner_at_tp.name,
-                currency=currency,
-            )
-            break
-
-        if winner_at_tp.id != current_winner.id:
-            # The winner changes — verify the new winner gives the customer
-            # strictly more benefit at this cart value.
-            current_benefit_at_tp = _compute_gross_discount(current_winner, tp)
-            new_benefit_at_tp = _compute_gross_discount(winner_at_tp, tp)
-            if new_benefit_at_tp > current_benefit_at_tp:
-                next_upgrade = OrderDiscountUpgrade(
-                    threshold=tp,
-                    remaining=(tp - cart_gross).quantize(_QUANTIZE, ROUND_HALF_UP),
-                    promotion_name=winner_at_tp.name,
-                    currency=currency,
-                )
-                break
+    # All active AUTO_APPLY promotions regardless of minimum_order_value (so
+    # future threshold/crossover transitions are visible), plus the claimed
+    # offer, which may improve at some threshold if it also has a
+    # minimum_order_value.  Compiled once per promotion snapshot.
+    table = get_order_discount_decision_table(campaign_offer_promotion)
 
     return OrderDiscountDecisionState(
         campaign_outcome=campaign_outcome,
-        next_upgrade=next_upgrade,
+        next_upgrade=table.next_upgrade(cart_gross, current_winner, currency),
     )
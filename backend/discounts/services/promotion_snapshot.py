@@ -0,0 +1,300 @@
+"""In-process promotion snapshot for the discount resolvers.
+
+Responsibility: hold the currently active promotion data in process memory
+so that steady-state catalogue and cart pricing does not query the
+promotion tables on every request.
+
+A snapshot contains:
+
+- every active, in-window line-level ``Promotion`` keyed by id,
+- the ``PromotionProduct`` / ``PromotionCategory`` targets of those
+  promotions as ``product_id → promotion ids`` and
+  ``category_id → promotion ids`` maps,
+- every active, in-window AUTO_APPLY ``OrderPromotion`` ordered by
+  ``(-priority, id)``.
+
+Invalidation
+------------
+A snapshot is valid while all of the following hold:
+
+1. **Version** — the promotion version counter stored in the Django cache
+   is unchanged.  ``discounts.signals`` bumps it on ``post_save`` /
+   ``post_delete`` of any promotion model, both immediately and again once
+   the surrounding transaction commits.  With a shared cache backend the
+   bump is visible to every worker process.
+2. **Date window** — the calendar day the snapshot was built for is still
+   today.  Promotion windows are day-granular, so the first request after
+   midnight rebuilds the snapshot (daily rollover).
+3. **TTL** — the snapshot is younger than ``PROMOTION_SNAPSHOT_TTL_SECONDS``
+   (default 60 s).  This is a safety net for writes that bypass model signals
+   (``QuerySet.update``, raw SQL) and for per-process cache backends.
+
+Snapshots built inside an ``atomic`` block are returned but never stored:
+they may contain uncommitted rows that a later rollback would discard.
+
+Content identity
+----------------
+The version counter only orders snapshots of one cache: with a per-process
+backend (LocMem) a promotion edited in another worker never bumps it here.
+Consumers that key stored results on the promotion state (the cart pricing
+cache, checkout pricing tokens) therefore also use
+``PromotionSnapshot.content_digest``, a hash of every row the snapshot
+holds.  A rebuild that loads different promotion data changes the digest
+whatever the version says.
+
+Usage
+-----
+    from discounts.services.promotion_snapshot import get_promotion_snapshot
+
+    snapshot = get_promotion_snapshot()
+    winner = snapshot.line_promotion_winner(
+        product_id=product.pk, category_id=product.category_id
+    )
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from functools import cached_property
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from discounts.models import (
+    AcquisitionMode,
+    OrderPromotion,
+    Promotion,
+    PromotionCategory,
+    PromotionProduct,
+)
+
+
+VERSION_CACHE_KEY = "discounts:promotion_snapshot:version"
+
+_DEFAULT_TTL_SECONDS = 60
+
+
+# ---------------------------------------------------------------------------
+# Snapshot type
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class PromotionSnapshot:
+    """Immutable view of the promotions active on ``as_of``.
+
+    Instances are shared between threads and requests; callers must treat
+    the contained model instances as read-only.
+    """
+
+    version: int
+    """Promotion version counter the snapshot was built for."""
+
+    as_of: date
+    """UTC date used for the line-level ``Promotion`` window filter."""
+
+    as_of_local: date
+    """Local date used for the ``OrderPromotion`` window filter."""
+
+    line_promotions: Dict[int, Promotion]
+    """Active, in-window line promotions keyed by id."""
+
+    product_targets: Dict[int, FrozenSet[int]]
+    """``product_id → ids of line promotions targeting that product``."""
+
+    category_targets: Dict[int, FrozenSet[int]]
+    """``category_id → ids of line promotions targeting that category``."""
+
+    auto_apply_order_promotions: Tuple[OrderPromotion, ...]
+    """Active, in-window AUTO_APPLY order promotions ordered by ``(-priority, id)``."""
+
+    def line_promotion_winner(
+        self,
+        *,
+        product_id: int,
+        category_id: Optional[int],
+    ) -> Optional[Promotion]:
+        """Return the winning line promotion for a product, or ``None``.
+
+        Same rule as the resolver's SQL path: highest ``priority`` wins,
+        lowest ``id`` breaks ties.
+        """
+        candidate_ids = self.product_targets.get(product_id, frozenset())
+        if category_id is not None:
+            candidate_ids = candidate_ids | self.category_targets.get(
+                category_id, frozenset()
+            )
+        if not candidate_ids:
+            return None
+        return min(
+            (self.line_promotions[pid] for pid in candidate_ids),
+            key=lambda p: (-p.priority, p.id),
+        )
+
+    @cached_property
+    def content_digest(self) -> str:
+        """SHA-256 of the promotion rows and targets in this snapshot.
+
+        Equal digests mean equal promotion data, independent of ``version``
+        and of the process that built the snapshot.
+        """
+        payload = repr(
+            (
+                [_row_values(self.line_promotions[pid]) for pid in sorted(self.line_promotions)],
+                sorted((k, sorted(v)) for k, v in self.product_targets.items()),
+                sorted((k, sorted(v)) for k, v in self.category_targets.items()),
+                [_row_values(p) for p in self.auto_apply_order_promotions],
+            )
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _row_values(instance) -> tuple:
+    return tuple(getattr(instance, f.attname) for f in instance._meta.concrete_fields)
+
+
+# ---------------------------------------------------------------------------
+# Version counter
+# ---------------------------------------------------------------------------
+
+
+def get_promotion_version() -> int:
+    """Return the current promotion version, initialising it when missing."""
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(VERSION_CACHE_KEY, 1, timeout=None)
+        version = cache.get(VERSION_CACHE_KEY, 1)
+    return version
+
+
+def bump_promotion_version() -> int:
+    """Increment the promotion version so every cached snapshot becomes stale."""
+    try:
+        return cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        # Key missing (first write or evicted) — start a fresh counter that
+        # cannot collide with a version a live snapshot was built for.
+        version = int(time.time())
+        cache.set(VERSION_CACHE_KEY, version, timeout=None)
+        return version
+
+
+# ---------------------------------------------------------------------------
+# Snapshot cache
+# ---------------------------------------------------------------------------
+
+
+_lock = threading.Lock()
+_cached: Optional[Tuple[PromotionSnapshot, float]] = None
+"""``(snapshot, expires_at)`` where ``expires_at`` is a ``time.monotonic()`` value."""
+
+
+def _ttl_seconds() -> float:
+    return getattr(settings, "PROMOTION_SNAPSHOT_TTL_SECONDS", _DEFAULT_TTL_SECONDS)
+
+
+def _build_snapshot(*, version: int, as_of: date, as_of_local: date) -> PromotionSnapshot:
+    """Load all active promotion data for the given dates (4 queries)."""
+    promotion_window_q = (
+        Q(promotion__is_active=True)
+        & (Q(promotion__active_from__isnull=True) | Q(promotion__active_from__lte=as_of))
+        & (Q(promotion__active_to__isnull=True) | Q(promotion__active_to__gte=as_of))
+    )
+
+    line_promotions = {
+        p.id: p
+        for p in Promotion.objects.filter(is_active=True).filter(
+            Q(active_from__isnull=True) | Q(active_from__lte=as_of),
+            Q(active_to__isnull=True) | Q(active_to__gte=as_of),
+        )
+    }
+
+    product_targets = defaultdict(set)
+    category_targets = defaultdict(set)
+    if line_promotions:
+        for product_id, promotion_id in PromotionProduct.objects.filter(
+            promotion_window_q
+        ).values_list("product_id", "promotion_id"):
+            product_targets[product_id].add(promotion_id)
+        for category_id, promotion_id in PromotionCategory.objects.filter(
+            promotion_window_q
+        ).values_list("category_id", "promotion_id"):
+            category_targets[category_id].add(promotion_id)
+
+    auto_apply = tuple(
+        OrderPromotion.objects.filter(
+            acquisition_mode=AcquisitionMode.AUTO_APPLY,
+            is_active=True,
+        )
+        .filter(
+            Q(active_from__isnull=True) | Q(active_from__lte=as_of_local),
+            Q(active_to__isnull=True) | Q(active_to__gte=as_of_local),
+        )
+        .order_by("-priority", "id")
+    )
+
+    return PromotionSnapshot(
+        version=version,
+        as_of=as_of,
+        as_of_local=as_of_local,
+        line_promotions=line_promotions,
+        product_targets={k: frozenset(v) for k, v in product_targets.items()},
+        category_targets={k: frozenset(v) for k, v in category_targets.items()},
+        auto_apply_order_promotions=auto_apply,
+    )
+
+
+def get_promotion_snapshot() -> PromotionSnapshot:
+    """Return a valid promotion snapshot, rebuilding it when stale.
+
+    The version is read *before* the data is loaded, so a concurrent bump
+    can only make the stored snapshot fresher than its version claims —
+    never staler.
+    """
+    global _cached
+
+    version = get_promotion_version()
+    current = timezone.now()
+    as_of = current.date()
+    as_of_local = timezone.localdate(current)
+
+    cached = _cached
+    if cached is not None:
+        snapshot, expires_at = cached
+        if (
+            snapshot.version == version
+            and snapshot.as_of == as_of
+            and snapshot.as_of_local == as_of_local
+            and time.monotonic() < expires_at
+        ):
+            return snapshot
+
+    snapshot = _build_snapshot(version=version, as_of=as_of, as_of_local=as_of_local)
+
+    # Never publish a snapshot that may contain uncommitted rows.
+    if not connection.in_atomic_block:
+        with _lock:
+            _cached = (snapshot, time.monotonic() + _ttl_seconds())
+    return snapshot
+
+
+def invalidate_promotion_snapshot() -> None:
+    """Bump the version and drop this process's snapshot.
+
+    Intended for writes that bypass model signals (``QuerySet.update``,
+    data migrations, test fixtures).
+    """
+    global _cached
+
+    bump_promotion_version()
+    with _lock:
+        _cached = None
@@ -0,0 +1,75 @@
+"""Signal handlers keeping the promotion snapshot in sync with the database.
+
+Any save or delete of a promotion model bumps the promotion version so that
+:func:`~discounts.services.promotion_snapshot.get_promotion_snapshot`
+rebuilds on next access.  The version is bumped twice: immediately, so the
+writing transaction sees its own changes, and again on commit, so that a
+snapshot another worker built from pre-commit data in between is discarded.
+
+Line-promotion writes also re-price the ``ProductEffectivePrice`` rows of
+the affected products (see ``products.services.effective_price``).  The
+affected ids are collected at write time — a deleted target row can no
+longer be queried later — and re-priced in the same on-commit callback as
+the second version bump, when the snapshot reflects the committed change.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from discounts.models import (
+    OrderPromotion,
+    Promotion,
+    PromotionCategory,
+    PromotionProduct,
+)
+from discounts.services.promotion_snapshot import bump_promotion_version
+from products.models import Product
+from products.services.effective_price import (
+    product_ids_for_promotions,
+    refresh_effective_prices,
+)
+
+_SNAPSHOT_MODELS = (Promotion, PromotionProduct, PromotionCategory, OrderPromotion)
+
+
+def _affected_product_ids(instance) -> list[int]:
+    """Ids of products whose effective price may change with *instance*."""
+    if isinstance(instance, Promotion):
+        return product_ids_for_promotions([instance.pk])
+    if isinstance(instance, PromotionProduct):
+        return [instance.product_id]
+    if isinstance(instance, PromotionCategory):
+        return list(
+            Product.objects.filter(category_id=instance.category_id).values_list(
+                "id", flat=True
+            )
+        )
+    return []
+
+
+def bump_promotion_version_on_change(sender, instance, **kwargs):
+    bump_promotion_version()
+
+    product_ids = _affected_product_ids(instance)
+    if not product_ids:
+        transaction.on_commit(bump_promotion_version)
+        return
+
+    def _on_commit():
+        bump_promotion_version()
+        refresh_effective_prices(product_ids)
+
+    transaction.on_commit(_on_commit)
+
+
+for _model in _SNAPSHOT_MODELS:
+    post_save.connect(
+        bump_promotion_version_on_change,
+        sender=_model,
+        dispatch_uid=f"promotion_snapshot_post_save_{_model.__name__}",
+    )
+    post_delete.connect(
+        bump_promotion_version_on_change,
+        sender=_model,
+        dispatch_uid=f"promotion_snapshot_post_delete_{_model.__name__}",
+    )
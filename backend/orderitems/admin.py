@@ -4,6 +4,7 @@ from django.utils.html import format_html
 
 from .models import OrderItem
 from orders.models import Order
+from orders.services.vat_breakdown import compute_order_vat_breakdown
 from shipping.services.fulfillment import OrderFulfillmentService
 
 
@@ -258,6 +259,7 @@ class OrderWithItemsAdmin(admin.ModelAdmin):
     )
     readonly_fields = (
         "created_at",
+        "vat_breakdown",
         "current_shipment_status",
         "current_shipping_method",
         "current_shipping_provider",
@@ -271,6 +273,15 @@ class OrderWithItemsAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         return super().get_queryset(request).select_related("user").prefetch_related("shipments")
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # vat_breakdown is a snapshot of the items and order discount; keep
+        # it in step with whatever was edited here.
+        if form.has_changed() or any(formset.has_changed() for formset in formsets):
+            order = form.instance
+            order.vat_breakdown = compute_order_vat_breakdown(order)
+            order.save(update_fields=["vat_breakdown"])
+
     @admin.action(description="Create missing shipment")
     def create_missing_shipment(self, request, queryset):
         self._run_bulk_action(
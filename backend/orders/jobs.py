@@ -5,6 +5,7 @@ command.  All business logic lives in the management command / service layer,
 not here.
 """
 
+from django.conf import settings
 from django.core.management import call_command
 
 
@@ -20,7 +21,52 @@ def run_overdue_reservation_expiration() -> None:
     * Emits audit events for both the reservation batch and the order, giving
       a traceable hook for future notification policies.
 
+    Work is done in chunks of ``OVERDUE_RESERVATIONS_EXPIRY_BATCH_SIZE``
+    orders, one transaction each; orders locked elsewhere are skipped until
+    the next run.  With more than one shard (``OVERDUE_RESERVATIONS_EXPIRY_SHARDS``,
+    one per worker by default) the command only enqueues
+    :func:`run_overdue_reservation_expiry_shard` tasks and returns.  Only
+    this job fans out by default; a manual run of the command sweeps inline
+    unless it is given ``--shards``.
+
     Intended to be invoked by the django-q2 scheduler; safe to call directly
     in tests or from the REPL.
     """
-    call_command("expire_overdue_reservations")
+    shards = getattr(settings, "OVERDUE_RESERVATIONS_EXPIRY_SHARDS", 0) or (
+        settings.Q_CLUSTER.get("workers", 1)
+    )
+    call_command("expire_overdue_reservations", shards=shards)
+
+
+def run_overdue_reservation_expiry_shard(
+    *,
+    first_order_id: int,
+    last_order_id: int,
+    as_of,
+    batch_size=None,
+    shard: int = 0,
+    shards: int = 1,
+) -> dict:
+    """Expire overdue reservations of orders in one id range.
+
+    Enqueued by ``expire_overdue_reservations`` when it fans out; ``shard``
+    and ``shards`` identify the task within its run (the hook reads
+    ``shards`` from the task kwargs).  The returned report is stored as the
+    task result.
+    """
+    from orders.services.reservation_expiry_shards import run_expiry_shard  # noqa: PLC0415
+
+    report = run_expiry_shard(
+        first_order_id=first_order_id,
+        last_order_id=last_order_id,
+        as_of=as_of,
+        batch_size=batch_size,
+    )
+    return {**report, "shard": shard, "shards": shards}
+
+
+def on_overdue_reservation_expiry_shard_done(task) -> None:
+    """Django-Q hook of every shard task: summarize the run after the last one."""
+    from orders.services.reservation_expiry_shards import summarize_expiry_run  # noqa: PLC0415
+
+    summarize_expiry_run(task.group, task.kwargs["shards"])
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.services.vat_breakdown import (
+    backfill_order_vat_breakdowns,
+    count_orders_missing_vat_breakdown,
+)
+
+
+class Command(BaseCommand):
+    help = "Store the VAT breakdown snapshot on orders created before it was persisted."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Orders loaded and updated per batch (default: 500).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            help="Do not write anything; only print how many orders would be backfilled.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        if options.get("dry_run"):
+            missing = count_orders_missing_vat_breakdown()
+            self.stdout.write(f"Would backfill {missing} orders.")
+            return
+
+        written = backfill_order_vat_breakdowns(batch_size=batch_size)
+        self.stdout.write(f"Backfilled VAT breakdown on {written} orders.")
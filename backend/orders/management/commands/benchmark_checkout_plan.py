@@ -0,0 +1,163 @@
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from carts.models import Cart, CartItem
+from carts.services.pricing import get_cart_pricing_with_order_discount
+from orderitems.models import OrderItem
+from orders.models import Order
+from orders.services.order_plan import (
+    ORDER_TOTAL_FIELDS,
+    build_order_plan,
+    cart_fingerprint,
+)
+from products.models import Product, TaxClass
+
+SLUG_PREFIX = "bench-checkout-"
+TAX_CLASS_CODE = "bench-checkout"
+
+DEFAULT_SIZES = [1, 20, 100]
+
+_ORDER_FIELDS = {
+    "customer_email": "bench@example.com",
+    "shipping_provider_code": "MOCK",
+    "shipping_service_code": "standard",
+    "shipping_method_name": "Standard",
+    "shipping_first_name": "Bench",
+    "shipping_last_name": "Customer",
+    "shipping_address_line1": "Main Street 1",
+    "shipping_city": "City",
+    "shipping_postal_code": "00000",
+    "shipping_country": "US",
+    "shipping_phone": "+10000000000",
+}
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _seed_cart(size: int, tax_class: TaxClass) -> Cart:
+    products = Product.objects.bulk_create(
+        Product(
+            name=f"Bench checkout product {size}-{i}",
+            slug=f"{SLUG_PREFIX}{size}-{i}",
+            price=Decimal("10.00") + i,
+            price_net_amount=Decimal("10.00") + i,
+            currency="EUR",
+            tax_class=tax_class,
+            stock_quantity=1000,
+        )
+        for i in range(size)
+    )
+    cart = Cart.objects.create(status=Cart.Status.ACTIVE)
+    CartItem.objects.bulk_create(
+        CartItem(
+            cart=cart,
+            product=product,
+            quantity=1 + i % 3,
+            price_at_add_time=product.price,
+        )
+        for i, product in enumerate(products)
+    )
+    return cart
+
+
+def _per_line_checkout(cart: Cart) -> None:
+    """Previous shape: price, then insert items one by one, then update totals."""
+    Cart.objects.select_for_update().get(pk=cart.pk)
+    cart.items.exists()
+    plan = build_order_plan(get_cart_pricing_with_order_discount(cart))
+    order = Order(**_ORDER_FIELDS)
+    order.save()
+    for line in plan.lines:
+        line.to_order_item(order).save()
+    plan.apply_totals(order)
+    order.save(update_fields=list(ORDER_TOTAL_FIELDS))
+
+
+def _planned_checkout(cart: Cart, plan) -> None:
+    """Current shape: verify fingerprint, insert order with totals, bulk insert items."""
+    Cart.objects.select_for_update().get(pk=cart.pk)
+    if cart_fingerprint(cart) != plan.cart_fingerprint:
+        raise RuntimeError("Benchmark cart changed unexpectedly.")
+    order = Order(**_ORDER_FIELDS)
+    plan.apply_totals(order)
+    order.save()
+    OrderItem.objects.bulk_create(plan.order_items(order))
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the checkout critical section (time the cart row lock is "
+        "held) for per-line OrderItem inserts versus a precomputed order plan "
+        "persisted with bulk_create."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            type=int,
+            action="append",
+            dest="sizes",
+            help="Cart line count to benchmark (repeatable; default: 1, 20, 100).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Timed runs per variant and size (default: 20).",
+        )
+
+    def _time_locked(self, fn, repeat: int) -> list[float]:
+        timings = []
+        for _ in range(repeat):
+            try:
+                with transaction.atomic():
+                    started = time.perf_counter()
+                    fn()
+                    timings.append((time.perf_counter() - started) * 1000)
+                    raise _Rollback()
+            except _Rollback:
+                pass
+        return timings
+
+    def handle(self, *args, **options):
+        sizes = options["sizes"] or DEFAULT_SIZES
+        repeat = options["repeat"]
+
+        tax_class, _ = TaxClass.objects.get_or_create(
+            code=TAX_CLASS_CODE,
+            defaults={"name": "Bench checkout", "rate": Decimal("21")},
+        )
+        carts = []
+        try:
+            for size in sizes:
+                cart = _seed_cart(size, tax_class)
+                carts.append(cart)
+
+                per_line = self._time_locked(lambda: _per_line_checkout(cart), repeat)
+
+                prep = []
+                plans = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    plans.append(build_order_plan(get_cart_pricing_with_order_discount(cart)))
+                    prep.append((time.perf_counter() - started) * 1000)
+                plan_iter = iter(plans)
+                planned = self._time_locked(
+                    lambda: _planned_checkout(cart, next(plan_iter)), repeat
+                )
+
+                self.stdout.write(
+                    f"lines={size:4} per-line locked={statistics.median(per_line):8.2f}ms "
+                    f"plan locked={statistics.median(planned):8.2f}ms "
+                    f"(plan built unlocked in {statistics.median(prep):8.2f}ms)"
+                )
+        finally:
+            Cart.objects.filter(pk__in=[c.pk for c in carts]).delete()
+            Product.objects.filter(slug__startswith=SLUG_PREFIX).delete()
+            tax_class.delete()
@@ -3,9 +3,10 @@ from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
 from orders.services.inventory_reservation_service import (
-    expire_overdue_reservations,
+    sweep_overdue_reservations,
     count_overdue_reservations,
 )
+from orders.services.reservation_expiry_shards import fan_out_overdue_reservation_expiry
 
 
 class Command(BaseCommand):
@@ -24,6 +25,21 @@ class Command(BaseCommand):
             dest="dry_run",
             help="Do not perform any updates; only print how many reservations would be expired.",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            dest="batch_size",
+            help="Orders expired per transaction. "
+                 "Defaults to settings.OVERDUE_RESERVATIONS_EXPIRY_BATCH_SIZE.",
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            dest="shards",
+            help="Enqueue this many Django-Q shard tasks instead of sweeping inline "
+                 "(1 = inline). Defaults to 1; the scheduled job passes "
+                 "settings.OVERDUE_RESERVATIONS_EXPIRY_SHARDS.",
+        )
 
     def handle(self, *args, **options):
         as_of_raw = options.get("as_of")
@@ -36,10 +52,47 @@ class Command(BaseCommand):
         else:
             as_of = timezone.now()
 
+        batch_size = options.get("batch_size")
+        if batch_size is not None and batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        shards = options.get("shards")
+        if shards is None:
+            shards = 1
+        elif shards < 1:
+            raise CommandError("--shards must be a positive integer.")
+
         if options.get("dry_run"):
             would_expire = count_overdue_reservations(now=as_of)
             self.stdout.write(f"Would expire {would_expire} reservations.")
             return
 
-        expired_count = expire_overdue_reservations(now=as_of)
-        self.stdout.write(f"Expired {expired_count} reservations.")
+        if shards > 1:
+            run = fan_out_overdue_reservation_expiry(
+                shards=shards, now=as_of, batch_size=batch_size
+            )
+            if run.shards:
+                self.stdout.write(
+                    f"Enqueued {run.shards} shards for {run.orders} orders (run {run.run_id})."
+                )
+            else:
+                self.stdout.write("No overdue reservations.")
+            return
+
+        def progress(report):
+            if options["verbosity"] >= 2:
+                self.stdout.write(
+                    f"Chunk {report.chunks}: {report.expired_reservations} reservations, "
+                    f"{report.cancelled_orders} orders so far."
+                )
+
+        report = sweep_overdue_reservations(
+            now=as_of, batch_size=batch_size, on_progress=progress
+        )
+        self.stdout.write(f"Expired {report.expired_reservations} reservations.")
+        self.stdout.write(
+            f"Cancelled {report.cancelled_orders} orders in {report.chunks} chunks "
+            f"({report.elapsed_seconds:.2f}s, "
+            f"{report.reservations_per_second:.1f} reservations/s); "
+            f"{report.remaining} overdue reservations remaining."
+        )
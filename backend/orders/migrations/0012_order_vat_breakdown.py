@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0011_alter_order_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="vat_breakdown",
+            field=models.JSONField(
+                blank=True,
+                help_text="VAT breakdown snapshot: [{tax_rate, tax_base, vat_amount, total_incl_vat}] after any order-level discount. Null when not yet computed.",
+                null=True,
+            ),
+        ),
+    ]
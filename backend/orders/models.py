@@ -190,6 +190,17 @@ class Order(models.Model):
         blank=True,
         help_text="ISO 4217 currency code for all monetary snapshot fields on this order.",
     )
+    # VAT-rate rows exactly as returned by the order API, computed once at
+    # checkout (orders.services.vat_breakdown).  Null for orders created
+    # before the column existed until backfill_order_vat_breakdown runs.
+    vat_breakdown = models.JSONField(
+        null=True,
+        blank=True,
+        help_text=(
+            "VAT breakdown snapshot: [{tax_rate, tax_base, vat_amount, total_incl_vat}] "
+            "after any order-level discount. Null when not yet computed."
+        ),
+    )
 
     # ------------------------------------------------------------------
     # Supplier snapshot fields — persisted at order creation time.
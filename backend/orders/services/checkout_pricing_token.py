@@ -0,0 +1,127 @@
+"""Signed checkout pricing token — preflight pricing reused by checkout.
+
+The checkout flow prices the cart twice: ``GET /cart/checkout/preflight/``
+prices it to detect price changes, and ``POST /cart/checkout/`` prices it
+again to build the order.  The cart pricing cache
+(``carts.services.pricing_cache``) removes the second run only when both
+requests hit the same cache.
+
+Preflight therefore also returns a *pricing token*: the checkout
+:class:`~orders.services.order_plan.OrderPlan` built from its pricing, the
+price-change payload it reported, the cart id and the pricing input
+fingerprint (``cart_pricing_fingerprint``), signed with
+``django.core.signing`` and valid for
+``CHECKOUT_PRICING_TOKEN_MAX_AGE_SECONDS``.
+
+When checkout receives the token back it recomputes the fingerprint (one
+query).  If the fingerprint is unchanged it uses the plan from the token and
+skips pricing entirely.  An invalid, expired or stale token is ignored and
+checkout prices the cart as before.
+
+The fingerprint covers two kinds of promotion input:
+
+- Line-level and AUTO_APPLY promotions come from the promotion snapshot's
+  ``content_digest``, not just its per-process version counter.  A token
+  is accepted only while the checkout worker's snapshot holds the same
+  promotion data the preflight was priced from, i.e. the data checkout
+  would price from without a token.  Like the pipeline itself, that
+  snapshot trails promotion edits made in other processes by up to
+  ``PROMOTION_SNAPSHOT_TTL_SECONDS``.
+- The claimed CAMPAIGN_APPLY offer and its promotion are read from the
+  database on every request.  Any edit to them rejects the token at once.
+
+Inputs the fingerprint does not cover (see ``carts.services.pricing_cache``)
+are bounded by the token age only.
+
+Usage
+-----
+    token = issue_checkout_pricing_token(
+        cart, fingerprint=fingerprint, cart_pricing=cart_pricing,
+        price_change=payload,
+    )
+    ...
+    snapshot = resolve_checkout_pricing_token(token, cart, offer=offer)
+    if snapshot is not None:
+        plan = snapshot.plan
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+from django.conf import settings
+from django.core import signing
+
+from orders.services.order_plan import OrderPlan, build_order_plan
+
+if TYPE_CHECKING:
+    from carts.models import Cart
+    from carts.services.pricing import CartTotalsResult
+
+_SALT = "orders.checkout_pricing_token"
+_DEFAULT_MAX_AGE_SECONDS = 600
+
+
+@dataclass(frozen=True)
+class CheckoutPricingSnapshot:
+    """Pricing carried by a verified checkout pricing token."""
+
+    plan: OrderPlan
+    price_change: dict
+
+
+def issue_checkout_pricing_token(
+    cart: "Cart",
+    *,
+    fingerprint: str,
+    cart_pricing: "CartTotalsResult",
+    price_change: dict,
+) -> str:
+    """Return a signed token for *cart_pricing* computed from inputs *fingerprint*.
+
+    *fingerprint* must have been taken no later than *cart_pricing* was
+    computed (see ``get_fingerprinted_cart_pricing``).
+    """
+    payload = {
+        "cart": cart.pk,
+        "fingerprint": fingerprint,
+        "plan": build_order_plan(cart_pricing).to_payload(),
+        "price_change": price_change,
+    }
+    return signing.dumps(payload, salt=_SALT, compress=True)
+
+
+def resolve_checkout_pricing_token(
+    token: Optional[str], cart: "Cart", *, offer: Any = None
+) -> Optional[CheckoutPricingSnapshot]:
+    """Return the snapshot in *token* if it is still valid for *cart*, else ``None``.
+
+    A token is valid when its signature verifies, it is younger than
+    ``CHECKOUT_PRICING_TOKEN_MAX_AGE_SECONDS``, it was issued for *cart*,
+    and the cart's pricing inputs (including the claimed *offer*) have the
+    same fingerprint as when it was issued.
+    """
+    from carts.services.pricing_cache import (  # noqa: PLC0415
+        cart_pricing_fingerprint,
+    )
+
+    if not token or cart.pk is None:
+        return None
+    max_age = getattr(
+        settings, "CHECKOUT_PRICING_TOKEN_MAX_AGE_SECONDS", _DEFAULT_MAX_AGE_SECONDS
+    )
+    try:
+        payload = signing.loads(token, salt=_SALT, max_age=max_age)
+    except signing.BadSignature:
+        return None
+
+    if payload.get("cart") != cart.pk:
+        return None
+    fingerprint = cart_pricing_fingerprint(cart, offer=offer)
+    if payload.get("fingerprint") != fingerprint:
+        return None
+    return CheckoutPricingSnapshot(
+        plan=OrderPlan.from_payload(payload["plan"]),
+        price_change=payload["price_change"],
+    )
@@ -1,7 +1,11 @@
+import time
+from dataclasses import dataclass
 from datetime import timedelta
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
 from api.exceptions.orders import (
@@ -44,36 +48,16 @@ def reserve_for_checkout(*, order, items, ttl_minutes=None) -> None:
         if InventoryReservation.objects.filter(order=order).exists():
             raise ReservationAlreadyExistsException()
 
-        products = (
-            Product.objects.select_for_update()
-            .filter(id__in=product_ids)
-            .order_by("id")
-        )
-        product_map = {product.id: product for product in products}
-
-        active_reservations = (
-            InventoryReservation.objects.select_for_update()
-            .filter(
-                product_id__in=product_ids,
-                status=InventoryReservation.Status.ACTIVE,
-                expires_at__gt=now,
-            )
-            .order_by("product_id")
-        )
-        reserved_totals = {}
-        for reservation in active_reservations:
-            reserved_totals[reservation.product_id] = (
-                reserved_totals.get(reservation.product_id, 0)
-                + reservation.quantity
-            )
-
+        # Availability = stock_quantity - reserved_quantity, claimed with one
+        # conditional UPDATE per product (ascending id = lock order).  A
+        # failure rolls back the claims already made by the transaction.
         for product_id in product_ids:
-            product = product_map.get(product_id)
-            if product is None:
-                raise OutOfStockException()
-            available = product.stock_quantity - \
-                reserved_totals.get(product_id, 0)
-            if requested[product_id] > available:
+            quantity = requested[product_id]
+            claimed = Product.objects.filter(
+                id=product_id,
+                stock_quantity__gte=F("reserved_quantity") + quantity,
+            ).update(reserved_quantity=F("reserved_quantity") + quantity)
+            if not claimed and not _claim_with_overdue(product_id, quantity, now):
                 raise OutOfStockException()
 
         reservations = [
@@ -133,28 +117,17 @@ def commit_reservations_for_paid(*, order) -> None:
             )
 
         product_ids = sorted(order_quantities.keys())
-        products = (
-            Product.objects.select_for_update()
-            .filter(id__in=product_ids)
-            .order_by("id")
-        )
-        product_map = {product.id: product for product in products}
+        stock = _lock_stock(product_ids)
 
         now = timezone.now()
         for product_id in product_ids:
-            product = product_map.get(product_id)
-            if product is None:
-                _cancel_order_out_of_stock(order, active_reservations, now)
-                raise OutOfStockException()
             # Commit can race with other commits; enforce physical stock constraint only.
-            if product.stock_quantity < order_quantities[product_id]:
+            # A missing product counts as zero stock.
+            if stock.get(product_id, 0) < order_quantities[product_id]:
                 _cancel_order_out_of_stock(order, active_reservations, now)
                 raise OutOfStockException()
 
-        for product_id in product_ids:
-            product = product_map[product_id]
-            product.stock_quantity -= order_quantities[product_id]
-            product.save(update_fields=["stock_quantity"])
+        _commit_stock(order_quantities)
 
         for reservation in active_reservations:
             reservation.status = InventoryReservation.Status.COMMITTED
@@ -168,6 +141,112 @@ def commit_reservations_for_paid(*, order) -> None:
         order.save(update_fields=["status"])
 
 
+@dataclass(frozen=True)
+class PaidOrdersCommitResult:
+    """Outcome of commit_reservations_for_paid_orders (order ids)."""
+
+    committed: tuple
+    # Cancelled with OUT_OF_STOCK; their reservations were released.
+    out_of_stock: tuple
+    # Not CREATED/PAYMENT_FAILED (or already PAID) when locked; left untouched.
+    skipped: tuple
+    # Payable but without ACTIVE reservations; left untouched, like
+    # commit_reservations_for_paid does (the caller decides).
+    unreserved: tuple
+
+
+def commit_reservations_for_paid_orders(*, orders) -> PaidOrdersCommitResult:
+    """
+    Micro-batch form of commit_reservations_for_paid for bursts of payments.
+
+    All orders are committed in one transaction with one ordered lock pass:
+    the order rows are locked in id order and their status is re-read from
+    the locked rows (the passed-in instances may be stale), then ACTIVE
+    reservations are locked by (order_id, product_id), then every product
+    involved is locked once in id order.  Orders are checked against the
+    locked stock in ascending id order; an order that no longer fits is
+    cancelled as OUT_OF_STOCK (instead of raising, so the rest of the batch
+    still commits).  Stock, reservations and order statuses are written
+    with one statement each.
+
+    As in the single-order path, orders without ACTIVE reservations are not
+    marked PAID here.  The passed-in Order instances get their current
+    status.
+
+    Not called by the payment flow yet, which applies one provider result
+    per request through commit_reservations_for_paid; this is the entry
+    point for a worker that settles payments in batches.
+    """
+    orders = sorted(orders, key=lambda o: o.id)
+    payable_states = (_order_status_created_value(), _order_status_payment_failed_value())
+
+    with transaction.atomic():
+        locked_status = dict(
+            Order.objects.select_for_update()
+            .filter(id__in=[o.id for o in orders])
+            .order_by("id")
+            .values_list("id", "status")
+        )
+        for order in orders:
+            if order.id in locked_status:
+                order.status = locked_status[order.id]
+        payable = [o for o in orders if locked_status.get(o.id) in payable_states]
+        skipped = tuple(o.id for o in orders if locked_status.get(o.id) not in payable_states)
+
+        reservations = list(
+            InventoryReservation.objects.select_for_update()
+            .filter(
+                order_id__in=[o.id for o in payable],
+                status=InventoryReservation.Status.ACTIVE,
+            )
+            .order_by("order_id", "product_id")
+        )
+        by_order = {}
+        for reservation in reservations:
+            by_order.setdefault(reservation.order_id, []).append(reservation)
+        unreserved = tuple(o.id for o in payable if o.id not in by_order)
+        payable = [o for o in payable if o.id in by_order]
+
+        stock = _lock_stock(sorted({r.product_id for r in reservations}))
+
+        now = timezone.now()
+        committed, out_of_stock = [], []
+        quantities = {}
+        for order in payable:
+            order_reservations = by_order[order.id]
+            if all(stock.get(r.product_id, 0) >= r.quantity for r in order_reservations):
+                for r in order_reservations:
+                    stock[r.product_id] -= r.quantity
+                    quantities[r.product_id] = quantities.get(r.product_id, 0) + r.quantity
+                committed.append(order)
+            else:
+                out_of_stock.append(order)
+
+        _commit_stock(quantities)
+        committed_reservations = [r for o in committed for r in by_order[o.id]]
+        for reservation in committed_reservations:
+            reservation.status = InventoryReservation.Status.COMMITTED
+            reservation.committed_at = now
+        InventoryReservation.objects.bulk_update(
+            committed_reservations, ["status", "committed_at"]
+        )
+        Order.objects.filter(
+            id__in=[o.id for o in committed], status__in=payable_states
+        ).update(status=_order_status_paid_value())
+        for order in committed:
+            order.status = _order_status_paid_value()
+
+        for order in out_of_stock:
+            _cancel_order_out_of_stock(order, by_order[order.id], now)
+
+    return PaidOrdersCommitResult(
+        committed=tuple(o.id for o in committed),
+        out_of_stock=tuple(o.id for o in out_of_stock),
+        skipped=skipped,
+        unreserved=unreserved,
+    )
+
+
 def release_reservations(*, order, reason, cancelled_by, cancel_reason) -> None:
     """
     Release ACTIVE reservations for an order. Idempotent when no ACTIVE rows exist.
@@ -189,6 +268,7 @@ def release_reservations(*, order, reason, cancelled_by, cancel_reason) -> None:
                 active_reservations,
                 ["status", "released_at", "release_reason"],
             )
+            _return_reserved(active_reservations)
 
         if order.status == _order_status_created_value():
             # Domain semantics:
@@ -219,134 +299,328 @@ def release_reservations(*, order, reason, cancelled_by, cancel_reason) -> None:
                 )
 
 
-def expire_overdue_reservations(*, now=None) -> int:
+@dataclass(frozen=True)
+class ReservationExpiryReport:
+    """Outcome of sweep_overdue_reservations."""
+
+    expired_reservations: int
+    cancelled_orders: int
+    chunks: int
+    elapsed_seconds: float
+    # Overdue reservations still ACTIVE after the sweep (orders locked by a
+    # concurrent transaction are skipped, not waited for).
+    remaining: int
+
+    @property
+    def reservations_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.expired_reservations / self.elapsed_seconds
+
+
+def expire_overdue_reservations(*, now=None, batch_size=None) -> int:
     """
     Expire ACTIVE reservations past their TTL for orders in CREATED state.
     Returns the number of reservations transitioned to EXPIRED/RELEASED.
     """
-    current_time = now or timezone.now()
-    affected = 0
+    return sweep_overdue_reservations(now=now, batch_size=batch_size).expired_reservations
 
-    with transaction.atomic():
-        order_ids = (
-            InventoryReservation.objects.filter(
-                status=InventoryReservation.Status.ACTIVE,
-                expires_at__lt=current_time,
-            )
-            .values_list("order_id", flat=True)
-            .distinct()
-        )
 
-        for order_id in sorted(order_ids):
-            order_locked = (
-                Order.objects.select_for_update()
-                .filter(id=order_id)
-                .first()
-            )
-            if not order_locked:
-                continue
+def sweep_overdue_reservations(
+    *, now=None, batch_size=None, on_progress=None, order_id_range=None
+) -> ReservationExpiryReport:
+    """
+    Expire overdue reservations in chunks of at most ``batch_size`` orders.
 
-            if order_locked.status not in (
-                _order_status_created_value(),
-                _order_status_payment_failed_value(),
-            ):
-                continue
-
-            overdue_reservations = list(
-                InventoryReservation.objects.select_for_update()
-                .filter(
-                    order_id=order_id,
-                    status=InventoryReservation.Status.ACTIVE,
-                    expires_at__lt=current_time,
+    Each chunk is its own transaction: it locks the next orders (by id) with
+    overdue ACTIVE reservations using SKIP LOCKED, so orders held by a
+    checkout, webhook or payment commit are left for the next run instead of
+    blocking the sweep.  Per chunk, reservations, orders and product
+    counters are updated with one statement each (one per product for the
+    counters) and audit events are written with one INSERT.
+
+    ``on_progress`` is called with a ReservationExpiryReport after every
+    chunk (``remaining`` is -1 until the sweep finishes).
+
+    ``order_id_range`` restricts the sweep (and ``remaining``) to orders with
+    ``first_id <= id <= last_id``; used by the sharded expiry jobs.
+    """
+    current_time = now or timezone.now()
+    if batch_size is None:
+        batch_size = getattr(settings, "OVERDUE_RESERVATIONS_EXPIRY_BATCH_SIZE", 200)
+
+    started = time.monotonic()
+    expired = cancelled = chunks = 0
+    cursor = order_id_range[0] - 1 if order_id_range else 0
+    last_id = order_id_range[1] if order_id_range else None
+    while True:
+        with transaction.atomic():
+            chunk_expired, chunk_cancelled, cursor = _expire_overdue_chunk(
+                current_time, batch_size, cursor, last_id
+            )
+        if cursor is None:
+            break
+        chunks += 1
+        expired += chunk_expired
+        cancelled += chunk_cancelled
+        if on_progress is not None:
+            on_progress(
+                ReservationExpiryReport(
+                    expired_reservations=expired,
+                    cancelled_orders=cancelled,
+                    chunks=chunks,
+                    elapsed_seconds=time.monotonic() - started,
+                    remaining=-1,
                 )
-                .order_by("product_id")
             )
 
-            if not overdue_reservations:
-                continue
+    return ReservationExpiryReport(
+        expired_reservations=expired,
+        cancelled_orders=cancelled,
+        chunks=chunks,
+        elapsed_seconds=time.monotonic() - started,
+        remaining=count_overdue_reservations(
+            now=current_time, order_id_range=order_id_range
+        ),
+    )
 
-            for reservation in overdue_reservations:
-                reservation.status = InventoryReservation.Status.EXPIRED
-                # Treat EXPIRED as a release with PAYMENT_EXPIRED metadata (ADR-025 consistency).
-                reservation.released_at = current_time
-                reservation.release_reason = InventoryReservation.ReleaseReason.PAYMENT_EXPIRED
-            InventoryReservation.objects.bulk_update(
-                overdue_reservations,
-                ["status", "released_at", "release_reason"],
-            )
-            affected += len(overdue_reservations)
 
-            order_locked.status = _order_status_cancelled_value()
-            order_locked.cancel_reason = _order_cancel_reason_value(
-                "PAYMENT_EXPIRED"
-            )
-            order_locked.cancelled_by = _order_cancelled_by_value("SYSTEM")
-            order_locked.cancelled_at = current_time
-            order_locked.save(
-                update_fields=[
-                    "status",
-                    "cancel_reason",
-                    "cancelled_by",
-                    "cancelled_at",
-                ]
-            )
+def _expire_overdue_chunk(current_time, batch_size, cursor, last_id=None):
+    """
+    Expire one chunk of orders with cursor < id (<= last_id) inside the
+    caller's transaction.
 
-            AuditService.emit(
-                entity_type="inventory_reservation_batch",
-                entity_id=str(order_locked.id),
-                action=AuditActions.INVENTORY_RESERVATIONS_EXPIRED,
-                actor_type=AuditEvent.ActorType.SYSTEM,
-                metadata={
-                    "order_id": str(order_locked.id),
-                    "affected_reservations": len(overdue_reservations),
-                    "reservation_ids": [str(r.id) for r in overdue_reservations],
+    Returns ``(expired_reservations, cancelled_orders, next_cursor)``;
+    ``next_cursor`` is None when no order is left to look at.
+    """
+    overdue_order_ids = InventoryReservation.objects.filter(
+        status=InventoryReservation.Status.ACTIVE,
+        expires_at__lt=current_time,
+    ).values("order_id")
+    candidates = Order.objects.select_for_update(skip_locked=True)
+    if last_id is not None:
+        candidates = candidates.filter(id__lte=last_id)
+    orders = list(
+        candidates.filter(
+            id__gt=cursor,
+            id__in=overdue_order_ids,
+            status__in=(
+                _order_status_created_value(),
+                _order_status_payment_failed_value(),
+            ),
+        )
+        .order_by("id")
+        .only("id", "customer_email", "status")[:batch_size]
+    )
+    if not orders:
+        return 0, 0, None
+    order_ids = [order.id for order in orders]
+
+    overdue_reservations = list(
+        InventoryReservation.objects.select_for_update()
+        .filter(
+            order_id__in=order_ids,
+            status=InventoryReservation.Status.ACTIVE,
+            expires_at__lt=current_time,
+        )
+        .order_by("order_id", "product_id")
+    )
+    by_order = {}
+    for reservation in overdue_reservations:
+        by_order.setdefault(reservation.order_id, []).append(reservation)
+    # Reservations committed or released since the order query are gone.
+    orders = [order for order in orders if order.id in by_order]
+    if not orders:
+        return 0, 0, order_ids[-1]
+
+    # Treat EXPIRED as a release with PAYMENT_EXPIRED metadata (ADR-025 consistency).
+    InventoryReservation.objects.filter(
+        id__in=[r.id for r in overdue_reservations]
+    ).update(
+        status=InventoryReservation.Status.EXPIRED,
+        released_at=current_time,
+        release_reason=InventoryReservation.ReleaseReason.PAYMENT_EXPIRED,
+    )
+    _return_reserved(overdue_reservations)
+
+    cancel_reason = _order_cancel_reason_value("PAYMENT_EXPIRED")
+    Order.objects.filter(id__in=[order.id for order in orders]).update(
+        status=_order_status_cancelled_value(),
+        cancel_reason=cancel_reason,
+        cancelled_by=_order_cancelled_by_value("SYSTEM"),
+        cancelled_at=current_time,
+    )
+
+    events = []
+    for order in orders:
+        reservations = by_order[order.id]
+        events.append(
+            {
+                "entity_type": "inventory_reservation_batch",
+                "entity_id": str(order.id),
+                "action": AuditActions.INVENTORY_RESERVATIONS_EXPIRED,
+                "actor_type": AuditEvent.ActorType.SYSTEM,
+                "metadata": {
+                    "order_id": str(order.id),
+                    "affected_reservations": len(reservations),
+                    "reservation_ids": [str(r.id) for r in reservations],
                 },
-                fail_silently=True,
-            )
-            AuditService.emit(
-                entity_type="order",
-                entity_id=str(order_locked.id),
-                action=AuditActions.ORDER_CANCELLED,
-                actor_type=AuditEvent.ActorType.SYSTEM,
-                metadata={"cancel_reason": order_locked.cancel_reason},
-                fail_silently=True,
+            }
+        )
+        events.append(
+            {
+                "entity_type": "order",
+                "entity_id": str(order.id),
+                "action": AuditActions.ORDER_CANCELLED,
+                "actor_type": AuditEvent.ActorType.SYSTEM,
+                "metadata": {"cancel_reason": cancel_reason},
+            }
+        )
+    AuditService.emit_bulk(events, fail_silently=True)
+
+    for order in orders:
+        # Enqueue customer notification on commit so the email is only
+        # dispatched when the chunk transaction actually commits.
+        # Capture loop-local values explicitly to avoid late-binding issues.
+        transaction.on_commit(
+            lambda email=order.customer_email, oid=order.id: enqueue_best_effort(
+                "notifications.jobs.send_order_system_cancelled_notification",
+                recipient_email=email,
+                order_id=oid,
             )
+        )
 
-            # Enqueue customer notification on commit so the email is only
-            # dispatched when the cancellation transaction actually commits.
-            # Capture loop-local values explicitly to avoid late-binding issues.
-            _email = order_locked.customer_email
-            _order_id = order_locked.id
-            transaction.on_commit(
-                lambda email=_email, oid=_order_id: enqueue_best_effort(
-                    "notifications.jobs.send_order_system_cancelled_notification",
-                    recipient_email=email,
-                    order_id=oid,
-                )
-            )
+    return len(overdue_reservations), len(orders), order_ids[-1]
 
-    return affected
 
+def _overdue_reservations(current_time, order_id_range=None):
+    queryset = InventoryReservation.objects.filter(
+        status=InventoryReservation.Status.ACTIVE,
+        expires_at__lt=current_time,
+        order__status__in=[
+            _order_status_created_value(),
+            _order_status_payment_failed_value(),
+        ],
+    )
+    if order_id_range is not None:
+        queryset = queryset.filter(
+            order_id__gte=order_id_range[0], order_id__lte=order_id_range[1]
+        )
+    return queryset
 
-def count_overdue_reservations(*, now=None) -> int:
+
+def count_overdue_reservations(*, now=None, order_id_range=None) -> int:
     """
     Read-only helper for tooling (management command --dry-run).
 
     Counts how many ACTIVE reservations are currently overdue (expires_at < now)
-    for orders that are in CREATED or PAYMENT_FAILED state.
+    for orders that are in CREATED or PAYMENT_FAILED state, optionally only
+    for orders with ``first_id <= id <= last_id`` (``order_id_range``).
 
     Note: This function intentionally does not take locks and does not perform any updates,
     so the result is a best-effort snapshot under concurrent activity.
     """
-    current_time = now or timezone.now()
-    return InventoryReservation.objects.filter(
-        status=InventoryReservation.Status.ACTIVE,
-        expires_at__lt=current_time,
-        order__status__in=[
-            _order_status_created_value(),
-            _order_status_payment_failed_value(),
-        ],
-    ).count()
+    return _overdue_reservations(now or timezone.now(), order_id_range).count()
+
+
+def list_overdue_order_ids(*, now=None) -> list[int]:
+    """
+    Ids (ascending) of orders that count_overdue_reservations would count.
+
+    Used to partition the backlog into shards; like the count it takes no
+    locks, so it is a snapshot.
+    """
+    return list(
+        _overdue_reservations(now or timezone.now())
+        .order_by("order_id")
+        .values_list("order_id", flat=True)
+        .distinct()
+    )
+
+
+def _claim_with_overdue(product_id, quantity, now) -> bool:
+    """
+    Slow path of reserve_for_checkout when the counter says "not enough".
+
+    reserved_quantity still includes ACTIVE reservations past their TTL that
+    expire_overdue_reservations has not processed yet, but those do not count
+    against availability.  Lock the product row, add back the overdue
+    quantity and claim if that is enough.  Only runs for products that are
+    (nearly) sold out.
+    """
+    product = (
+        Product.objects.select_for_update()
+        .filter(id=product_id)
+        .values("stock_quantity", "reserved_quantity")
+        .first()
+    )
+    if product is None:
+        return False
+    # Locking read: sees expiries committed after this transaction started.
+    overdue = sum(
+        InventoryReservation.objects.select_for_update()
+        .filter(
+            product_id=product_id,
+            status=InventoryReservation.Status.ACTIVE,
+            expires_at__lte=now,
+        )
+        .values_list("quantity", flat=True)
+    )
+    available = product["stock_quantity"] - product["reserved_quantity"] + overdue
+    if quantity > available:
+        return False
+    Product.objects.filter(id=product_id).update(
+        reserved_quantity=F("reserved_quantity") + quantity
+    )
+    return True
+
+
+def _lock_stock(product_ids) -> dict:
+    """Lock the products (ascending id) and return {product_id: stock_quantity}."""
+    return dict(
+        Product.objects.select_for_update()
+        .filter(id__in=product_ids)
+        .order_by("id")
+        .values_list("id", "stock_quantity")
+    )
+
+
+def _commit_stock(quantities) -> None:
+    """
+    Move committed quantities out of stock_quantity and reserved_quantity
+    with a single UPDATE (a CASE over the product ids).  The caller has
+    locked the products and checked stock.
+    """
+    if not quantities:
+        return
+    committed = Case(
+        *[When(id=product_id, then=Value(quantity)) for product_id, quantity in quantities.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    Product.objects.filter(id__in=list(quantities)).update(
+        stock_quantity=F("stock_quantity") - committed,
+        reserved_quantity=Greatest(F("reserved_quantity") - committed, Value(0)),
+    )
+
+
+def _return_reserved(reservations) -> None:
+    """
+    Give the quantities of reservations leaving ACTIVE back to the
+    products' reserved_quantity counters (one UPDATE per product).
+    Clamped at zero for reservation rows written outside this service.
+    """
+    quantities = {}
+    for reservation in reservations:
+        quantities[reservation.product_id] = (
+            quantities.get(reservation.product_id, 0) + reservation.quantity
+        )
+    for product_id in sorted(quantities):
+        Product.objects.filter(id=product_id).update(
+            reserved_quantity=Greatest(
+                F("reserved_quantity") - quantities[product_id], Value(0)
+            )
+        )
 
 
 def _order_status_created_value():
@@ -392,6 +666,7 @@ def _cancel_order_out_of_stock(order, active_reservations, now):
         active_reservations,
         ["status", "released_at", "release_reason"],
     )
+    _return_reserved(active_reservations)
 
     order.status = _order_status_cancelled_value()
     order.cancel_reason = _order_cancel_reason_value("OUT_OF_STOCK")
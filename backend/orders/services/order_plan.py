@@ -0,0 +1,333 @@
+"""Checkout order plan — everything checkout writes, computed up front.
+
+``CartCheckoutView`` holds a row lock on the ``Cart`` (and, through
+``reserve_for_checkout``, on the ``Product`` rows) while it creates the
+order.  Pricing the cart and deriving every ``OrderItem`` snapshot value
+inside that critical section made lock hold time grow with the number of
+cart lines.
+
+An :class:`OrderPlan` is an immutable, fully computed description of the
+order: one :class:`OrderLinePlan` per cart line with every
+``*_at_order_time`` value already quantized, plus the order-level totals.
+It is built from a ``CartTotalsResult`` *before* the lock is taken.  Inside
+the critical section checkout only
+
+1. re-reads the cart lines (one query) and compares them with
+   :attr:`OrderPlan.cart_fingerprint` — the plan is rebuilt if the cart
+   changed in between,
+2. inserts the order with its totals already set (one write),
+3. inserts all items with one ``bulk_create``.
+
+Snapshot semantics are unchanged from the per-line implementation:
+
+- Migrated products take unit/line amounts from the pricing pipeline.
+- Unmigrated products fall back to ``price_at_add_time`` as the gross unit
+  price with no discount; their gross is added on top of the pipeline
+  subtotal.
+- When an order-level discount applies, subtotal and tax are the
+  post-allocation values.
+- The VAT breakdown is computed from the planned lines with the same rules
+  as for stored ``OrderItem`` rows and written with the totals.
+
+Usage
+-----
+    plan = build_order_plan(cart_pricing)
+    ...
+    with transaction.atomic():
+        if cart_fingerprint(cart) != plan.cart_fingerprint:
+            plan = build_order_plan(reprice(cart))
+        plan.apply_totals(order)
+        order.save()
+        OrderItem.objects.bulk_create(plan.order_items(order))
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, Optional
+
+from orderitems.models import OrderItem
+from orders.services.vat_breakdown import compute_vat_breakdown
+
+if TYPE_CHECKING:
+    from carts.models import Cart
+    from carts.services.pricing import CartLinePricingResult, CartTotalsResult
+    from orders.models import Order
+
+_CENT = Decimal("0.01")
+
+# Order fields written from the plan totals.
+ORDER_TOTAL_FIELDS = (
+    "subtotal_net",
+    "subtotal_gross",
+    "total_tax",
+    "total_discount",
+    "order_discount_gross",
+    "order_promotion_code",
+    "currency",
+    "vat_breakdown",
+)
+
+
+def _q(value: Decimal) -> Decimal:
+    return value.quantize(_CENT, rounding=ROUND_HALF_UP)
+
+
+@dataclass(frozen=True)
+class OrderLinePlan:
+    """Snapshot values of one ``OrderItem``, ready to insert."""
+
+    product_id: int
+    quantity: int
+    unit_price_at_order_time: Decimal
+    line_total_at_order_time: Decimal
+    applied_discount_type_at_order_time: Optional[str]
+    applied_discount_value_at_order_time: Optional[Decimal]
+    unit_price_net_at_order_time: Optional[Decimal]
+    unit_price_gross_at_order_time: Optional[Decimal]
+    tax_amount_at_order_time: Optional[Decimal]
+    tax_rate_at_order_time: Optional[Decimal]
+    promotion_code_at_order_time: Optional[str]
+    promotion_type_at_order_time: Optional[str]
+    promotion_discount_gross_at_order_time: Optional[Decimal]
+    product_name_at_order_time: str
+    line_total_net_at_order_time: Optional[Decimal]
+    # True for products without price_net_amount (legacy price fallback).
+    is_legacy: bool = False
+
+    @property
+    def line_total_gross_at_order_time(self) -> Decimal:
+        return self.line_total_at_order_time
+
+    def to_order_item(self, order: "Order") -> OrderItem:
+        return OrderItem(
+            order=order,
+            product_id=self.product_id,
+            quantity=self.quantity,
+            price_at_order_time=self.line_total_at_order_time,
+            unit_price_at_order_time=self.unit_price_at_order_time,
+            line_total_at_order_time=self.line_total_at_order_time,
+            applied_discount_type_at_order_time=self.applied_discount_type_at_order_time,
+            applied_discount_value_at_order_time=self.applied_discount_value_at_order_time,
+            unit_price_net_at_order_time=self.unit_price_net_at_order_time,
+            unit_price_gross_at_order_time=self.unit_price_gross_at_order_time,
+            tax_amount_at_order_time=self.tax_amount_at_order_time,
+            tax_rate_at_order_time=self.tax_rate_at_order_time,
+            promotion_code_at_order_time=self.promotion_code_at_order_time,
+            promotion_type_at_order_time=self.promotion_type_at_order_time,
+            promotion_discount_gross_at_order_time=self.promotion_discount_gross_at_order_time,
+            product_name_at_order_time=self.product_name_at_order_time,
+            line_total_net_at_order_time=self.line_total_net_at_order_time,
+            line_total_gross_at_order_time=self.line_total_at_order_time,
+        )
+
+
+@dataclass(frozen=True)
+class OrderPlan:
+    """Immutable result of :func:`build_order_plan`."""
+
+    lines: tuple[OrderLinePlan, ...]
+    subtotal_net: Decimal
+    subtotal_gross: Decimal
+    total_tax: Decimal
+    total_discount: Decimal
+    order_discount_gross: Optional[Decimal]
+    order_promotion_code: Optional[str]
+    currency: str
+    # Serialized VAT-rate rows; see orders.services.vat_breakdown.
+    vat_breakdown: list
+    # Cart lines the plan was built from; see cart_fingerprint().
+    cart_fingerprint: tuple
+
+    @property
+    def reservation_items(self) -> list[dict]:
+        """Items in the shape expected by ``reserve_for_checkout``."""
+        return [
+            {"product_id": line.product_id, "quantity": line.quantity}
+            for line in self.lines
+        ]
+
+    def apply_totals(self, order: "Order") -> None:
+        """Copy the order-level totals onto *order* (does not save)."""
+        for name in ORDER_TOTAL_FIELDS:
+            setattr(order, name, getattr(self, name))
+
+    def order_items(self, order: "Order") -> list[OrderItem]:
+        """Unsaved ``OrderItem`` rows for *order*, for one ``bulk_create``."""
+        return [line.to_order_item(order) for line in self.lines]
+
+    def to_payload(self) -> dict:
+        """JSON-safe representation; decimals become strings."""
+        data = _dump(self, exclude=("lines", "cart_fingerprint"))
+        data["lines"] = [_dump(line) for line in self.lines]
+        data["cart_fingerprint"] = [
+            [item_id, product_id, quantity, str(price)]
+            for item_id, product_id, quantity, price in self.cart_fingerprint
+        ]
+        return data
+
+    @classmethod
+    def from_payload(cls, data: dict) -> "OrderPlan":
+        """Inverse of :meth:`to_payload`."""
+        return cls(
+            **_load(cls, data, exclude=("lines", "cart_fingerprint")),
+            lines=tuple(OrderLinePlan(**_load(OrderLinePlan, line)) for line in data["lines"]),
+            cart_fingerprint=tuple(
+                (item_id, product_id, quantity, Decimal(price))
+                for item_id, product_id, quantity, price in data["cart_fingerprint"]
+            ),
+        )
+
+
+def _dump(obj, exclude: tuple[str, ...] = ()) -> dict:
+    data = {}
+    for f in fields(obj):
+        if f.name in exclude:
+            continue
+        value = getattr(obj, f.name)
+        data[f.name] = str(value) if isinstance(value, Decimal) else value
+    return data
+
+
+def _load(cls, data: dict, exclude: tuple[str, ...] = ()) -> dict:
+    # Annotations are strings here (``from __future__ import annotations``).
+    kwargs = {}
+    for f in fields(cls):
+        if f.name in exclude:
+            continue
+        value = data[f.name]
+        if value is not None and "Decimal" in f.type:
+            value = Decimal(value)
+        kwargs[f.name] = value
+    return kwargs
+
+
+# ---------------------------------------------------------------------------
+# Building
+# ---------------------------------------------------------------------------
+
+
+def cart_fingerprint(cart: "Cart") -> tuple:
+    """Return the current cart lines as ``((item_id, product_id, quantity, price_at_add_time), …)``.
+
+    Compared against :attr:`OrderPlan.cart_fingerprint` after the cart row is
+    locked.  An empty tuple means the cart has no items.
+    """
+    return tuple(
+        cart.items.order_by("id").values_list(
+            "id", "product_id", "quantity", "price_at_add_time"
+        )
+    )
+
+
+def _plan_line(line: "CartLinePricingResult") -> OrderLinePlan:
+    item = line.item
+    quantity = Decimal(str(line.quantity))
+    unit_pricing = line.unit_pricing
+
+    if unit_pricing is None:
+        # Unmigrated product (price_net_amount not set): price_at_add_time is
+        # the gross unit price, without any discount.
+        line_total = _q(item.price_at_add_time * quantity)
+        return OrderLinePlan(
+            product_id=item.product_id,
+            quantity=item.quantity,
+            unit_price_at_order_time=item.price_at_add_time,
+            line_total_at_order_time=line_total,
+            applied_discount_type_at_order_time=None,
+            applied_discount_value_at_order_time=None,
+            unit_price_net_at_order_time=None,
+            unit_price_gross_at_order_time=None,
+            tax_amount_at_order_time=None,
+            tax_rate_at_order_time=None,
+            promotion_code_at_order_time=None,
+            promotion_type_at_order_time=None,
+            promotion_discount_gross_at_order_time=None,
+            product_name_at_order_time=item.product.name,
+            line_total_net_at_order_time=None,
+            is_legacy=True,
+        )
+
+    discounted = unit_pricing.discounted
+    discount = unit_pricing.discount
+    unit_gross = discounted.gross.amount
+
+    discount_type = discount.promotion_type or None
+    if discount_type == "PERCENT":
+        discount_value = discount.percentage
+    elif discount_type == "FIXED":
+        discount_value = discount.amount_gross.amount
+    else:
+        discount_type = None
+        discount_value = None
+
+    return OrderLinePlan(
+        product_id=item.product_id,
+        quantity=item.quantity,
+        unit_price_at_order_time=unit_gross,
+        line_total_at_order_time=_q(unit_gross * quantity),
+        applied_discount_type_at_order_time=discount_type,
+        applied_discount_value_at_order_time=discount_value,
+        unit_price_net_at_order_time=discounted.net.amount,
+        unit_price_gross_at_order_time=unit_gross,
+        tax_amount_at_order_time=discounted.tax.amount,
+        tax_rate_at_order_time=discounted.tax_rate,
+        promotion_code_at_order_time=discount.promotion_code,
+        promotion_type_at_order_time=discount.promotion_type,
+        promotion_discount_gross_at_order_time=(
+            discount.amount_gross.amount if discount.promotion_type else None
+        ),
+        product_name_at_order_time=item.product.name,
+        line_total_net_at_order_time=_q(discounted.net.amount * quantity),
+    )
+
+
+def build_order_plan(cart_pricing: "CartTotalsResult") -> OrderPlan:
+    """Derive every value checkout persists from *cart_pricing*.
+
+    Performs no queries: products are pre-loaded on the cart lines by
+    ``get_cart_pricing``.
+    """
+    lines = tuple(_plan_line(line) for line in cart_pricing.items)
+    legacy_gross = sum(
+        (line.line_total_at_order_time for line in lines if line.is_legacy),
+        Decimal("0.00"),
+    )
+
+    od = cart_pricing.order_discount
+    if od is not None:
+        subtotal_gross = _q(od.total_gross_after.amount + legacy_gross)
+        total_tax = od.total_tax_after.amount
+        order_discount_gross = od.gross_reduction.amount
+        order_promotion_code = od.promotion_code
+    else:
+        subtotal_gross = _q(cart_pricing.subtotal_discounted.amount + legacy_gross)
+        total_tax = cart_pricing.total_tax.amount
+        order_discount_gross = None
+        order_promotion_code = None
+
+    return OrderPlan(
+        lines=lines,
+        vat_breakdown=compute_vat_breakdown(
+            lines, order_discount_gross=order_discount_gross, currency=cart_pricing.currency
+        ),
+        subtotal_net=_q(subtotal_gross - total_tax),
+        subtotal_gross=subtotal_gross,
+        total_tax=total_tax,
+        total_discount=_q(
+            cart_pricing.total_discount.amount + (order_discount_gross or Decimal("0"))
+        ),
+        order_discount_gross=order_discount_gross,
+        order_promotion_code=order_promotion_code,
+        currency=cart_pricing.currency,
+        cart_fingerprint=tuple(
+            (
+                line.item.pk,
+                line.item.product_id,
+                line.item.quantity,
+                line.item.price_at_add_time,
+            )
+            for line in sorted(cart_pricing.items, key=lambda line: line.item.pk)
+        ),
+    )
@@ -0,0 +1,204 @@
+"""Sharded overdue reservation expiry — one Django-Q task per order-id range.
+
+``sweep_overdue_reservations`` works through the whole backlog serially in
+one worker, even though the cluster has several.  After an outage (or a
+flash sale with many abandoned checkouts) that single worker is the
+bottleneck of the 15-minute job.
+
+The coordinator (:func:`fan_out_overdue_reservation_expiry`) takes one
+snapshot of the overdue order ids, splits it into contiguous id ranges
+holding the same number of orders and enqueues one
+``orders.jobs.run_overdue_reservation_expiry_shard`` task per range, all in
+one Django-Q group.  Each shard runs the normal chunked sweep restricted to
+its range; ranges do not overlap and every chunk locks its orders with
+``SKIP LOCKED``, so shards never wait on each other or on checkout.
+
+Every shard task carries ``orders.jobs.on_overdue_reservation_expiry_shard_done``
+as its hook.  When the last shard of a run has finished (successfully or
+not), :func:`summarize_expiry_run` adds the shard reports up and writes one
+``inventory.reservations.expiry_sweep`` audit event for the run.  Hooks of
+shards finishing together may all see the complete group; they serialize
+on the group's task rows, so only the first one writes the summary.
+
+Orders that become overdue after the snapshot are not part of this run
+(their reservations are younger than the shared ``as_of`` cut-off); the
+next run picks them up.
+
+Usage
+-----
+    run = fan_out_overdue_reservation_expiry(shards=4)
+    # ... later, from the hook:
+    summarize_expiry_run(run.run_id, run.shards)
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from django.db import transaction
+
+from auditlog.actions import AuditActions
+from auditlog.models import AuditEvent
+from auditlog.services import AuditService
+from orders.services.inventory_reservation_service import (
+    list_overdue_order_ids,
+    sweep_overdue_reservations,
+)
+
+SHARD_JOB = "orders.jobs.run_overdue_reservation_expiry_shard"
+SHARD_HOOK = "orders.jobs.on_overdue_reservation_expiry_shard_done"
+SUMMARY_ENTITY_TYPE = "inventory_reservation_sweep"
+
+
+@dataclass(frozen=True)
+class ExpiryFanOut:
+    """Outcome of :func:`fan_out_overdue_reservation_expiry`."""
+
+    # Django-Q group of the shard tasks; empty when nothing was enqueued.
+    run_id: str
+    shards: int
+    orders: int
+    # ``(first_order_id, last_order_id)`` per shard, inclusive.
+    ranges: tuple[tuple[int, int], ...]
+
+
+# ---------------------------------------------------------------------------
+# Coordinator
+# ---------------------------------------------------------------------------
+
+
+def plan_order_id_ranges(order_ids: list[int], shards: int) -> list[tuple[int, int]]:
+    """Split sorted *order_ids* into at most *shards* contiguous, inclusive ranges.
+
+    Ranges hold the same number of orders (the first ones one more when it
+    does not divide evenly), not the same span of ids, so a dense block of
+    recent orders does not end up in a single shard.
+    """
+    if shards < 1:
+        raise ValueError("shards must be a positive integer.")
+    shards = min(shards, len(order_ids))
+    ranges = []
+    start = 0
+    for index in range(shards):
+        size = len(order_ids) // shards + (1 if index < len(order_ids) % shards else 0)
+        ranges.append((order_ids[start], order_ids[start + size - 1]))
+        start += size
+    return ranges
+
+
+def fan_out_overdue_reservation_expiry(
+    *, shards: int, now=None, batch_size: Optional[int] = None
+) -> ExpiryFanOut:
+    """Enqueue one expiry task per shard of the current overdue backlog.
+
+    Parameters
+    ----------
+    shards:
+        Maximum number of shard tasks; fewer are enqueued when there are
+        fewer overdue orders.
+    now:
+        Reference time passed to every shard, so they all expire against the
+        same cut-off.  Defaults to the current time.
+    batch_size:
+        Orders per transaction inside a shard; ``None`` uses
+        ``OVERDUE_RESERVATIONS_EXPIRY_BATCH_SIZE``.
+    """
+    from django.utils import timezone  # noqa: PLC0415
+    from django_q.tasks import async_task  # noqa: PLC0415
+
+    current_time = now or timezone.now()
+    order_ids = list_overdue_order_ids(now=current_time)
+    if not order_ids:
+        return ExpiryFanOut(run_id="", shards=0, orders=0, ranges=())
+
+    ranges = plan_order_id_ranges(order_ids, shards)
+    run_id = f"overdue-expiry-{uuid.uuid4().hex}"
+    for index, (first_id, last_id) in enumerate(ranges):
+        async_task(
+            SHARD_JOB,
+            first_order_id=first_id,
+            last_order_id=last_id,
+            as_of=current_time,
+            batch_size=batch_size,
+            shard=index,
+            shards=len(ranges),
+            group=run_id,
+            hook=SHARD_HOOK,
+            task_name=f"{run_id}-{index}",
+        )
+    return ExpiryFanOut(
+        run_id=run_id, shards=len(ranges), orders=len(order_ids), ranges=tuple(ranges)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Shard
+# ---------------------------------------------------------------------------
+
+
+def run_expiry_shard(
+    *, first_order_id: int, last_order_id: int, as_of, batch_size: Optional[int] = None
+) -> dict:
+    """Sweep one order-id range; returns the ReservationExpiryReport as a dict.
+
+    The dict is stored as the Django-Q task result and read back by
+    :func:`summarize_expiry_run`.
+    """
+    report = sweep_overdue_reservations(
+        now=as_of,
+        batch_size=batch_size,
+        order_id_range=(first_order_id, last_order_id),
+    )
+    return asdict(report)
+
+
+# ---------------------------------------------------------------------------
+# Summary
+# ---------------------------------------------------------------------------
+
+
+def summarize_expiry_run(run_id: str, shards: int) -> Optional[AuditEvent]:
+    """Write the summary audit event of *run_id* once all *shards* have finished.
+
+    Returns ``None`` while shards are still running, and when the summary
+    was already written (hooks may run more than once for a task).
+    Failed shards are counted in ``failed_shards``; their orders are left
+    for the next run.
+    """
+    from django_q.models import Task  # noqa: PLC0415
+
+    with transaction.atomic():
+        # Locking the group's tasks makes the check-then-insert below atomic
+        # across concurrently running hooks.
+        tasks = list(Task.objects.select_for_update().filter(group=run_id).order_by("id"))
+        if len(tasks) < shards:
+            return None
+        if AuditEvent.objects.filter(
+            entity_type=SUMMARY_ENTITY_TYPE, entity_id=run_id
+        ).exists():
+            return None
+        return _emit_summary(run_id, shards, tasks)
+
+
+def _emit_summary(run_id: str, shards: int, tasks: list) -> Optional[AuditEvent]:
+    reports = [task.result for task in tasks if task.success]
+    metadata = {
+        "shards": shards,
+        "failed_shards": shards - len(reports),
+        "expired_reservations": sum(r["expired_reservations"] for r in reports),
+        "cancelled_orders": sum(r["cancelled_orders"] for r in reports),
+        "chunks": sum(r["chunks"] for r in reports),
+        "remaining": sum(r["remaining"] for r in reports),
+        # Shards run in parallel: wall time is bounded by the slowest one.
+        "elapsed_seconds": round(max((r["elapsed_seconds"] for r in reports), default=0.0), 3),
+    }
+    return AuditService.emit(
+        entity_type=SUMMARY_ENTITY_TYPE,
+        entity_id=run_id,
+        action=AuditActions.INVENTORY_RESERVATIONS_EXPIRY_SWEEP,
+        actor_type=AuditEvent.ActorType.SYSTEM,
+        metadata=metadata,
+        fail_silently=True,
+    )
@@ -0,0 +1,244 @@
+"""Order VAT breakdown snapshot — computed once, stored on ``Order.vat_breakdown``.
+
+The VAT breakdown (one row per tax rate with ``tax_base``, ``vat_amount``
+and ``total_incl_vat``) only depends on the ``OrderItem`` snapshot values,
+``order_discount_gross`` and ``currency``, all of which are immutable after
+checkout.  Recomputing it — including a full ``allocate_order_discount``
+run for orders with an order-level discount — on every order read was
+wasted work, so checkout now stores the serialized rows in
+``Order.vat_breakdown`` and ``OrderResponseSerializer`` returns them as-is.
+
+Orders created before the column existed have ``vat_breakdown = NULL``.
+The serializer computes their breakdown on the fly until the
+``backfill_order_vat_breakdown`` management command has stored it.
+
+Rules (unchanged from the former serializer implementation)
+----------------------------------------------------------
+- Only items with both ``line_total_net_at_order_time`` and
+  ``line_total_gross_at_order_time`` are included; legacy items are skipped.
+- With an order-level discount (``order_discount_gross > 0``) the discount
+  is allocated across the VAT-rate buckets by the allocation engine and the
+  rows show the post-discount values.
+- Without one, each row is the plain sum of item line totals for that rate.
+- Rows are ordered by tax rate ascending; amounts are 2-decimal strings.
+
+Usage
+-----
+    order.vat_breakdown = compute_vat_breakdown(
+        plan.lines,
+        order_discount_gross=plan.order_discount_gross,
+        currency=plan.currency,
+    )
+
+    written = backfill_order_vat_breakdowns(batch_size=500)
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Iterable, Optional, Sequence
+
+from discounts.models import PromotionType
+from discounts.services.order_discount_allocation import (
+    OrderDiscountInput,
+    OrderLineInput,
+    allocate_order_discounts,
+)
+
+_CENT = Decimal("0.01")
+# OrderItem.tax_rate_at_order_time precision; plan lines are rounded to it
+# so a breakdown computed at checkout equals one computed from the DB rows.
+_RATE_QUANTIZE = Decimal("0.0001")
+_ZERO = Decimal("0")
+
+
+def _format(value: Decimal) -> str:
+    return f"{Decimal(value).quantize(_CENT, rounding=ROUND_HALF_UP):.2f}"
+
+
+def _snapshot_lines(items: Iterable[Any]) -> list[tuple[Decimal, Decimal, Decimal]]:
+    """``(line_net, line_gross, tax_rate)`` for items with full snapshot fields.
+
+    *items* are ``OrderItem`` rows or ``OrderLinePlan`` lines; both expose
+    the ``*_at_order_time`` snapshot attributes.
+    """
+    lines = []
+    for item in items:
+        line_net = item.line_total_net_at_order_time
+        line_gross = item.line_total_gross_at_order_time
+        if line_net is None or line_gross is None:
+            continue
+        rate = item.tax_rate_at_order_time
+        lines.append(
+            (
+                Decimal(str(line_net)),
+                Decimal(str(line_gross)),
+                (
+                    Decimal(str(rate)).quantize(_RATE_QUANTIZE, rounding=ROUND_HALF_UP)
+                    if rate is not None
+                    else _ZERO
+                ),
+            )
+        )
+    return lines
+
+
+def _has_order_discount(order_discount_gross: Optional[Decimal], currency: Optional[str]) -> bool:
+    return order_discount_gross is not None and order_discount_gross > _ZERO and bool(currency)
+
+
+def _allocation_input(lines, order_discount_gross, currency):
+    return (
+        [
+            OrderLineInput(line_net=net, line_gross=gross, tax_rate=rate, currency=currency)
+            for net, gross, rate in lines
+        ],
+        OrderDiscountInput(
+            type=PromotionType.FIXED,
+            value=Decimal(str(order_discount_gross)),
+            currency=currency,
+        ),
+    )
+
+
+def _allocated_rows(allocation) -> list[dict]:
+    return [
+        {
+            "tax_rate": _format(bucket.tax_rate),
+            "tax_base": _format(bucket.adjusted_net),
+            "vat_amount": _format(bucket.adjusted_tax),
+            "total_incl_vat": _format(bucket.adjusted_gross),
+        }
+        for bucket in allocation.buckets
+    ]
+
+
+def _grouped_rows(lines) -> list[dict]:
+    groups: dict[str, dict] = defaultdict(
+        lambda: {"tax_base": _ZERO, "vat_amount": _ZERO, "total_incl_vat": _ZERO}
+    )
+    for line_net, line_gross, rate in lines:
+        group = groups[_format(rate)]
+        group["tax_base"] += line_net
+        group["vat_amount"] += line_gross - line_net
+        group["total_incl_vat"] += line_gross
+
+    return [
+        {
+            "tax_rate": rate,
+            "tax_base": _format(g["tax_base"]),
+            "vat_amount": _format(g["vat_amount"]),
+            "total_incl_vat": _format(g["total_incl_vat"]),
+        }
+        for rate, g in sorted(groups.items(), key=lambda x: Decimal(x[0]))
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def compute_vat_breakdown(
+    items: Iterable[Any],
+    *,
+    order_discount_gross: Optional[Decimal],
+    currency: Optional[str],
+) -> list[dict]:
+    """Return the serialized VAT breakdown rows for one order.
+
+    Parameters
+    ----------
+    items:
+        ``OrderItem`` rows or ``OrderLinePlan`` lines of the order.
+    order_discount_gross:
+        The order-level gross discount, or ``None``.
+    currency:
+        The order currency.
+    """
+    return compute_vat_breakdowns([(items, order_discount_gross, currency)])[0]
+
+
+def compute_vat_breakdowns(
+    orders: Sequence[tuple[Iterable[Any], Optional[Decimal], Optional[str]]],
+) -> list[list[dict]]:
+    """Batch form of :func:`compute_vat_breakdown`.
+
+    *orders* are ``(items, order_discount_gross, currency)`` triples.  All
+    discount allocations run in one ``allocate_order_discounts`` call.
+    """
+    snapshot = [
+        (_snapshot_lines(items), order_discount_gross, currency)
+        for items, order_discount_gross, currency in orders
+    ]
+    to_allocate = [
+        index
+        for index, (lines, order_discount_gross, currency) in enumerate(snapshot)
+        if lines and _has_order_discount(order_discount_gross, currency)
+    ]
+    allocations = dict(
+        zip(
+            to_allocate,
+            allocate_order_discounts(
+                [_allocation_input(*snapshot[index]) for index in to_allocate]
+            ),
+        )
+    )
+
+    breakdowns = []
+    for index, (lines, _, _) in enumerate(snapshot):
+        if not lines:
+            breakdowns.append([])
+        elif index in allocations:
+            breakdowns.append(_allocated_rows(allocations[index]))
+        else:
+            breakdowns.append(_grouped_rows(lines))
+    return breakdowns
+
+
+def compute_order_vat_breakdown(order) -> list[dict]:
+    """Compute the breakdown of a saved ``Order`` from its ``OrderItem`` rows."""
+    return compute_vat_breakdown(
+        order.items.all(),
+        order_discount_gross=order.order_discount_gross,
+        currency=order.currency,
+    )
+
+
+def backfill_order_vat_breakdowns(*, batch_size: int = 500) -> int:
+    """Store ``vat_breakdown`` on every order that does not have one yet.
+
+    Orders are processed in primary-key order, ``batch_size`` at a time,
+    with their items prefetched and one ``bulk_update`` per batch.  Safe to
+    re-run; returns the number of orders written.
+    """
+    from orders.models import Order  # noqa: PLC0415
+
+    written = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            Order.objects.filter(vat_breakdown__isnull=True, pk__gt=last_pk)
+            .order_by("pk")
+            .only("pk", "order_discount_gross", "currency", "vat_breakdown")
+            .prefetch_related("items")[:batch_size]
+        )
+        if not batch:
+            return written
+
+        breakdowns = compute_vat_breakdowns(
+            [(order.items.all(), order.order_discount_gross, order.currency) for order in batch]
+        )
+        for order, breakdown in zip(batch, breakdowns):
+            order.vat_breakdown = breakdown
+        Order.objects.bulk_update(batch, ["vat_breakdown"])
+        written += len(batch)
+        last_pk = batch[-1].pk
+
+
+def count_orders_missing_vat_breakdown() -> int:
+    """Number of orders :func:`backfill_order_vat_breakdowns` would write."""
+    from orders.models import Order  # noqa: PLC0415
+
+    return Order.objects.filter(vat_breakdown__isnull=True).count()
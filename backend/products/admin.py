@@ -43,7 +43,7 @@ class ProductAdmin(admin.ModelAdmin):
     list_display = ("id", "name", "slug", "price", "price_net_amount", "price_gross_amount", "currency", "stock_quantity", "is_active")
     list_filter = ("is_active", "currency", "tax_class")
     search_fields = ("name", "slug")
-    readonly_fields = ("price_gross_amount",)
+    readonly_fields = ("price_gross_amount", "reserved_quantity")
     fields = (
         "name",
         "slug",
@@ -55,6 +55,7 @@ class ProductAdmin(admin.ModelAdmin):
         "tax_class",
         # --- Inventory ---
         "stock_quantity",
+        "reserved_quantity",
         "is_active",
         "category",
         # --- Content ---
@@ -3,3 +3,14 @@ from django.apps import AppConfig
 
 class ProductsConfig(AppConfig):
     name = "products"
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from products import signals
+
+        post_migrate.connect(
+            signals.backfill_effective_prices_after_migrate,
+            sender=self,
+            dispatch_uid="effective_price_backfill_post_migrate",
+        )
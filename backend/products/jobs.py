@@ -0,0 +1,17 @@
+"""Django-Q2 job definitions for the products app.
+
+Each function here is a thin adapter that delegates all business logic to
+the corresponding management command, which stays the single source of
+truth.
+"""
+
+from django.core.management import call_command
+
+
+def run_effective_price_boundary_refresh() -> None:
+    """Re-price products whose line promotions start or end at today's boundary.
+
+    Intended to be invoked by the django-q2 scheduler shortly after
+    midnight; can also be called directly in tests or from the REPL.
+    """
+    call_command("refresh_effective_prices", boundaries=True)
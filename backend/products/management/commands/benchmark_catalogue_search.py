@@ -0,0 +1,125 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from products.models import Product
+from products.search.backends import (
+    InMemoryNgramSearchBackend,
+    MySQLCatalogSearchBackend,
+)
+from products.search.cache import bump_catalogue_version
+from products.search.ngram import NgramIndex, reset_ngram_index
+from products.search.types import CatalogSearchQuery
+
+SLUG_PREFIX = "bench-search-"
+
+_ADJECTIVES = ["wireless", "compact", "ergonomic", "premium", "portable", "silent"]
+_NOUNS = ["mouse", "keyboard", "headset", "monitor", "charger", "speaker", "cable"]
+_DETAILS = ["usb-c", "bluetooth", "aluminium", "backlit", "foldable", "waterproof"]
+
+DEFAULT_TERMS = ["mouse", "wireless keyboard", "usb", "ergo", "portable speaker", "xyzzy"]
+
+
+def _seed_rows(count: int):
+    for i in range(count):
+        adjective = _ADJECTIVES[i % len(_ADJECTIVES)]
+        noun = _NOUNS[(i // len(_ADJECTIVES)) % len(_NOUNS)]
+        detail = _DETAILS[(i // 7) % len(_DETAILS)]
+        yield Product(
+            name=f"{adjective.title()} {noun.title()} {i}",
+            slug=f"{SLUG_PREFIX}{i}",
+            short_description=f"{adjective} {noun} with {detail} design",
+            full_description=(
+                f"## {noun.title()}\n\nA {adjective} {noun}. Features: {detail}, "
+                f"model number {i:06d}."
+            ),
+            price=10 + i % 90,
+            stock_quantity=i % 5,
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the in-memory ngram search backend (and the MySQL FULLTEXT "
+        "backend when running on MySQL) on a seeded synthetic catalogue."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--products",
+            type=int,
+            default=50_000,
+            help="Number of synthetic products to seed (default: 50000).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Timed runs per search term (default: 20).",
+        )
+        parser.add_argument(
+            "--term",
+            action="append",
+            dest="terms",
+            help="Search term to benchmark (repeatable; defaults to a fixed set).",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the seeded products instead of deleting them afterwards.",
+        )
+
+    def handle(self, *args, **options):
+        terms = options["terms"] or DEFAULT_TERMS
+        repeat = options["repeat"]
+
+        # Rows are committed: InnoDB FULLTEXT does not see uncommitted inserts.
+        Product.objects.filter(slug__startswith=SLUG_PREFIX).delete()
+        started = time.perf_counter()
+        Product.objects.bulk_create(_seed_rows(options["products"]), batch_size=2000)
+        bump_catalogue_version()
+        self.stdout.write(
+            f"Seeded {options['products']} products in {time.perf_counter() - started:.2f}s"
+        )
+
+        try:
+            started = time.perf_counter()
+            index = NgramIndex.build(version=0)
+            self.stdout.write(
+                f"In-memory index build: {time.perf_counter() - started:.2f}s "
+                f"({index.live_count} products)"
+            )
+
+            backends = {"inmemory": InMemoryNgramSearchBackend()}
+            if connection.vendor == "mysql":
+                backends["mysql"] = MySQLCatalogSearchBackend()
+            else:
+                self.stdout.write("MySQL backend skipped (database is not MySQL).")
+
+            reset_ngram_index()
+            for term in terms:
+                query = CatalogSearchQuery(search=term)
+                top = {}
+                for name, backend in backends.items():
+                    backend.search(query)  # warm-up (builds the in-memory index)
+                    timings = []
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        result = backend.search(query)
+                        timings.append((time.perf_counter() - started) * 1000)
+                    top[name] = set(result.product_ids[:10])
+                    self.stdout.write(
+                        f"{term!r:24} {name:9} hits={len(result.hits):6} "
+                        f"median={statistics.median(timings):8.2f}ms "
+                        f"max={max(timings):8.2f}ms"
+                    )
+                if len(top) == 2:
+                    overlap = len(top["inmemory"] & top["mysql"])
+                    self.stdout.write(f"{term!r:24} top-10 overlap={overlap}/10")
+        finally:
+            reset_ngram_index()
+            if not options["keep"]:
+                Product.objects.filter(slug__startswith=SLUG_PREFIX).delete()
+                bump_catalogue_version()
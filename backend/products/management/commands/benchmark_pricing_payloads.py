@@ -0,0 +1,112 @@
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from prices import Money
+
+from api.serializers.product import (
+    ProductPricingResultSerializer,
+    pricing_result_payload,
+)
+from products.services.pricing import (
+    DiscountResult,
+    PricingTierResult,
+    ProductPricingResult,
+)
+
+
+def _tier(net: str, gross: str, currency: str = "EUR") -> PricingTierResult:
+    net_money = Money(Decimal(net), currency)
+    gross_money = Money(Decimal(gross), currency)
+    return PricingTierResult(
+        net=net_money,
+        gross=gross_money,
+        tax=gross_money - net_money,
+        currency=currency,
+        tax_rate=Decimal("23.0000"),
+    )
+
+
+def _sample_results() -> dict[str, ProductPricingResult]:
+    """One promoted and one unpromoted pricing result, built in memory."""
+    undiscounted = _tier("100.00", "123.00")
+    discounted = _tier("90.00", "110.70")
+    promoted = ProductPricingResult(
+        undiscounted=undiscounted,
+        discounted=discounted,
+        discount=DiscountResult(
+            amount_net=Money(Decimal("10.00"), "EUR"),
+            amount_gross=Money(Decimal("12.30"), "EUR"),
+            percentage=Decimal("10.00"),
+            promotion_code="SPRING-10",
+            promotion_type="PERCENT",
+            amount_scope=None,
+        ),
+    )
+    zero = Money(Decimal("0.00"), "EUR")
+    plain = ProductPricingResult(
+        undiscounted=undiscounted,
+        discounted=undiscounted,
+        discount=DiscountResult(
+            amount_net=zero,
+            amount_gross=zero,
+            percentage=Decimal("0"),
+            promotion_code=None,
+            promotion_type=None,
+            amount_scope=None,
+        ),
+    )
+    return {"promoted": promoted, "plain": plain}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the per-item cost of rendering pricing payloads with "
+        "ProductPricingResultSerializer versus the plain-dict builder."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--items",
+            type=int,
+            default=20_000,
+            help="Pricing payloads rendered per timed run (default: 20000).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed runs per variant; the best run is reported (default: 5).",
+        )
+
+    def _best_per_item_us(self, render, result, items: int, repeat: int) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(items):
+                render(result)
+            best = min(best, time.perf_counter() - started)
+        return best / items * 1_000_000
+
+    def handle(self, *args, **options):
+        items = options["items"]
+        repeat = options["repeat"]
+
+        variants = {
+            "serializer": lambda r: ProductPricingResultSerializer(r).data,
+            "builder": pricing_result_payload,
+        }
+
+        for label, result in _sample_results().items():
+            if variants["serializer"](result) != variants["builder"](result):
+                raise AssertionError(f"{label}: builder output differs from serializer")
+
+            timings = {
+                name: self._best_per_item_us(render, result, items, repeat)
+                for name, render in variants.items()
+            }
+            self.stdout.write(
+                f"{label:9} serializer={timings['serializer']:8.2f}us/item "
+                f"builder={timings['builder']:8.2f}us/item "
+                f"speedup={timings['serializer'] / timings['builder']:6.1f}x"
+            )
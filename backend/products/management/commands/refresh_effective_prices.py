@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from products.services.effective_price import (
+    refresh_effective_prices,
+    refresh_effective_prices_at_window_boundaries,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute materialised product effective prices "
+        "(all products, or only those at promotion-window boundaries)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--boundaries",
+            action="store_true",
+            help=(
+                "Only re-price products whose rows predate a promotion-window "
+                "boundary up to today (daily job; catches up missed days)."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["boundaries"]:
+            written = refresh_effective_prices_at_window_boundaries(
+                timezone.now().date()
+            )
+            self.stdout.write(
+                f"Refreshed {written} effective prices at promotion-window boundaries"
+            )
+            return
+
+        written = refresh_effective_prices()
+        self.stdout.write(f"Refreshed {written} effective prices")
@@ -0,0 +1,55 @@
+# Generated by Django 6.0 on 2026-10-17 06:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0011_product_slug"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductEffectivePrice",
+            fields=[
+                (
+                    "product",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="effective_price",
+                        serialize=False,
+                        to="products.product",
+                    ),
+                ),
+                ("currency", models.CharField(max_length=3)),
+                (
+                    "undiscounted_net",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                (
+                    "undiscounted_gross",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                (
+                    "discounted_net",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                (
+                    "discounted_gross",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                ("valid_on", models.DateField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["discounted_gross"], name="product_eff_price_disc_gross"
+                    )
+                ],
+            },
+        ),
+    ]
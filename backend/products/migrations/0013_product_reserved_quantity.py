@@ -0,0 +1,43 @@
+"""
+Migration 0013: Product.reserved_quantity counter.
+
+Strategy
+--------
+1. Add the counter with default 0.
+2. Data-migrate: set it to the sum of ACTIVE inventory reservations per
+   product (overdue ones included — they hold stock until expired).
+"""
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def forwards(apps, schema_editor):
+    Product = apps.get_model("products", "Product")
+    InventoryReservation = apps.get_model("orders", "InventoryReservation")
+    totals = (
+        InventoryReservation.objects.filter(status="ACTIVE")
+        .values("product_id")
+        .annotate(total=Sum("quantity"))
+    )
+    for row in totals:
+        Product.objects.filter(pk=row["product_id"]).update(
+            reserved_quantity=row["total"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0012_product_effective_price"),
+        ("orders", "0012_order_vat_breakdown"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="reserved_quantity",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -167,6 +167,11 @@ class Product(models.Model):
         )
 
     stock_quantity = models.IntegerField()
+    # Units held by ACTIVE inventory reservations (including overdue ones
+    # not yet expired).  Maintained only by
+    # orders.services.inventory_reservation_service with atomic UPDATEs;
+    # never written back by a save() without update_fields (see _do_update()).
+    reserved_quantity = models.IntegerField(default=0, editable=False)
     is_active = models.BooleanField(default=True)
     category = models.ForeignKey("categories.Category", null=True, blank=True, on_delete=models.SET_NULL, related_name="products")
 
@@ -231,8 +236,21 @@ class Product(models.Model):
         # Strip raw HTML from the Markdown description before persisting.
         # Applies to all entry points: admin, API, management commands.
         self.full_description = sanitize_markdown(self.full_description)
+
         super().save(*args, **kwargs)
 
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, *args, **kwargs):
+        # reserved_quantity is a concurrently updated counter; writing back a
+        # value read earlier would lose reservations made in the meantime.
+        # Only the UPDATE of a save() without update_fields skips it: a caller
+        # naming it in update_fields writes it, and a save() whose row is gone
+        # still falls back to a full INSERT.
+        if update_fields is None:
+            values = [value for value in values if value[0].name != "reserved_quantity"]
+        return super()._do_update(
+            base_qs, using, pk_val, values, update_fields, *args, **kwargs
+        )
+
     def is_sellable(self) -> bool:
         return self.is_active and self.stock_quantity > 0
 
@@ -282,3 +300,43 @@ class ProductImage(models.Model):
 
     def __str__(self):
         return f"ProductImage(product_id={self.product_id}, sort_order={self.sort_order})"
+
+
+class ProductEffectivePrice(models.Model):
+    """Materialised, promotion-aware unit price of a product.
+
+    Denormalised copy of ``get_product_pricing(product)`` so that catalogue
+    price filters, price sorts and slider bounds can run in SQL on the price
+    the customer actually sees (``discounted_gross``) instead of the legacy
+    ``Product.price`` column.
+
+    Rows are maintained by ``products.services.effective_price``: refreshed
+    incrementally on product, tax-class and promotion changes and in full by
+    a daily job (promotion windows are day-granular).  ``valid_on`` records
+    the date the promotion windows were evaluated for.
+
+    Products without ``price_net_amount`` (not yet migrated from the legacy
+    ``price`` field) store ``price`` in every column.
+    """
+
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="effective_price",
+    )
+    currency = models.CharField(max_length=3)
+    undiscounted_net = models.DecimalField(max_digits=10, decimal_places=2)
+    undiscounted_gross = models.DecimalField(max_digits=10, decimal_places=2)
+    discounted_net = models.DecimalField(max_digits=10, decimal_places=2)
+    discounted_gross = models.DecimalField(max_digits=10, decimal_places=2)
+    valid_on = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["discounted_gross"], name="product_eff_price_disc_gross"),
+        ]
+
+    def __str__(self):
+        return f"ProductEffectivePrice(product_id={self.product_id}, gross={self.discounted_gross})"
@@ -0,0 +1,37 @@
+"""Idempotent django-q2 schedule registration for the products app.
+
+Call ``register_effective_price_refresh()`` to ensure the scheduled job
+exists in the database.  Idempotent: ``update_or_create`` is keyed on a
+stable name so repeated calls never produce duplicate rows.
+
+Typical entry point: the project-wide ``sync_q_schedules`` management command,
+which is executed once during deployment (after ``migrate``).
+"""
+
+from django.conf import settings
+from django_q.models import Schedule
+
+#: Stable identifier used to look up the schedule row.  Never change this
+#: value once deployed; doing so would orphan the old row.
+EFFECTIVE_PRICE_REFRESH_SCHEDULE_NAME = "products.effective_price_refresh"
+
+
+def register_effective_price_refresh() -> None:
+    """Create or update the django-q2 schedule for the daily effective-price refresh.
+
+    Reads the cron expression from ``EFFECTIVE_PRICE_REFRESH_CRON`` so the
+    run time can be aligned with the promotion-window rollover via
+    environment variable without code changes.
+    """
+    cron: str = getattr(settings, "EFFECTIVE_PRICE_REFRESH_CRON", "5 0 * * *")
+
+    Schedule.objects.update_or_create(
+        name=EFFECTIVE_PRICE_REFRESH_SCHEDULE_NAME,
+        defaults={
+            "func": "products.jobs.run_effective_price_boundary_refresh",
+            "schedule_type": Schedule.CRON,
+            "cron": cron,
+            # repeats=-1 means run indefinitely.
+            "repeats": -1,
+        },
+    )
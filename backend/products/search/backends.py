@@ -86,6 +86,26 @@ class MySQLCatalogSearchBackend:
         return SearchResult(hits=hits)
 
 
+class InMemoryNgramSearchBackend:
+    """
+    Pure-Python ngram search backend for databases without FULLTEXT support
+    (SQLite, PostgreSQL).
+
+    Mirrors MySQLCatalogSearchBackend: the same three columns are split into
+    bigram tokens, any shared bigram is a hit, and hits carry a BM25
+    relevance score.  The inverted index lives in process memory (see
+    products.search.ngram) and is kept current by product change signals.
+    """
+
+    def search(self, query: CatalogSearchQuery) -> SearchResult:
+        if not query.search or not query.search.strip():
+            return SearchResult()
+
+        from .ngram import search_index  # noqa: PLC0415
+
+        return SearchResult(hits=search_index(query.search.strip()))
+
+
 class NullSearchBackend:
     """
     No-op backend used when no search engine is available (e.g. SQLite in
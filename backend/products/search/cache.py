@@ -0,0 +1,177 @@
+"""
+Caching decorator for catalog search backends.
+
+``CachedSearchBackend`` wraps any CatalogSearchBackend and stores its hit
+list in the Django cache, so popular search terms do not re-run the
+FULLTEXT query on every request.
+
+Cache key
+---------
+Backends only retrieve text hits; stock, category and price filters are
+applied afterwards by CatalogSearchService.  The key is therefore built
+from the *normalised search term* alone (case-folded, whitespace
+collapsed), so every filter / sort combination for the same term shares
+one entry.
+
+Invalidation
+------------
+Keys embed the catalogue version counter stored in the Django cache.
+``products.signals`` bumps it when a Product is created, deleted or has
+its searchable text saved, which orphans every cached hit list at once;
+orphaned entries simply expire.  The TTL
+(``CATALOGUE_SEARCH_CACHE_TTL_SECONDS``) bounds staleness for writes that
+bypass model signals.
+
+Statistics
+----------
+Hits and misses are counted in the Django cache (shared between workers
+when the cache backend is) and exposed via ``get_search_cache_stats()``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .backends import CatalogSearchBackend
+from .types import CatalogSearchQuery, SearchHit, SearchResult
+
+VERSION_CACHE_KEY = "products:catalogue:version"
+HITS_CACHE_KEY = "products:search_cache:hits"
+MISSES_CACHE_KEY = "products:search_cache:misses"
+
+_KEY_PREFIX = "products:search_cache:result"
+_DEFAULT_TTL_SECONDS = 300
+
+
+# ---------------------------------------------------------------------------
+# Catalogue version counter
+# ---------------------------------------------------------------------------
+
+
+def get_catalogue_version() -> int:
+    """Return the current catalogue version, initialising it when missing."""
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(VERSION_CACHE_KEY, 1, timeout=None)
+        version = cache.get(VERSION_CACHE_KEY, 1)
+    return version
+
+
+def bump_catalogue_version() -> int:
+    """Increment the catalogue version so every cached search result becomes stale."""
+    try:
+        return cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        # Key missing (first write or evicted) — start a fresh counter that
+        # cannot collide with a version existing entries were stored under.
+        version = int(time.time())
+        cache.set(VERSION_CACHE_KEY, version, timeout=None)
+        return version
+
+
+# ---------------------------------------------------------------------------
+# Hit / miss counters
+# ---------------------------------------------------------------------------
+
+
+def _count(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_search_cache_stats() -> dict[str, int]:
+    """Return ``{"hits": …, "misses": …}`` for the search result cache."""
+    return {
+        "hits": cache.get(HITS_CACHE_KEY, 0),
+        "misses": cache.get(MISSES_CACHE_KEY, 0),
+    }
+
+
+def reset_search_cache_stats() -> None:
+    cache.delete_many([HITS_CACHE_KEY, MISSES_CACHE_KEY])
+
+
+# ---------------------------------------------------------------------------
+# Key normalisation
+# ---------------------------------------------------------------------------
+
+
+def normalize_query(query: CatalogSearchQuery) -> Optional[str]:
+    """
+    Return the cache-relevant form of *query*, or None when it has no search term.
+
+    Only the search term determines a backend's hits.  It is case-folded
+    (the FULLTEXT collation is case-insensitive) and runs of whitespace are
+    collapsed (whitespace only separates tokens).
+    """
+    if not query.search:
+        return None
+    term = " ".join(query.search.split()).casefold()
+    return term or None
+
+
+def _cache_key(term: str, version: int) -> str:
+    digest = hashlib.sha256(term.encode()).hexdigest()
+    return f"{_KEY_PREFIX}:v{version}:{digest}"
+
+
+# ---------------------------------------------------------------------------
+# Backend decorator
+# ---------------------------------------------------------------------------
+
+
+class CachedSearchBackend:
+    """
+    CatalogSearchBackend decorator that caches hit lists per normalised term.
+
+    Usage::
+
+        backend = CachedSearchBackend(MySQLCatalogSearchBackend())
+        service = CatalogSearchService(backend)
+    """
+
+    def __init__(
+        self,
+        backend: CatalogSearchBackend,
+        *,
+        ttl: Optional[int] = None,
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    def _ttl_seconds(self) -> int:
+        if self.ttl is not None:
+            return self.ttl
+        return getattr(
+            settings, "CATALOGUE_SEARCH_CACHE_TTL_SECONDS", _DEFAULT_TTL_SECONDS
+        )
+
+    def search(self, query: CatalogSearchQuery) -> SearchResult:
+        term = normalize_query(query)
+        if term is None:
+            return self.backend.search(query)
+
+        key = _cache_key(term, get_catalogue_version())
+        cached = cache.get(key)
+        if cached is not None:
+            _count(HITS_CACHE_KEY)
+            return SearchResult(
+                hits=[SearchHit(product_id=pk, relevance=rel) for pk, rel in cached]
+            )
+
+        _count(MISSES_CACHE_KEY)
+        result = self.backend.search(query)
+        cache.set(
+            key,
+            [(hit.product_id, hit.relevance) for hit in result.hits],
+            timeout=self._ttl_seconds(),
+        )
+        return result
@@ -0,0 +1,326 @@
+"""
+In-process bigram inverted index for InMemoryNgramSearchBackend.
+
+The index mirrors what the MySQL backend gets from a FULLTEXT index with
+the ngram parser (``ngram_token_size = 2``): the text of ``name``,
+``short_description`` and ``full_description`` is case-folded, split into
+words and each word into overlapping bigrams (a one-character word is its
+own token).  A search term is tokenised the same way and any shared bigram
+is a hit (natural-language / OR semantics), scored with Okapi BM25.
+
+Layout
+------
+Documents are addressed by a dense *slot* number.  Per term the index keeps
+two parallel ``array('i')`` posting lists — slots and term frequencies — so
+a 50k-product catalogue costs a few machine words per posting instead of a
+Python object.  Document lengths and product ids are ``array``s indexed by
+slot.
+
+Incremental updates
+-------------------
+Changing a product appends a fresh slot and tombstones the old one (its
+product id becomes ``-1``); deleting only tombstones.  Postings are never
+rewritten in place.  Document frequencies still count tombstoned postings
+until the index is compacted, which happens with a full rebuild once more
+than ``_MAX_DEAD_FRACTION`` of the slots are dead.
+
+Freshness
+---------
+The published index records the catalogue version (see
+products.search.cache) it reflects.  ``products.signals`` reports every
+version bump caused by a local product write through
+``note_product_change``; if the index was current before that bump, the
+product id is queued and re-read on the next search.  Any other version
+change — a write in another process — forces a full rebuild.
+
+The queue is filled at write time, so a search in another thread may
+re-read a queued product before its writer commits and index the old row.
+The published index is therefore also rebuilt once it is older than
+``CATALOGUE_NGRAM_INDEX_TTL_SECONDS``, which bounds how long such an entry
+(or one missed by a write that bypasses signals) is served.
+
+Concurrency
+-----------
+A published index is never modified (only its ``version`` is advanced by
+``note_product_change``), so searches run on it without holding the
+module lock.  The lock only guards reading / swapping ``_index`` and
+draining ``_pending``.  Refreshes happen outside the lock: a full rebuild
+builds a new index, an incremental refresh applies the queued products to
+a copy-on-write :meth:`NgramIndex.clone`.  The result is published only if
+the index it started from is still the published one; otherwise the
+drained product ids are queued again.
+
+Indexes are never built inside an ``atomic`` block, where they could
+reflect uncommitted writes: such searches use the published index as is,
+and only build a private, unpublished one while nothing is published yet.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import connection
+
+from products.models import Product
+
+from .cache import get_catalogue_version
+from .types import SearchHit
+
+# BM25 parameters (Robertson / Spärck Jones defaults).
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Fraction of tombstoned slots that triggers a compacting full rebuild.
+_MAX_DEAD_FRACTION = 0.25
+
+# Rows fetched per round trip while building the index.
+_BUILD_CHUNK_SIZE = 2000
+
+_TEXT_FIELDS = ("name", "short_description", "full_description")
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split *text* into the bigram tokens used by the index."""
+    tokens: list[str] = []
+    for word in _WORD_RE.findall(text.casefold()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class NgramIndex:
+    """Bigram inverted index with BM25 scoring.  Not thread-safe on its own."""
+
+    def __init__(self, version: int) -> None:
+        self.version = version
+        # time.monotonic() at construction; clones keep it.
+        self.built_at = time.monotonic()
+        self._term_ids: dict[str, int] = {}
+        self._post_slots: list[array] = []
+        self._post_freqs: list[array] = []
+        self._slot_product: array = array("q")
+        self._slot_length: array = array("i")
+        self._product_slot: dict[int, int] = {}
+        self._live_length_total = 0
+        # Per-slot BM25 length normalisation; recomputed lazily after writes.
+        self._norms: Optional[list[float]] = None
+        # Posting arrays with a term id below this are shared with the index
+        # this one was cloned from and are copied before the first append.
+        self._shared_terms = 0
+        self._copied_terms: set[int] = set()
+
+    # ------------------------------------------------------------------
+    # Construction / maintenance
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, version: int, rows: Optional[Iterable[tuple]] = None) -> "NgramIndex":
+        """Build an index from ``(id, name, short_description, full_description)`` rows."""
+        index = cls(version)
+        if rows is None:
+            rows = (
+                Product.objects.order_by("id")
+                .values_list("id", *_TEXT_FIELDS)
+                .iterator(chunk_size=_BUILD_CHUNK_SIZE)
+            )
+        for pk, *texts in rows:
+            index.upsert(pk, texts)
+        return index
+
+    def clone(self) -> "NgramIndex":
+        """Return a copy that can be updated without affecting this index.
+
+        Per-slot arrays and lookup tables are copied; posting arrays are
+        shared until the copy appends to them.
+        """
+        other = NgramIndex(self.version)
+        other.built_at = self.built_at
+        other._term_ids = dict(self._term_ids)
+        other._post_slots = list(self._post_slots)
+        other._post_freqs = list(self._post_freqs)
+        other._slot_product = array("q", self._slot_product)
+        other._slot_length = array("i", self._slot_length)
+        other._product_slot = dict(self._product_slot)
+        other._live_length_total = self._live_length_total
+        other._shared_terms = len(self._post_slots)
+        return other
+
+    @property
+    def live_count(self) -> int:
+        return len(self._product_slot)
+
+    @property
+    def dead_fraction(self) -> float:
+        total = len(self._slot_product)
+        return 0.0 if total == 0 else 1 - self.live_count / total
+
+    def upsert(self, product_id: int, texts: Iterable[str]) -> None:
+        self.remove(product_id)
+        counts = Counter(tokenize(" ".join(t or "" for t in texts)))
+
+        slot = len(self._slot_product)
+        length = sum(counts.values())
+        self._slot_product.append(product_id)
+        self._slot_length.append(length)
+        self._product_slot[product_id] = slot
+        self._live_length_total += length
+        self._norms = None
+
+        for term, freq in counts.items():
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = self._term_ids[term] = len(self._post_slots)
+                self._post_slots.append(array("i"))
+                self._post_freqs.append(array("i"))
+            elif term_id < self._shared_terms and term_id not in self._copied_terms:
+                self._post_slots[term_id] = array("i", self._post_slots[term_id])
+                self._post_freqs[term_id] = array("i", self._post_freqs[term_id])
+                self._copied_terms.add(term_id)
+            self._post_slots[term_id].append(slot)
+            self._post_freqs[term_id].append(freq)
+
+    def remove(self, product_id: int) -> None:
+        slot = self._product_slot.pop(product_id, None)
+        if slot is not None:
+            self._slot_product[slot] = -1
+            self._live_length_total -= self._slot_length[slot]
+            self._norms = None
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def _length_norms(self) -> list[float]:
+        if self._norms is None:
+            avg_length = self._live_length_total / (self.live_count or 1) or 1.0
+            self._norms = [
+                BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                for length in self._slot_length
+            ]
+        return self._norms
+
+    def search(self, term: str) -> list[SearchHit]:
+        """Return BM25-scored hits for *term*, highest relevance first."""
+        n = self.live_count
+        if n == 0:
+            return []
+        norms = self._length_norms()
+
+        # Dense score accumulator indexed by slot; tombstones are dropped at
+        # the end instead of being tested once per posting.
+        scores = [0.0] * len(self._slot_product)
+        for token in set(tokenize(term)):
+            term_id = self._term_ids.get(token)
+            if term_id is None:
+                continue
+            slots = self._post_slots[term_id]
+            df = len(slots)
+            weight = math.log(1 + (n - df + 0.5) / (df + 0.5)) * (BM25_K1 + 1)
+            for slot, tf in zip(slots, self._post_freqs[term_id]):
+                scores[slot] += weight * tf / (tf + norms[slot])
+
+        slot_product = self._slot_product
+        hits = [
+            SearchHit(product_id=slot_product[slot], relevance=score)
+            for slot, score in enumerate(scores)
+            if score > 0 and slot_product[slot] >= 0
+        ]
+        hits.sort(key=lambda h: (-h.relevance, h.product_id))
+        return hits
+
+
+# ---------------------------------------------------------------------------
+# Process-wide index
+# ---------------------------------------------------------------------------
+
+
+_lock = threading.Lock()
+_index: Optional[NgramIndex] = None
+_pending: set[int] = set()
+
+
+def note_product_change(product_id: int, *, version: int) -> None:
+    """Queue *product_id* for re-indexing after a local write bumped to *version*."""
+    with _lock:
+        if _index is not None and _index.version == version - 1:
+            _index.version = version
+            _pending.add(product_id)
+
+
+def _apply_pending(index: NgramIndex, product_ids: set[int]) -> None:
+    rows = {
+        pk: texts
+        for pk, *texts in Product.objects.filter(pk__in=product_ids).values_list(
+            "id", *_TEXT_FIELDS
+        )
+    }
+    for pk in product_ids:
+        if pk in rows:
+            index.upsert(pk, rows[pk])
+        else:
+            index.remove(pk)
+
+
+def _expired(index: NgramIndex) -> bool:
+    return time.monotonic() - index.built_at > settings.CATALOGUE_NGRAM_INDEX_TTL_SECONDS
+
+
+def search_index(term: str) -> list[SearchHit]:
+    """Search the process-wide index, refreshing it first when stale."""
+    global _index, _pending
+
+    version = get_catalogue_version()
+    with _lock:
+        index = _index
+
+    if connection.in_atomic_block:
+        # May see uncommitted rows: never build an index to publish here.
+        if index is None:
+            return NgramIndex.build(version).search(term)
+        return index.search(term)
+
+    if index is None or index.version != version or _expired(index):
+        drained: set[int] = set()
+        fresh = NgramIndex.build(version)
+    else:
+        with _lock:
+            drained, _pending = _pending, set()
+        if not drained:
+            return index.search(term)
+        fresh = index.clone()
+        _apply_pending(fresh, drained)
+        if fresh.dead_fraction > _MAX_DEAD_FRACTION:
+            fresh = NgramIndex.build(version)
+
+    with _lock:
+        if _index is index:
+            if drained:
+                # Changes noted since the drain advanced the old index's
+                # version; their ids are still queued.
+                fresh.version = index.version
+            else:
+                _pending.clear()
+            _index = fresh
+        else:
+            # Another search published first; keep the ids for its index.
+            _pending |= drained
+    return fresh.search(term)
+
+
+def reset_ngram_index() -> None:
+    """Drop this process's index (tests, management commands)."""
+    global _index
+
+    with _lock:
+        _index = None
+        _pending.clear()
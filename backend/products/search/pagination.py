@@ -0,0 +1,99 @@
+"""
+Keyset (cursor) pagination for catalogue querysets.
+
+The generic keyset paginator lives in api.pagination: the catalogue
+orderings built by CatalogSearchService always end with a unique ``id``
+tiebreaker, so every page is fetched with a "row comes after these values"
+filter instead of an OFFSET.
+
+Relevance-ordered searches are paged over a RankedCatalog instead: the
+same keyset rule is applied to the in-memory ranking with a binary search,
+and only the products of the requested page are fetched.
+
+Cursors embed the ordering they were issued for, so a cursor reused with a
+different ``sort`` is rejected instead of silently producing a wrong page.
+"""
+
+from __future__ import annotations
+
+import bisect
+from typing import Any, Optional
+
+from django.db.models import QuerySet
+
+from api.pagination import (
+    CursorPage,
+    InvalidCursor,
+    KeysetCursorPaginator,
+    decode_cursor,
+    encode_cursor,
+)
+
+from .service import RANK_CHUNK_SIZE
+from .types import RankedCatalog
+
+__all__ = [
+    "RANKED_ORDERING",
+    "CatalogCursorPaginator",
+    "CatalogPage",
+    "InvalidCursor",
+    "decode_cursor",
+    "encode_cursor",
+    "fetch_in_rank_order",
+]
+
+# Ordering signature embedded in cursors issued for a RankedCatalog.  It
+# mirrors the SQL relevance ordering of CatalogSearchService._apply_ordering;
+# ``_name_key`` is the lower-cased name on both sides.
+RANKED_ORDERING = ["-_relevance", "_availability", "_name_key", "id"]
+
+CatalogPage = CursorPage
+
+
+def fetch_in_rank_order(
+    qs: QuerySet, ids: list[int], *, chunk_size: int = RANK_CHUNK_SIZE
+) -> list:
+    """Fetch the products for *ids* from *qs*, returned in the order of *ids*.
+
+    Ids are looked up in chunks so no single ``pk__in`` list exceeds
+    *chunk_size*.  Ids no longer present in *qs* are skipped.
+    """
+    by_id: dict[int, Any] = {}
+    for start in range(0, len(ids), chunk_size):
+        by_id.update(qs.in_bulk(ids[start : start + chunk_size]))
+    return [by_id[pk] for pk in ids if pk in by_id]
+
+
+class CatalogCursorPaginator(KeysetCursorPaginator):
+    """
+    Keyset paginator for catalogue querysets and ranked searches.
+
+    Usage::
+
+        page = CatalogCursorPaginator(page_size=24).paginate(qs, cursor)
+        page.items        # list[Product]
+        page.next_cursor  # str | None
+    """
+
+    def paginate_ranked(
+        self,
+        ranked: RankedCatalog,
+        qs: QuerySet,
+        cursor: Optional[str],
+    ) -> CatalogPage:
+        """Page over a RankedCatalog and fetch only that page's products from *qs*."""
+        start = 0
+        if cursor:
+            after = tuple(decode_cursor(cursor, RANKED_ORDERING))
+            try:
+                start = bisect.bisect_right(ranked.keys, after)
+            except TypeError as exc:
+                raise InvalidCursor("Cursor is malformed.") from exc
+
+        keys = ranked.keys[start : start + self.page_size]
+        items = fetch_in_rank_order(qs, [key[-1] for key in keys])
+
+        next_cursor = None
+        if start + self.page_size < len(ranked.keys):
+            next_cursor = encode_cursor(RANKED_ORDERING, list(keys[-1]))
+        return CatalogPage(items=items, next_cursor=next_cursor)
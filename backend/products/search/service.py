@@ -7,8 +7,23 @@ Responsibilities:
   * Delegate text search to a CatalogSearchBackend.
   * Compose the final queryset with appropriate ordering.
 
+Price filters, price sorts and price bounds use the promotion-aware gross
+price materialised in ProductEffectivePrice (falling back to the legacy
+``price`` column for products without a row), annotated as
+``_effective_price``.
+
 This module contains NO database-vendor-specific SQL.  Relevance-based
 ordering uses Django's Case/When, which is fully portable.
+
+Relevance-ordered searches can also run in *ranked* mode
+(``get_ranked_catalog``): the backend's hit list is filtered in bounded
+chunks and ordered in Python, so callers page over product ids and only
+fetch the products of the requested page.  Query size then stays bounded
+regardless of how many products the search term matches.
+
+``execute`` is the single-pass entry point for listings: it calls the
+text-search backend at most once and derives both the result set and the
+price-slider bounds from the same hit list.
 """
 
 from __future__ import annotations
@@ -16,22 +31,40 @@ from __future__ import annotations
 from decimal import Decimal, InvalidOperation
 from typing import Optional
 
-from django.db.models import Case, IntegerField, Max, Min, QuerySet, Value, When
+from django.db.models import (
+    Case,
+    F,
+    IntegerField,
+    Max,
+    Min,
+    QuerySet,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Lower
 
 from products.models import Product
 
 from .backends import CatalogSearchBackend
-from .types import CatalogSearchQuery
+from .types import CatalogResult, CatalogSearchQuery, RankedCatalog, SearchResult
+
+# Maximum number of ids placed in a single ``pk__in`` list by ranked mode.
+RANK_CHUNK_SIZE = 500
+
+# Relevance scores are floats; both ordering paths compare them as integers.
+_RELEVANCE_SCALE = 1_000_000
 
 # ---------------------------------------------------------------------------
 # Ordering maps for explicit sort params
 # ---------------------------------------------------------------------------
+# Every ordering ends with the unique ``id`` so that it is total — required
+# for stable keyset pagination (see products.search.pagination).
 
 _SORT_ORDERING: dict[str, list[str]] = {
-    "price_asc": ["price", "name"],
-    "price_desc": ["-price", "name"],
-    "name_asc": ["name"],
-    "name_desc": ["-name"],
+    "price_asc": ["_effective_price", "name", "id"],
+    "price_desc": ["-_effective_price", "name", "id"],
+    "name_asc": ["name", "id"],
+    "name_desc": ["-name", "-id"],
 }
 
 
@@ -44,6 +77,9 @@ class CatalogSearchService:
         backend = MySQLCatalogSearchBackend()   # or NullSearchBackend()
         service = CatalogSearchService(backend)
         qs = service.get_queryset(query, is_staff=request.user.is_staff)
+
+        # Listings: one backend search for results *and* price bounds.
+        result = service.execute(query, is_staff=request.user.is_staff)
     """
 
     def __init__(self, backend: CatalogSearchBackend) -> None:
@@ -59,28 +95,10 @@ class CatalogSearchService:
         *,
         is_staff: bool = False,
     ) -> QuerySet:
-        qs = Product.objects.all()
-
-        # --- Availability ----------------------------------------------------
-        # include_unavailable is only honoured for staff/admin users.
-        if query.include_unavailable and is_staff:
-            pass  # show everything — inactive products included
-        else:
-            qs = qs.filter(is_active=True)
-
-        # --- Stock filter ----------------------------------------------------
-        if query.in_stock_only:
-            qs = qs.filter(stock_quantity__gt=0)
-
-        # --- Category --------------------------------------------------------
-        if query.category_ids:
-            qs = qs.filter(category_id__in=query.category_ids)
+        qs = self._filtered_queryset(query, is_staff=is_staff)
 
         # --- Price range -----------------------------------------------------
-        if query.min_price is not None:
-            qs = qs.filter(price__gte=query.min_price)
-        if query.max_price is not None:
-            qs = qs.filter(price__lte=query.max_price)
+        qs = self._apply_price_range(qs, query)
 
         # --- Text search -----------------------------------------------------
         if query.search and query.search.strip():
@@ -92,6 +110,78 @@ class CatalogSearchService:
 
         return self._apply_ordering(qs, query, relevance_map=None)
 
+    def is_ranked(self, query: CatalogSearchQuery) -> bool:
+        """True when *query* is a relevance-ordered search (ranked mode applies)."""
+        return self._has_search(query) and query.sort not in _SORT_ORDERING
+
+    def execute(
+        self,
+        query: CatalogSearchQuery,
+        *,
+        is_staff: bool = False,
+        with_price_bounds: bool = True,
+    ) -> CatalogResult:
+        """
+        Run *query* once and return the listing results with price bounds.
+
+        ``backend.search`` is called at most once; its hit set feeds both
+        the results and the min/max price aggregate (which, as in
+        ``get_price_bounds``, ignores the price-range filter).
+
+        * Relevance-ordered searches return ``ranked``.  The bounds are
+          taken from the same chunked eligibility rows, so they cost no
+          extra query.
+        * Every other query returns an ordered ``queryset``.  The bounds
+          cost one aggregate query, skipped when *with_price_bounds* is
+          False (e.g. on follow-up pages that do not render the slider).
+        """
+        search_result = self.backend.search(query) if self._has_search(query) else None
+        base_qs = self._filtered_queryset(query, is_staff=is_staff)
+
+        if self.is_ranked(query):
+            ranked, lo, hi = self._rank_hits(base_qs, query, search_result)
+            return CatalogResult(ranked=ranked, price_min=lo, price_max=hi)
+
+        if search_result is not None:
+            if search_result.is_empty:
+                return CatalogResult(queryset=base_qs.none())
+            base_qs = base_qs.filter(pk__in=search_result.product_ids)
+
+        lo = hi = None
+        if with_price_bounds:
+            lo, hi = self._price_bounds(base_qs)
+
+        qs = self._apply_ordering(
+            self._apply_price_range(base_qs, query), query, relevance_map=None
+        )
+        return CatalogResult(queryset=qs, price_min=lo, price_max=hi)
+
+    def get_ranked_catalog(
+        self,
+        query: CatalogSearchQuery,
+        *,
+        is_staff: bool = False,
+    ) -> RankedCatalog:
+        """
+        Return the filtered search hits of a relevance-ordered query, ranked.
+
+        The backend hit list is checked against the catalogue filters in
+        chunks of ``RANK_CHUNK_SIZE`` ids, fetching only the columns needed
+        for ordering.  The ranking is identical to ``get_queryset`` for the
+        same query: relevance DESC, in-stock first, name ASC, id ASC.
+
+        Only valid when ``is_ranked(query)`` is true.
+        """
+        if not self.is_ranked(query):
+            raise ValueError("Ranked mode requires a relevance-ordered search query.")
+
+        ranked, _, _ = self._rank_hits(
+            self._filtered_queryset(query, is_staff=is_staff),
+            query,
+            self.backend.search(query),
+        )
+        return ranked
+
     def get_price_bounds(
         self,
         query: CatalogSearchQuery,
@@ -104,29 +194,114 @@ class CatalogSearchService:
 
         Used to compute meaningful slider bounds for the FE price filter UI.
         """
-        qs = Product.objects.all()
+        qs = self._filtered_queryset(query, is_staff=is_staff)
+
+        # Explicit text search: restrict to matched ids, same as main queryset.
+        if query.search and query.search.strip():
+            result = self.backend.search(query)
+            if result.is_empty:
+                return None, None
+            qs = qs.filter(pk__in=result.product_ids)
 
+        return self._price_bounds(qs)
+
+    # ------------------------------------------------------------------
+    # Internal ranking helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _has_search(query: CatalogSearchQuery) -> bool:
+        return bool(query.search and query.search.strip())
+
+    @staticmethod
+    def _rank_hits(
+        base_qs: QuerySet,
+        query: CatalogSearchQuery,
+        search_result: SearchResult,
+    ) -> tuple[RankedCatalog, Decimal | None, Decimal | None]:
+        """
+        Rank the hits of *search_result* that pass the filters of *base_qs*.
+
+        *base_qs* carries every filter except the price range, which is
+        applied here in Python so the same rows also yield the price
+        bounds.  Returns ``(ranked, price_min, price_max)``.
+        """
+        if search_result.is_empty:
+            return RankedCatalog(), None, None
+
+        relevance = search_result.relevance_map
+        hit_ids = search_result.product_ids
+        lo = hi = None
+
+        keys = []
+        for start in range(0, len(hit_ids), RANK_CHUNK_SIZE):
+            chunk = hit_ids[start : start + RANK_CHUNK_SIZE]
+            for pk, stock_quantity, name, price in base_qs.filter(
+                pk__in=chunk
+            ).values_list("id", "stock_quantity", "name", "_effective_price"):
+                lo = price if lo is None else min(lo, price)
+                hi = price if hi is None else max(hi, price)
+                if query.min_price is not None and price < query.min_price:
+                    continue
+                if query.max_price is not None and price > query.max_price:
+                    continue
+                keys.append(
+                    (
+                        -int(relevance[pk] * _RELEVANCE_SCALE),
+                        0 if stock_quantity > 0 else 1,
+                        # Same key as Lower("name") in _apply_ordering, so
+                        # the order does not depend on the DB collation.
+                        name.lower(),
+                        pk,
+                    )
+                )
+        keys.sort()
+        return RankedCatalog(keys=keys), lo, hi
+
+    # ------------------------------------------------------------------
+    # Internal filter helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _filtered_queryset(query: CatalogSearchQuery, *, is_staff: bool) -> QuerySet:
+        """Availability, stock and category filters shared by every entry point.
+
+        Also annotates ``_effective_price`` for price filters, sorts and bounds.
+        """
+        qs = Product.objects.annotate(
+            _effective_price=Coalesce(F("effective_price__discounted_gross"), F("price"))
+        )
+
+        # --- Availability ----------------------------------------------------
+        # include_unavailable is only honoured for staff/admin users.
         if query.include_unavailable and is_staff:
-            pass
+            pass  # show everything — inactive products included
         else:
             qs = qs.filter(is_active=True)
 
+        # --- Stock filter ----------------------------------------------------
         if query.in_stock_only:
             qs = qs.filter(stock_quantity__gt=0)
 
+        # --- Category --------------------------------------------------------
         if query.category_ids:
             qs = qs.filter(category_id__in=query.category_ids)
 
-        # Explicit text search: restrict to matched ids, same as main queryset.
-        if query.search and query.search.strip():
-            result = self.backend.search(query)
-            if result.is_empty:
-                return None, None
-            qs = qs.filter(pk__in=result.product_ids)
+        return qs
 
-        agg = qs.aggregate(lo=Min("price"), hi=Max("price"))
+    @staticmethod
+    def _price_bounds(qs: QuerySet) -> tuple[Decimal | None, Decimal | None]:
+        agg = qs.aggregate(lo=Min("_effective_price"), hi=Max("_effective_price"))
         return agg["lo"], agg["hi"]
 
+    @staticmethod
+    def _apply_price_range(qs: QuerySet, query: CatalogSearchQuery) -> QuerySet:
+        if query.min_price is not None:
+            qs = qs.filter(_effective_price__gte=query.min_price)
+        if query.max_price is not None:
+            qs = qs.filter(_effective_price__lte=query.max_price)
+        return qs
+
     # ------------------------------------------------------------------
     # Internal ordering helpers
     # ------------------------------------------------------------------
@@ -146,12 +321,14 @@ class CatalogSearchService:
             # Relevance-based ordering:
             #   1. relevance DESC  (backend score, scaled to integer)
             #   2. availability    (in-stock first)
-            #   3. name ASC
+            #   3. name ASC        (lower-cased: collation-independent, and
+            #                       mirrored by the in-memory ranking)
+            #   4. id ASC          (unique tiebreaker for keyset pagination)
             #
             # Uses Case/When so ordering is expressed in pure Django ORM —
             # no vendor-specific SQL leaks into this layer.
             relevance_cases = [
-                When(pk=pid, then=Value(int(rel * 1_000_000)))
+                When(pk=pid, then=Value(int(rel * _RELEVANCE_SCALE)))
                 for pid, rel in relevance_map.items()
             ]
             qs = qs.annotate(
@@ -161,15 +338,16 @@ class CatalogSearchService:
                     output_field=IntegerField(),
                 ),
                 _availability=self._availability_annotation(),
+                _name_key=Lower("name"),
             )
-            return qs.order_by("-_relevance", "_availability", "name")
+            return qs.order_by("-_relevance", "_availability", "_name_key", "id")
 
         # Default catalogue ordering:
         #   1. in-stock first  (stock_quantity > 0)
         #   2. out-of-stock last
-        #   3. name ASC within each group
+        #   3. name ASC within each group, id as the unique tiebreaker
         qs = qs.annotate(_availability=self._availability_annotation())
-        return qs.order_by("_availability", "name")
+        return qs.order_by("_availability", "name", "id")
 
     @staticmethod
     def _availability_annotation() -> Case:
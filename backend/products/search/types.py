@@ -9,7 +9,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
 
 
 @dataclass
@@ -54,3 +57,48 @@ class SearchResult:
     def relevance_map(self) -> dict[int, float]:
         """Map of product_id → relevance score, for ordering annotation."""
         return {h.product_id: h.relevance for h in self.hits}
+
+
+@dataclass
+class RankedCatalog:
+    """
+    Search hits that survived the catalogue filters, in final display order.
+
+    Produced by CatalogSearchService.get_ranked_catalog for relevance-ordered
+    searches.  Each key is ``(-relevance_score, availability, name.lower(), id)``
+    — the same ordering the SQL path expresses as
+    ``-_relevance, _availability, Lower("name"), id`` — and ``keys`` is
+    sorted ascending, so paging is plain list slicing.
+    """
+
+    keys: list[tuple] = field(default_factory=list)
+
+    @property
+    def product_ids(self) -> list[int]:
+        return [key[-1] for key in self.keys]
+
+
+@dataclass
+class CatalogResult:
+    """
+    Everything a catalogue listing needs, from one CatalogSearchService.execute call.
+
+    Exactly one of ``queryset`` / ``ranked`` is set:
+
+    * ``ranked`` — relevance-ordered searches; page over it and fetch only
+      the products of the page (see products.search.pagination).
+    * ``queryset`` — every other query; already filtered and ordered.
+
+    ``price_min`` / ``price_max`` are the slider bounds over the filtered
+    subset *ignoring* the price-range filter (None when empty or not
+    requested).
+    """
+
+    queryset: Optional["QuerySet"] = None
+    ranked: Optional[RankedCatalog] = None
+    price_min: Optional[Decimal] = None
+    price_max: Optional[Decimal] = None
+
+    @property
+    def is_ranked(self) -> bool:
+        return self.ranked is not None
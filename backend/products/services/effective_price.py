@@ -0,0 +1,232 @@
+"""Materialised effective-price maintenance for Shopwise.
+
+Responsibility: keep ``ProductEffectivePrice`` rows equal to what
+``get_product_pricing`` returns for each product, so that catalogue price
+filters, price sorts and slider bounds can run in SQL on the
+promotion-aware gross price.
+
+Refresh triggers
+----------------
+- **Product writes** (``products.signals``): the saved product is
+  re-priced synchronously, inside the writing transaction.
+- **Tax-class writes** (``products.signals``): every product of the class is
+  re-priced synchronously.
+- **Promotion writes** (``discounts.signals``): the products targeted by the
+  promotion (directly or through a category) are re-priced once the
+  transaction commits, when the promotion snapshot reflects the change.
+- **Promotion windows**: windows are day-granular, so a daily job
+  (``refresh_effective_prices --boundaries``) re-prices the products whose
+  rows were priced before a window boundary (a promotion starting, or the
+  day after it ended) that has passed since.  Rows carry the day they were
+  priced for (``valid_on``), so a run that was missed is caught up by the
+  next one.
+
+``refresh_effective_prices`` without arguments rebuilds every row and is
+the backfill / repair path for writes that bypass model signals.  After
+``migrate``, :func:`backfill_effective_prices_if_empty` runs it
+automatically while the table is still empty (first deploy of the table),
+so price filters never silently fall back to the legacy ``price``.
+
+Usage
+-----
+    from products.services.effective_price import refresh_effective_prices
+
+    refresh_effective_prices([product.pk])
+    refresh_effective_prices()  # full rebuild
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from django.db import connection
+from django.db.models import Min, Q
+
+from products.models import Product, ProductEffectivePrice
+from products.services.pricing import get_product_pricing
+
+_CHUNK_SIZE = 1000
+
+_UPDATE_FIELDS = [
+    "currency",
+    "undiscounted_net",
+    "undiscounted_gross",
+    "discounted_net",
+    "discounted_gross",
+    "valid_on",
+    "updated_at",
+]
+
+
+# ---------------------------------------------------------------------------
+# Core
+# ---------------------------------------------------------------------------
+
+
+def refresh_product_effective_prices(products: Iterable[Product]) -> int:
+    """Re-price already loaded *products* and upsert their rows.
+
+    Winning promotions are resolved in bulk from the promotion snapshot;
+    ``tax_class`` is read via FK, so callers pricing many products should
+    ``select_related("tax_class")``.  Returns the number of rows written.
+    """
+    # Lazy import avoids a products → discounts dependency at module load.
+    from discounts.services.line_promotion import (  # noqa: PLC0415
+        resolve_line_promotions_bulk,
+    )
+    from discounts.services.promotion_snapshot import (  # noqa: PLC0415
+        get_promotion_snapshot,
+    )
+
+    products = [p for p in products if p.pk is not None]
+    if not products:
+        return 0
+
+    valid_on = get_promotion_snapshot().as_of
+    winners = resolve_line_promotions_bulk(products)
+
+    rows = []
+    for product in products:
+        pricing = get_product_pricing(product, line_promotions=winners)
+        if pricing is None:
+            # Legacy product without price_net_amount — fall back to price.
+            amounts = [product.price] * 4
+        else:
+            amounts = [
+                pricing.undiscounted.net.amount,
+                pricing.undiscounted.gross.amount,
+                pricing.discounted.net.amount,
+                pricing.discounted.gross.amount,
+            ]
+        rows.append(
+            ProductEffectivePrice(
+                product_id=product.pk,
+                currency=product.currency,
+                undiscounted_net=amounts[0],
+                undiscounted_gross=amounts[1],
+                discounted_net=amounts[2],
+                discounted_gross=amounts[3],
+                valid_on=valid_on,
+            )
+        )
+
+    # MySQL upserts on any unique key and rejects an explicit target.
+    unique_fields = (
+        ["product"] if connection.features.supports_update_conflicts_with_target else None
+    )
+    ProductEffectivePrice.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=_UPDATE_FIELDS,
+    )
+    return len(rows)
+
+
+def refresh_effective_prices(product_ids: Optional[Iterable[int]] = None) -> int:
+    """Re-price the given products (all products when *product_ids* is None).
+
+    Products are loaded and written in chunks of ``_CHUNK_SIZE``.  Ids of
+    products that no longer exist are ignored (their rows are removed by
+    ``on_delete=CASCADE``).  Returns the number of rows written.
+    """
+    qs = Product.objects.select_related("tax_class").order_by("id")
+
+    written = 0
+    if product_ids is None:
+        last_id = 0
+        while True:
+            chunk = list(qs.filter(pk__gt=last_id)[:_CHUNK_SIZE])
+            if not chunk:
+                return written
+            written += refresh_product_effective_prices(chunk)
+            last_id = chunk[-1].pk
+
+    ids = sorted(set(product_ids))
+    for start in range(0, len(ids), _CHUNK_SIZE):
+        written += refresh_product_effective_prices(
+            qs.filter(pk__in=ids[start : start + _CHUNK_SIZE])
+        )
+    return written
+
+
+def backfill_effective_prices_if_empty() -> int:
+    """Run a full :func:`refresh_effective_prices` when no row exists yet.
+
+    A no-op (returns 0) once the table has rows or when there are no
+    products.  Called from the ``post_migrate`` handler in
+    ``products.signals``.
+    """
+    if ProductEffectivePrice.objects.exists() or not Product.objects.exists():
+        return 0
+    return refresh_effective_prices()
+
+
+# ---------------------------------------------------------------------------
+# Targeted refreshes
+# ---------------------------------------------------------------------------
+
+
+def product_ids_for_tax_class(tax_class_id: int) -> list[int]:
+    return list(
+        Product.objects.filter(tax_class_id=tax_class_id).values_list("id", flat=True)
+    )
+
+
+def product_ids_for_promotions(promotion_ids: Iterable[int]) -> list[int]:
+    """Ids of products targeted by the given line promotions, directly or via category."""
+    from discounts.models import PromotionCategory, PromotionProduct  # noqa: PLC0415
+
+    promotion_ids = list(promotion_ids)
+    category_ids = PromotionCategory.objects.filter(
+        promotion_id__in=promotion_ids
+    ).values("category_id")
+    direct_ids = PromotionProduct.objects.filter(
+        promotion_id__in=promotion_ids
+    ).values("product_id")
+    return list(
+        Product.objects.filter(
+            Q(pk__in=direct_ids) | Q(category_id__in=category_ids)
+        ).values_list("id", flat=True)
+    )
+
+
+def refresh_effective_prices_at_window_boundaries(today: date) -> int:
+    """Re-price products whose rows predate a promotion window boundary up to *today*.
+
+    A promotion's boundaries are its ``active_from`` and the day after its
+    ``active_to``.  A row priced for ``valid_on`` is stale when a promotion
+    targeting its product has a boundary in ``(valid_on, today]``; boundaries
+    are looked up from the oldest ``valid_on`` in the table, so days on which
+    the job did not run are caught up.  Boundaries on *today* re-price every
+    targeted row, as rows priced earlier today may come from a promotion
+    snapshot that predates the promotion.
+    """
+    from discounts.models import Promotion  # noqa: PLC0415
+
+    oldest = ProductEffectivePrice.objects.aggregate(oldest=Min("valid_on"))["oldest"]
+    if oldest is None:
+        return 0
+    first = min(oldest + timedelta(days=1), today)
+
+    stale: set[int] = set()
+    for promotion_id, active_from, active_to in Promotion.objects.filter(
+        Q(active_from__range=(first, today))
+        | Q(active_to__range=(first - timedelta(days=1), today - timedelta(days=1)))
+    ).values_list("id", "active_from", "active_to"):
+        boundary = max(
+            day
+            for day in (active_from, active_to and active_to + timedelta(days=1))
+            if day is not None and first <= day <= today
+        )
+        cutoff = boundary + timedelta(days=1) if boundary == today else boundary
+        stale.update(
+            ProductEffectivePrice.objects.filter(
+                product_id__in=product_ids_for_promotions([promotion_id]),
+                valid_on__lt=cutoff,
+            ).values_list("product_id", flat=True)
+        )
+    if not stale:
+        return 0
+    return refresh_effective_prices(sorted(stale))
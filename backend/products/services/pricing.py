@@ -32,6 +32,12 @@ Design notes
 - The service does not compute tax directly — it delegates to ``resolve_tax``.
 - The service does not apply promotions directly — it delegates to
   ``resolve_line_promotion``.
+- Listings price many products at once: resolve the winners with
+  ``resolve_line_promotions_bulk`` and pass them as ``line_promotions`` so
+  no per-product promotion query is issued.
+- ``price_products_bulk`` is the batch engine for listings and carts: the
+  same arithmetic on integer minor-unit columns, with result objects built
+  only when a caller (typically a serializer) asks for one.
 
 Usage
 -----
@@ -51,13 +57,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal, ROUND_HALF_UP
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Iterable, Mapping, Optional
 
 from prices import Money, TaxedMoney
 
 from products.services.tax_resolver import resolve_tax
 
 if TYPE_CHECKING:
+    from discounts.models import Promotion
     from products.models import Product
 
 
@@ -201,7 +208,12 @@ class ProductPricingResult:
 # ---------------------------------------------------------------------------
 
 
-def get_product_pricing(product: "Product") -> Optional[ProductPricingResult]:
+def get_product_pricing(
+    product: "Product",
+    *,
+    line_promotions: Optional[Mapping[int, Optional["Promotion"]]] = None,
+    bulk_pricing: Optional["BulkPricing"] = None,
+) -> Optional[ProductPricingResult]:
     """Return the full promotion-aware pricing breakdown for a product, or ``None``.
 
     Returns ``None`` when ``product.price_net_amount`` is not set (products not
@@ -218,11 +230,24 @@ def get_product_pricing(product: "Product") -> Optional[ProductPricingResult]:
         via FK; callers should use
         ``select_related("tax_class", "category")`` on the queryset when
         pricing many products at once to avoid N+1 queries.
+    line_promotions:
+        Optional mapping of product id to its pre-resolved winning promotion,
+        as returned by
+        :func:`~discounts.services.line_promotion.resolve_line_promotions_bulk`.
+        When the product is present in the mapping no promotion query is
+        issued; otherwise the winner is resolved for this product alone.
+    bulk_pricing:
+        Optional result of :func:`price_products_bulk` for a batch the
+        product belongs to.  When the product is present its precomputed
+        pricing is returned and nothing is recomputed.
 
     Returns
     -------
     ProductPricingResult | None
     """
+    if bulk_pricing is not None and product.pk in bulk_pricing:
+        return bulk_pricing.result(product.pk)
+
     if product.price_net_amount is None:
         return None
 
@@ -245,15 +270,26 @@ def get_product_pricing(product: "Product") -> Optional[ProductPricingResult]:
     )
 
     # Step 2: Resolve line-level promotion (lazy import avoids circular deps).
-    from discounts.services.line_promotion import resolve_line_promotion  # noqa: PLC0415
-
-    promo_result = resolve_line_promotion(
-        product=product,
-        net_amount=product.price_net_amount,
-        currency=currency,
-        tax_rate=tax_rate,
+    from discounts.services.line_promotion import (  # noqa: PLC0415
+        build_line_promotion_result,
+        resolve_line_promotion,
     )
 
+    if line_promotions is not None and product.pk in line_promotions:
+        promo_result = build_line_promotion_result(
+            promotion=line_promotions[product.pk],
+            net_amount=product.price_net_amount,
+            currency=currency,
+            tax_rate=tax_rate,
+        )
+    else:
+        promo_result = resolve_line_promotion(
+            product=product,
+            net_amount=product.price_net_amount,
+            currency=currency,
+            tax_rate=tax_rate,
+        )
+
     # Step 3: If a promotion applies, compute tax on the discounted NET.
     if promo_result.promotion is None:
         # No promotion — discounted tier == undiscounted tier.
@@ -312,3 +348,267 @@ def get_product_pricing(product: "Product") -> Optional[ProductPricingResult]:
             amount_scope=promo_result.amount_scope,
         ),
     )
+
+
+# ---------------------------------------------------------------------------
+# Bulk pricing engine
+# ---------------------------------------------------------------------------
+#
+# Same arithmetic as ``get_product_pricing`` / ``resolve_tax`` /
+# ``_compute_discount``, carried out on integers:
+#
+# - money in minor units (cents), promotion values in cents,
+# - tax multipliers as ``1_000_000 + rate * 10_000`` (rates have 4 decimal
+#   places, so ``1 + rate / 100`` is exact at 6 decimal places),
+# - every ``quantize(0.01, ROUND_HALF_UP)`` of a non-negative quotient p / q
+#   becomes ``(2p + q) // 2q``.
+#
+# Exact rational rounding equals Decimal's 28-digit quotient followed by
+# ROUND_HALF_UP for the magnitudes involved, so both paths agree to the cent.
+# Inputs that do not fit the integer model (extra decimal places, negative
+# amounts) are priced by the scalar path instead.
+
+_MICRO = 1_000_000
+_PERCENT_DIVISOR = 10_000  # value_cents / 100 (percent) / 100 (cents)
+
+_KIND_NONE = 0
+_KIND_PERCENT = 1
+_KIND_FIXED_GROSS = 2
+_KIND_FIXED_NET = 3
+
+
+def _to_units(value: Optional[Decimal], places: int) -> Optional[int]:
+    """Return ``value * 10**places`` as an int, or None when not exact / negative."""
+    if value is None:
+        return None
+    scaled = value.scaleb(places)
+    if scaled != scaled.to_integral_value() or scaled < 0:
+        return None
+    return int(scaled)
+
+
+def _from_cents(units: int) -> Decimal:
+    return Decimal(units).scaleb(-2)
+
+
+def _div_half_up(p: int, q: int) -> int:
+    """``round_half_up(p / q)`` for ``p >= 0``, ``q > 0``."""
+    return (2 * p + q) // (2 * q)
+
+
+@dataclass(frozen=True)
+class PricingMinorUnits:
+    """Per-unit amounts in minor units, as needed for cart totals."""
+
+    undiscounted_gross: int
+    discounted_gross: int
+    discounted_tax: int
+
+
+class BulkPricing:
+    """Columnar pricing for many products, returned by :func:`price_products_bulk`.
+
+    Amounts are kept in integer arrays; ``ProductPricingResult`` objects are
+    only built when ``result()`` is called, i.e. at the serializer boundary.
+    """
+
+    def __init__(self) -> None:
+        self._row: dict[int, int] = {}
+        self._products: list["Product"] = []
+        self._tax_rates: list[Decimal] = []
+        self._promotions: list[Optional["Promotion"]] = []
+        self._und_net: list[int] = []
+        self._und_gross: list[int] = []
+        self._dis_net: list[int] = []
+        self._dis_gross: list[int] = []
+        self._discount: list[int] = []
+        self._percentage: list[Optional[int]] = []
+        # Scalar-path results for products outside the integer model, and
+        # ``None`` for products without price_net_amount.
+        self._scalar: dict[int, Optional[ProductPricingResult]] = {}
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self._row or product_id in self._scalar
+
+    def __len__(self) -> int:
+        return len(self._row) + len(self._scalar)
+
+    def minor_units(self, product_id: int) -> Optional[PricingMinorUnits]:
+        """Per-unit gross / tax in minor units, or None for unpriced products."""
+        row = self._row.get(product_id)
+        if row is not None:
+            return PricingMinorUnits(
+                undiscounted_gross=self._und_gross[row],
+                discounted_gross=self._dis_gross[row],
+                discounted_tax=self._dis_gross[row] - self._dis_net[row],
+            )
+        result = self._scalar.get(product_id)
+        if result is None:
+            return None
+        return PricingMinorUnits(
+            undiscounted_gross=int(result.undiscounted.gross.amount.scaleb(2)),
+            discounted_gross=int(result.discounted.gross.amount.scaleb(2)),
+            discounted_tax=int(result.discounted.tax.amount.scaleb(2)),
+        )
+
+    def result(self, product_id: int) -> Optional[ProductPricingResult]:
+        """Build the ``ProductPricingResult`` for one product (None when unpriced)."""
+        row = self._row.get(product_id)
+        if row is None:
+            return self._scalar.get(product_id)
+
+        product = self._products[row]
+        currency = product.currency
+        tax_rate = self._tax_rates[row]
+        undiscounted = self._tier(self._und_net[row], self._und_gross[row], currency, tax_rate)
+        promotion = self._promotions[row]
+        zero = Money(_from_cents(0), currency)
+
+        if promotion is None:
+            return ProductPricingResult(
+                undiscounted=undiscounted,
+                discounted=undiscounted,
+                discount=DiscountResult(
+                    amount_net=zero,
+                    amount_gross=zero,
+                    percentage=Decimal("0"),
+                    promotion_code=None,
+                    promotion_type=None,
+                    amount_scope=None,
+                ),
+            )
+
+        percentage = self._percentage[row]
+        return ProductPricingResult(
+            undiscounted=undiscounted,
+            discounted=self._tier(self._dis_net[row], self._dis_gross[row], currency, tax_rate),
+            discount=DiscountResult(
+                amount_net=Money(_from_cents(self._discount[row]), currency),
+                amount_gross=Money(
+                    _from_cents(self._und_gross[row] - self._dis_gross[row]), currency
+                ),
+                percentage=None if percentage is None else _from_cents(percentage),
+                promotion_code=promotion.code,
+                promotion_type=promotion.type,
+                amount_scope=promotion.amount_scope if promotion.type == "FIXED" else None,
+            ),
+        )
+
+    @staticmethod
+    def _tier(net: int, gross: int, currency: str, tax_rate: Decimal) -> PricingTierResult:
+        return PricingTierResult(
+            net=Money(_from_cents(net), currency),
+            gross=Money(_from_cents(gross), currency),
+            tax=Money(_from_cents(gross - net), currency),
+            currency=currency,
+            tax_rate=tax_rate,
+        )
+
+
+def price_products_bulk(
+    products: Iterable["Product"],
+    promotions: Optional[Mapping[int, Optional["Promotion"]]] = None,
+) -> BulkPricing:
+    """Price many products at once on integer minor-unit columns.
+
+    Produces exactly what ``get_product_pricing`` would for each product,
+    without building per-product ``Money`` / dataclass objects up front.
+
+    Parameters
+    ----------
+    products:
+        Products to price.  ``tax_class`` is read via FK — use
+        ``select_related("tax_class")``.
+    promotions:
+        Winning line promotion per product id, as returned by
+        :func:`~discounts.services.line_promotion.resolve_line_promotions_bulk`.
+        Resolved here when omitted.
+
+    Returns
+    -------
+    BulkPricing
+        Call ``.result(product_id)`` for a ``ProductPricingResult`` (or
+        ``None`` when the product has no ``price_net_amount``).
+    """
+    products = list(products)
+    if promotions is None:
+        from discounts.services.line_promotion import (  # noqa: PLC0415
+            resolve_line_promotions_bulk,
+        )
+
+        promotions = resolve_line_promotions_bulk(products)
+
+    bulk = BulkPricing()
+
+    # --- Gather input columns -----------------------------------------------
+    net: list[int] = []
+    multiplier: list[int] = []
+    kind: list[int] = []
+    value: list[int] = []
+    for product in products:
+        if product.price_net_amount is None:
+            bulk._scalar[product.pk] = None
+            continue
+
+        tax_class = product.tax_class
+        rate = tax_class.rate if (tax_class and tax_class.rate is not None) else Decimal("0")
+        promotion = promotions.get(product.pk)
+        net_cents = _to_units(product.price_net_amount, 2)
+        rate_e4 = _to_units(rate, 4)
+        value_cents = _to_units(promotion.value, 2) if promotion is not None else 0
+        if net_cents is None or rate_e4 is None or value_cents is None:
+            bulk._scalar[product.pk] = get_product_pricing(
+                product, line_promotions=promotions
+            )
+            continue
+
+        if promotion is None:
+            promo_kind = _KIND_NONE
+        elif promotion.type == "PERCENT":
+            promo_kind = _KIND_PERCENT
+        elif promotion.amount_scope == "GROSS":
+            promo_kind = _KIND_FIXED_GROSS
+        else:
+            promo_kind = _KIND_FIXED_NET
+
+        bulk._row[product.pk] = len(bulk._products)
+        bulk._products.append(product)
+        bulk._tax_rates.append(rate)
+        bulk._promotions.append(promotion)
+        net.append(net_cents)
+        multiplier.append(_MICRO + rate_e4)
+        kind.append(promo_kind)
+        value.append(value_cents)
+
+    # --- Undiscounted tier --------------------------------------------------
+    und_gross = [_div_half_up(n * m, _MICRO) for n, m in zip(net, multiplier)]
+
+    # --- Line discount (clamped to [0, net]) --------------------------------
+    discount = []
+    for n, m, g, k, v in zip(net, multiplier, und_gross, kind, value):
+        if k == _KIND_NONE:
+            raw = 0
+        elif k == _KIND_PERCENT:
+            raw = _div_half_up(n * v, _PERCENT_DIVISOR)
+        elif k == _KIND_FIXED_GROSS:
+            discounted_gross = g - min(v, g)
+            raw = n - _div_half_up(discounted_gross * _MICRO, m) if m > 0 else 0
+        else:
+            raw = v
+        discount.append(max(0, min(raw, n)))
+
+    # --- Discounted tier ----------------------------------------------------
+    dis_net = [n - d for n, d in zip(net, discount)]
+    dis_gross = [_div_half_up(n * m, _MICRO) for n, m in zip(dis_net, multiplier)]
+    percentage = [
+        _div_half_up(d * _PERCENT_DIVISOR, n) if n > 0 else None
+        for n, d in zip(net, discount)
+    ]
+
+    bulk._und_net = net
+    bulk._und_gross = und_gross
+    bulk._dis_net = dis_net
+    bulk._dis_gross = dis_gross
+    bulk._discount = discount
+    bulk._percentage = percentage
+    return bulk
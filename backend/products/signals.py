@@ -0,0 +1,143 @@
+"""Signal handlers keeping derived catalogue data in sync with products.
+
+Search
+------
+Creating, deleting or editing the searchable text of a Product bumps the
+catalogue version so that :class:`~products.search.cache.CachedSearchBackend`
+stops serving hit lists computed before the change, and queues the product
+for re-indexing by the in-memory ngram index.
+
+Saves restricted via ``update_fields`` to columns outside the FULLTEXT
+index (e.g. ``stock_quantity`` during reservations) cannot change search
+hits and do not bump the version.  The version is bumped at write time
+only; a hit list another worker caches before the transaction commits is
+bounded by ``CATALOGUE_SEARCH_CACHE_TTL_SECONDS``, an ngram index entry
+re-read from the old row by ``CATALOGUE_NGRAM_INDEX_TTL_SECONDS``.
+
+Effective prices
+----------------
+Saving a product re-prices its ``ProductEffectivePrice`` row, and saving a
+tax class re-prices every product of that class.  Both run synchronously
+inside the writing transaction, so a rollback discards them too.  Rows of
+deleted products go away through ``on_delete=CASCADE``.
+
+After ``migrate`` (once every migration is applied) an empty
+``ProductEffectivePrice`` table is backfilled, so the first deploy of the
+table does not depend on running ``refresh_effective_prices`` by hand.
+"""
+
+import logging
+
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models.signals import post_delete, post_save, pre_delete
+
+from products.models import Product, TaxClass
+from products.search.cache import bump_catalogue_version
+from products.search.ngram import note_product_change
+from products.services.effective_price import (
+    backfill_effective_prices_if_empty,
+    product_ids_for_tax_class,
+    refresh_effective_prices,
+    refresh_product_effective_prices,
+)
+
+logger = logging.getLogger(__name__)
+
+# Columns covered by the FULLTEXT index (see MySQLCatalogSearchBackend).
+SEARCH_INDEXED_FIELDS = frozenset({"name", "short_description", "full_description"})
+
+# Columns that feed get_product_pricing (the legacy price is the fallback).
+PRICING_FIELDS = frozenset(
+    {
+        "price",
+        "price_net_amount",
+        "currency",
+        "tax_class",
+        "tax_class_id",
+        "category",
+        "category_id",
+    }
+)
+
+
+def _bump(product_id: int) -> None:
+    note_product_change(product_id, version=bump_catalogue_version())
+
+
+def bump_catalogue_version_on_save(
+    sender, instance, created=False, update_fields=None, **kwargs
+):
+    if created or update_fields is None or SEARCH_INDEXED_FIELDS & set(update_fields):
+        _bump(instance.pk)
+
+
+def bump_catalogue_version_on_delete(sender, instance, **kwargs):
+    _bump(instance.pk)
+
+
+def refresh_effective_price_on_product_save(
+    sender, instance, created=False, update_fields=None, **kwargs
+):
+    if created or update_fields is None or PRICING_FIELDS & set(update_fields):
+        refresh_product_effective_prices([instance])
+
+
+def refresh_effective_prices_on_tax_class_save(sender, instance, created=False, **kwargs):
+    if not created:
+        refresh_effective_prices(product_ids_for_tax_class(instance.pk))
+
+
+def collect_products_on_tax_class_delete(sender, instance, **kwargs):
+    # Products are detached with a bulk SET NULL; remember them beforehand.
+    instance._effective_price_product_ids = product_ids_for_tax_class(instance.pk)
+
+
+def refresh_effective_prices_on_tax_class_delete(sender, instance, **kwargs):
+    refresh_effective_prices(getattr(instance, "_effective_price_product_ids", []))
+
+
+def backfill_effective_prices_after_migrate(sender, using="default", plan=None, **kwargs):
+    # Only with the schema fully migrated: pricing uses the live models.
+    # Connected to the products app's post_migrate in ProductsConfig.ready().
+    connection = connections[using]
+    executor = MigrationExecutor(connection)
+    if executor.migration_plan(executor.loader.graph.leaf_nodes()):
+        return
+    written = backfill_effective_prices_if_empty()
+    if written:
+        logger.warning(
+            "ProductEffectivePrice was empty; backfilled %s effective prices.", written
+        )
+
+
+post_save.connect(
+    bump_catalogue_version_on_save,
+    sender=Product,
+    dispatch_uid="catalogue_version_post_save_Product",
+)
+post_delete.connect(
+    bump_catalogue_version_on_delete,
+    sender=Product,
+    dispatch_uid="catalogue_version_post_delete_Product",
+)
+post_save.connect(
+    refresh_effective_price_on_product_save,
+    sender=Product,
+    dispatch_uid="effective_price_post_save_Product",
+)
+post_save.connect(
+    refresh_effective_prices_on_tax_class_save,
+    sender=TaxClass,
+    dispatch_uid="effective_price_post_save_TaxClass",
+)
+pre_delete.connect(
+    collect_products_on_tax_class_delete,
+    sender=TaxClass,
+    dispatch_uid="effective_price_pre_delete_TaxClass",
+)
+post_delete.connect(
+    refresh_effective_prices_on_tax_class_delete,
+    sender=TaxClass,
+    dispatch_uid="effective_price_post_delete_TaxClass",
+)
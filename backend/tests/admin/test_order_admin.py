@@ -1,3 +1,6 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
 import pytest
 from django.contrib import messages
 from django.contrib.admin.sites import AdminSite
@@ -15,7 +18,10 @@ from orderitems.admin import (
     ShippingMethodFilter,
     ShippingProviderFilter,
 )
+from orderitems.models import OrderItem
 from orders.models import Order
+from orders.services.vat_breakdown import compute_order_vat_breakdown
+from products.models import Product
 from shipping.models import Shipment
 from shipping.services.fulfillment import BulkOrderFulfillmentResult, OrderFulfillmentService
 from shipping.services.shipment import ShipmentService
@@ -147,6 +153,35 @@ def test_order_admin_fieldsets_only_include_editable_model_fields(order_admin):
     assert "id" not in base_fields
 
 
+def test_order_admin_vat_breakdown_is_read_only_and_recomputed_on_save(order_admin):
+    assert "vat_breakdown" in order_admin.readonly_fields
+
+    order = create_valid_order(user=None, status=Order.Status.PAID)
+    product = Product.objects.create(name="Admin item", price=Decimal("10.00"), stock_quantity=5)
+    OrderItem.objects.create(
+        order=order,
+        product=product,
+        quantity=3,
+        price_at_order_time=Decimal("36.30"),
+        line_total_net_at_order_time=Decimal("30.00"),
+        line_total_gross_at_order_time=Decimal("36.30"),
+        tax_rate_at_order_time=Decimal("21"),
+    )
+    Order.objects.filter(pk=order.pk).update(vat_breakdown=[{"stale": True}])
+    order.refresh_from_db()
+
+    unchanged = SimpleNamespace(instance=order, save_m2m=lambda: None, has_changed=lambda: False)
+    order_admin.save_related(_request_with_messages(), unchanged, [], change=True)
+    order.refresh_from_db()
+    assert order.vat_breakdown == [{"stale": True}]
+
+    edited = SimpleNamespace(instance=order, save_m2m=lambda: None, has_changed=lambda: True)
+    order_admin.save_related(_request_with_messages(), edited, [], change=True)
+    order.refresh_from_db()
+    assert order.vat_breakdown == compute_order_vat_breakdown(order)
+    assert order.vat_breakdown
+
+
 def test_current_shipment_status_filter_supports_no_shipment_and_failed_delivery(order_admin):
     user = User.objects.create_user(email="order-admin-status-filter@example.com", password="pass")
     no_shipment_order = create_valid_order(user=user, status=Order.Status.PAID)
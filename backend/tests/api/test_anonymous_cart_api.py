@@ -166,3 +166,51 @@ def test_guest_register_then_login_adopts_guest_cart(product):
     assert res2.status_code in (200, 201, 404, 401), res2.content
     if res2.status_code in (200, 201):
         assert res2.json()["items"] == []
+
+
+@pytest.mark.django_db
+@pytest.mark.sqlite
+def test_guest_get_without_token_returns_virtual_cart_without_writing():
+    """
+    Anonymous reads are write-free:
+    - no token -> empty virtual cart (id null), no cookie, no Cart row
+    - an unknown token behaves the same way
+    """
+    client = APIClient()
+
+    res = client.get("/api/v1/cart/")
+    assert res.status_code == 200, res.content
+    body = res.json()
+    assert body["id"] is None
+    assert body["status"] == "ACTIVE"
+    assert body["items"] == []
+    assert body["totals"]["item_count"] == 0
+    assert CART_TOKEN_COOKIE not in res.cookies
+
+    res = client.get(
+        "/api/v1/cart/",
+        **{f"HTTP_{CART_TOKEN_HEADER.replace('-', '_').upper()}": "unknown-token"},
+    )
+    assert res.status_code == 200, res.content
+    assert res.json()["id"] is None
+
+    assert not Cart.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.sqlite
+def test_guest_first_mutation_materialises_cart_read_by_later_gets(product):
+    client = APIClient()
+    client.get("/api/v1/cart/")
+
+    add = client.post(
+        "/api/v1/cart/items/",
+        {"product_id": product.id, "quantity": 1},
+        format="json",
+    )
+    assert add.status_code == 201, add.content
+    _extract_cart_token_from_response(add)
+
+    res = client.get("/api/v1/cart/")
+    assert res.json()["id"] == Cart.objects.get().id
+    assert CART_TOKEN_COOKIE not in res.cookies
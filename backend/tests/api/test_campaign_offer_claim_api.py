@@ -2,6 +2,7 @@
 
 Covers:
 - POST /api/v1/cart/offer/claim/ with valid token → 200, cookie set in response
+- anonymous claim without a cart creates the cart and mirrors the token on it
 - POST with non-existent token → 404
 - POST with inactive offer → 400 (OFFER_INACTIVE)
 - POST with non-CAMPAIGN_APPLY offer → 400 (OFFER_NOT_CLAIMABLE)
@@ -161,6 +162,27 @@ def test_claim_response_sets_campaign_offer_cookie():
     assert resp.cookies[CAMPAIGN_OFFER_COOKIE].value == offer.token
 
 
+@pytest.mark.django_db
+def test_anonymous_claim_without_cart_creates_cart_with_offer_token():
+    """Claiming is a cart mutation: it materialises the anonymous cart."""
+    from carts.models import Cart
+
+    promo = _campaign_promotion()
+    offer = _offer(promo)
+    client = APIClient()
+
+    resp = client.post(CLAIM_URL, {"token": offer.token}, format="json")
+
+    assert resp.status_code == 200
+    assert "cart_token" in resp.cookies
+    cart = Cart.objects.get()
+    assert cart.user is None
+    assert cart.claimed_offer_token == offer.token
+
+    # The same client now reads the persisted cart.
+    assert client.get(CART_URL).json()["id"] == cart.id
+
+
 @pytest.mark.django_db
 def test_claim_missing_token_returns_404():
     client = APIClient()
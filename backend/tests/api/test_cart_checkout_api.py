@@ -229,7 +229,7 @@ def test_checkout_rolls_back_on_order_item_failure(auth_client, user):
 
     # force failure INSIDE transaction
     with patch(
-        "api.views.carts.OrderItem.objects.create",
+        "api.views.carts.OrderItem.objects.bulk_create",
         side_effect=Exception("Boom during order item creation"),
     ):
         response = auth_client.post(
@@ -0,0 +1,160 @@
+"""
+Tests for POST /api/v1/cart/items/bulk/ — several cart lines in one request.
+
+Covers:
+  - New lines are inserted (201) and returned in the full cart snapshot
+  - Existing lines get their quantity set (200) and keep price_at_add_time
+  - Any invalid line (missing / unavailable / out of stock) writes nothing
+  - Duplicate product ids and empty payloads are rejected with 400
+  - Anonymous requests receive a cart_token cookie for a new cart
+  - The write path does not scale queries with the number of lines
+  - A cart checked out before the write is locked gets 404, nothing written
+"""
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.views import carts as cart_views
+from carts.models import Cart, CartItem
+from products.models import Product
+
+BULK_URL = "/api/v1/cart/items/bulk/"
+
+
+def _product(name: str = "P", *, stock: int = 10, is_active: bool = True) -> Product:
+    return Product.objects.create(
+        name=name, price=Decimal("10.00"), stock_quantity=stock, is_active=is_active
+    )
+
+
+def _lines(*pairs):
+    return {"items": [{"product_id": pid, "quantity": qty} for pid, qty in pairs]}
+
+
+@pytest.mark.django_db
+def test_bulk_inserts_new_lines_and_returns_cart_snapshot(auth_client):
+    a, b = _product("A"), _product("B")
+
+    resp = auth_client.post(BULK_URL, _lines((a.id, 1), (b.id, 3)), format="json")
+
+    assert resp.status_code == 201
+    quantities = {i["product"]["id"]: i["quantity"] for i in resp.json()["items"]}
+    assert quantities == {a.id: 1, b.id: 3}
+    assert "totals" in resp.json()
+
+
+@pytest.mark.django_db
+def test_bulk_sets_quantity_of_existing_lines_and_keeps_snapshot(auth_client):
+    a, b = _product("A"), _product("B")
+    auth_client.post("/api/v1/cart/items/", {"product_id": a.id, "quantity": 1}, format="json")
+    CartItem.objects.filter(product=a).update(price_at_add_time=Decimal("7.00"))
+
+    resp = auth_client.post(BULK_URL, _lines((a.id, 4)), format="json")
+    assert resp.status_code == 200
+
+    resp = auth_client.post(BULK_URL, _lines((a.id, 2), (b.id, 1)), format="json")
+    assert resp.status_code == 201
+
+    item = CartItem.objects.get(product=a)
+    assert item.quantity == 2
+    assert item.price_at_add_time == Decimal("7.00")
+    assert CartItem.objects.get(product=b).price_at_add_time == Decimal("10.00")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "bad_line, expected_status",
+    [
+        ("missing", 404),
+        ("inactive", 409),
+        ("out_of_stock", 409),
+    ],
+)
+def test_bulk_rejects_whole_request_when_one_line_is_invalid(
+    auth_client, bad_line, expected_status
+):
+    ok = _product("OK")
+    if bad_line == "missing":
+        bad_id, qty = 999_999, 1
+    elif bad_line == "inactive":
+        bad_id, qty = _product("Off", is_active=False).id, 1
+    else:
+        bad_id, qty = _product("Low", stock=2).id, 5
+
+    resp = auth_client.post(BULK_URL, _lines((ok.id, 1), (bad_id, qty)), format="json")
+
+    assert resp.status_code == expected_status
+    assert not CartItem.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"items": []},
+        {},
+        {"items": [{"product_id": 1, "quantity": 0}]},
+        {"items": [{"product_id": 1, "quantity": 1}, {"product_id": 1, "quantity": 2}]},
+    ],
+)
+def test_bulk_rejects_malformed_payloads(auth_client, payload):
+    _product("A")
+
+    resp = auth_client.post(BULK_URL, payload, format="json")
+
+    assert resp.status_code == 400
+    assert not CartItem.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_anonymous_request_sets_cart_token_cookie():
+    a = _product("A")
+    client = APIClient()
+
+    resp = client.post(BULK_URL, _lines((a.id, 2)), format="json")
+
+    assert resp.status_code == 201
+    assert resp.cookies.get("cart_token") is not None
+
+    client.cookies["cart_token"] = resp.cookies["cart_token"].value
+    cart = client.get("/api/v1/cart/").json()
+    assert [i["quantity"] for i in cart["items"]] == [2]
+
+
+@pytest.mark.django_db
+def test_bulk_query_count_does_not_grow_with_lines(auth_client):
+    auth_client.get("/api/v1/cart/")
+    few = [_product(f"F{i}") for i in range(2)]
+    many = [_product(f"M{i}") for i in range(12)]
+
+    def _count(products):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = auth_client.post(
+                BULK_URL, _lines(*[(p.id, 1) for p in products]), format="json"
+            )
+        assert resp.status_code == 201
+        return len(ctx.captured_queries)
+
+    assert _count(many) == _count(few)
+
+
+@pytest.mark.django_db
+def test_bulk_on_cart_checked_out_meanwhile_writes_nothing(auth_client):
+    a = _product("A")
+    resolve = cart_views._resolve_or_create_cart
+
+    def resolve_then_checkout(request):
+        resolved = resolve(request)
+        Cart.objects.filter(pk=resolved[0].pk).update(status=Cart.Status.CONVERTED)
+        return resolved
+
+    with patch.object(cart_views, "_resolve_or_create_cart", side_effect=resolve_then_checkout):
+        resp = auth_client.post(BULK_URL, _lines((a.id, 1)), format="json")
+
+    assert resp.status_code == 404
+    assert resp.json()["code"] == "NO_ACTIVE_CART"
+    assert not CartItem.objects.exists()
@@ -0,0 +1,172 @@
+"""
+Checkout pricing token — preflight pricing reused by POST /cart/checkout/.
+
+Covers:
+  - Preflight returns a pricing_token
+  - Checkout with a valid token creates the order without repricing the cart
+    and reports the preflight price-change payload
+  - A product price change after preflight invalidates the token; checkout
+    reprices and uses the current price
+  - A promotion edited without bumping this process's version (another
+    worker, LocMem cache) invalidates the token once the snapshot is rebuilt
+  - Editing the claimed campaign offer's promotion after preflight
+    invalidates the token without any promotion version bump
+  - Tampered tokens and tokens issued for another cart are ignored
+"""
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from rest_framework.test import APIClient
+
+from carts.models import Cart
+from api.services.campaign_offer_session import CAMPAIGN_OFFER_COOKIE
+from discounts.models import (
+    AcquisitionMode,
+    Offer,
+    OfferStatus,
+    OrderPromotion,
+    Promotion,
+    PromotionProduct,
+    PromotionType,
+    StackingPolicy,
+)
+from discounts.services.promotion_snapshot import get_promotion_version
+from orders.models import Order
+from orders.services.checkout_pricing_token import resolve_checkout_pricing_token
+from products.models import Product, TaxClass
+from tests.conftest import checkout_payload
+
+PREFLIGHT_URL = "/api/v1/cart/checkout/preflight/"
+CHECKOUT_URL = "/api/v1/cart/checkout/"
+
+
+@pytest.fixture
+def product():
+    tax_class = TaxClass.objects.create(name="Std", code="std-token", rate=Decimal("21"))
+    return Product.objects.create(
+        name="Mug",
+        price=Decimal("10.00"),
+        price_net_amount=Decimal("10.00"),
+        currency="EUR",
+        tax_class=tax_class,
+        stock_quantity=20,
+        is_active=True,
+    )
+
+
+def _fill_cart(client, product, quantity=2):
+    client.post(
+        "/api/v1/cart/items/",
+        {"product_id": product.id, "quantity": quantity},
+        format="json",
+    )
+
+
+def _checkout(client, user, **overrides):
+    return client.post(
+        CHECKOUT_URL, checkout_payload(customer_email=user.email, **overrides), format="json"
+    )
+
+
+@pytest.mark.django_db
+def test_checkout_with_valid_token_skips_repricing(auth_client, user, product):
+    _fill_cart(auth_client, product)
+    preflight = auth_client.get(PREFLIGHT_URL).json()
+    assert preflight["pricing_token"]
+
+    with patch(
+        "api.views.carts.get_cached_cart_pricing",
+        side_effect=AssertionError("cart repriced"),
+    ):
+        response = _checkout(auth_client, user, pricing_token=preflight["pricing_token"])
+
+    assert response.status_code == 201, response.content
+    assert response.json()["price_change"] == preflight["price_change"]
+    order = Order.objects.get(pk=response.json()["id"])
+    assert order.subtotal_gross == Decimal("24.20")
+    assert order.items.get().unit_price_at_order_time == Decimal("12.10")
+
+
+@pytest.mark.django_db
+def test_price_change_after_preflight_invalidates_token(auth_client, user, product):
+    _fill_cart(auth_client, product)
+    token = auth_client.get(PREFLIGHT_URL).json()["pricing_token"]
+
+    Product.objects.filter(pk=product.pk).update(price_net_amount=Decimal("20.00"))
+    response = _checkout(auth_client, user, pricing_token=token)
+
+    assert response.status_code == 201, response.content
+    order = Order.objects.get(pk=response.json()["id"])
+    assert order.subtotal_gross == Decimal("48.40")
+    assert response.json()["price_change"]["severity"] == "WARNING"
+
+
+@pytest.mark.django_db
+def test_promotion_edit_from_another_process_invalidates_token(
+    auth_client, user, product, settings
+):
+    promotion = Promotion.objects.create(
+        name="Mugs", code="mugs-token", type=PromotionType.PERCENT, value=Decimal("10")
+    )
+    PromotionProduct.objects.create(promotion=promotion, product=product)
+    settings.PROMOTION_SNAPSHOT_TTL_SECONDS = 0
+    _fill_cart(auth_client, product)
+    token = auth_client.get(PREFLIGHT_URL).json()["pricing_token"]
+
+    # Another worker's save bumps only its own cache; here the version stays.
+    Promotion.objects.filter(pk=promotion.pk).update(value=Decimal("50"))
+    cart = Cart.objects.get(user=user, status=Cart.Status.ACTIVE)
+    assert resolve_checkout_pricing_token(token, cart) is None
+
+    response = _checkout(auth_client, user, pricing_token=token)
+    assert response.status_code == 201, response.content
+    order = Order.objects.get(pk=response.json()["id"])
+    assert order.items.get().unit_price_at_order_time == Decimal("6.05")
+
+
+@pytest.mark.django_db
+def test_campaign_promotion_edit_invalidates_token(auth_client, user, product):
+    promotion = OrderPromotion.objects.create(
+        name="Campaign",
+        code="campaign-token",
+        type=PromotionType.FIXED,
+        value=Decimal("2.00"),
+        acquisition_mode=AcquisitionMode.CAMPAIGN_APPLY,
+        stacking_policy=StackingPolicy.EXCLUSIVE,
+    )
+    Offer.objects.create(
+        token="camp-tok", promotion=promotion, status=OfferStatus.CREATED, is_active=True
+    )
+    auth_client.cookies[CAMPAIGN_OFFER_COOKIE] = "camp-tok"
+    _fill_cart(auth_client, product)
+    token = auth_client.get(PREFLIGHT_URL).json()["pricing_token"]
+    version = get_promotion_version()
+
+    # Edited in another worker: no snapshot version bump reaches this one.
+    OrderPromotion.objects.filter(pk=promotion.pk).update(value=Decimal("5.00"))
+    response = _checkout(auth_client, user, pricing_token=token)
+
+    assert get_promotion_version() == version
+    assert response.status_code == 201, response.content
+    order = Order.objects.get(pk=response.json()["id"])
+    assert order.order_discount_gross == Decimal("5.00")
+
+
+@pytest.mark.django_db
+def test_foreign_or_tampered_token_is_ignored(auth_client, user, product):
+    other = APIClient()
+    _fill_cart(other, product, quantity=1)
+    foreign_token = other.get(PREFLIGHT_URL).json()["pricing_token"]
+
+    _fill_cart(auth_client, product)
+    own_token = auth_client.get(PREFLIGHT_URL).json()["pricing_token"]
+    cart = Cart.objects.get(user=user, status=Cart.Status.ACTIVE)
+
+    assert resolve_checkout_pricing_token(own_token, cart) is not None
+    assert resolve_checkout_pricing_token(foreign_token, cart) is None
+    assert resolve_checkout_pricing_token(own_token[:-2] + "xx", cart) is None
+
+    response = _checkout(auth_client, user, pricing_token=foreign_token)
+    assert response.status_code == 201, response.content
+    assert Order.objects.get(pk=response.json()["id"]).items.get().quantity == 2
@@ -0,0 +1,191 @@
+"""
+Customer order list: prefetching and opt-in cursor pagination.
+
+Covers:
+  - GET /api/v1/orders/ runs a constant number of queries regardless of how
+    many orders (with items, shipments, shipment events, payments) the user has
+  - The prefetched list returns the same data as serialising each order
+    on its own
+  - ?page_size= returns compact rows newest first with a next_cursor;
+    following the cursors visits every order once; page queries are constant
+  - A malformed cursor, or a well-formed one with a non-integer id, is
+    rejected with INVALID_CURSOR
+  - The list schema declares both the full list and the paginated page
+  - Cancelling an order does not prefetch the response relations
+"""
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from drf_spectacular.generators import SchemaGenerator
+
+from api.pagination import encode_cursor
+from api.serializers.order import OrderResponseSerializer
+from api.views import orders as order_views
+from orderitems.models import OrderItem
+from orders.models import Order
+from payments.models import Payment
+from products.models import Product
+from shipping.models import Shipment, ShipmentEvent
+from shipping.statuses import ShipmentStatus
+from tests.conftest import create_valid_order
+
+pytestmark = pytest.mark.django_db
+
+
+def _order_with_relations(user, product, n):
+    order = create_valid_order(user=user, status=Order.Status.PAID)
+    OrderItem.objects.create(
+        order=order,
+        product=product,
+        quantity=2,
+        unit_price_at_order_time=Decimal("10.00"),
+        line_total_at_order_time=Decimal("20.00"),
+        price_at_order_time=Decimal("20.00"),
+        product_name_at_order_time=f"Snapshot {n}",
+    )
+    # Legacy item without a name snapshot: falls back to the live product.
+    OrderItem.objects.create(order=order, product=product, quantity=1, price_at_order_time=Decimal("5.00"))
+    shipment = Shipment.objects.create(
+        order=order,
+        provider_code="MOCK",
+        service_code="standard",
+        carrier_name_snapshot="Carrier",
+        service_name_snapshot="Standard",
+        status=ShipmentStatus.IN_TRANSIT,
+        tracking_number=f"TRK-{n}",
+    )
+    for status in (ShipmentStatus.LABEL_CREATED, ShipmentStatus.IN_TRANSIT):
+        ShipmentEvent.objects.create(
+            shipment=shipment,
+            event_type="tracking_updated",
+            raw_status=status,
+            normalized_status=status,
+            external_event_id=f"evt-{n}-{status}",
+            payload={},
+        )
+    older = Payment.objects.create(
+        order=order, status=Payment.Status.FAILED, payment_method=Payment.PaymentMethod.CARD
+    )
+    Payment.objects.filter(pk=older.pk).update(created_at=timezone.now() - timedelta(hours=1))
+    Payment.objects.create(
+        order=order, status=Payment.Status.SUCCESS, payment_method=Payment.PaymentMethod.COD
+    )
+    return order
+
+
+@pytest.fixture
+def add_orders(user):
+    product = Product.objects.create(
+        name="Live name", price="10.00", stock_quantity=10, is_active=True
+    )
+    counter = iter(range(1000))
+
+    def add(count):
+        return [_order_with_relations(user, product, next(counter)) for _ in range(count)]
+
+    return add
+
+
+def _get(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200, response.content
+    return response.json(), len(ctx.captured_queries)
+
+
+def test_list_query_count_is_constant(auth_client, add_orders):
+    add_orders(2)
+    small, small_queries = _get(auth_client, "/api/v1/orders/")
+    add_orders(8)
+    large, large_queries = _get(auth_client, "/api/v1/orders/")
+
+    assert (len(small), len(large)) == (2, 10)
+    assert small_queries == large_queries
+
+
+def test_prefetched_list_matches_single_order_serialization(auth_client, add_orders):
+    orders = add_orders(3)
+
+    data, _ = _get(auth_client, "/api/v1/orders/")
+
+    expected = [
+        OrderResponseSerializer(Order.objects.get(pk=order.pk)).data for order in orders
+    ]
+    assert data == expected
+    assert data[0]["payment_method"] == Payment.PaymentMethod.COD
+    assert data[0]["shipment_summary"]["tracking_number"] == "TRK-0"
+    assert [item["product_name"] for item in data[0]["items"]] == ["Snapshot 0", "Live name"]
+
+
+def test_paginated_list_follows_cursors(auth_client, add_orders):
+    orders = add_orders(5)
+
+    seen, page_queries = [], set()
+    url = "/api/v1/orders/?page_size=2"
+    while True:
+        page, queries = _get(auth_client, url)
+        page_queries.add(queries)
+        seen.extend(row["id"] for row in page["results"])
+        if page["next_cursor"] is None:
+            break
+        url = f"/api/v1/orders/?page_size=2&cursor={page['next_cursor']}"
+
+    assert seen == sorted((o.id for o in orders), reverse=True)
+    assert len(page_queries) == 1
+    assert set(page["results"][0]) == {
+        "id", "status", "created_at", "total", "currency", "item_count",
+    }
+    assert (page["results"][0]["item_count"], page["results"][0]["total"]) == (3, "25.00")
+
+
+def test_invalid_cursor_is_rejected(auth_client):
+    response = auth_client.get("/api/v1/orders/?cursor=not-a-cursor")
+
+    assert response.status_code == 400
+    assert response.json()["code"] == "INVALID_CURSOR"
+
+
+@pytest.mark.parametrize("bad_id", ["abc", [1], {"id": 1}])
+def test_cursor_with_wrong_value_type_is_rejected(auth_client, add_orders, bad_id):
+    add_orders(1)
+    cursor = encode_cursor(["-id"], [bad_id])
+
+    response = auth_client.get(f"/api/v1/orders/?page_size=5&cursor={cursor}")
+
+    assert response.status_code == 400
+    assert response.json()["code"] == "INVALID_CURSOR"
+
+
+def test_list_schema_declares_full_and_paginated_responses():
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+
+    body = schema["paths"]["/api/v1/orders/"]["get"]["responses"]["200"]
+    ref = body["content"]["application/json"]["schema"]["$ref"]
+    variants = schema["components"]["schemas"][ref.rsplit("/", 1)[-1]]["oneOf"]
+    assert variants == [
+        {"type": "array", "items": {"$ref": "#/components/schemas/OrderResponse"}},
+        {"$ref": "#/components/schemas/OrderListPage"},
+    ]
+    page = schema["components"]["schemas"]["OrderListPage"]["properties"]
+    assert set(page) == {"results", "next_cursor"}
+
+
+def test_cancel_does_not_prefetch_response_relations(auth_client, user):
+    order = create_valid_order(user=user, status=Order.Status.CREATED)
+
+    with patch.object(
+        order_views,
+        "with_order_response_relations",
+        wraps=order_views.with_order_response_relations,
+    ) as prefetch:
+        response = auth_client.post(f"/api/v1/orders/{order.id}/cancel/")
+        assert response.status_code == 200, response.content
+        assert not prefetch.called
+
+        _get(auth_client, f"/api/v1/orders/{order.id}/")
+        assert prefetch.called
@@ -0,0 +1,127 @@
+"""Pricing payload builders — parity with the documenting serializers.
+
+The list / detail / cart serializers render pricing with the plain-dict
+builders in api.serializers.product, while ProductPricingResultSerializer
+and its nested serializers remain the schema of record.
+
+Covers:
+  - Builder output equals the serializer output with and without a promotion
+  - FIXED promotions (amount_scope) and a null percentage render identically
+  - The no-promotion shortcut does not alias the two tier dicts
+  - The cart response still carries the per-line pricing payload
+"""
+from decimal import Decimal
+
+import pytest
+from prices import Money, TaxedMoney
+from rest_framework.test import APIClient
+
+from api.serializers.product import (
+    ProductPricingResultSerializer,
+    _DiscountResultSerializer,
+    _PricingTierSerializer,
+    discount_payload,
+    pricing_result_payload,
+    pricing_tier_payload,
+)
+from products.models import Product, TaxClass
+from products.services.pricing import (
+    DiscountResult,
+    PricingTierResult,
+    ProductPricingResult,
+    get_product_pricing,
+)
+
+
+def _tier(net: str, gross: str, rate: str = "23.0000") -> PricingTierResult:
+    net_money = Money(Decimal(net), "EUR")
+    gross_money = Money(Decimal(gross), "EUR")
+    return PricingTierResult(
+        net=net_money,
+        gross=gross_money,
+        tax=gross_money - net_money,
+        currency="EUR",
+        tax_rate=Decimal(rate),
+    )
+
+
+def _fixed_result() -> ProductPricingResult:
+    return ProductPricingResult(
+        undiscounted=_tier("0.00", "0.00", rate="10.5000"),
+        discounted=_tier("0.00", "0.00", rate="10.5000"),
+        discount=DiscountResult(
+            amount_net=Money(Decimal("0.00"), "EUR"),
+            amount_gross=Money(Decimal("0.00"), "EUR"),
+            percentage=None,
+            promotion_code="FIX-5",
+            promotion_type="FIXED",
+            amount_scope="GROSS",
+        ),
+    )
+
+
+def test_builders_match_serializers_for_fixed_promotion():
+    result = _fixed_result()
+
+    assert pricing_tier_payload(result.discounted) == _PricingTierSerializer(
+        result.discounted
+    ).data
+    assert discount_payload(result.discount) == _DiscountResultSerializer(
+        result.discount
+    ).data
+    assert pricing_result_payload(result) == ProductPricingResultSerializer(result).data
+    assert pricing_result_payload(result)["discount"]["percentage"] is None
+
+
+def test_no_promotion_payload_tiers_are_independent_dicts():
+    result = ProductPricingResult.from_taxed_money(
+        TaxedMoney(net=Money(Decimal("10.00"), "EUR"), gross=Money(Decimal("12.30"), "EUR")),
+        tax_rate=Decimal("23"),
+    )
+
+    payload = pricing_result_payload(result)
+
+    assert payload == ProductPricingResultSerializer(result).data
+    assert payload["undiscounted"] == payload["discounted"]
+    assert payload["undiscounted"] is not payload["discounted"]
+
+
+@pytest.mark.django_db
+def test_builder_matches_serializer_for_priced_products():
+    tax_class = TaxClass.objects.create(name="Std", code="std", rate=Decimal("21"))
+    for net in ("0.00", "0.01", "9.99", "1234.56"):
+        product = Product.objects.create(
+            name=f"P {net}",
+            price=Decimal(net),
+            price_net_amount=Decimal(net),
+            currency="EUR",
+            tax_class=tax_class,
+            stock_quantity=1,
+        )
+        result = get_product_pricing(product)
+        assert pricing_result_payload(result) == ProductPricingResultSerializer(result).data
+
+
+@pytest.mark.django_db
+def test_cart_items_carry_pricing_payload():
+    tax_class = TaxClass.objects.create(name="Std", code="std", rate=Decimal("23"))
+    product = Product.objects.create(
+        name="Mouse",
+        price=Decimal("10.00"),
+        price_net_amount=Decimal("10.00"),
+        currency="EUR",
+        tax_class=tax_class,
+        stock_quantity=5,
+    )
+    client = APIClient()
+    client.get("/api/v1/cart/")
+    response = client.post(
+        "/api/v1/cart/items/", {"product_id": product.id, "quantity": 2}, format="json"
+    )
+    assert response.status_code in (200, 201)
+
+    cart = client.get("/api/v1/cart/").json()
+    pricing = cart["items"][0]["pricing"]
+
+    assert pricing == ProductPricingResultSerializer(get_product_pricing(product)).data
+    assert pricing["discounted"]["gross"] == "12.30"
@@ -10,7 +10,7 @@ These tests cover:
   - stock_status field in serializer responses
   - Price metadata in response
   - Blank / absent search falls back to standard catalogue behaviour
-  - Search with no hits returns empty valid response (NullSearchBackend)
+  - Search with no hits returns empty valid response (in-memory backend on SQLite)
 """
 
 from decimal import Decimal
@@ -502,7 +502,7 @@ def test_price_metadata_respects_category_filter():
 
 
 # ---------------------------------------------------------------------------
-# Search fallback behaviour (NullSearchBackend on SQLite)
+# Search fallback behaviour (in-memory ngram backend on SQLite)
 # ---------------------------------------------------------------------------
 
 
@@ -533,8 +533,9 @@ def test_blank_search_returns_standard_catalogue():
 @pytest.mark.django_db
 def test_search_no_hits_returns_empty_valid_response():
     """
-    On SQLite (NullSearchBackend) any non-empty search returns empty results.
-    The response must be HTTP 200 with results=[].
+    On SQLite (in-memory ngram backend) a term sharing no bigram with any
+    product returns empty results.  The response must be HTTP 200 with
+    results=[].
     """
     _make_product(name="Some Product")
 
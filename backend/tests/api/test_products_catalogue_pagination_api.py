@@ -0,0 +1,169 @@
+"""
+Catalogue API tests — cursor pagination and field projection.
+
+These tests cover:
+  - Unpaginated responses keep the legacy envelope (no next_cursor)
+  - page_size / cursor walk the full catalogue without gaps or duplicates
+    for the default ordering and every explicit sort
+  - metadata is returned on the first page only
+  - Invalid / mismatched cursors, including well-formed cursors with values
+    of the wrong type, are rejected with INVALID_CURSOR
+  - fields= projection limits output and skips pricing computation
+"""
+
+import base64
+import json
+from decimal import Decimal
+
+import pytest
+from rest_framework.test import APIClient
+
+from products.models import Product
+from products.search.pagination import decode_cursor, encode_cursor
+
+URL = "/api/v1/products/"
+
+
+def _make_product(**kwargs) -> Product:
+    defaults = {"price": 10, "stock_quantity": 10, "is_active": True}
+    defaults.update(kwargs)
+    return Product.objects.create(**defaults)
+
+
+def _seed_catalogue() -> None:
+    # Duplicate names and prices exercise the id tiebreaker.
+    for i in range(7):
+        _make_product(
+            name=f"Item {i % 3}",
+            price=Decimal(10 + (i % 2)),
+            stock_quantity=0 if i % 4 == 0 else 5,
+        )
+
+
+def _walk(client: APIClient, **params) -> tuple[list[int], list[dict]]:
+    ids: list[int] = []
+    bodies: list[dict] = []
+    cursor = None
+    while True:
+        query = dict(params)
+        if cursor:
+            query["cursor"] = cursor
+        resp = client.get(URL, query)
+        assert resp.status_code == 200, resp.content
+        body = resp.json()
+        bodies.append(body)
+        ids.extend(item["id"] for item in body["results"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, bodies
+
+
+@pytest.mark.django_db
+def test_unpaginated_response_has_no_next_cursor():
+    _seed_catalogue()
+
+    body = APIClient().get(URL).json()
+
+    assert len(body["results"]) == 7
+    assert "next_cursor" not in body
+    assert body["metadata"] is not None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("sort", [None, "price_asc", "price_desc", "name_asc", "name_desc"])
+def test_cursor_pages_match_unpaginated_ordering(sort):
+    _seed_catalogue()
+    client = APIClient()
+    params = {"sort": sort} if sort else {}
+
+    expected = [item["id"] for item in client.get(URL, params).json()["results"]]
+    ids, bodies = _walk(client, page_size=3, **params)
+
+    assert ids == expected
+    assert [len(b["results"]) for b in bodies] == [3, 3, 1]
+
+
+@pytest.mark.django_db
+def test_metadata_only_on_first_page():
+    _seed_catalogue()
+
+    _, bodies = _walk(APIClient(), page_size=3)
+
+    metadata = bodies[0]["metadata"]
+    assert Decimal(metadata["price_min_available"]) == Decimal("10")
+    assert Decimal(metadata["price_max_available"]) == Decimal("11")
+    assert all(b["metadata"] is None for b in bodies[1:])
+
+
+@pytest.mark.django_db
+def test_page_size_is_capped(settings):
+    settings.CATALOGUE_MAX_PAGE_SIZE = 2
+    _seed_catalogue()
+
+    body = APIClient().get(URL, {"page_size": 50}).json()
+
+    assert len(body["results"]) == 2
+    assert body["next_cursor"] is not None
+
+
+@pytest.mark.django_db
+def test_malformed_cursor_returns_400():
+    resp = APIClient().get(URL, {"cursor": "not-a-cursor"})
+
+    assert resp.status_code == 400
+    assert resp.json()["code"] == "INVALID_CURSOR"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("bad_id", ["abc", [1], {"id": 1}])
+def test_cursor_with_wrong_value_types_returns_400(bad_id):
+    _seed_catalogue()
+    client = APIClient()
+    cursor = client.get(URL, {"page_size": 2, "sort": "name_asc"}).json()["next_cursor"]
+    ordering = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))["o"]
+    values = decode_cursor(cursor, ordering)
+
+    forged = encode_cursor(ordering, [*values[:-1], bad_id])
+    resp = client.get(URL, {"cursor": forged, "sort": "name_asc"})
+
+    assert resp.status_code == 400
+    assert resp.json()["code"] == "INVALID_CURSOR"
+
+
+@pytest.mark.django_db
+def test_cursor_from_other_sort_is_rejected():
+    _seed_catalogue()
+    client = APIClient()
+    cursor = client.get(URL, {"page_size": 2}).json()["next_cursor"]
+
+    resp = client.get(URL, {"cursor": cursor, "sort": "price_desc"})
+
+    assert resp.status_code == 400
+    assert resp.json()["code"] == "INVALID_CURSOR"
+
+
+@pytest.mark.django_db
+def test_fields_projection_limits_output_and_skips_pricing(monkeypatch):
+    _make_product(name="Projected", price_net_amount=Decimal("10.00"))
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("pricing must not be computed")
+
+    monkeypatch.setattr("api.serializers.product.get_product_pricing", _fail)
+    monkeypatch.setattr("api.views.products.resolve_line_promotions_bulk", _fail)
+
+    resp = APIClient().get(URL, {"fields": "id,name,unknown"})
+
+    assert resp.status_code == 200
+    assert resp.json()["results"] == [
+        {"id": Product.objects.get().id, "name": "Projected"}
+    ]
+
+
+@pytest.mark.django_db
+def test_fields_projection_with_only_unknown_names_keeps_all_fields():
+    _make_product(name="Everything")
+
+    item = APIClient().get(URL, {"fields": "bogus"}).json()["results"][0]
+
+    assert {"id", "name", "pricing", "primary_image"} <= set(item)
@@ -2,6 +2,7 @@ import os
 import sys
 from decimal import Decimal
 from discounts.models import Discount
+from discounts.services.promotion_snapshot import invalidate_promotion_snapshot
 import pytest
 from django.contrib.auth import get_user_model
 from django.core.management import call_command
@@ -195,6 +196,18 @@ def _default_supplier_config(db):
     make_default_supplier()
 
 
+@pytest.fixture(autouse=True)
+def _fresh_promotion_snapshot():
+    """
+    Autouse fixture: drop the in-process promotion snapshot before every test.
+
+    Database teardown (rollback / flush) does not fire model signals, so a
+    snapshot published by a previous transactional test could otherwise
+    leak promotions that no longer exist into the next test.
+    """
+    invalidate_promotion_snapshot()
+
+
 @pytest.fixture
 def user(db):
     """
@@ -21,18 +21,18 @@ def test_guest_order_link_email_is_delivered_to_mailpit(client, settings, monkey
     product = Product.objects.create(
         name="E2E_P1", price="10.00", stock_quantity=10, is_active=True)
 
-    # 1) Create/resolve anonymous cart -> sets cart_token cookie
+    # 1) Anonymous read -> virtual empty cart, no cookie yet
     resp = client.get("/api/v1/cart/")
     assert resp.status_code in (200, 201)
-    assert "cart_token" in client.cookies, "Expected cart_token cookie to be set for anonymous cart"
 
-    # 2) Add item to cart
+    # 2) Add item to cart -> creates the anonymous cart and sets cart_token cookie
     resp = client.post(
         "/api/v1/cart/items/",
         data={"product_id": product.id, "quantity": 1},
         content_type="application/json",
     )
     assert resp.status_code in (200, 201)
+    assert "cart_token" in client.cookies, "Expected cart_token cookie to be set for anonymous cart"
 
     payload = {
         "customer_email": "guest@example.com",
@@ -0,0 +1,49 @@
+import threading
+
+import pytest
+from django.db import DatabaseError, close_old_connections, transaction
+
+from carts.models import Cart, CartItem
+from carts.services.merge import _locked_cart_lines
+from products.models import Product
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.mysql
+def test_mysql_merge_locks_cart_lines_but_not_products():
+    """
+    The merge lock read joins product stock but must only lock the cart lines.
+    """
+    product = Product.objects.create(
+        name="Merge Lock", price="10.00", stock_quantity=5, is_active=True)
+    cart = Cart.objects.create(status=Cart.Status.ACTIVE)
+    item = CartItem.objects.create(
+        cart=cart, product=product, quantity=1, price_at_add_time=product.price)
+
+    outcome: dict[str, bool] = {}
+
+    def other_transaction():
+        close_old_connections()
+        try:
+            with transaction.atomic():
+                Product.objects.select_for_update(nowait=True).get(pk=product.pk)
+            outcome["product_locked"] = False
+        except DatabaseError:
+            outcome["product_locked"] = True
+        try:
+            with transaction.atomic():
+                CartItem.objects.select_for_update(nowait=True).get(pk=item.pk)
+            outcome["line_locked"] = False
+        except DatabaseError:
+            outcome["line_locked"] = True
+        finally:
+            close_old_connections()
+
+    with transaction.atomic():
+        lines = _locked_cart_lines([cart.id])
+        t = threading.Thread(target=other_transaction)
+        t.start()
+        t.join()
+
+    assert [line.product__stock_quantity for line in lines] == [5]
+    assert outcome == {"product_locked": False, "line_locked": True}
@@ -2,6 +2,8 @@ import pytest
 from django.test import RequestFactory
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from carts.models import Cart, CartItem
 from products.models import Product
@@ -191,3 +193,59 @@ def test_extract_cart_token_empty_header_falls_back_to_cookie():
     req.COOKIES["cart_token"] = "cookie-token"
 
     assert extract_cart_token(req) == "cookie-token"
+
+
+def _merge_fixture(email: str, raw_token: str, *, lines: int):
+    """User cart and guest cart sharing half of *lines* products."""
+    User = get_user_model()
+    user = User.objects.create_user(email=email, password="Passw0rd!123")
+    user_cart = Cart.objects.create(user=user, status=Cart.Status.ACTIVE)
+    anon = Cart.objects.create(
+        user=None,
+        status=Cart.Status.ACTIVE,
+        anonymous_token_hash=hash_cart_token(raw_token),
+    )
+    for i in range(lines):
+        p = Product.objects.create(
+            name=f"{raw_token}-{i}", price=10, stock_quantity=5, is_active=True)
+        CartItem.objects.create(cart=anon, product=p,
+                                quantity=3, price_at_add_time=p.price)
+        if i % 2:
+            CartItem.objects.create(cart=user_cart, product=p,
+                                    quantity=1, price_at_add_time=p.price)
+    return user, user_cart
+
+
+@pytest.mark.django_db
+def test_merge_moves_sums_and_drops_in_one_pass():
+    user, user_cart = _merge_fixture("set_merge@example.com", "guest-set", lines=2)
+    empty = Product.objects.create(
+        name="Empty", price=10, stock_quantity=0, is_active=True)
+    anon = Cart.objects.get(anonymous_token_hash=hash_cart_token("guest-set"))
+    CartItem.objects.create(cart=anon, product=empty,
+                            quantity=1, price_at_add_time=empty.price)
+
+    report = merge_or_adopt_guest_cart(user=user, raw_token="guest-set")
+
+    assert report["result"] == "MERGED"
+    assert report["items_added"] == 1
+    assert report["items_updated"] == 1
+    assert [(w["product_id"], w["requested"], w["applied"]) for w in report["warnings"]] == [
+        (empty.id, 1, 0)
+    ]
+    assert sorted(
+        CartItem.objects.filter(cart=user_cart).values_list("quantity", flat=True)
+    ) == [3, 4]
+    assert not CartItem.objects.filter(cart=anon).exists()
+
+
+@pytest.mark.django_db
+def test_merge_query_count_does_not_grow_with_lines():
+    counts = []
+    for lines, token in ((2, "guest-few"), (12, "guest-many")):
+        user, _ = _merge_fixture(f"{token}@example.com", token, lines=lines)
+        with CaptureQueriesContext(connection) as ctx:
+            merge_or_adopt_guest_cart(user=user, raw_token=token)
+        counts.append(len(ctx.captured_queries))
+
+    assert counts[0] == counts[1]
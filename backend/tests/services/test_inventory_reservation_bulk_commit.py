@@ -0,0 +1,140 @@
+"""
+Bulk stock decrement on payment commit.
+
+Covers:
+  - commit_reservations_for_paid decrements every product of the order with
+    one UPDATE
+  - commit_reservations_for_paid_orders commits a batch in id order against
+    the locked stock: orders that no longer fit are cancelled as
+    OUT_OF_STOCK, orders not awaiting payment are skipped
+  - The statement count of a batch does not grow with the number of orders
+"""
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from orders.models import InventoryReservation, Order
+from orders.services.inventory_reservation_service import (
+    commit_reservations_for_paid,
+    commit_reservations_for_paid_orders,
+    reserve_for_checkout,
+    sweep_overdue_reservations,
+)
+from products.models import Product
+from tests.conftest import create_valid_order
+
+pytestmark = pytest.mark.django_db
+
+
+def _product(name, stock):
+    return Product.objects.create(
+        name=name, price="10.00", stock_quantity=stock, is_active=True
+    )
+
+
+def _reserved_order(n, items):
+    order = create_valid_order(
+        user=None, status=Order.Status.CREATED, customer_email=f"b{n}@example.com"
+    )
+    reserve_for_checkout(
+        order=order,
+        items=[{"product_id": p.id, "quantity": q} for p, q in items],
+        ttl_minutes=15,
+    )
+    return order
+
+
+def _counters(product):
+    product.refresh_from_db()
+    return product.stock_quantity, product.reserved_quantity
+
+
+def _product_updates(ctx):
+    return [
+        q["sql"] for q in ctx.captured_queries
+        if q["sql"].startswith('UPDATE "products_product"')
+    ]
+
+
+def test_single_commit_updates_products_once():
+    lamp, book, pen = _product("Lamp", 5), _product("Book", 5), _product("Pen", 5)
+    order = _reserved_order(1, [(lamp, 1), (book, 2), (pen, 3)])
+
+    with CaptureQueriesContext(connection) as ctx:
+        commit_reservations_for_paid(order=order)
+
+    assert len(_product_updates(ctx)) == 1
+    assert [_counters(p) for p in (lamp, book, pen)] == [(4, 0), (3, 0), (2, 0)]
+    assert order.status == Order.Status.PAID
+
+
+def test_batch_commits_in_id_order_and_cancels_what_no_longer_fits():
+    scarce, plenty = _product("Scarce", 3), _product("Plenty", 100)
+    first = _reserved_order(1, [(scarce, 2), (plenty, 1)])
+    second = _reserved_order(2, [(plenty, 4)])
+    late = _reserved_order(3, [(scarce, 1), (plenty, 1)])
+    paid = _reserved_order(4, [(plenty, 1)])
+    commit_reservations_for_paid(order=paid)
+    # Stock sold elsewhere after the reservations were made.
+    Product.objects.filter(pk=scarce.pk).update(stock_quantity=2)
+
+    result = commit_reservations_for_paid_orders(orders=[late, paid, second, first])
+
+    assert result.committed == (first.id, second.id)
+    assert result.out_of_stock == (late.id,)
+    assert result.skipped == (paid.id,)
+    assert (first.status, second.status) == (Order.Status.PAID, Order.Status.PAID)
+    late.refresh_from_db()
+    assert late.status == Order.Status.CANCELLED
+    assert late.cancel_reason == Order.CancelReason.OUT_OF_STOCK
+    assert set(
+        InventoryReservation.objects.filter(order=late).values_list("status", flat=True)
+    ) == {InventoryReservation.Status.RELEASED}
+    assert _counters(scarce) == (0, 0)
+    assert _counters(plenty) == (94, 0)
+
+
+def test_stale_instance_of_expired_order_is_skipped():
+    product = _product("Expired", 5)
+    order = _reserved_order(1, [(product, 2)])
+    InventoryReservation.objects.filter(order=order).update(
+        expires_at=timezone.now() - timedelta(minutes=1)
+    )
+    sweep_overdue_reservations()
+
+    result = commit_reservations_for_paid_orders(orders=[order])
+
+    assert (result.committed, result.skipped) == ((), (order.id,))
+    assert order.status == Order.Status.CANCELLED
+    order.refresh_from_db()
+    assert order.cancel_reason == Order.CancelReason.PAYMENT_EXPIRED
+    assert _counters(product) == (5, 0)
+
+
+def test_order_without_active_reservations_is_left_to_the_caller():
+    order = create_valid_order(
+        user=None, status=Order.Status.CREATED, customer_email="none@example.com"
+    )
+
+    result = commit_reservations_for_paid_orders(orders=[order])
+
+    assert result.unreserved == (order.id,)
+    assert result.committed == ()
+    order.refresh_from_db()
+    assert order.status == Order.Status.CREATED
+
+
+def _batch_statements(count, start):
+    product = _product(f"Batch {start}", 1000)
+    orders = [_reserved_order(start + n, [(product, 1)]) for n in range(count)]
+    with CaptureQueriesContext(connection) as ctx:
+        result = commit_reservations_for_paid_orders(orders=orders)
+    assert len(result.committed) == count
+    return len(ctx.captured_queries)
+
+
+def test_batch_statement_count_is_constant():
+    assert _batch_statements(2, start=0) == _batch_statements(10, start=100)
@@ -0,0 +1,175 @@
+"""
+Product.reserved_quantity counter maintained by the inventory reservation service.
+
+Covers:
+  - reserve increments the counter; commit, release and expire give it back
+    (commit also decrements physical stock)
+  - A failed multi-product reservation leaves every counter untouched
+  - Reserving does not read other orders' reservations while stock is ample
+  - Overdue ACTIVE reservations not yet expired do not block availability
+  - A full Product.save() from a stale instance does not overwrite the counter;
+    update_fields naming it does, and a save() whose row was deleted inserts
+"""
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.exceptions.orders import OutOfStockException
+from orders.models import InventoryReservation, Order
+from orders.services.inventory_reservation_service import (
+    commit_reservations_for_paid,
+    expire_overdue_reservations,
+    release_reservations,
+    reserve_for_checkout,
+)
+from products.models import Product
+from tests.conftest import create_valid_order
+
+
+def _product(stock=10, name="Counter Product"):
+    return Product.objects.create(
+        name=name, price="10.00", stock_quantity=stock, is_active=True
+    )
+
+
+def _order(n=1):
+    return create_valid_order(
+        user=None, status=Order.Status.CREATED, customer_email=f"c{n}@example.com"
+    )
+
+
+def _reserve(order, product, quantity):
+    reserve_for_checkout(
+        order=order,
+        items=[{"product_id": product.id, "quantity": quantity}],
+        ttl_minutes=15,
+    )
+
+
+def _counters(product):
+    product.refresh_from_db()
+    return product.stock_quantity, product.reserved_quantity
+
+
+@pytest.mark.django_db
+def test_counter_follows_reservation_lifecycle():
+    product = _product(stock=10)
+    paid, released, expired = _order(1), _order(2), _order(3)
+
+    _reserve(paid, product, 2)
+    _reserve(released, product, 3)
+    _reserve(expired, product, 4)
+    assert _counters(product) == (10, 9)
+
+    commit_reservations_for_paid(order=paid)
+    assert _counters(product) == (8, 7)
+
+    release_reservations(
+        order=released,
+        reason=InventoryReservation.ReleaseReason.CUSTOMER_REQUEST,
+        cancelled_by=Order.CancelledBy.CUSTOMER,
+        cancel_reason=Order.CancelReason.CUSTOMER_REQUEST,
+    )
+    assert _counters(product) == (8, 4)
+
+    InventoryReservation.objects.filter(order=expired).update(
+        expires_at=timezone.now() - timedelta(minutes=1)
+    )
+    assert expire_overdue_reservations() == 1
+    assert _counters(product) == (8, 0)
+
+
+@pytest.mark.django_db
+def test_failed_reservation_rolls_back_counters():
+    plenty, scarce = _product(stock=10), _product(stock=1, name="Scarce")
+
+    with pytest.raises(OutOfStockException):
+        reserve_for_checkout(
+            order=_order(),
+            items=[
+                {"product_id": plenty.id, "quantity": 2},
+                {"product_id": scarce.id, "quantity": 2},
+            ],
+        )
+
+    assert _counters(plenty) == (10, 0)
+    assert _counters(scarce) == (1, 0)
+    assert not InventoryReservation.objects.exists()
+
+
+@pytest.mark.django_db
+def test_reserve_does_not_scan_other_reservations():
+    product = _product(stock=1000)
+    for n in range(20):
+        _reserve(_order(n), product, 1)
+
+    with CaptureQueriesContext(connection) as ctx:
+        _reserve(_order(99), product, 1)
+
+    reservation_queries = [
+        q["sql"] for q in ctx.captured_queries if "orders_inventoryreservation" in q["sql"]
+    ]
+    # The per-order guardrail check and the INSERT.
+    assert len(reservation_queries) == 2
+    assert _counters(product) == (1000, 21)
+
+
+@pytest.mark.django_db
+def test_overdue_reservation_does_not_block_availability():
+    product = _product(stock=1)
+    stale, fresh = _order(1), _order(2)
+    _reserve(stale, product, 1)
+    InventoryReservation.objects.filter(order=stale).update(
+        expires_at=timezone.now() - timedelta(seconds=1)
+    )
+
+    _reserve(fresh, product, 1)
+    assert _counters(product) == (1, 2)
+
+    with pytest.raises(OutOfStockException):
+        _reserve(_order(3), product, 1)
+
+    expire_overdue_reservations()
+    assert _counters(product) == (1, 1)
+
+
+@pytest.mark.django_db
+def test_full_save_keeps_counter():
+    product = _product(stock=5)
+    stale = Product.objects.get(pk=product.pk)
+    _reserve(_order(), product, 2)
+
+    stale.name = "Renamed"
+    stale.save()
+
+    product.refresh_from_db()
+    assert product.name == "Renamed"
+    assert product.reserved_quantity == 2
+
+
+@pytest.mark.django_db
+def test_save_with_update_fields_writes_counter():
+    product = _product(stock=5)
+
+    product.reserved_quantity = 3
+    product.save(update_fields=["reserved_quantity"])
+
+    product.refresh_from_db()
+    assert product.reserved_quantity == 3
+
+
+@pytest.mark.django_db
+def test_save_of_deleted_product_inserts_it_again():
+    product = _product(stock=5)
+    pk = product.pk
+    Product.objects.filter(pk=pk).delete()
+
+    product.name = "Restored"
+    product.save()
+
+    restored = Product.objects.get(pk=pk)
+    assert restored.name == "Restored"
+    assert restored.reserved_quantity == 0
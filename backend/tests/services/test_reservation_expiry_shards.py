@@ -0,0 +1,180 @@
+"""
+Sharded overdue reservation expiry (orders.services.reservation_expiry_shards).
+
+Covers:
+  - Overdue order ids are split into contiguous ranges with balanced counts
+  - expire_overdue_reservations --shards N enqueues one Django-Q task per
+    range; together they expire the whole backlog and the last one writes a
+    single summary audit event with the aggregated counts
+  - Without --shards the command sweeps inline, whatever the shard setting
+    and worker count
+  - The summary waits for every shard, is written once, and counts failed
+    shards
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from django_q.models import Task
+
+from auditlog.actions import AuditActions
+from auditlog.models import AuditEvent
+from orders.models import InventoryReservation, Order
+from orders.services.inventory_reservation_service import reserve_for_checkout
+from orders.services.reservation_expiry_shards import (
+    fan_out_overdue_reservation_expiry,
+    plan_order_id_ranges,
+    summarize_expiry_run,
+)
+from products.models import Product
+from tests.conftest import create_valid_order
+
+
+@pytest.fixture(autouse=True)
+def _no_notifications():
+    with patch("notifications.enqueue.async_task"):
+        yield
+
+
+def _overdue_orders(count):
+    product = Product.objects.create(
+        name="Shard", price="10.00", stock_quantity=1000, is_active=True
+    )
+    orders = []
+    for n in range(count):
+        order = create_valid_order(
+            user=None, status=Order.Status.CREATED, customer_email=f"sh{n}@example.com"
+        )
+        reserve_for_checkout(
+            order=order, items=[{"product_id": product.id, "quantity": 1}], ttl_minutes=15
+        )
+        orders.append(order)
+    InventoryReservation.objects.filter(order__in=orders).update(
+        expires_at=timezone.now() - timedelta(minutes=1)
+    )
+    return orders, product
+
+
+def _summaries():
+    return AuditEvent.objects.filter(
+        action=AuditActions.INVENTORY_RESERVATIONS_EXPIRY_SWEEP
+    )
+
+
+def test_plan_order_id_ranges_is_balanced():
+    ids = [3, 4, 9, 10, 11, 40, 41]
+
+    assert plan_order_id_ranges(ids, 3) == [(3, 9), (10, 11), (40, 41)]
+    assert plan_order_id_ranges(ids, 10) == [(i, i) for i in ids]
+    assert plan_order_id_ranges([], 4) == []
+    with pytest.raises(ValueError):
+        plan_order_id_ranges(ids, 0)
+
+
+@pytest.mark.django_db
+def test_command_fans_out_and_summarizes():
+    _, product = _overdue_orders(5)
+    out = StringIO()
+
+    call_command("expire_overdue_reservations", "--shards", "3", "--batch-size", "1", stdout=out)
+
+    assert out.getvalue().startswith("Enqueued 3 shards for 5 orders (run overdue-expiry-")
+    assert set(Order.objects.values_list("status", flat=True)) == {Order.Status.CANCELLED}
+    product.refresh_from_db()
+    assert product.reserved_quantity == 0
+
+    summary = _summaries().get()
+    assert Task.objects.filter(group=summary.entity_id).count() == 3
+    assert summary.metadata == {
+        "shards": 3,
+        "failed_shards": 0,
+        "expired_reservations": 5,
+        "cancelled_orders": 5,
+        "chunks": 5,
+        "remaining": 0,
+        "elapsed_seconds": summary.metadata["elapsed_seconds"],
+    }
+    assert AuditEvent.objects.filter(action=AuditActions.ORDER_CANCELLED).count() == 5
+
+
+@pytest.mark.django_db
+@override_settings(
+    OVERDUE_RESERVATIONS_EXPIRY_SHARDS=0,
+    Q_CLUSTER={**settings.Q_CLUSTER, "workers": 4},
+)
+def test_manual_run_without_shards_sweeps_inline():
+    _overdue_orders(3)
+    out = StringIO()
+
+    call_command("expire_overdue_reservations", stdout=out)
+
+    assert out.getvalue().startswith("Expired 3 reservations.\n")
+    assert not Task.objects.exists()
+    assert set(Order.objects.values_list("status", flat=True)) == {Order.Status.CANCELLED}
+
+
+@pytest.mark.django_db
+def test_nothing_overdue_enqueues_nothing():
+    out = StringIO()
+
+    call_command("expire_overdue_reservations", "--shards", "4", stdout=out)
+
+    assert out.getvalue() == "No overdue reservations.\n"
+    assert not Task.objects.exists()
+    assert not _summaries().exists()
+
+
+@pytest.mark.django_db
+def test_summary_waits_for_all_shards_and_is_written_once():
+    _overdue_orders(2)
+    run = fan_out_overdue_reservation_expiry(shards=2)
+
+    assert summarize_expiry_run(run.run_id, shards=3) is None
+    # Already written by the hook of the last shard.
+    assert summarize_expiry_run(run.run_id, shards=2) is None
+    assert _summaries().count() == 1
+
+
+def _shard_task(run_id, index, *, result, success=True):
+    return Task.objects.create(
+        id=f"{run_id}-{index}",
+        name=f"{run_id}-{index}",
+        func="orders.jobs.run_overdue_reservation_expiry_shard",
+        group=run_id,
+        kwargs={"shard": index, "shards": 2},
+        result=result,
+        success=success,
+        started=timezone.now(),
+        stopped=timezone.now(),
+    )
+
+
+@pytest.mark.django_db
+def test_failed_shard_is_counted():
+    # Sync test clusters re-raise task errors, so record the outcome directly.
+    report = {
+        "expired_reservations": 3,
+        "cancelled_orders": 2,
+        "chunks": 1,
+        "elapsed_seconds": 0.5,
+        "remaining": 0,
+    }
+    _shard_task("run-1", 0, result=report)
+    _shard_task("run-1", 1, result="RuntimeError: shard crashed", success=False)
+
+    summary = summarize_expiry_run("run-1", shards=2)
+
+    assert summary.metadata == {
+        "shards": 2,
+        "failed_shards": 1,
+        "expired_reservations": 3,
+        "cancelled_orders": 2,
+        "chunks": 1,
+        "remaining": 0,
+        "elapsed_seconds": 0.5,
+    }
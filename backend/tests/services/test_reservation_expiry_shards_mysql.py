@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+from django.db import close_old_connections
+from django.utils import timezone
+from django_q.models import Task
+
+from auditlog.actions import AuditActions
+from auditlog.models import AuditEvent
+from orders.services.reservation_expiry_shards import summarize_expiry_run
+
+REPORT = {
+    "expired_reservations": 1,
+    "cancelled_orders": 1,
+    "chunks": 1,
+    "elapsed_seconds": 0.1,
+    "remaining": 0,
+}
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.mysql
+def test_mysql_concurrent_hooks_write_one_summary():
+    """
+    Hooks of the last two shards finishing together must not both write the summary.
+    """
+    for index in range(2):
+        Task.objects.create(
+            id=f"race-run-{index}",
+            name=f"race-run-{index}",
+            func="orders.jobs.run_overdue_reservation_expiry_shard",
+            group="race-run",
+            kwargs={"shard": index, "shards": 2},
+            result=REPORT,
+            success=True,
+            started=timezone.now(),
+            stopped=timezone.now(),
+        )
+
+    barrier = threading.Barrier(2)
+    errors: list[Exception] = []
+
+    def hook():
+        close_old_connections()
+        try:
+            barrier.wait()
+            summarize_expiry_run("race-run", shards=2)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            close_old_connections()
+
+    threads = [threading.Thread(target=hook) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert AuditEvent.objects.filter(
+        action=AuditActions.INVENTORY_RESERVATIONS_EXPIRY_SWEEP, entity_id="race-run"
+    ).count() == 1
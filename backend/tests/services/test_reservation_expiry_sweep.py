@@ -0,0 +1,122 @@
+"""
+Chunked overdue reservation sweep (sweep_overdue_reservations).
+
+Covers:
+  - A backlog is expired in chunks of batch_size orders, with progress
+    reported after each chunk and an empty remaining backlog at the end
+  - The statement count of a chunk does not grow with the number of orders
+  - Audit events are written in bulk; a failing audit write does not stop
+    the sweep
+  - expire_overdue_reservations command reports chunks, throughput and
+    remaining backlog
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from auditlog.actions import AuditActions
+from auditlog.models import AuditEvent
+from orders.models import InventoryReservation, Order
+from orders.services.inventory_reservation_service import (
+    reserve_for_checkout,
+    sweep_overdue_reservations,
+)
+from products.models import Product
+from tests.conftest import create_valid_order
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _no_notifications():
+    with patch("notifications.enqueue.async_task"):
+        yield
+
+
+def _overdue_orders(count, *, products=1, start=0):
+    items = [
+        Product.objects.create(
+            name=f"Sweep {start}-{i}", price="10.00", stock_quantity=1000, is_active=True
+        )
+        for i in range(products)
+    ]
+    orders = []
+    for n in range(start, start + count):
+        order = create_valid_order(
+            user=None, status=Order.Status.CREATED, customer_email=f"s{n}@example.com"
+        )
+        reserve_for_checkout(
+            order=order,
+            items=[{"product_id": p.id, "quantity": 1} for p in items],
+            ttl_minutes=15,
+        )
+        orders.append(order)
+    InventoryReservation.objects.filter(order__in=orders).update(
+        expires_at=timezone.now() - timedelta(minutes=1)
+    )
+    return orders, items
+
+
+def test_backlog_is_expired_in_chunks():
+    orders, products = _overdue_orders(5, products=2)
+    progress = []
+
+    report = sweep_overdue_reservations(batch_size=2, on_progress=progress.append)
+
+    assert (report.expired_reservations, report.cancelled_orders, report.chunks) == (10, 5, 3)
+    assert report.remaining == 0
+    assert [p.cancelled_orders for p in progress] == [2, 4, 5]
+    assert set(Order.objects.values_list("status", flat=True)) == {Order.Status.CANCELLED}
+    assert not InventoryReservation.objects.filter(
+        status=InventoryReservation.Status.ACTIVE
+    ).exists()
+    assert {p.reserved_quantity for p in Product.objects.filter(pk__in=[p.pk for p in products])} == {0}
+    assert AuditEvent.objects.filter(action=AuditActions.ORDER_CANCELLED).count() == 5
+    batch_event = AuditEvent.objects.get(
+        entity_type="inventory_reservation_batch", entity_id=str(orders[0].id)
+    )
+    assert batch_event.metadata["affected_reservations"] == 2
+
+
+def _chunk_statements(order_count, start):
+    _overdue_orders(order_count, start=start)
+    with CaptureQueriesContext(connection) as ctx:
+        report = sweep_overdue_reservations(batch_size=50)
+    assert report.cancelled_orders == order_count
+    return len(ctx.captured_queries)
+
+
+def test_chunk_statement_count_is_constant():
+    assert _chunk_statements(2, start=0) == _chunk_statements(12, start=100)
+
+
+def test_audit_failure_does_not_stop_sweep():
+    _overdue_orders(3)
+
+    with patch.object(AuditEvent.objects, "bulk_create", side_effect=RuntimeError("down")):
+        report = sweep_overdue_reservations(batch_size=2)
+
+    assert report.cancelled_orders == 3
+    assert not AuditEvent.objects.filter(action=AuditActions.ORDER_CANCELLED).exists()
+
+
+def test_command_reports_progress_and_backlog():
+    _overdue_orders(3)
+    out = StringIO()
+
+    call_command("expire_overdue_reservations", "--batch-size", "2", "-v", "2", stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert lines[:2] == [
+        "Chunk 1: 2 reservations, 2 orders so far.",
+        "Chunk 2: 3 reservations, 3 orders so far.",
+    ]
+    assert lines[2] == "Expired 3 reservations."
+    assert lines[3].startswith("Cancelled 3 orders in 2 chunks (")
+    assert lines[3].endswith("reservations/s); 0 overdue reservations remaining.")
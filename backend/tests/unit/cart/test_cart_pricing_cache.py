@@ -0,0 +1,195 @@
+"""
+Cart pricing cache (carts.services.pricing_cache).
+
+Covers:
+  - A repeated read with unchanged inputs is a hit and skips the pipeline
+  - Quantity, product price (even via QuerySet.update) and promotion
+    version changes are misses
+  - A promotion edited without bumping this process's version (another
+    worker, LocMem cache) is a miss once the snapshot is rebuilt
+  - A different claimed offer token is a miss
+  - A campaign promotion edited without bumping the promotion version is a
+    miss on the next read
+  - Unsaved (virtual) carts bypass the cache
+  - GET /cart/ followed by the checkout preflight reuses the result
+"""
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from carts.models import Cart, CartItem
+from carts.services import pricing_cache
+from carts.services.pricing_cache import (
+    get_cached_cart_pricing,
+    get_cart_pricing_cache_stats,
+    reset_cart_pricing_cache_stats,
+)
+from discounts.models import (
+    AcquisitionMode,
+    Offer,
+    OfferStatus,
+    OrderPromotion,
+    Promotion,
+    PromotionProduct,
+    PromotionType,
+    StackingPolicy,
+)
+from discounts.services.promotion_snapshot import (
+    get_promotion_version,
+    invalidate_promotion_snapshot,
+)
+from products.models import Product, TaxClass
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats():
+    reset_cart_pricing_cache_stats()
+    yield
+    reset_cart_pricing_cache_stats()
+
+
+def _cart(user=None) -> Cart:
+    tax_class = TaxClass.objects.create(name="Std", code="std-cache", rate=Decimal("21"))
+    product = Product.objects.create(
+        name="Mug",
+        price=Decimal("10.00"),
+        price_net_amount=Decimal("10.00"),
+        currency="EUR",
+        tax_class=tax_class,
+        stock_quantity=20,
+        is_active=True,
+    )
+    cart = Cart.objects.create(user=user, status=Cart.Status.ACTIVE)
+    CartItem.objects.create(
+        cart=cart, product=product, quantity=2, price_at_add_time=Decimal("12.10")
+    )
+    return cart
+
+
+def _campaign_offer(token: str) -> Offer:
+    promotion = OrderPromotion.objects.create(
+        name=f"Campaign {token}",
+        code=f"campaign-{token}",
+        type=PromotionType.FIXED,
+        value=Decimal("2.00"),
+        acquisition_mode=AcquisitionMode.CAMPAIGN_APPLY,
+        stacking_policy=StackingPolicy.EXCLUSIVE,
+    )
+    return Offer.objects.create(
+        token=token, promotion=promotion, status=OfferStatus.CREATED, is_active=True
+    )
+
+
+def _reloaded(offer: Offer) -> Offer:
+    # Requests resolve the claimed offer from the database every time.
+    return Offer.objects.select_related("promotion").get(pk=offer.pk)
+
+
+def _stats() -> tuple[int, int]:
+    stats = get_cart_pricing_cache_stats()
+    return stats["hits"], stats["misses"]
+
+
+@pytest.mark.django_db
+def test_repeated_read_hits_without_running_pipeline():
+    cart = _cart()
+    first = get_cached_cart_pricing(cart)
+
+    with patch.object(pricing_cache, "_compute", side_effect=AssertionError("recomputed")):
+        second = get_cached_cart_pricing(cart)
+
+    assert second.total_gross == first.total_gross
+    assert _stats() == (1, 1)
+    assert get_cart_pricing_cache_stats()["hit_rate"] == 0.5
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda cart: CartItem.objects.filter(cart=cart).update(quantity=3),
+        lambda cart: Product.objects.update(price_net_amount=Decimal("11.00")),
+        lambda cart: TaxClass.objects.update(rate=Decimal("10")),
+        lambda cart: invalidate_promotion_snapshot(),
+    ],
+    ids=["quantity", "product-price", "tax-rate", "promotion-version"],
+)
+def test_input_changes_are_misses(mutate):
+    cart = _cart()
+    get_cached_cart_pricing(cart)
+
+    mutate(cart)
+    get_cached_cart_pricing(cart)
+
+    assert _stats() == (0, 2)
+
+
+@pytest.mark.django_db
+def test_promotion_edit_from_another_process_is_a_miss(settings):
+    cart = _cart()
+    promotion = Promotion.objects.create(
+        name="Mugs", code="mugs", type=PromotionType.PERCENT, value=Decimal("10")
+    )
+    PromotionProduct.objects.create(promotion=promotion, product=cart.items.get().product)
+    settings.PROMOTION_SNAPSHOT_TTL_SECONDS = 0
+    first = get_cached_cart_pricing(cart)
+    version = get_promotion_version()
+
+    # Another worker's save bumps only its own cache; here the version stays.
+    Promotion.objects.filter(pk=promotion.pk).update(value=Decimal("50"))
+    second = get_cached_cart_pricing(cart)
+
+    assert get_promotion_version() == version
+    assert _stats() == (0, 2)
+    assert second.total_gross < first.total_gross
+
+
+@pytest.mark.django_db
+def test_offer_token_is_part_of_the_key():
+    cart = _cart()
+    get_cached_cart_pricing(cart)
+
+    offer = _campaign_offer("tok-1")
+    with patch.object(pricing_cache, "_compute", return_value="priced-with-offer") as compute:
+        assert get_cached_cart_pricing(cart, offer=offer) == "priced-with-offer"
+        assert get_cached_cart_pricing(cart, offer=offer) == "priced-with-offer"
+
+    assert compute.call_count == 1
+    assert _stats() == (1, 2)
+
+
+@pytest.mark.django_db
+def test_unsaved_cart_bypasses_cache():
+    result = get_cached_cart_pricing(Cart(status=Cart.Status.ACTIVE))
+
+    assert result.item_count == 0
+    assert _stats() == (0, 0)
+
+
+@pytest.mark.django_db
+def test_cart_get_then_preflight_reuses_pricing(auth_client, user):
+    _cart(user=user)
+
+    assert auth_client.get("/api/v1/cart/").status_code == 200
+    preflight = auth_client.get("/api/v1/cart/checkout/preflight/")
+
+    assert preflight.status_code == 200
+    assert _stats() == (1, 1)
+
+
+@pytest.mark.django_db
+def test_campaign_promotion_edit_is_a_miss():
+    cart = _cart()
+    offer = _campaign_offer("tok-edit")
+    first = get_cached_cart_pricing(cart, offer=_reloaded(offer))
+    version = get_promotion_version()
+
+    # Edited in another worker: no snapshot version bump reaches this one.
+    OrderPromotion.objects.filter(pk=offer.promotion_id).update(value=Decimal("5.00"))
+    second = get_cached_cart_pricing(cart, offer=_reloaded(offer))
+
+    assert get_promotion_version() == version
+    assert _stats() == (0, 2)
+    assert first.order_discount.gross_reduction.amount == Decimal("2.00")
+    assert second.order_discount.gross_reduction.amount == Decimal("5.00")
@@ -0,0 +1,192 @@
+"""
+Incremental cart repricing (carts.services.pricing.reprice_cart_line).
+
+Covers:
+  - Quantity change, removal and a new line give the same result as a full
+    repricing, including legacy (unmigrated) lines
+  - Crossing an AUTO_APPLY threshold re-resolves the order-level discount
+  - Changing an existing line does not price any product again
+  - PATCH /cart/items/{id}/ responds with the incrementally repriced cart,
+    which the next GET reads from the cart pricing cache
+  - Without a cached result PATCH and DELETE price the cart once, after the
+    write
+"""
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.utils.timezone import now, timedelta
+
+from carts.models import Cart, CartItem
+from carts.services.pricing import (
+    CartLineDelta,
+    get_cart_pricing_with_order_discount,
+    reprice_cart_line,
+)
+from carts.services import pricing_cache
+from carts.services.pricing_cache import (
+    get_cart_pricing_cache_stats,
+    reset_cart_pricing_cache_stats,
+)
+from discounts.models import AcquisitionMode, OrderPromotion, PromotionType, StackingPolicy
+from products.models import Product, TaxClass
+
+
+def _product(name: str, net: str, tax_class: TaxClass) -> Product:
+    return Product.objects.create(
+        name=name,
+        price=Decimal(net),
+        price_net_amount=Decimal(net),
+        currency="EUR",
+        tax_class=tax_class,
+        stock_quantity=100,
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def cart_setup():
+    tax_class = TaxClass.objects.create(name="Std", code="std-incr", rate=Decimal("21"))
+    mug = _product("Mug", "10.00", tax_class)
+    pen = _product("Pen", "1.99", tax_class)
+    lamp = _product("Lamp", "33.33", tax_class)
+    legacy = Product.objects.create(
+        name="Legacy", price=Decimal("5.55"), stock_quantity=100, is_active=True
+    )
+    cart = Cart.objects.create(status=Cart.Status.ACTIVE)
+    for product, quantity in ((mug, 2), (pen, 3), (legacy, 1)):
+        CartItem.objects.create(
+            cart=cart, product=product, quantity=quantity, price_at_add_time=product.price
+        )
+    return cart, {"mug": mug, "pen": pen, "lamp": lamp, "legacy": legacy}
+
+
+def _threshold_promotion(minimum: str) -> OrderPromotion:
+    return OrderPromotion.objects.create(
+        name="Ten off",
+        code="INCR-10",
+        type=PromotionType.PERCENT,
+        value=Decimal("10"),
+        acquisition_mode=AcquisitionMode.AUTO_APPLY,
+        stacking_policy=StackingPolicy.EXCLUSIVE,
+        priority=5,
+        is_active=True,
+        minimum_order_value=Decimal(minimum),
+        active_from=now() - timedelta(days=1),
+        active_to=now() + timedelta(days=30),
+    )
+
+
+def _apply(cart: Cart, product: Product, quantity: int) -> CartLineDelta:
+    """Write the change to the DB and return the matching delta."""
+    if quantity == 0:
+        CartItem.objects.filter(cart=cart, product=product).delete()
+        return CartLineDelta(product_id=product.id, quantity=0)
+    item, _ = CartItem.objects.update_or_create(
+        cart=cart,
+        product=product,
+        defaults={"quantity": quantity, "price_at_add_time": product.price},
+    )
+    return CartLineDelta(product_id=product.id, quantity=quantity, item=item)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "name, quantity",
+    [
+        ("mug", 5),
+        ("pen", 0),
+        ("lamp", 2),
+        ("legacy", 4),
+        ("legacy", 0),
+    ],
+)
+def test_incremental_matches_full_repricing(cart_setup, name, quantity):
+    cart, products = cart_setup
+    previous = get_cart_pricing_with_order_discount(cart)
+
+    delta = _apply(cart, products[name], quantity)
+
+    assert reprice_cart_line(previous, delta) == get_cart_pricing_with_order_discount(cart)
+
+
+@pytest.mark.django_db
+def test_crossing_threshold_resolves_order_discount(cart_setup):
+    cart, products = cart_setup
+    _threshold_promotion("100.00")
+    previous = get_cart_pricing_with_order_discount(cart)
+    assert previous.order_discount is None
+
+    incremental = reprice_cart_line(previous, _apply(cart, products["mug"], 8))
+
+    assert incremental.order_discount is not None
+    assert incremental.order_discount.promotion_code == "INCR-10"
+    assert incremental == get_cart_pricing_with_order_discount(cart)
+
+
+@pytest.mark.django_db
+def test_existing_line_change_prices_no_product(cart_setup):
+    cart, products = cart_setup
+    previous = get_cart_pricing_with_order_discount(cart)
+    delta = _apply(cart, products["pen"], 7)
+
+    with patch(
+        "products.services.pricing.price_products_bulk",
+        side_effect=AssertionError("line repriced"),
+    ):
+        result = reprice_cart_line(previous, delta)
+
+    assert result.item_count == 9
+
+
+@pytest.mark.django_db
+def test_patch_responds_with_incremental_pricing_and_primes_cache(auth_client, user):
+    tax_class = TaxClass.objects.create(name="Std", code="std-incr-api", rate=Decimal("21"))
+    mug = _product("Mug", "10.00", tax_class)
+    pen = _product("Pen", "1.99", tax_class)
+    auth_client.post("/api/v1/cart/items/", {"product_id": mug.id, "quantity": 1}, format="json")
+    auth_client.post("/api/v1/cart/items/", {"product_id": pen.id, "quantity": 1}, format="json")
+    auth_client.get("/api/v1/cart/")
+
+    with patch(
+        "carts.services.pricing.get_cart_pricing",
+        side_effect=AssertionError("full repricing"),
+    ):
+        patched = auth_client.patch(
+            f"/api/v1/cart/items/{mug.id}/", {"quantity": 4}, format="json"
+        )
+    assert patched.status_code == 200
+
+    reset_cart_pricing_cache_stats()
+    fetched = auth_client.get("/api/v1/cart/")
+
+    assert get_cart_pricing_cache_stats()["hits"] == 1
+    assert patched.json() == fetched.json()
+    assert patched.json()["totals"]["subtotal_discounted"] == "50.81"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("method", ["patch", "delete"])
+def test_edit_without_cached_pricing_prices_once(auth_client, user, method):
+    tax_class = TaxClass.objects.create(name="Std", code=f"std-incr-{method}", rate=Decimal("21"))
+    mug = _product("Mug", "10.00", tax_class)
+    pen = _product("Pen", "1.99", tax_class)
+    auth_client.post("/api/v1/cart/items/", {"product_id": mug.id, "quantity": 1}, format="json")
+    auth_client.post("/api/v1/cart/items/", {"product_id": pen.id, "quantity": 1}, format="json")
+    cart = Cart.objects.get(user=user, status=Cart.Status.ACTIVE)
+    pricing_cache.invalidate_cart_pricing(cart.pk)
+
+    url = f"/api/v1/cart/items/{mug.id}/"
+    with patch.object(
+        pricing_cache, "_compute", wraps=pricing_cache._compute
+    ) as compute, patch(
+        "api.views.carts.reprice_cart_line",
+        side_effect=AssertionError("priced before and after the write"),
+    ):
+        if method == "patch":
+            response = auth_client.patch(url, {"quantity": 4}, format="json")
+        else:
+            response = auth_client.delete(url)
+
+    assert response.status_code == 200
+    assert compute.call_count == 1
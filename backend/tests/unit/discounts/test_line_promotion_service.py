@@ -14,17 +14,26 @@ Covers:
 - No applicable promotion returns safe no-discount result
 - Product without a category only matched by product targets (not category targets)
 - discounted_net is always non-negative
+- Bulk resolver picks the same winner as the per-product path
+- Bulk resolver issues a constant number of queries
 """
 
 from decimal import Decimal
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 from prices import Money
 
 from categories.models import Category
 from discounts.models import Promotion, PromotionAmountScope, PromotionCategory, PromotionProduct, PromotionType
-from discounts.services.line_promotion import LinePromotionResult, resolve_line_promotion
+from discounts.services.line_promotion import (
+    LinePromotionResult,
+    build_line_promotion_result,
+    resolve_line_promotion,
+    resolve_line_promotions_bulk,
+)
 from products.models import Product
 
 
@@ -516,3 +525,81 @@ def test_currency_is_propagated_to_result():
     assert result.original_net.currency == "USD"
     assert result.discount_net.currency == "USD"
     assert result.discounted_net.currency == "USD"
+
+
+# ---------------------------------------------------------------------------
+# Bulk resolver
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.django_db
+def test_bulk_resolver_matches_per_product_path():
+    """Bulk winners are identical to resolving each product on its own."""
+    today = now().date()
+    electronics = make_category("Electronics")
+    books = make_category("Books")
+
+    direct = make_product("Direct", category=books)
+    by_category = make_product("By category", category=electronics)
+    both = make_product("Both", category=electronics)
+    uncategorised = make_product("Uncategorised")
+    untargeted = make_product("Untargeted", category=books)
+
+    cat_promo = make_promotion(code="cat", value=Decimal("10"), priority=5)
+    target_category(cat_promo, electronics)
+    prod_promo = make_promotion(code="prod", value=Decimal("20"), priority=5)
+    target_product(prod_promo, direct)
+    target_product(prod_promo, both)
+    high = make_promotion(code="high", value=Decimal("30"), priority=9)
+    target_product(high, uncategorised)
+    expired = make_promotion(
+        code="expired", priority=99, active_to=today.replace(year=today.year - 1)
+    )
+    target_product(expired, untargeted)
+    inactive = make_promotion(code="inactive", priority=99, is_active=False)
+    target_category(inactive, books)
+
+    products = [direct, by_category, both, uncategorised, untargeted]
+    winners = resolve_line_promotions_bulk(products)
+
+    assert set(winners) == {p.pk for p in products}
+    for product in products:
+        single = resolve_line_promotion(
+            product=product, net_amount=Decimal("100.00"), currency="EUR"
+        )
+        bulk = build_line_promotion_result(
+            promotion=winners[product.pk],
+            net_amount=Decimal("100.00"),
+            currency="EUR",
+        )
+        assert bulk == single
+
+    # Equal priority → lower id wins, same as the per-product path.
+    assert winners[both.pk] == cat_promo
+    assert winners[untargeted.pk] is None
+
+
+@pytest.mark.django_db
+def test_bulk_resolver_uses_constant_number_of_queries():
+    category = make_category()
+    products = [make_product(f"P{i}", category=category) for i in range(20)]
+    promo = make_promotion(code="all")
+    target_category(promo, category)
+    for product in products[:10]:
+        target_product(make_promotion(code=f"p-{product.pk}", priority=1), product)
+
+    with CaptureQueriesContext(connection) as single:
+        resolve_line_promotions_bulk(products[:1])
+    with CaptureQueriesContext(connection) as ctx:
+        winners = resolve_line_promotions_bulk(products)
+
+    assert len(ctx.captured_queries) == len(single.captured_queries)
+    assert all(winners[p.pk].code == f"p-{p.pk}" for p in products[:10])
+    assert all(winners[p.pk] == promo for p in products[10:])
+
+
+@pytest.mark.django_db
+def test_bulk_resolver_empty_input_issues_no_queries():
+    with CaptureQueriesContext(connection) as ctx:
+        assert resolve_line_promotions_bulk([]) == {}
+    assert len(ctx.captured_queries) == 0
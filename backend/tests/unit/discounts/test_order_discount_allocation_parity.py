@@ -0,0 +1,187 @@
+"""
+Integer-cent allocation core vs the former Decimal implementation
+(discounts.services.order_discount_allocation).
+
+Covers:
+  - allocate_order_discount returns exactly the same buckets and totals
+    (value and representation) as the previous Decimal engine, for
+    randomised carts: many rates (incl. 0 %, fractional and tie-prone rates),
+    zero and sub-cent line amounts, PERCENT and FIXED discounts, discounts
+    at and above the order gross
+  - allocate_order_discounts gives the same results as per-order calls and
+    validates every pair before allocating
+"""
+import random
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+from discounts.services.order_discount_allocation import (
+    OrderDiscountAllocationResult,
+    OrderDiscountBucketResult,
+    OrderDiscountInput,
+    OrderLineInput,
+    allocate_order_discount,
+    allocate_order_discounts,
+)
+
+_Q = Decimal("0.01")
+_HUNDRED = Decimal("100")
+_ZERO = Decimal("0.00")
+
+
+def _q(v):
+    return v.quantize(_Q, rounding=ROUND_HALF_UP)
+
+
+def _reference_allocate(lines, discount):
+    """The Decimal engine the integer core replaces (validation omitted)."""
+    buckets = {}
+    for ln in lines:
+        net, gross = buckets.setdefault(_q(ln.tax_rate), [_ZERO, _ZERO])
+        buckets[_q(ln.tax_rate)] = [net + _q(ln.line_net), gross + _q(ln.line_gross)]
+    rates = sorted(buckets)
+    total_gross = _q(sum(buckets[r][1] for r in rates))
+
+    if total_gross <= _ZERO:
+        total_discount = _ZERO
+    elif discount.type == "PERCENT":
+        total_discount = _q(total_gross * discount.value / _HUNDRED)
+    else:
+        total_discount = _q(min(discount.value, total_gross))
+
+    if total_discount == _ZERO or total_gross == _ZERO:
+        reductions = [_ZERO] * len(rates)
+    else:
+        reductions = [
+            _q(total_discount * buckets[r][1] / total_gross) if buckets[r][1] > _ZERO else _ZERO
+            for r in rates
+        ]
+        residual = _q(total_discount - _q(sum(reductions)))
+        if residual != _ZERO:
+            best = max(
+                (i for i, r in enumerate(rates) if buckets[r][1] > _ZERO),
+                key=lambda i: buckets[rates[i]][1],
+            )
+            reductions[best] = _q(reductions[best] + residual)
+
+    result = []
+    for rate, gross_red in zip(rates, reductions):
+        net, gross = buckets[rate]
+        gross_red = max(_ZERO, min(gross_red, gross))
+        if rate == _ZERO:
+            net_red, tax_red = gross_red, _ZERO
+        else:
+            net_red = _q(gross_red * (_ZERO + _HUNDRED / (_HUNDRED + rate)))
+            tax_red = max(_ZERO, _q(gross_red - net_red))
+        original_tax = max(_ZERO, _q(_q(gross) - _q(net)))
+        result.append(
+            OrderDiscountBucketResult(
+                tax_rate=rate,
+                original_gross=_q(gross),
+                original_net=_q(net),
+                original_tax=original_tax,
+                gross_reduction=gross_red,
+                net_reduction=net_red,
+                tax_reduction=tax_red,
+                adjusted_gross=max(_ZERO, _q(_q(gross) - gross_red)),
+                adjusted_net=max(_ZERO, _q(_q(net) - net_red)),
+                adjusted_tax=max(_ZERO, _q(original_tax - tax_red)),
+            )
+        )
+
+    def _sum(attr):
+        return _q(sum(getattr(b, attr) for b in result))
+
+    return OrderDiscountAllocationResult(
+        buckets=result,
+        total_original_gross=_sum("original_gross"),
+        total_original_net=_sum("original_net"),
+        total_original_tax=_sum("original_tax"),
+        total_gross_reduction=_sum("gross_reduction"),
+        total_net_reduction=_sum("net_reduction"),
+        total_tax_reduction=_sum("tax_reduction"),
+        total_adjusted_gross=_sum("adjusted_gross"),
+        total_adjusted_net=_sum("adjusted_net"),
+        total_adjusted_tax=_sum("adjusted_tax"),
+        currency=discount.currency,
+    )
+
+
+# 4 % and 12 % admit exact half-cent net reductions; 0.16 % has a long
+# non-terminating multiplier.
+_RATES = ["0", "4", "5", "8", "10", "12", "12.5", "15", "20", "21", "23", "27", "0.16"]
+
+
+def _amount(rng, upper_cents):
+    cents = rng.randint(0, upper_cents)
+    if rng.random() < 0.15:
+        # Sub-cent input exercises the entry quantisation.
+        return (Decimal(cents) + Decimal(rng.randint(0, 9)) / 10).scaleb(-2)
+    return Decimal(cents).scaleb(-2)
+
+
+def _random_order(rng):
+    lines = []
+    for _ in range(rng.randint(1, 8)):
+        rate = Decimal(rng.choice(_RATES))
+        gross = _amount(rng, rng.choice([99, 5_000, 500_000]))
+        net = _q(gross * _HUNDRED / (_HUNDRED + rate))
+        lines.append(OrderLineInput(line_net=net, line_gross=gross, tax_rate=rate, currency="EUR"))
+
+    total = sum(_q(ln.line_gross) for ln in lines)
+    roll = rng.random()
+    if roll < 0.4:
+        value = Decimal(rng.choice(["5", "10", "12.5", "15", "33.33", "50", "99.99", "100"]))
+        discount = OrderDiscountInput(type="PERCENT", value=value, currency="EUR")
+    elif roll < 0.8:
+        discount = OrderDiscountInput(type="FIXED", value=_amount(rng, 10_000), currency="EUR")
+    else:
+        value = rng.choice([total, total + Decimal("0.01"), _ZERO, total * 3])
+        discount = OrderDiscountInput(type="FIXED", value=value, currency="EUR")
+    return lines, discount
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_integer_core_matches_decimal_reference(seed):
+    rng = random.Random(seed)
+    lines, discount = _random_order(rng)
+
+    result = allocate_order_discount(lines=lines, discount=discount)
+
+    # repr also pins every amount to two decimal places.
+    assert repr(result) == repr(_reference_allocate(lines, discount))
+
+
+@pytest.mark.parametrize(
+    "rate, gross",
+    [("4", "0.13"), ("4", "3.25"), ("12", "0.07"), ("100", "0.01")],
+)
+def test_half_cent_net_reduction_matches_reference(rate, gross):
+    line = OrderLineInput(
+        line_net=_ZERO, line_gross=Decimal(gross), tax_rate=Decimal(rate), currency="EUR"
+    )
+    discount = OrderDiscountInput(type="FIXED", value=Decimal(gross), currency="EUR")
+
+    result = allocate_order_discount(lines=[line], discount=discount)
+
+    assert repr(result) == repr(_reference_allocate([line], discount))
+
+
+def test_batch_matches_single_calls():
+    rng = random.Random(7)
+    orders = [_random_order(rng) for _ in range(50)]
+
+    batch = allocate_order_discounts(orders)
+
+    assert batch == [allocate_order_discount(lines=l, discount=d) for l, d in orders]
+    assert allocate_order_discounts([]) == []
+
+
+def test_batch_validates_every_order_first():
+    rng = random.Random(11)
+    valid = _random_order(rng)
+    invalid = (valid[0], OrderDiscountInput(type="BOGUS", value=Decimal("1"), currency="EUR"))
+
+    with pytest.raises(ValueError, match="Unsupported discount type"):
+        allocate_order_discounts([valid, invalid])
@@ -0,0 +1,134 @@
+"""
+Compiled order-discount decision table
+(discounts.services.order_discount_decision.OrderDiscountDecisionTable).
+
+Covers:
+  - next_upgrade, the current winner and threshold-reward picks match a
+    direct scan over every candidate, for randomised promotion sets and
+    cart values (including cent-rounding ties)
+  - Tables are compiled once per promotion snapshot and per extra
+    campaign promotion
+"""
+import random
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from discounts.models import OrderPromotion, PromotionType
+from discounts.services import order_discount_decision as decision
+from discounts.services.order_discount_decision import (
+    _collect_transition_points,
+    _compute_gross_discount,
+    _pick_winner,
+    compile_order_discount_decision_table,
+    get_order_discount_decision_table,
+)
+from discounts.services.promotion_snapshot import PromotionSnapshot
+
+
+def _promotion(pk, type_, value, *, minimum=None, priority=5):
+    return OrderPromotion(
+        id=pk,
+        name=f"P{pk}",
+        code=f"P{pk}",
+        type=type_,
+        value=Decimal(value),
+        minimum_order_value=None if minimum is None else Decimal(minimum),
+        priority=priority,
+    )
+
+
+def _random_promotions(rng):
+    promotions = []
+    for pk in range(1, rng.randint(1, 7) + 1):
+        if rng.random() < 0.5:
+            promotion = _promotion(pk, PromotionType.PERCENT, f"{rng.choice([5, 10, 12.5, 15, 20])}")
+        else:
+            promotion = _promotion(pk, PromotionType.FIXED, f"{rng.randint(1, 40)}.{rng.randint(0, 99):02d}")
+        if rng.random() < 0.6:
+            promotion.minimum_order_value = Decimal(rng.randint(1, 300))
+        promotion.priority = rng.randint(1, 3)
+        promotions.append(promotion)
+    # Snapshot order.
+    return sorted(promotions, key=lambda p: (-p.priority, p.id))
+
+
+def _eligible(candidates, gross):
+    return [
+        p for p in candidates
+        if p.minimum_order_value is None or gross >= p.minimum_order_value
+    ]
+
+
+def _reference_next_upgrade(candidates, gross, current):
+    """The per-request scan the table replaces."""
+    for tp in _collect_transition_points(candidates, gross):
+        winner = _pick_winner(_eligible(candidates, tp), tp)
+        if winner is None:
+            continue
+        if current is None:
+            return tp, winner.name
+        if winner.id != current.id and _compute_gross_discount(
+            winner, tp
+        ) > _compute_gross_discount(current, tp):
+            return tp, winner.name
+    return None
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_table_matches_direct_scan(seed):
+    rng = random.Random(seed)
+    candidates = _random_promotions(rng)
+    table = compile_order_discount_decision_table(candidates)
+
+    grosses = [Decimal(rng.randint(0, 40000)).scaleb(-2) for _ in range(60)]
+    grosses += list(table.points) + [p - Decimal("0.01") for p in table.points]
+    for gross in grosses:
+        winner = _pick_winner(_eligible(candidates, gross), gross)
+        assert table.winner_at(gross) == winner
+
+        for current in (None, winner, rng.choice(candidates)):
+            upgrade = table.next_upgrade(gross, current, "EUR")
+            expected = _reference_next_upgrade(candidates, gross, current)
+            got = None if upgrade is None else (upgrade.threshold, upgrade.promotion_name)
+            assert got == expected, (gross, current)
+
+        locked = [
+            p for p in candidates
+            if p.minimum_order_value is not None and p.minimum_order_value > gross
+        ]
+        expected_locked = (
+            min(locked, key=lambda p: p.minimum_order_value - gross) if locked else None
+        )
+        assert table.closest_locked_threshold(gross) == expected_locked
+
+
+def _snapshot(promotions):
+    return PromotionSnapshot(
+        version=1,
+        as_of=date(2026, 1, 1),
+        as_of_local=date(2026, 1, 1),
+        line_promotions={},
+        product_targets={},
+        category_targets={},
+        auto_apply_order_promotions=tuple(promotions),
+    )
+
+
+def test_tables_are_compiled_once_per_snapshot():
+    auto = [_promotion(1, PromotionType.PERCENT, "10", minimum="50")]
+    campaign = _promotion(9, PromotionType.FIXED, "15")
+    first, second = _snapshot(auto), _snapshot(auto)
+
+    with patch.object(decision, "get_promotion_snapshot", return_value=first):
+        table = get_order_discount_decision_table()
+        assert get_order_discount_decision_table() is table
+        with_campaign = get_order_discount_decision_table(campaign)
+        assert with_campaign is not table
+        assert get_order_discount_decision_table(campaign) is with_campaign
+        assert {p.id for p in with_campaign.candidates} == {1, 9}
+
+    with patch.object(decision, "get_promotion_snapshot", return_value=second):
+        assert get_order_discount_decision_table() is not table
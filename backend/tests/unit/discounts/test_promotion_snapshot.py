@@ -0,0 +1,196 @@
+"""Unit tests for the in-process promotion snapshot.
+
+Covers:
+- Snapshot contents: active, in-window line promotions, targets and
+  AUTO_APPLY order promotions
+- Saving / deleting any promotion model bumps the version
+- A published snapshot is reused without queries outside transactions
+- Version bump, date rollover and TTL expiry each force a rebuild
+- Snapshots built inside an atomic block are never published
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from categories.models import Category
+from discounts.models import (
+    AcquisitionMode,
+    OrderPromotion,
+    Promotion,
+    PromotionCategory,
+    PromotionProduct,
+    PromotionType,
+)
+from discounts.services import promotion_snapshot
+from discounts.services.promotion_snapshot import (
+    get_promotion_snapshot,
+    get_promotion_version,
+)
+from products.models import Product
+
+
+def make_product(name: str = "Snapshot Product", category=None) -> Product:
+    return Product.objects.create(
+        name=name,
+        price=Decimal("10.00"),
+        stock_quantity=1,
+        price_net_amount=Decimal("10.00"),
+        currency="EUR",
+        category=category,
+    )
+
+
+def make_promotion(code: str, **kwargs) -> Promotion:
+    defaults = dict(name=f"Promo {code}", type=PromotionType.PERCENT, value=Decimal("10"))
+    defaults.update(kwargs)
+    return Promotion.objects.create(code=code, **defaults)
+
+
+def make_order_promotion(code: str, **kwargs) -> OrderPromotion:
+    defaults = dict(
+        name=f"Order {code}",
+        type=PromotionType.PERCENT,
+        value=Decimal("5"),
+        acquisition_mode=AcquisitionMode.AUTO_APPLY,
+    )
+    defaults.update(kwargs)
+    return OrderPromotion.objects.create(code=code, **defaults)
+
+
+# ---------------------------------------------------------------------------
+# Contents
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.django_db
+def test_snapshot_contains_only_active_in_window_promotions():
+    today = timezone.now().date()
+    category = Category.objects.create(name="Snapshot")
+    product = make_product(category=category)
+
+    active = make_promotion("active")
+    PromotionProduct.objects.create(promotion=active, product=product)
+    future = make_promotion("future", active_from=today + timedelta(days=1))
+    PromotionProduct.objects.create(promotion=future, product=product)
+    inactive = make_promotion("inactive", is_active=False)
+    PromotionCategory.objects.create(promotion=inactive, category=category)
+
+    auto = make_order_promotion("auto")
+    make_order_promotion("campaign", acquisition_mode=AcquisitionMode.CAMPAIGN_APPLY)
+    make_order_promotion("expired", active_to=today - timedelta(days=1))
+
+    snapshot = get_promotion_snapshot()
+
+    assert set(snapshot.line_promotions) == {active.id}
+    assert snapshot.product_targets == {product.id: frozenset({active.id})}
+    assert snapshot.category_targets == {}
+    assert snapshot.auto_apply_order_promotions == (auto,)
+
+
+@pytest.mark.django_db
+def test_auto_apply_order_promotions_are_ordered_by_priority_then_id():
+    low = make_order_promotion("low", priority=1)
+    high = make_order_promotion("high", priority=9)
+    low_later = make_order_promotion("low-later", priority=1)
+
+    snapshot = get_promotion_snapshot()
+
+    assert snapshot.auto_apply_order_promotions == (high, low, low_later)
+
+
+# ---------------------------------------------------------------------------
+# Version bumps
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.django_db
+def test_version_is_bumped_by_every_promotion_model_write():
+    category = Category.objects.create(name="Versioned")
+    product = make_product(category=category)
+
+    writes = [
+        lambda: make_promotion("v-promo"),
+        lambda: PromotionProduct.objects.create(
+            promotion=Promotion.objects.get(code="v-promo"), product=product
+        ),
+        lambda: PromotionCategory.objects.create(
+            promotion=Promotion.objects.get(code="v-promo"), category=category
+        ),
+        lambda: make_order_promotion("v-order"),
+        lambda: PromotionProduct.objects.all().delete(),
+        lambda: Promotion.objects.get(code="v-promo").delete(),
+    ]
+    for write in writes:
+        before = get_promotion_version()
+        write()
+        assert get_promotion_version() > before
+
+
+# ---------------------------------------------------------------------------
+# Publishing and reuse (outside test transactions)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.django_db(transaction=True)
+def test_published_snapshot_is_reused_without_queries():
+    make_order_promotion("reuse")
+    first = get_promotion_snapshot()
+
+    with CaptureQueriesContext(connection) as ctx:
+        second = get_promotion_snapshot()
+
+    assert second is first
+    assert len(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_promotion_write_forces_rebuild():
+    first = get_promotion_snapshot()
+    assert first.auto_apply_order_promotions == ()
+
+    promo = make_order_promotion("fresh")
+    second = get_promotion_snapshot()
+
+    assert second is not first
+    assert second.auto_apply_order_promotions == (promo,)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_date_rollover_forces_rebuild(monkeypatch):
+    tomorrow = timezone.now() + timedelta(days=1)
+    promo = make_order_promotion("tomorrow", active_from=tomorrow.date())
+    first = get_promotion_snapshot()
+    assert first.auto_apply_order_promotions == ()
+
+    monkeypatch.setattr(promotion_snapshot.timezone, "now", lambda: tomorrow)
+    second = get_promotion_snapshot()
+
+    assert second.as_of == tomorrow.date()
+    assert second.auto_apply_order_promotions == (promo,)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_ttl_expiry_forces_rebuild(settings):
+    settings.PROMOTION_SNAPSHOT_TTL_SECONDS = 0
+    first = get_promotion_snapshot()
+
+    assert get_promotion_snapshot() is not first
+
+
+@pytest.mark.django_db(transaction=True)
+def test_snapshot_built_inside_atomic_block_is_not_published():
+    with transaction.atomic():
+        make_order_promotion("uncommitted")
+        inside = get_promotion_snapshot()
+        assert len(inside.auto_apply_order_promotions) == 1
+        transaction.set_rollback(True)
+
+    outside = get_promotion_snapshot()
+
+    assert outside is not inside
+    assert outside.auto_apply_order_promotions == ()
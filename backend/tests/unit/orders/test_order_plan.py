@@ -0,0 +1,157 @@
+"""
+Tests for the checkout order plan (orders.services.order_plan).
+
+Covers:
+  - Line snapshot values for migrated and unmigrated products
+  - Order totals include the legacy gross of unmigrated lines
+  - build_order_plan issues no queries
+  - cart_fingerprint detects quantity changes made after planning
+  - to_payload / from_payload round-trip a plan through JSON
+  - Checkout inserts all order items with a single INSERT and writes the
+    order totals with the order row
+  - Checkout re-plans when the cart changed between planning and locking
+"""
+import json
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from carts.models import Cart, CartItem
+from carts.services.pricing import get_cart_pricing_with_order_discount
+from orderitems.models import OrderItem
+from orders.models import Order
+from orders.services import order_plan as order_plan_module
+from orders.services.order_plan import OrderPlan, build_order_plan, cart_fingerprint
+from products.models import Product, TaxClass
+from tests.conftest import checkout_payload
+
+
+def _cart_with_lines(user=None) -> Cart:
+    tax_class = TaxClass.objects.create(name="Std", code="std-plan", rate=Decimal("21"))
+    migrated = Product.objects.create(
+        name="Migrated",
+        price=Decimal("10.00"),
+        price_net_amount=Decimal("10.00"),
+        currency="EUR",
+        tax_class=tax_class,
+        stock_quantity=50,
+        is_active=True,
+    )
+    legacy = Product.objects.create(
+        name="Legacy", price=Decimal("5.55"), stock_quantity=50, is_active=True
+    )
+    cart = Cart.objects.create(user=user, status=Cart.Status.ACTIVE)
+    CartItem.objects.create(
+        cart=cart, product=migrated, quantity=3, price_at_add_time=Decimal("12.10")
+    )
+    CartItem.objects.create(
+        cart=cart, product=legacy, quantity=2, price_at_add_time=Decimal("5.55")
+    )
+    return cart
+
+
+@pytest.mark.django_db
+def test_plan_lines_and_totals():
+    cart = _cart_with_lines()
+    pricing = get_cart_pricing_with_order_discount(cart)
+
+    with CaptureQueriesContext(connection) as ctx:
+        plan = build_order_plan(pricing)
+    assert ctx.captured_queries == []
+
+    migrated, legacy = sorted(plan.lines, key=lambda line: line.is_legacy)
+    assert migrated.unit_price_at_order_time == Decimal("12.10")
+    assert migrated.line_total_at_order_time == Decimal("36.30")
+    assert migrated.line_total_net_at_order_time == Decimal("30.00")
+    assert migrated.tax_rate_at_order_time == Decimal("21")
+    assert migrated.applied_discount_type_at_order_time is None
+
+    assert legacy.is_legacy
+    assert legacy.unit_price_at_order_time == Decimal("5.55")
+    assert legacy.line_total_at_order_time == Decimal("11.10")
+    assert legacy.unit_price_net_at_order_time is None
+
+    assert plan.subtotal_gross == Decimal("47.40")
+    assert plan.total_tax == Decimal("6.30")
+    assert plan.subtotal_net == Decimal("41.10")
+    assert plan.currency == "EUR"
+    assert plan.cart_fingerprint == cart_fingerprint(cart)
+
+
+@pytest.mark.django_db
+def test_cart_fingerprint_changes_with_quantity():
+    cart = _cart_with_lines()
+    plan = build_order_plan(get_cart_pricing_with_order_discount(cart))
+
+    CartItem.objects.filter(cart=cart, product__name="Legacy").update(quantity=5)
+
+    assert cart_fingerprint(cart) != plan.cart_fingerprint
+
+
+@pytest.mark.django_db
+def test_plan_payload_round_trip():
+    cart = _cart_with_lines()
+    plan = build_order_plan(get_cart_pricing_with_order_discount(cart))
+
+    restored = OrderPlan.from_payload(json.loads(json.dumps(plan.to_payload())))
+
+    assert restored == plan
+    assert restored.cart_fingerprint == cart_fingerprint(cart)
+
+
+@pytest.mark.django_db
+def test_checkout_bulk_inserts_items_and_writes_totals_once(auth_client, user):
+    cart = _cart_with_lines(user=user)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = auth_client.post(
+            "/api/v1/cart/checkout/",
+            checkout_payload(customer_email=user.email),
+            format="json",
+        )
+    assert response.status_code == 201, response.content
+
+    item_table = OrderItem._meta.db_table
+    order_table = Order._meta.db_table
+    sqls = [q["sql"] for q in ctx.captured_queries]
+    assert sum(s.startswith(f'INSERT INTO "{item_table}"') for s in sqls) == 1
+    assert not any(
+        s.startswith(f'UPDATE "{order_table}"') and '"subtotal_gross"' in s for s in sqls
+    )
+
+    order = Order.objects.get(pk=response.json()["id"])
+    assert order.items.count() == 2
+    assert order.subtotal_gross == Decimal("47.40")
+    cart.refresh_from_db()
+    assert cart.status == Cart.Status.CONVERTED
+
+
+@pytest.mark.django_db
+def test_checkout_replans_when_cart_changes_before_lock(auth_client, user):
+    cart = _cart_with_lines(user=user)
+    real_build = order_plan_module.build_order_plan
+    calls = []
+
+    def build_then_mutate(pricing):
+        plan = real_build(pricing)
+        if not calls:
+            # Simulate a concurrent quantity change after planning.
+            CartItem.objects.filter(cart=cart, product__name="Legacy").update(quantity=4)
+        calls.append(plan)
+        return plan
+
+    with patch("api.views.carts.build_order_plan", side_effect=build_then_mutate):
+        response = auth_client.post(
+            "/api/v1/cart/checkout/",
+            checkout_payload(customer_email=user.email),
+            format="json",
+        )
+
+    assert response.status_code == 201, response.content
+    assert len(calls) == 2
+    legacy_item = OrderItem.objects.get(product__name="Legacy")
+    assert legacy_item.quantity == 4
+    assert legacy_item.line_total_at_order_time == Decimal("22.20")
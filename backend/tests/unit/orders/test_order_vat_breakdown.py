@@ -0,0 +1,144 @@
+"""
+Persisted order VAT breakdown (orders.services.vat_breakdown, Order.vat_breakdown).
+
+Covers:
+  - Checkout stores the breakdown; it equals the one computed from the saved
+    OrderItem rows, with and without an order-level discount and with a
+    legacy (unmigrated) line
+  - Order reads return the stored rows without recomputing them
+  - Orders without a stored breakdown are computed on read
+  - backfill_order_vat_breakdown writes the same rows in batches, skips
+    orders that already have one and supports --dry-run
+"""
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.utils.timezone import now
+
+from discounts.models import AcquisitionMode, OrderPromotion, PromotionType, StackingPolicy
+from orders.models import Order
+from orders.services.vat_breakdown import compute_order_vat_breakdown
+from products.models import Product, TaxClass
+from tests.conftest import checkout_payload
+
+
+def _product(name, net, tax_class):
+    return Product.objects.create(
+        name=name,
+        price=Decimal(net),
+        price_net_amount=Decimal(net),
+        currency="EUR",
+        tax_class=tax_class,
+        stock_quantity=50,
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def products():
+    standard = TaxClass.objects.create(name="Std", code="std-vb", rate=Decimal("21"))
+    reduced = TaxClass.objects.create(name="Red", code="red-vb", rate=Decimal("10"))
+    legacy = Product.objects.create(
+        name="Legacy", price=Decimal("7.77"), stock_quantity=50, is_active=True
+    )
+    return [
+        _product("Lamp", "33.33", standard),
+        _product("Book", "12.99", reduced),
+        legacy,
+    ]
+
+
+def _order_discount():
+    return OrderPromotion.objects.create(
+        name="Seven off",
+        code="VB-7",
+        type=PromotionType.PERCENT,
+        value=Decimal("7"),
+        acquisition_mode=AcquisitionMode.AUTO_APPLY,
+        stacking_policy=StackingPolicy.EXCLUSIVE,
+        priority=5,
+        is_active=True,
+        active_from=now() - timedelta(days=1),
+        active_to=now() + timedelta(days=30),
+    )
+
+
+def _checkout(client, products) -> Order:
+    for quantity, product in enumerate(products, start=1):
+        client.post(
+            "/api/v1/cart/items/",
+            {"product_id": product.id, "quantity": quantity},
+            format="json",
+        )
+    response = client.post("/api/v1/cart/checkout/", checkout_payload(), format="json")
+    assert response.status_code == 201, response.content
+    return Order.objects.get(pk=response.json()["id"])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("with_order_discount", [False, True])
+def test_checkout_stores_breakdown_matching_items(auth_client, products, with_order_discount):
+    if with_order_discount:
+        _order_discount()
+
+    order = _checkout(auth_client, products)
+
+    assert (order.order_discount_gross is not None) is with_order_discount
+    assert [row["tax_rate"] for row in order.vat_breakdown] == ["10.00", "21.00"]
+    assert order.vat_breakdown == compute_order_vat_breakdown(order)
+
+
+@pytest.mark.django_db
+def test_read_returns_stored_breakdown(auth_client, products):
+    _order_discount()
+    order = _checkout(auth_client, products)
+
+    with patch(
+        "api.serializers.order.compute_order_vat_breakdown",
+        side_effect=AssertionError("recomputed"),
+    ):
+        response = auth_client.get(f"/api/v1/orders/{order.pk}/")
+
+    assert response.status_code == 200
+    assert response.json()["vat_breakdown"] == order.vat_breakdown
+
+
+@pytest.mark.django_db
+def test_missing_breakdown_is_computed_on_read(auth_client, products):
+    _order_discount()
+    order = _checkout(auth_client, products)
+    stored = order.vat_breakdown
+    Order.objects.filter(pk=order.pk).update(vat_breakdown=None)
+
+    response = auth_client.get(f"/api/v1/orders/{order.pk}/")
+
+    assert response.json()["vat_breakdown"] == stored
+
+
+@pytest.mark.django_db
+def test_backfill_command(auth_client, products):
+    first = _checkout(auth_client, products[:1])
+    _order_discount()
+    second = _checkout(auth_client, products)
+    third = _checkout(auth_client, products[2:])
+    expected = {o.pk: o.vat_breakdown for o in (first, second, third)}
+    Order.objects.filter(pk__in=[first.pk, second.pk]).update(vat_breakdown=None)
+
+    out = StringIO()
+    call_command("backfill_order_vat_breakdown", "--dry-run", stdout=out)
+    assert "Would backfill 2 orders." in out.getvalue()
+    assert Order.objects.filter(vat_breakdown__isnull=True).count() == 2
+
+    out = StringIO()
+    call_command("backfill_order_vat_breakdown", "--batch-size", "1", stdout=out)
+
+    assert "Backfilled VAT breakdown on 2 orders." in out.getvalue()
+    assert {
+        o.pk: o.vat_breakdown for o in Order.objects.filter(pk__in=expected)
+    } == expected
+    # Legacy-only order: nothing to break down.
+    assert expected[third.pk] == []
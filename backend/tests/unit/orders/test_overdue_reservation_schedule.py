@@ -4,7 +4,8 @@ Covers:
 - Settings default is a sensible cron expression.
 - Schedule registration is idempotent.
 - The registered schedule targets the correct job function and cron.
-- The job function delegates to the management command (no duplicated logic).
+- The job function delegates to the management command (no duplicated logic)
+  and passes the configured shard count (one per worker by default).
 - sync_q_schedules management command registers both schedules in one call.
 
 Domain behavior (expire_overdue_reservations) is tested in the existing
@@ -15,6 +16,8 @@ intentionally does NOT re-test the service layer.
 from unittest.mock import patch, call
 
 import pytest
+from django.conf import settings
+from django.test import override_settings
 from django_q.models import Schedule
 
 from orders.jobs import run_overdue_reservation_expiration
@@ -130,11 +133,11 @@ def test_job_calls_management_command():
     with patch("orders.jobs.call_command") as mock_call:
         run_overdue_reservation_expiration()
 
-    mock_call.assert_called_once_with("expire_overdue_reservations")
+    mock_call.assert_called_once_with("expire_overdue_reservations", shards=1)
 
 
 def test_job_does_not_pass_extra_args():
-    """The job calls the command with no positional/keyword overrides.
+    """The job passes no overrides besides the shard count.
 
     The command defaults to timezone.now() for --as-of and omits --dry-run,
     so the job must not inject those values — the scheduled job is always
@@ -145,7 +148,26 @@ def test_job_does_not_pass_extra_args():
 
     args, kwargs = mock_call.call_args
     assert args == ("expire_overdue_reservations",)
-    assert kwargs == {}
+    assert set(kwargs) == {"shards"}
+
+
+@override_settings(
+    OVERDUE_RESERVATIONS_EXPIRY_SHARDS=0,
+    Q_CLUSTER={**settings.Q_CLUSTER, "workers": 4},
+)
+def test_job_fans_out_one_shard_per_worker_by_default():
+    with patch("orders.jobs.call_command") as mock_call:
+        run_overdue_reservation_expiration()
+
+    mock_call.assert_called_once_with("expire_overdue_reservations", shards=4)
+
+
+@override_settings(OVERDUE_RESERVATIONS_EXPIRY_SHARDS=3)
+def test_job_uses_configured_shard_count():
+    with patch("orders.jobs.call_command") as mock_call:
+        run_overdue_reservation_expiration()
+
+    mock_call.assert_called_once_with("expire_overdue_reservations", shards=3)
 
 
 # ---------------------------------------------------------------------------
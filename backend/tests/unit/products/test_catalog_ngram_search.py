@@ -0,0 +1,190 @@
+"""
+InMemoryNgramSearchBackend — pure-Python bigram search.
+
+Covers:
+  - Bigram tokenisation (case-folding, one-character words)
+  - BM25 ranking: more / rarer shared bigrams score higher; no overlap → no hit
+  - All three text columns are searched
+  - Product create / update / delete are reflected through signals
+  - Incremental updates tombstone old slots and compact past the threshold
+  - Published index is reused and refreshed incrementally (copy-on-write)
+    outside transactions
+  - Inside a transaction the published index is searched without rebuilding
+  - A product re-read before its writer committed is re-indexed once the
+    index outlives CATALOGUE_NGRAM_INDEX_TTL_SECONDS
+  - The list endpoint searches on SQLite
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from products.models import Product
+from products.search import ngram
+from products.search.backends import InMemoryNgramSearchBackend
+from products.search.ngram import NgramIndex, reset_ngram_index, tokenize
+from products.search.types import CatalogSearchQuery
+
+
+@pytest.fixture(autouse=True)
+def _fresh_index():
+    reset_ngram_index()
+    yield
+    reset_ngram_index()
+
+
+def _make_product(name: str, **kwargs) -> Product:
+    defaults = {"price": Decimal("10.00"), "stock_quantity": 5}
+    defaults.update(kwargs)
+    return Product.objects.create(name=name, **defaults)
+
+
+def _search(term: str) -> list[int]:
+    return InMemoryNgramSearchBackend().search(CatalogSearchQuery(search=term)).product_ids
+
+
+def test_tokenize_splits_words_into_bigrams():
+    assert tokenize("Mouse X") == ["mo", "ou", "us", "se", "x"]
+    assert tokenize("  ") == []
+
+
+def test_bm25_ranks_closer_matches_higher():
+    index = NgramIndex.build(
+        1,
+        rows=[
+            (1, "Wireless Mouse", "", ""),
+            (2, "Mouse pad", "", ""),
+            (3, "Keyboard", "", ""),
+            (4, "Wireless keyboard", "", ""),
+        ],
+    )
+
+    hits = index.search("wireless mouse")
+
+    assert [h.product_id for h in hits][:1] == [1]
+    assert {h.product_id for h in hits} == {1, 2, 4}
+    assert all(h.relevance > 0 for h in hits)
+    assert index.search("zzz") == []
+
+
+def test_upsert_tombstones_and_dead_fraction():
+    index = NgramIndex.build(1, rows=[(1, "Alpha", "", ""), (2, "Bravo", "", "")])
+
+    index.upsert(1, ["Charlie", "", ""])
+    index.remove(2)
+
+    assert index.live_count == 1
+    assert index.dead_fraction == pytest.approx(2 / 3)
+    assert [h.product_id for h in index.search("charlie")] == [1]
+    assert index.search("alpha") == []
+    assert index.search("bravo") == []
+
+
+@pytest.mark.django_db
+def test_searches_all_text_columns():
+    by_name = _make_product("Ergonomic chair")
+    by_short = _make_product("Desk", short_description="ergonomic height")
+    by_full = _make_product("Lamp", full_description="An **ergonomic** lamp.")
+    _make_product("Unrelated")
+
+    assert set(_search("ergonomic")) == {by_name.id, by_short.id, by_full.id}
+
+
+@pytest.mark.django_db
+def test_product_changes_are_reflected():
+    product = _make_product("Wireless mouse")
+    assert _search("mouse") == [product.id]
+
+    product.name = "Keyboard"
+    product.save()
+    assert _search("mouse") == []
+    assert _search("keyboard") == [product.id]
+
+    product.delete()
+    assert _search("keyboard") == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_published_index_is_updated_incrementally(monkeypatch):
+    keep = [_make_product(f"Keyboard {i}") for i in range(4)]
+    target = _make_product("Wireless mouse")
+    assert _search("mouse") == [target.id]
+    published = ngram._index
+
+    builds = []
+    original_build = NgramIndex.build.__func__
+    monkeypatch.setattr(
+        NgramIndex,
+        "build",
+        classmethod(lambda cls, *a, **kw: builds.append(1) or original_build(cls, *a, **kw)),
+    )
+
+    target.name = "Wireless trackball"
+    target.save()
+
+    assert _search("trackball") == [target.id]
+    assert _search("mouse") == []
+    assert builds == []
+    # Applied to a copy: the previously published index is never modified.
+    assert ngram._index is not published
+    assert [h.product_id for h in published.search("mouse")] == [target.id]
+
+    # Tombstones beyond the threshold trigger a compacting rebuild.
+    for product in keep:
+        product.delete()
+    assert _search("trackball") == [target.id]
+    assert builds == [1]
+    assert ngram._index.dead_fraction == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stale_entry_is_rebuilt_after_index_ttl(settings):
+    target = _make_product("Wireless mouse")
+    assert _search("mouse") == [target.id]
+
+    with transaction.atomic():
+        target.name = "Wireless trackball"
+        target.save()
+        # A search in another thread consumes the queue before the commit
+        # and re-reads the old row: the index stays on "mouse" but is marked
+        # current.
+        with ngram._lock:
+            ngram._pending.clear()
+    assert _search("trackball") == []
+
+    settings.CATALOGUE_NGRAM_INDEX_TTL_SECONDS = 0
+    assert _search("trackball") == [target.id]
+    assert _search("mouse") == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_atomic_block_searches_published_index_without_rebuilding(monkeypatch):
+    target = _make_product("Wireless mouse")
+    assert _search("mouse") == [target.id]
+    builds = []
+    original_build = NgramIndex.build.__func__
+    monkeypatch.setattr(
+        NgramIndex,
+        "build",
+        classmethod(lambda cls, *a, **kw: builds.append(1) or original_build(cls, *a, **kw)),
+    )
+
+    with transaction.atomic():
+        _make_product("Wired mouse")
+        assert _search("mouse") == [target.id]
+        assert _search("mouse") == [target.id]
+
+    assert builds == []
+    assert len(_search("mouse")) == 2
+
+
+@pytest.mark.django_db
+def test_list_endpoint_searches_with_inmemory_backend():
+    mouse = _make_product("Wireless mouse")
+    _make_product("Keyboard")
+
+    body = APIClient().get("/api/v1/products/", {"search": "mouse"}).json()
+
+    assert [item["id"] for item in body["results"]] == [mouse.id]
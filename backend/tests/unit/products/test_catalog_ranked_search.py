@@ -0,0 +1,152 @@
+"""
+Ranked (relevance-ordered) catalogue search — vendor-agnostic tests.
+
+A stub backend supplies fixed hits so the ranked execution mode can be
+exercised on SQLite.
+
+Covers:
+  - Ranked order equals the SQL relevance ordering of get_queryset, also
+    for names that differ in case
+  - Catalogue filters are applied to the hit list
+  - Eligibility queries are chunked: no pk__in list exceeds RANK_CHUNK_SIZE
+  - The list endpoint pages over the ranking and fetches only page products
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from products.models import Product
+from products.search import service as service_module
+from products.search.service import CatalogSearchService
+from products.search.types import CatalogSearchQuery, SearchHit, SearchResult
+
+
+class _StubBackend:
+    def __init__(self, hits: list[SearchHit]) -> None:
+        self.hits = hits
+
+    def search(self, query: CatalogSearchQuery) -> SearchResult:
+        return SearchResult(hits=list(self.hits))
+
+
+def _make_product(**kwargs) -> Product:
+    defaults = {"price": Decimal("10.00"), "stock_quantity": 5, "is_active": True}
+    defaults.update(kwargs)
+    return Product.objects.create(**defaults)
+
+
+def _catalogue() -> list[SearchHit]:
+    a = _make_product(name="Alpha")
+    b = _make_product(name="Bravo", stock_quantity=0)
+    c = _make_product(name="Charlie")
+    d = _make_product(name="Delta", is_active=False)
+    e = _make_product(name="Echo", price=Decimal("99.00"))
+    return [
+        SearchHit(product_id=b.id, relevance=2.0),
+        SearchHit(product_id=c.id, relevance=1.0),
+        SearchHit(product_id=a.id, relevance=1.0),
+        SearchHit(product_id=d.id, relevance=3.0),
+        SearchHit(product_id=e.id, relevance=0.5),
+    ]
+
+
+@pytest.mark.django_db
+def test_ranked_order_matches_sql_relevance_ordering():
+    service = CatalogSearchService(_StubBackend(_catalogue()))
+    query = CatalogSearchQuery(search="x")
+
+    ranked = service.get_ranked_catalog(query)
+    sql_ids = list(service.get_queryset(query).values_list("id", flat=True))
+
+    assert ranked.product_ids == sql_ids
+    assert [Product.objects.get(pk=pk).name for pk in ranked.product_ids] == [
+        "Bravo",
+        "Alpha",
+        "Charlie",
+        "Echo",
+    ]
+
+
+@pytest.mark.django_db
+def test_ranked_order_ignores_name_case_like_sql_ordering():
+    names = ["banana", "Apple", "apple", "Cherry"]
+    hits = [SearchHit(product_id=_make_product(name=n).id, relevance=1.0) for n in names]
+    service = CatalogSearchService(_StubBackend(hits))
+    query = CatalogSearchQuery(search="x")
+
+    ranked = service.get_ranked_catalog(query)
+    sql_ids = list(service.get_queryset(query).values_list("id", flat=True))
+
+    assert ranked.product_ids == sql_ids
+    assert [Product.objects.get(pk=pk).name for pk in ranked.product_ids] == [
+        "Apple",
+        "apple",
+        "banana",
+        "Cherry",
+    ]
+
+
+@pytest.mark.django_db
+def test_ranked_catalog_applies_catalogue_filters():
+    service = CatalogSearchService(_StubBackend(_catalogue()))
+
+    ranked = service.get_ranked_catalog(
+        CatalogSearchQuery(search="x", in_stock_only=True, max_price=Decimal("50"))
+    )
+
+    assert [Product.objects.get(pk=pk).name for pk in ranked.product_ids] == [
+        "Alpha",
+        "Charlie",
+    ]
+
+
+@pytest.mark.django_db
+def test_explicit_sort_is_not_ranked():
+    service = CatalogSearchService(_StubBackend([]))
+
+    assert service.is_ranked(CatalogSearchQuery(search="x"))
+    assert not service.is_ranked(CatalogSearchQuery(search="x", sort="price_asc"))
+    assert not service.is_ranked(CatalogSearchQuery(search="  "))
+    with pytest.raises(ValueError):
+        service.get_ranked_catalog(CatalogSearchQuery())
+
+
+@pytest.mark.django_db
+def test_ranked_catalog_chunks_id_lists(monkeypatch):
+    monkeypatch.setattr(service_module, "RANK_CHUNK_SIZE", 2)
+    hits = [
+        SearchHit(product_id=_make_product(name=f"P{i}").id, relevance=float(i))
+        for i in range(5)
+    ]
+    service = CatalogSearchService(_StubBackend(hits))
+
+    with CaptureQueriesContext(connection) as ctx:
+        ranked = service.get_ranked_catalog(CatalogSearchQuery(search="x"))
+
+    assert len(ranked.keys) == 5
+    assert len(ctx.captured_queries) == 3
+    assert all("CASE" not in q["sql"] for q in ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_list_endpoint_pages_over_ranking(monkeypatch):
+    hits = _catalogue()
+    monkeypatch.setattr(
+        "api.views.products._build_backend", lambda: _StubBackend(hits)
+    )
+    client = APIClient()
+
+    full = [i["id"] for i in client.get("/api/v1/products/", {"search": "x"}).json()["results"]]
+    first = client.get("/api/v1/products/", {"search": "x", "page_size": 3}).json()
+    second = client.get(
+        "/api/v1/products/", {"search": "x", "cursor": first["next_cursor"]}
+    ).json()
+
+    assert [i["id"] for i in first["results"] + second["results"]] == full
+    assert len(full) == 4
+    assert second["next_cursor"] is None
+    assert second["metadata"] is None
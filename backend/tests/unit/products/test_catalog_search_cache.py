@@ -0,0 +1,129 @@
+"""
+CachedSearchBackend — search result cache keyed by normalised query.
+
+Covers:
+  - Queries differing only in case, whitespace or filters share one entry
+  - Cached hits are returned without calling the wrapped backend
+  - Product save / delete bump the catalogue version and invalidate entries
+  - Hit / miss counters
+  - Blank search terms bypass the cache
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+
+from products.models import Product
+from products.search.cache import (
+    CachedSearchBackend,
+    get_catalogue_version,
+    get_search_cache_stats,
+    normalize_query,
+    reset_search_cache_stats,
+)
+from products.search.types import CatalogSearchQuery, SearchHit, SearchResult
+
+
+class _CountingBackend:
+    def __init__(self, hits: list[SearchHit]) -> None:
+        self.hits = hits
+        self.calls = 0
+
+    def search(self, query: CatalogSearchQuery) -> SearchResult:
+        self.calls += 1
+        return SearchResult(hits=list(self.hits))
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _make_product(name: str = "Cached") -> Product:
+    return Product.objects.create(name=name, price=Decimal("10.00"), stock_quantity=1)
+
+
+def test_normalize_query_ignores_case_whitespace_and_filters():
+    assert normalize_query(CatalogSearchQuery(search="  Wireless   MOUSE ")) == (
+        "wireless mouse"
+    )
+    assert normalize_query(
+        CatalogSearchQuery(search="wireless mouse", category_ids=[3], sort="price_asc")
+    ) == normalize_query(CatalogSearchQuery(search="Wireless Mouse"))
+    assert normalize_query(CatalogSearchQuery(search="   ")) is None
+    assert normalize_query(CatalogSearchQuery()) is None
+
+
+@pytest.mark.django_db
+def test_repeated_query_is_served_from_cache():
+    inner = _CountingBackend([SearchHit(product_id=7, relevance=1.5)])
+    backend = CachedSearchBackend(inner)
+
+    first = backend.search(CatalogSearchQuery(search="mouse"))
+    second = backend.search(CatalogSearchQuery(search=" MOUSE", in_stock_only=True))
+
+    assert inner.calls == 1
+    assert second.relevance_map == first.relevance_map == {7: 1.5}
+    assert get_search_cache_stats() == {"hits": 1, "misses": 1}
+
+
+@pytest.mark.django_db
+def test_empty_result_is_cached():
+    inner = _CountingBackend([])
+    backend = CachedSearchBackend(inner)
+
+    backend.search(CatalogSearchQuery(search="nothing"))
+    result = backend.search(CatalogSearchQuery(search="nothing"))
+
+    assert result.is_empty
+    assert inner.calls == 1
+
+
+@pytest.mark.django_db
+def test_product_save_and_delete_invalidate_cache():
+    inner = _CountingBackend([])
+    backend = CachedSearchBackend(inner)
+    query = CatalogSearchQuery(search="mouse")
+
+    backend.search(query)
+    version = get_catalogue_version()
+    product = _make_product()
+    assert get_catalogue_version() > version
+    backend.search(query)
+    assert inner.calls == 2
+
+    version = get_catalogue_version()
+    product.delete()
+    assert get_catalogue_version() > version
+    backend.search(query)
+    assert inner.calls == 3
+
+
+@pytest.mark.django_db
+def test_blank_search_bypasses_cache():
+    inner = _CountingBackend([])
+    backend = CachedSearchBackend(inner)
+    reset_search_cache_stats()
+
+    backend.search(CatalogSearchQuery(search="  "))
+    backend.search(CatalogSearchQuery(search="  "))
+
+    assert inner.calls == 2
+    assert get_search_cache_stats() == {"hits": 0, "misses": 0}
+
+
+@pytest.mark.django_db
+def test_stock_only_save_keeps_cache():
+    product = _make_product()
+    version = get_catalogue_version()
+
+    product.stock_quantity = 0
+    product.save(update_fields=["stock_quantity"])
+    assert get_catalogue_version() == version
+
+    product.name = "Renamed"
+    product.save(update_fields=["name"])
+    assert get_catalogue_version() > version
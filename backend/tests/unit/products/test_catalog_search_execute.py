@@ -0,0 +1,126 @@
+"""
+CatalogSearchService.execute — single-pass catalogue search.
+
+Covers:
+  - The text-search backend runs once per listing request (results + bounds)
+  - Price bounds match get_price_bounds and ignore the price-range filter
+  - Results match get_queryset / get_ranked_catalog for the same query
+  - with_price_bounds=False skips the aggregate query
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from products.models import Product
+from products.search.service import CatalogSearchService
+from products.search.types import CatalogSearchQuery, SearchHit, SearchResult
+
+
+class _CountingBackend:
+    def __init__(self, hits: list[SearchHit]) -> None:
+        self.hits = hits
+        self.calls = 0
+
+    def search(self, query: CatalogSearchQuery) -> SearchResult:
+        self.calls += 1
+        return SearchResult(hits=list(self.hits))
+
+
+def _make_product(**kwargs) -> Product:
+    defaults = {"price": Decimal("10.00"), "stock_quantity": 5, "is_active": True}
+    defaults.update(kwargs)
+    return Product.objects.create(**defaults)
+
+
+def _catalogue() -> list[SearchHit]:
+    cheap = _make_product(name="Cheap", price=Decimal("5.00"))
+    mid = _make_product(name="Mid", price=Decimal("20.00"), stock_quantity=0)
+    dear = _make_product(name="Dear", price=Decimal("90.00"))
+    _make_product(name="Unmatched", price=Decimal("1.00"))
+    return [
+        SearchHit(product_id=mid.id, relevance=2.0),
+        SearchHit(product_id=cheap.id, relevance=1.0),
+        SearchHit(product_id=dear.id, relevance=1.0),
+    ]
+
+
+QUERIES = [
+    CatalogSearchQuery(search="x"),
+    CatalogSearchQuery(search="x", max_price=Decimal("50")),
+    CatalogSearchQuery(search="x", sort="price_desc", min_price=Decimal("10")),
+    CatalogSearchQuery(in_stock_only=True),
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", QUERIES)
+def test_execute_matches_separate_calls(query):
+    hits = _catalogue()
+    result = CatalogSearchService(_CountingBackend(hits)).execute(query)
+    service = CatalogSearchService(_CountingBackend(hits))
+
+    if service.is_ranked(query):
+        assert result.ranked.product_ids == service.get_ranked_catalog(query).product_ids
+    else:
+        assert list(result.queryset) == list(service.get_queryset(query))
+    assert (result.price_min, result.price_max) == service.get_price_bounds(query)
+
+
+@pytest.mark.django_db
+def test_ranked_bounds_ignore_price_filter_and_cost_no_extra_query():
+    backend = _CountingBackend(_catalogue())
+    query = CatalogSearchQuery(search="x", min_price=Decimal("10"), max_price=Decimal("50"))
+
+    with CaptureQueriesContext(connection) as ctx:
+        result = CatalogSearchService(backend).execute(query)
+
+    assert [Product.objects.get(pk=pk).name for pk in result.ranked.product_ids] == ["Mid"]
+    assert (result.price_min, result.price_max) == (Decimal("5.00"), Decimal("90.00"))
+    assert backend.calls == 1
+    assert len(ctx.captured_queries) == 1
+
+
+@pytest.mark.django_db
+def test_empty_search_returns_empty_result():
+    _catalogue()
+    backend = _CountingBackend([])
+
+    result = CatalogSearchService(backend).execute(
+        CatalogSearchQuery(search="x", sort="name_asc")
+    )
+
+    assert list(result.queryset) == []
+    assert (result.price_min, result.price_max) == (None, None)
+    assert backend.calls == 1
+
+
+@pytest.mark.django_db
+def test_without_price_bounds_skips_aggregate():
+    _catalogue()
+
+    with CaptureQueriesContext(connection) as ctx:
+        result = CatalogSearchService(_CountingBackend([])).execute(
+            CatalogSearchQuery(), with_price_bounds=False
+        )
+
+    assert len(ctx.captured_queries) == 0
+    assert result.price_min is None
+    assert result.queryset.count() == 4
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{"search": "x"}, {"search": "x", "sort": "name_asc"}])
+def test_list_endpoint_searches_once(monkeypatch, params):
+    backend = _CountingBackend(_catalogue())
+    monkeypatch.setattr("api.views.products._build_backend", lambda: backend)
+
+    body = APIClient().get("/api/v1/products/", params).json()
+
+    assert backend.calls == 1
+    assert len(body["results"]) == 3
+    assert Decimal(body["metadata"]["price_min_available"]) == Decimal("5")
+    assert Decimal(body["metadata"]["price_max_available"]) == Decimal("90")
@@ -0,0 +1,146 @@
+"""Parity tests for the bulk pricing engine (price_products_bulk).
+
+Every case prices the same products through the scalar path
+(``get_product_pricing``) and the integer minor-unit engine and requires
+identical ``ProductPricingResult`` values — amounts, exponents, percentage
+and promotion metadata.
+
+Covers:
+- Seeded random catalogues: PERCENT, FIXED/GROSS and FIXED/NET promotions,
+  fractional tax rates, prices on rounding boundaries, no promotion
+- Discounts larger than the price clamp to zero
+- Products without price_net_amount return None
+- Inputs outside the integer model fall back to the scalar path
+- minor_units() matches the result amounts
+"""
+
+import random
+from decimal import Decimal
+
+import pytest
+
+from discounts.models import Promotion, PromotionAmountScope, PromotionType
+from products.models import Product, TaxClass
+from products.services.pricing import get_product_pricing, price_products_bulk
+
+_RATES = [None, Decimal("0"), Decimal("5"), Decimal("8.5"), Decimal("19"), Decimal("23"), Decimal("21.3333")]
+
+
+def _product(pk: int, net, rate=None) -> Product:
+    product = Product(
+        id=pk,
+        name=f"P{pk}",
+        price=Decimal("1.00"),
+        price_net_amount=net,
+        currency="EUR",
+        stock_quantity=1,
+    )
+    product.tax_class = (
+        TaxClass(id=pk, name="T", code=f"t{pk}", rate=rate) if rate is not None else None
+    )
+    return product
+
+
+def _promotion(pk: int, promo_type: str, value: Decimal, scope=PromotionAmountScope.GROSS) -> Promotion:
+    return Promotion(
+        id=pk, name=f"Promo {pk}", code=f"promo-{pk}", type=promo_type, value=value, amount_scope=scope
+    )
+
+
+def _random_case(rng: random.Random, pk: int):
+    net = Decimal(rng.choice([rng.randint(0, 500_00), rng.randint(0, 200) * 50 + 5])).scaleb(-2)
+    product = _product(pk, net, rng.choice(_RATES))
+    roll = rng.random()
+    if roll < 0.25:
+        promotion = None
+    elif roll < 0.55:
+        promotion = _promotion(pk, PromotionType.PERCENT, Decimal(rng.randint(1, 10000)).scaleb(-2))
+    else:
+        scope = rng.choice([PromotionAmountScope.GROSS, PromotionAmountScope.NET])
+        promotion = _promotion(pk, PromotionType.FIXED, Decimal(rng.randint(1, 60000)).scaleb(-2), scope)
+    return product, promotion
+
+
+def _assert_same(bulk, product, promotions):
+    expected = get_product_pricing(product, line_promotions=promotions)
+    actual = bulk.result(product.pk)
+    assert actual == expected, (product.price_net_amount, promotions.get(product.pk))
+    if expected is not None:
+        # Equal Decimals may still differ in exponent ("5.0" vs "5.00").
+        assert str(actual.discounted.gross.amount) == str(expected.discounted.gross.amount)
+        assert str(actual.discount.percentage) == str(expected.discount.percentage)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_bulk_matches_scalar_on_random_catalogue(seed):
+    rng = random.Random(seed)
+    cases = [_random_case(rng, pk) for pk in range(1, 401)]
+    products = [p for p, _ in cases]
+    promotions = {p.pk: promo for p, promo in cases}
+
+    bulk = price_products_bulk(products, promotions)
+
+    assert len(bulk) == len(products)
+    for product in products:
+        _assert_same(bulk, product, promotions)
+
+
+@pytest.mark.parametrize(
+    "promotion",
+    [
+        _promotion(1, PromotionType.PERCENT, Decimal("100.00")),
+        _promotion(1, PromotionType.FIXED, Decimal("999.99"), PromotionAmountScope.GROSS),
+        _promotion(1, PromotionType.FIXED, Decimal("999.99"), PromotionAmountScope.NET),
+    ],
+)
+def test_discount_clamps_to_zero(promotion):
+    product = _product(1, Decimal("10.00"), Decimal("23"))
+    promotions = {1: promotion}
+
+    bulk = price_products_bulk([product], promotions)
+
+    assert bulk.result(1).discounted.gross.amount == Decimal("0.00")
+    _assert_same(bulk, product, promotions)
+
+
+def test_zero_net_with_promotion_has_null_percentage():
+    product = _product(1, Decimal("0.00"))
+    promotions = {1: _promotion(1, PromotionType.PERCENT, Decimal("10"))}
+
+    bulk = price_products_bulk([product], promotions)
+
+    assert bulk.result(1).discount.percentage is None
+    _assert_same(bulk, product, promotions)
+
+
+def test_product_without_net_amount_is_unpriced():
+    product = _product(1, None)
+
+    bulk = price_products_bulk([product], {1: None})
+
+    assert 1 in bulk
+    assert bulk.result(1) is None
+    assert bulk.minor_units(1) is None
+
+
+def test_inputs_outside_integer_model_use_scalar_path():
+    product = _product(1, Decimal("10.005"), Decimal("23"))
+    promotions = {1: _promotion(1, PromotionType.PERCENT, Decimal("12.5"))}
+
+    bulk = price_products_bulk([product], promotions)
+
+    _assert_same(bulk, product, promotions)
+
+
+def test_minor_units_match_result():
+    products = [_product(1, Decimal("19.99"), Decimal("23")), _product(2, Decimal("10.005"))]
+    promotions = {1: _promotion(1, PromotionType.PERCENT, Decimal("15")), 2: None}
+
+    bulk = price_products_bulk(products, promotions)
+
+    for product in products:
+        result = bulk.result(product.pk)
+        units = bulk.minor_units(product.pk)
+        assert units.undiscounted_gross == int(result.undiscounted.gross.amount * 100)
+        assert units.discounted_gross == int(result.discounted.gross.amount * 100)
+        assert units.discounted_tax == int(result.discounted.tax.amount * 100)
@@ -0,0 +1,212 @@
+"""Unit tests for the materialised ProductEffectivePrice table.
+
+Covers:
+- Creating a product materialises its promotion-aware price
+- Legacy products (no price_net_amount) fall back to price
+- Stock-only saves do not re-price
+- Tax-class rate changes re-price every product of the class
+- Promotion target writes re-price affected products on commit
+- Window-boundary refresh picks up promotions starting today
+- Window-boundary refresh catches up boundaries of days it did not run
+- Full refresh rebuilds missing rows
+- migrate backfills an empty table and leaves a populated one alone
+- Catalogue price filter, sort and bounds use the discounted gross
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from categories.models import Category
+from discounts.models import Promotion, PromotionCategory, PromotionProduct, PromotionType
+from products.models import Product, ProductEffectivePrice, TaxClass
+from products.services.effective_price import (
+    refresh_effective_prices,
+    refresh_effective_prices_at_window_boundaries,
+)
+from products.services.pricing import get_product_pricing
+
+
+def make_product(name: str = "Effective", net: Decimal = Decimal("100.00"), **kwargs) -> Product:
+    defaults = dict(price=net, price_net_amount=net, currency="EUR", stock_quantity=5)
+    defaults.update(kwargs)
+    return Product.objects.create(name=name, **defaults)
+
+
+def make_promotion(code: str, value: Decimal = Decimal("50"), **kwargs) -> Promotion:
+    return Promotion.objects.create(
+        name=f"Promo {code}", code=code, type=PromotionType.PERCENT, value=value, **kwargs
+    )
+
+
+def row(product: Product) -> ProductEffectivePrice:
+    return ProductEffectivePrice.objects.get(product=product)
+
+
+@pytest.mark.django_db
+def test_product_create_materialises_pricing():
+    tax = TaxClass.objects.create(name="Standard", code="std", rate=Decimal("23"))
+    product = make_product(tax_class=tax)
+
+    pricing = get_product_pricing(product)
+    eff = row(product)
+
+    assert eff.undiscounted_net == pricing.undiscounted.net.amount
+    assert eff.undiscounted_gross == Decimal("123.00")
+    assert eff.discounted_gross == pricing.discounted.gross.amount
+    assert eff.currency == "EUR"
+    assert eff.valid_on == timezone.now().date()
+
+
+@pytest.mark.django_db
+def test_legacy_product_falls_back_to_price():
+    product = Product.objects.create(name="Legacy", price=Decimal("7.50"), stock_quantity=1)
+
+    eff = row(product)
+
+    assert eff.discounted_gross == eff.undiscounted_net == Decimal("7.50")
+
+
+@pytest.mark.django_db
+def test_stock_only_save_does_not_reprice():
+    product = make_product()
+    product.stock_quantity = 1
+
+    with CaptureQueriesContext(connection) as ctx:
+        product.save(update_fields=["stock_quantity"])
+
+    assert len(ctx.captured_queries) == 1
+
+
+@pytest.mark.django_db
+def test_tax_class_change_reprices_its_products():
+    tax = TaxClass.objects.create(name="Reduced", code="red", rate=Decimal("10"))
+    product = make_product(tax_class=tax)
+    assert row(product).discounted_gross == Decimal("110.00")
+
+    tax.rate = Decimal("20")
+    tax.save()
+    assert row(product).discounted_gross == Decimal("120.00")
+
+    tax.delete()
+    assert row(product).discounted_gross == Decimal("100.00")
+
+
+@pytest.mark.django_db
+def test_promotion_targets_reprice_on_commit(django_capture_on_commit_callbacks):
+    category = Category.objects.create(name="Effective")
+    direct = make_product("Direct")
+    in_category = make_product("In category", category=category)
+    promo = make_promotion("half")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        PromotionProduct.objects.create(promotion=promo, product=direct)
+        PromotionCategory.objects.create(promotion=promo, category=category)
+    assert row(direct).discounted_gross == Decimal("50.00")
+    assert row(in_category).discounted_gross == Decimal("50.00")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        promo.is_active = False
+        promo.save()
+    assert row(direct).discounted_gross == Decimal("100.00")
+    assert row(in_category).discounted_gross == Decimal("100.00")
+
+
+@pytest.mark.django_db
+def test_window_boundary_refresh_applies_promotion_starting_today():
+    today = timezone.now().date()
+    product = make_product()
+    promo = make_promotion("starts-today", active_from=today)
+    # on_commit callbacks do not run in this test, so the row is stale.
+    PromotionProduct.objects.create(promotion=promo, product=product)
+    assert row(product).discounted_gross == Decimal("100.00")
+
+    written = refresh_effective_prices_at_window_boundaries(today)
+
+    assert written == 1
+    assert row(product).discounted_gross == Decimal("50.00")
+    assert refresh_effective_prices_at_window_boundaries(today + timedelta(days=3)) == 0
+
+
+@pytest.mark.django_db
+def test_window_boundary_refresh_catches_up_skipped_days():
+    today = timezone.now().date()
+    started, ended, current = make_product("Started"), make_product("Ended"), make_product("Current")
+    # Priced two days ago; the promotion started yesterday, when the job did not run.
+    PromotionProduct.objects.create(
+        promotion=make_promotion("started", active_from=today - timedelta(days=1)),
+        product=started,
+    )
+    ProductEffectivePrice.objects.filter(product=started).update(
+        valid_on=today - timedelta(days=2)
+    )
+    # Priced while its promotion ran; the promotion ended two days ago.
+    PromotionProduct.objects.create(
+        promotion=make_promotion("ended", active_to=today - timedelta(days=2)),
+        product=ended,
+    )
+    ProductEffectivePrice.objects.filter(product=ended).update(
+        valid_on=today - timedelta(days=3), discounted_gross=Decimal("50.00")
+    )
+    # Priced after its promotion started: already current.
+    PromotionProduct.objects.create(
+        promotion=make_promotion("current", active_from=today - timedelta(days=1)),
+        product=current,
+    )
+    ProductEffectivePrice.objects.filter(product=current).update(
+        discounted_gross=Decimal("50.00")
+    )
+
+    assert refresh_effective_prices_at_window_boundaries(today) == 2
+    assert row(started).discounted_gross == Decimal("50.00")
+    assert row(ended).discounted_gross == Decimal("100.00")
+    assert row(started).valid_on == today
+
+
+@pytest.mark.django_db
+def test_full_refresh_rebuilds_missing_rows():
+    products = [make_product(f"P{i}") for i in range(3)]
+    ProductEffectivePrice.objects.all().delete()
+
+    assert refresh_effective_prices() == 3
+    assert ProductEffectivePrice.objects.filter(product__in=products).count() == 3
+
+
+@pytest.mark.django_db
+def test_migrate_backfills_empty_table():
+    products = [make_product(f"M{i}") for i in range(2)]
+    ProductEffectivePrice.objects.all().delete()
+
+    call_command("migrate", verbosity=0)
+
+    assert ProductEffectivePrice.objects.filter(product__in=products).count() == 2
+
+    # Populated table: no full rebuild on later migrations.
+    ProductEffectivePrice.objects.filter(product=products[0]).delete()
+    call_command("migrate", verbosity=0)
+    assert not ProductEffectivePrice.objects.filter(product=products[0]).exists()
+
+
+@pytest.mark.django_db
+def test_catalogue_price_filter_sort_and_bounds_use_discounted_gross(
+    django_capture_on_commit_callbacks,
+):
+    discounted = make_product("Discounted", net=Decimal("100.00"))
+    regular = make_product("Regular", net=Decimal("60.00"))
+    with django_capture_on_commit_callbacks(execute=True):
+        PromotionProduct.objects.create(promotion=make_promotion("half"), product=discounted)
+    client = APIClient()
+
+    ids = [i["id"] for i in client.get("/api/v1/products/", {"sort": "price_asc"}).json()["results"]]
+    filtered = client.get("/api/v1/products/", {"max_price": "55"}).json()
+
+    assert ids == [discounted.id, regular.id]
+    assert [i["id"] for i in filtered["results"]] == [discounted.id]
+    assert Decimal(filtered["metadata"]["price_min_available"]) == Decimal("50")
+    assert Decimal(filtered["metadata"]["price_max_available"]) == Decimal("60")
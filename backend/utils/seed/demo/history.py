@@ -14,6 +14,7 @@ from carts.services.snapshot import get_snapshot_gross_price
 from orderitems.models import OrderItem
 from orders.models import InventoryReservation, Order
 from orders.services.inventory_reservation_service import release_reservations, reserve_for_checkout
+from orders.services.vat_breakdown import compute_order_vat_breakdown
 from payments.models import Payment
 from payments.providers.acquiremock_webhook import AcquireMockWebhookEvent
 from payments.services.acquiremock_webhook_processor import process_acquiremock_webhook_event
@@ -263,6 +264,7 @@ def _persist_order_totals(*, order: Order, cart_pricing) -> None:
     order.order_discount_gross = order_discount_gross
     order.order_promotion_code = order_promotion_code
     order.currency = cart_pricing.currency
+    order.vat_breakdown = compute_order_vat_breakdown(order)
     order.save(
         update_fields=[
             "subtotal_net",
@@ -272,6 +274,7 @@ def _persist_order_totals(*, order: Order, cart_pricing) -> None:
             "order_discount_gross",
             "order_promotion_code",
             "currency",
+            "vat_breakdown",
         ]
     )
 